@@ -17,6 +17,7 @@ from magnetodb.api.amz.dynamodb.action import DynamoDBAction
 from magnetodb.api.amz.dynamodb import parser
 
 from magnetodb import storage
+from magnetodb.storage import capacity
 from magnetodb.api.amz.dynamodb.exception import AWSValidationException
 from magnetodb.api.amz.dynamodb.exception import AWSErrorResponseException
 
@@ -170,7 +171,9 @@ class QueryDynamoDBAction(DynamoDBAction):
                     parser.Values.RETURN_CONSUMED_CAPACITY_NONE):
                 response[parser.Props.CONSUMED_CAPACITY] = (
                     parser.Parser.format_consumed_capacity(
-                        return_consumed_capacity, None
+                        return_consumed_capacity,
+                        capacity.get_consumed_capacity(self.context,
+                                                       table_name)
                     )
                 )
 
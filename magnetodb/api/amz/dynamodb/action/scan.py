@@ -17,6 +17,7 @@ from magnetodb.api.amz.dynamodb.action import DynamoDBAction
 from magnetodb.api.amz.dynamodb import parser
 
 from magnetodb import storage
+from magnetodb.storage import capacity
 from magnetodb.common import exception
 from magnetodb.storage.models import ScanCondition
 
@@ -124,7 +125,8 @@ class ScanDynamoDBAction(DynamoDBAction):
             result = storage.scan(
                 self.context, table_name, condition_map,
                 attributes_to_get=attrs_to_get, limit=limit,
-                exclusive_start_key=exclusive_start_key)
+                exclusive_start_key=exclusive_start_key,
+                segment=segment, total_segments=total_segments)
 
             response = {
                 parser.Props.COUNT: result.count,
@@ -140,7 +142,9 @@ class ScanDynamoDBAction(DynamoDBAction):
                     parser.Values.RETURN_CONSUMED_CAPACITY_NONE):
                 response[parser.Props.CONSUMED_CAPACITY] = (
                     parser.Parser.format_consumed_capacity(
-                        return_consumed_capacity, None
+                        return_consumed_capacity,
+                        capacity.get_consumed_capacity(self.context,
+                                                       table_name)
                     )
                 )
 
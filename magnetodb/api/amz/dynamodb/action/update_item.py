@@ -17,6 +17,7 @@ from magnetodb.api.amz.dynamodb.action import DynamoDBAction
 from magnetodb.api.amz.dynamodb import parser
 
 from magnetodb import storage
+from magnetodb.storage import capacity
 from magnetodb.api.amz.dynamodb.exception import AWSErrorResponseException
 from magnetodb.api.amz.dynamodb.exception import AWSValidationException
 
@@ -100,10 +101,12 @@ class UpdateItemDynamoDBAction(DynamoDBAction):
             )
 
             # parse return_values param
-            return_values = self.action_params.get(
+            return_values_json = self.action_params.get(
                 parser.Props.RETURN_VALUES, parser.Values.RETURN_VALUES_NONE
             )
 
+            return_values = models.UpdateReturnValuesType(return_values_json)
+
             # parse return_item_collection_metrics
             return_item_collection_metrics = self.action_params.get(
                 parser.Props.RETURN_ITEM_COLLECTION_METRICS,
@@ -124,7 +127,8 @@ class UpdateItemDynamoDBAction(DynamoDBAction):
                 table_name,
                 key_attribute_map=key_attributes,
                 attribute_action_map=attribute_updates,
-                expected_condition_map=expected_item_conditions)
+                expected_condition_map=expected_item_conditions,
+                return_values=return_values)
 
             if not result:
                 raise AWSErrorResponseException()
@@ -132,7 +136,7 @@ class UpdateItemDynamoDBAction(DynamoDBAction):
             # format response
             response = {}
 
-            if return_values != parser.Values.RETURN_VALUES_NONE:
+            if return_values.type != parser.Values.RETURN_VALUES_NONE:
                 response[parser.Props.ATTRIBUTES] = (
                     parser.Parser.format_item_attributes(old_item)
                 )
@@ -152,7 +156,9 @@ class UpdateItemDynamoDBAction(DynamoDBAction):
                     parser.Values.RETURN_CONSUMED_CAPACITY_NONE):
                 response[parser.Props.CONSUMED_CAPACITY] = (
                     parser.Parser.format_consumed_capacity(
-                        return_consumed_capacity, None
+                        return_consumed_capacity,
+                        capacity.get_consumed_capacity(self.context,
+                                                       table_name)
                     )
                 )
 
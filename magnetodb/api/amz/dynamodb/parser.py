@@ -552,36 +552,31 @@ class Parser():
         return expected_attribute_conditions
 
     @staticmethod
-    def format_consumed_capacity(return_consumed_capacity, table_schema):
+    def format_consumed_capacity(return_consumed_capacity, consumed_capacity):
+        """
+        :param return_consumed_capacity: ReturnConsumedCapacity value
+        :param consumed_capacity: storage.capacity.ConsumedCapacity of the
+                    table
+        """
         if return_consumed_capacity == Values.RETURN_CONSUMED_CAPACITY_NONE:
             return None
 
-        consumed_capacity = {
-            Props.GLOBAL_SECONDARY_INDEXES: {
-                # TODO(dukhlov):
-                # read schema and fill global index consumed
-                # capacity to imitate DynamoDB API
-                "global_index_name": {
-                    Props.CAPACITY_UNITS: 0
-                }
-            },
-            Props.LOCAL_SECONDARY_INDEXES: {
-                # TODO(dukhlov):
-                # read schema and fill local index consumed
-                # capacity to imitate DynamoDB API
-                "local_index_name": {
-                    Props.CAPACITY_UNITS: 0
-                }
-            }
+        res = {
+            Props.TABLE_NAME: consumed_capacity.table_name,
+            Props.CAPACITY_UNITS: consumed_capacity.capacity_units
         }
 
-        if return_consumed_capacity == Values.RETURN_CONSUMED_CAPACITY_TOTAL:
-            consumed_capacity[Props.CAPACITY_UNITS] = 0
-            consumed_capacity[Props.TABLE] = {
-                Props.CAPACITY_UNITS: 0
+        if return_consumed_capacity == Values.RETURN_CONSUMED_CAPACITY_INDEXES:
+            res[Props.TABLE] = {
+                Props.CAPACITY_UNITS: consumed_capacity.table_units
             }
+            res[Props.LOCAL_SECONDARY_INDEXES] = dict(
+                (index_name, {Props.CAPACITY_UNITS: units})
+                for index_name, units in
+                consumed_capacity.index_units.iteritems()
+            )
 
-        return consumed_capacity
+        return res
 
     @classmethod
     def parse_select_type(cls, select, attributes_to_get,
@@ -27,6 +27,8 @@ from magnetodb.api.openstack.v1.management import list_backups
 from magnetodb.api.openstack.v1.management import create_restore_job
 from magnetodb.api.openstack.v1.management import describe_restore_job
 from magnetodb.api.openstack.v1.management import list_restore_jobs
+from magnetodb.api.openstack.v1.management import create_export
+from magnetodb.api.openstack.v1.management import describe_export
 
 
 class ManagementApplication(wsgi.Router):
@@ -99,6 +101,24 @@ class ManagementApplication(wsgi.Router):
             action="process_request"
         )
 
+        mapper.connect(
+            "create_export",
+            "/{project_id}/{table_name}/exports",
+            conditions={'method': 'POST'},
+            controller=create_resource(
+                create_export.CreateExportController()),
+            action="process_request"
+        )
+
+        mapper.connect(
+            "describe_export",
+            "/{project_id}/{table_name}/exports/{export_id}",
+            conditions={'method': 'GET'},
+            controller=create_resource(
+                describe_export.DescribeExportController()),
+            action="process_request"
+        )
+
 
 @with_global_env(default_program='management-api')
 def app_factory(global_conf, **local_conf):
@@ -18,6 +18,7 @@ import routes
 from magnetodb.api import with_global_env
 from magnetodb.common import wsgi
 from magnetodb.api.openstack.v1 import create_resource
+from magnetodb.api.openstack.v1.monitoring import metrics
 from magnetodb.api.openstack.v1.monitoring import table_usage_details
 from magnetodb.api.openstack.v1.monitoring import monitoring_list_tables
 
@@ -29,6 +30,12 @@ class MonitoringApplication(wsgi.Router):
         mapper = routes.Mapper()
         super(MonitoringApplication, self).__init__(mapper)
 
+        mapper.connect(
+            "metrics", "/metrics",
+            conditions={'method': 'GET'},
+            controller=create_resource(metrics.MetricsController()),
+            action="metrics"
+        )
         mapper.connect(
             "list_monitored_tables", "/{project_id}/tables",
             conditions={'method': 'GET'},
@@ -14,6 +14,7 @@
 #    under the License.
 
 from magnetodb import storage
+from magnetodb.storage import capacity
 from magnetodb.api import validation
 
 from magnetodb.api.openstack.v1 import parser
@@ -38,6 +39,14 @@ class BatchGetItemController(object):
             validation.validate_object(request_items_json,
                                        parser.Props.REQUEST_ITEMS)
 
+            # parse return_consumed_capacity param
+            return_consumed_capacity = (
+                parser.Parser.parse_return_consumed_capacity(
+                    body.pop(parser.Props.RETURN_CONSUMED_CAPACITY,
+                             parser.Values.RETURN_CONSUMED_CAPACITY_NONE)
+                )
+            )
+
             validation.validate_unexpected_props(body, "body")
 
         # parse request_items
@@ -59,8 +68,20 @@ class BatchGetItemController(object):
             item = parser.Parser.format_item_attributes(res.items[0])
             table_items.append(item)
 
-        return {
+        response = {
             'responses': responses,
             'unprocessed_keys': parser.Parser.format_batch_get_unprocessed(
                 unprocessed, request_items_json)
         }
+
+        if (return_consumed_capacity !=
+                parser.Values.RETURN_CONSUMED_CAPACITY_NONE):
+            response[parser.Props.CONSUMED_CAPACITY] = [
+                parser.Parser.format_consumed_capacity(
+                    return_consumed_capacity, consumed_capacity
+                )
+                for consumed_capacity in capacity.get_consumed_capacity(
+                    req.context)
+            ]
+
+        return response
@@ -15,6 +15,7 @@
 #    under the License.
 
 from magnetodb import storage
+from magnetodb.storage import capacity
 
 from magnetodb.api.openstack.v1 import parser
 from magnetodb.api.openstack.v1 import utils
@@ -39,6 +40,14 @@ class BatchWriteItemController(object):
             validation.validate_object(request_items_json,
                                        parser.Props.REQUEST_ITEMS)
 
+            # parse return_consumed_capacity param
+            return_consumed_capacity = (
+                parser.Parser.parse_return_consumed_capacity(
+                    body.pop(parser.Props.RETURN_CONSUMED_CAPACITY,
+                             parser.Values.RETURN_CONSUMED_CAPACITY_NONE)
+                )
+            )
+
             validation.validate_unexpected_props(body, "body")
 
             # parse request_items
@@ -49,6 +58,18 @@ class BatchWriteItemController(object):
         unprocessed_items = storage.execute_write_batch(
             req.context, request_map)
 
-        return {
+        response = {
             'unprocessed_items': parser.Parser.format_request_items(
                 unprocessed_items)}
+
+        if (return_consumed_capacity !=
+                parser.Values.RETURN_CONSUMED_CAPACITY_NONE):
+            response[parser.Props.CONSUMED_CAPACITY] = [
+                parser.Parser.format_consumed_capacity(
+                    return_consumed_capacity, consumed_capacity
+                )
+                for consumed_capacity in capacity.get_consumed_capacity(
+                    req.context)
+            ]
+
+        return response
@@ -78,11 +78,36 @@ class CreateTableController():
             else:
                 index_def_map = {}
 
+            # parse counter attribute names
+            counter_attrs_json = body.pop(
+                parser.Props.COUNTER_ATTRIBUTES, None
+            )
+
+            if counter_attrs_json:
+                validation.validate_set(
+                    counter_attrs_json, parser.Props.COUNTER_ATTRIBUTES
+                )
+                for attr_name in counter_attrs_json:
+                    validation.validate_attr_name(attr_name)
+
+            # parse default consistency levels of the table
+            consistency_levels_json = body.pop(
+                parser.Props.CONSISTENCY_LEVELS, None
+            )
+
+            if consistency_levels_json is not None:
+                consistency_levels = parser.Parser.parse_consistency_levels(
+                    consistency_levels_json
+                )
+            else:
+                consistency_levels = None
+
             validation.validate_unexpected_props(body, "body")
 
         # prepare table_schema structure
         table_schema = models.TableSchema(
-            attribute_definitions, key_attrs, index_def_map)
+            attribute_definitions, key_attrs, index_def_map,
+            counter_attrs_json, consistency_levels=consistency_levels)
 
         table_meta = storage.create_table(
             req.context, table_name, table_schema)
@@ -132,4 +157,18 @@ class CreateTableController():
                 )
             )
 
+        if table_meta.schema.counter_attributes:
+            table_def = result[parser.Props.TABLE_DESCRIPTION]
+            table_def[parser.Props.COUNTER_ATTRIBUTES] = sorted(
+                table_meta.schema.counter_attributes
+            )
+
+        if table_meta.schema.consistency_levels:
+            table_def = result[parser.Props.TABLE_DESCRIPTION]
+            table_def[parser.Props.CONSISTENCY_LEVELS] = (
+                parser.Parser.format_consistency_levels(
+                    table_meta.schema.consistency_levels
+                )
+            )
+
         return result
@@ -14,6 +14,7 @@
 #    under the License.
 
 from magnetodb import storage
+from magnetodb.storage import capacity
 from magnetodb.api import validation
 from magnetodb.api.openstack.v1 import parser
 from magnetodb.api.openstack.v1 import utils
@@ -64,11 +65,27 @@ class DeleteItemController(object):
 
             return_values = DeleteReturnValuesType(return_values_json)
 
+            # parse consistency_level param
+            consistency_level = body.pop(parser.Props.CONSISTENCY_LEVEL, None)
+            if consistency_level is not None:
+                consistency_level = parser.Parser.parse_consistency_level(
+                    consistency_level
+                )
+
+            # parse return_consumed_capacity param
+            return_consumed_capacity = (
+                parser.Parser.parse_return_consumed_capacity(
+                    body.pop(parser.Props.RETURN_CONSUMED_CAPACITY,
+                             parser.Values.RETURN_CONSUMED_CAPACITY_NONE)
+                )
+            )
+
             validation.validate_unexpected_props(body, "body")
 
         # delete item
         storage.delete_item(req.context, table_name, key_attributes,
-                            expected_condition_map=expected_item_conditions)
+                            expected_condition_map=expected_item_conditions,
+                            consistency_level=consistency_level)
 
         # format response
         response = {}
@@ -81,4 +98,13 @@ class DeleteItemController(object):
                 parser.Parser.format_item_attributes(key_attributes)
             )
 
+        if (return_consumed_capacity !=
+                parser.Values.RETURN_CONSUMED_CAPACITY_NONE):
+            response[parser.Props.CONSUMED_CAPACITY] = (
+                parser.Parser.format_consumed_capacity(
+                    return_consumed_capacity,
+                    capacity.get_consumed_capacity(req.context, table_name)
+                )
+            )
+
         return response
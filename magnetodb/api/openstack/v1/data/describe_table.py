@@ -83,4 +83,18 @@ class DescribeTableController(object):
                     table_meta.schema.index_def_map
                 )
             )
+
+        if table_meta.schema.counter_attributes:
+            table_def = result[parser.Props.TABLE]
+            table_def[parser.Props.COUNTER_ATTRIBUTES] = sorted(
+                table_meta.schema.counter_attributes
+            )
+
+        if table_meta.schema.consistency_levels:
+            table_def = result[parser.Props.TABLE]
+            table_def[parser.Props.CONSISTENCY_LEVELS] = (
+                parser.Parser.format_consistency_levels(
+                    table_meta.schema.consistency_levels
+                )
+            )
         return result
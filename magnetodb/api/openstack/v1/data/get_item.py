@@ -20,6 +20,7 @@ from magnetodb.api.openstack.v1 import parser
 from magnetodb.api.openstack.v1 import utils
 from magnetodb.common import probe
 from magnetodb import storage
+from magnetodb.storage import capacity
 from magnetodb.storage import models
 
 
@@ -56,6 +57,21 @@ class GetItemController(object):
             validation.validate_boolean(consistent_read,
                                         parser.Props.CONSISTENT_READ)
 
+            # parse consistency_level, it overrides consistent_read
+            consistency_level = body.pop(parser.Props.CONSISTENCY_LEVEL, None)
+            if consistency_level is not None:
+                consistent_read = parser.Parser.parse_consistency_level(
+                    consistency_level
+                )
+
+            # parse return_consumed_capacity param
+            return_consumed_capacity = (
+                parser.Parser.parse_return_consumed_capacity(
+                    body.pop(parser.Props.RETURN_CONSUMED_CAPACITY,
+                             parser.Values.RETURN_CONSUMED_CAPACITY_NONE)
+                )
+            )
+
             validation.validate_unexpected_props(body, "body")
 
             # parse key_attributes
@@ -67,11 +83,20 @@ class GetItemController(object):
             select_type=select_type, consistent=consistent_read)
 
         # format response
-        if result.count == 0:
-            return {}
+        response = {}
+
+        if result.count != 0:
+            response[parser.Props.ITEM] = (
+                parser.Parser.format_item_attributes(result.items[0])
+            )
+
+        if (return_consumed_capacity !=
+                parser.Values.RETURN_CONSUMED_CAPACITY_NONE):
+            response[parser.Props.CONSUMED_CAPACITY] = (
+                parser.Parser.format_consumed_capacity(
+                    return_consumed_capacity,
+                    capacity.get_consumed_capacity(req.context, table_name)
+                )
+            )
 
-        response = {
-            parser.Props.ITEM: parser.Parser.format_item_attributes(
-                result.items[0])
-        }
         return response
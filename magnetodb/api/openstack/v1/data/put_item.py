@@ -15,6 +15,7 @@
 #    under the License.
 
 from magnetodb import storage
+from magnetodb.storage import capacity
 from magnetodb.api import validation
 
 from magnetodb.api.openstack.v1 import parser
@@ -67,6 +68,21 @@ class PutItemController(object):
                     time_to_live, parser.Props.TIME_TO_LIVE, min_val=0
                 )
 
+            # parse consistency_level param
+            consistency_level = body.pop(parser.Props.CONSISTENCY_LEVEL, None)
+            if consistency_level is not None:
+                consistency_level = parser.Parser.parse_consistency_level(
+                    consistency_level
+                )
+
+            # parse return_consumed_capacity param
+            return_consumed_capacity = (
+                parser.Parser.parse_return_consumed_capacity(
+                    body.pop(parser.Props.RETURN_CONSUMED_CAPACITY,
+                             parser.Values.RETURN_CONSUMED_CAPACITY_NONE)
+                )
+            )
+
             validation.validate_unexpected_props(body, "body")
 
         # put item
@@ -75,6 +91,7 @@ class PutItemController(object):
             return_values=return_values,
             if_not_exist=False,
             expected_condition_map=expected_item_conditions,
+            consistency_level=consistency_level
         )
 
         response = {}
@@ -84,4 +101,13 @@ class PutItemController(object):
                 parser.Parser.format_item_attributes(old_item)
             )
 
+        if (return_consumed_capacity !=
+                parser.Values.RETURN_CONSUMED_CAPACITY_NONE):
+            response[parser.Props.CONSUMED_CAPACITY] = (
+                parser.Parser.format_consumed_capacity(
+                    return_consumed_capacity,
+                    capacity.get_consumed_capacity(req.context, table_name)
+                )
+            )
+
         return response
@@ -15,6 +15,7 @@
 #    under the License.
 
 from magnetodb import storage
+from magnetodb.storage import capacity
 from magnetodb.api import validation
 from magnetodb.openstack.common.log import logging
 from magnetodb.storage import models
@@ -96,6 +97,13 @@ class QueryController(object):
             consistent_read = body.pop(parser.Props.CONSISTENT_READ, False)
             validation.validate_boolean(consistent_read,
                                         parser.Props.CONSISTENT_READ)
+
+            # parse consistency_level, it overrides consistent_read
+            consistency_level = body.pop(parser.Props.CONSISTENCY_LEVEL, None)
+            if consistency_level is not None:
+                consistent_read = parser.Parser.parse_consistency_level(
+                    consistency_level
+                )
             limit = body.pop(parser.Props.LIMIT, None)
             if limit is not None:
                 limit = validation.validate_integer(limit, parser.Props.LIMIT,
@@ -113,9 +121,50 @@ class QueryController(object):
             else:
                 order_type = None
 
+            # parse return_consumed_capacity param
+            return_consumed_capacity = (
+                parser.Parser.parse_return_consumed_capacity(
+                    body.pop(parser.Props.RETURN_CONSUMED_CAPACITY,
+                             parser.Values.RETURN_CONSUMED_CAPACITY_NONE)
+                )
+            )
+
             validation.validate_unexpected_props(body, "body")
 
         # select item
+        if utils.CONF.stream_read_results and not select_type.is_count:
+            result = storage.query_stream(
+                req.context, table_name, indexed_condition_map,
+                select_type=select_type, index_name=index_name, limit=limit,
+                consistent=consistent_read, order_type=order_type,
+                exclusive_start_key=exclusive_start_key_attributes
+            )
+
+            def get_other_props():
+                props = {parser.Props.COUNT: result.count}
+                if result.last_evaluated_key:
+                    props[parser.Props.LAST_EVALUATED_KEY] = (
+                        parser.Parser.format_item_attributes(
+                            result.last_evaluated_key
+                        )
+                    )
+                # capacity is accounted when items are exhausted
+                if (return_consumed_capacity !=
+                        parser.Values.RETURN_CONSUMED_CAPACITY_NONE):
+                    props[parser.Props.CONSUMED_CAPACITY] = (
+                        parser.Parser.format_consumed_capacity(
+                            return_consumed_capacity,
+                            capacity.get_consumed_capacity(req.context,
+                                                           table_name)
+                        )
+                    )
+                return props
+
+            return utils.stream_items_response(
+                parser.Props.ITEMS, result.items,
+                parser.Parser.format_item_attributes, get_other_props
+            )
+
         result = storage.query(
             req.context, table_name, indexed_condition_map,
             select_type=select_type, index_name=index_name, limit=limit,
@@ -143,4 +192,13 @@ class QueryController(object):
                     result.last_evaluated_key)
             )
 
+        if (return_consumed_capacity !=
+                parser.Values.RETURN_CONSUMED_CAPACITY_NONE):
+            response[parser.Props.CONSUMED_CAPACITY] = (
+                parser.Parser.format_consumed_capacity(
+                    return_consumed_capacity,
+                    capacity.get_consumed_capacity(req.context, table_name)
+                )
+            )
+
         return response
@@ -15,6 +15,7 @@
 #    under the License.
 
 from magnetodb import storage
+from magnetodb.storage import capacity
 from magnetodb.api import validation
 
 from magnetodb.openstack.common.log import logging
@@ -99,15 +100,68 @@ class ScanController(object):
             segment = body.pop(parser.Props.SEGMENT, 0)
             segment = validation.validate_integer(
                 segment, parser.Props.SEGMENT, min_val=0,
-                max_val=total_segments
+                max_val=total_segments - 1
+            )
+
+            # parse consistency_level, scan isn't consistent by default
+            consistency_level = body.pop(parser.Props.CONSISTENCY_LEVEL, None)
+            if consistency_level is not None:
+                consistency_level = parser.Parser.parse_consistency_level(
+                    consistency_level
+                )
+
+            # parse return_consumed_capacity param
+            return_consumed_capacity = (
+                parser.Parser.parse_return_consumed_capacity(
+                    body.pop(parser.Props.RETURN_CONSUMED_CAPACITY,
+                             parser.Values.RETURN_CONSUMED_CAPACITY_NONE)
+                )
             )
 
             validation.validate_unexpected_props(body, "body")
 
+        if utils.CONF.stream_read_results and not select_type.is_count:
+            result = storage.scan_stream(
+                req.context, table_name, condition_map,
+                attributes_to_get=attributes_to_get, limit=limit,
+                exclusive_start_key=exclusive_start_key_attributes,
+                consistent=consistency_level or False,
+                segment=segment, total_segments=total_segments)
+
+            def get_other_props():
+                props = {
+                    parser.Props.COUNT: result.count,
+                    parser.Props.SCANNED_COUNT: result.scanned_count
+                }
+                if result.last_evaluated_key:
+                    props[parser.Props.LAST_EVALUATED_KEY] = (
+                        parser.Parser.format_item_attributes(
+                            result.last_evaluated_key
+                        )
+                    )
+                # capacity is accounted when items are exhausted
+                if (return_consumed_capacity !=
+                        parser.Values.RETURN_CONSUMED_CAPACITY_NONE):
+                    props[parser.Props.CONSUMED_CAPACITY] = (
+                        parser.Parser.format_consumed_capacity(
+                            return_consumed_capacity,
+                            capacity.get_consumed_capacity(req.context,
+                                                           table_name)
+                        )
+                    )
+                return props
+
+            return utils.stream_items_response(
+                parser.Props.ITEMS, result.items,
+                parser.Parser.format_item_attributes, get_other_props
+            )
+
         result = storage.scan(
             req.context, table_name, condition_map,
             attributes_to_get=attributes_to_get, limit=limit,
-            exclusive_start_key=exclusive_start_key_attributes)
+            exclusive_start_key=exclusive_start_key_attributes,
+            consistent=consistency_level or False,
+            segment=segment, total_segments=total_segments)
 
         response = {
             parser.Props.COUNT: result.count,
@@ -126,4 +180,13 @@ class ScanController(object):
                 )
             )
 
+        if (return_consumed_capacity !=
+                parser.Values.RETURN_CONSUMED_CAPACITY_NONE):
+            response[parser.Props.CONSUMED_CAPACITY] = (
+                parser.Parser.format_consumed_capacity(
+                    return_consumed_capacity,
+                    capacity.get_consumed_capacity(req.context, table_name)
+                )
+            )
+
         return response
@@ -17,6 +17,7 @@ from magnetodb.api import validation
 from magnetodb.api.openstack.v1 import parser
 from magnetodb.api.openstack.v1 import utils
 from magnetodb import storage
+from magnetodb.storage import capacity
 from magnetodb.common import exception
 from magnetodb.common import probe
 from magnetodb.storage.models import UpdateReturnValuesType
@@ -76,6 +77,21 @@ class UpdateItemController(object):
 
             return_values = UpdateReturnValuesType(return_values_json)
 
+            # parse consistency_level param
+            consistency_level = body.pop(parser.Props.CONSISTENCY_LEVEL, None)
+            if consistency_level is not None:
+                consistency_level = parser.Parser.parse_consistency_level(
+                    consistency_level
+                )
+
+            # parse return_consumed_capacity param
+            return_consumed_capacity = (
+                parser.Parser.parse_return_consumed_capacity(
+                    body.pop(parser.Props.RETURN_CONSUMED_CAPACITY,
+                             parser.Values.RETURN_CONSUMED_CAPACITY_NONE)
+                )
+            )
+
             validation.validate_unexpected_props(body, "body")
 
         result, old_item = storage.update_item(
@@ -83,7 +99,9 @@ class UpdateItemController(object):
             table_name,
             key_attribute_map=key_attribute_map,
             attribute_action_map=attribute_updates,
-            expected_condition_map=expected_item_conditions)
+            expected_condition_map=expected_item_conditions,
+            return_values=return_values,
+            consistency_level=consistency_level)
 
         if not result:
             raise exception.BackendInteractionException()
@@ -96,4 +114,13 @@ class UpdateItemController(object):
                 parser.Parser.format_item_attributes(old_item)
             )
 
+        if (return_consumed_capacity !=
+                parser.Values.RETURN_CONSUMED_CAPACITY_NONE):
+            response[parser.Props.CONSUMED_CAPACITY] = (
+                parser.Parser.format_consumed_capacity(
+                    return_consumed_capacity,
+                    capacity.get_consumed_capacity(req.context, table_name)
+                )
+            )
+
         return response
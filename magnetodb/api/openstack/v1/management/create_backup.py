@@ -17,6 +17,7 @@ from magnetodb.api.openstack.v1 import parser
 from magnetodb.api.openstack.v1 import utils
 from magnetodb.api import validation
 from magnetodb.common import probe
+from magnetodb import storage
 
 
 class CreateBackupController(object):
@@ -32,14 +33,18 @@ class CreateBackupController(object):
         with probe.Probe(__name__ + '.validation'):
             validation.validate_object(body, "body")
 
-            # backup_name =
-            body.pop(parser.Props.BACKUP_NAME, None)
-            # strategy =
-            body.pop(parser.Props.STRATEGY, None)
+            backup_name = body.pop(parser.Props.BACKUP_NAME, None)
+            if backup_name is not None:
+                validation.validate_string(backup_name,
+                                           parser.Props.BACKUP_NAME)
+
+            strategy = body.pop(parser.Props.STRATEGY, {})
+            validation.validate_object(strategy, parser.Props.STRATEGY)
 
             validation.validate_unexpected_props(body, "body")
 
-        backup = None
+        backup = storage.create_backup(req.context, table_name, backup_name,
+                                       strategy)
         href_prefix = req.path_url
         response = parser.Parser.format_backup(backup, href_prefix)
 
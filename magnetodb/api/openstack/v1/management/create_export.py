@@ -0,0 +1,53 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from magnetodb.api import validation
+from magnetodb.api.openstack.v1 import parser
+from magnetodb.api.openstack.v1 import utils
+from magnetodb.common import probe
+from magnetodb import storage
+
+
+class CreateExportController(object):
+    """ Starts export of table items to sharded NDJSON files. """
+
+    @probe.Probe(__name__)
+    def process_request(self, req, body, project_id, table_name):
+        utils.check_project_id(req.context, project_id)
+        req.context.tenant = project_id
+
+        validation.validate_table_name(table_name)
+
+        with probe.Probe(__name__ + '.validation'):
+            validation.validate_object(body, "body")
+
+            total_segments = body.pop(parser.Props.TOTAL_SEGMENTS, None)
+            if total_segments is not None:
+                total_segments = validation.validate_integer(
+                    total_segments, parser.Props.TOTAL_SEGMENTS, min_val=1,
+                    max_val=4096
+                )
+
+            compress = body.pop(parser.Props.COMPRESS, False)
+            validation.validate_boolean(compress, parser.Props.COMPRESS)
+
+            validation.validate_unexpected_props(body, "body")
+
+        export = storage.create_export(req.context, table_name,
+                                       total_segments, compress)
+        href_prefix = req.path_url
+        response = parser.Parser.format_export(export, href_prefix)
+
+        return response
@@ -17,6 +17,7 @@ from magnetodb.api.openstack.v1 import parser
 from magnetodb.api.openstack.v1 import utils
 from magnetodb.api import validation
 from magnetodb.common import probe
+from magnetodb import storage
 
 
 class CreateRestoreJobController(object):
@@ -27,17 +28,28 @@ class CreateRestoreJobController(object):
         utils.check_project_id(req.context, project_id)
         req.context.tenant = project_id
 
+        validation.validate_table_name(table_name)
+
         with probe.Probe(__name__ + '.validation'):
             validation.validate_object(body, "body")
 
-            # backup_id =
-            body.pop(parser.Props.BACKUP_ID, None)
-            # source =
-            body.pop(parser.Props.SOURCE, None)
+            backup_id = body.pop(parser.Props.BACKUP_ID, None)
+            if backup_id is not None:
+                backup_id = validation.validate_uuid(backup_id,
+                                                     parser.Props.BACKUP_ID)
+
+            source = body.pop(parser.Props.SOURCE, None)
+            if source is not None:
+                validation.validate_string(source, parser.Props.SOURCE)
+
+            strategy = body.pop(parser.Props.STRATEGY, {})
+            validation.validate_object(strategy, parser.Props.STRATEGY)
 
             validation.validate_unexpected_props(body, "body")
 
-        restore_job = None
+        restore_job = storage.create_restore_job(
+            req.context, table_name, backup_id, source, strategy
+        )
         href_prefix = req.path_url
         response = parser.Parser.format_restore_job(restore_job, href_prefix)
 
@@ -17,6 +17,7 @@ from magnetodb.api import validation
 from magnetodb.api.openstack.v1 import parser
 from magnetodb.api.openstack.v1 import utils
 from magnetodb.common import probe
+from magnetodb import storage
 
 
 class DescribeBackupController(object):
@@ -28,9 +29,11 @@ class DescribeBackupController(object):
         req.context.tenant = project_id
 
         validation.validate_table_name(table_name)
+        backup_id = validation.validate_uuid(backup_id,
+                                             parser.Props.BACKUP_ID)
 
-        backup = None
-        href_prefix = req.path_url
+        backup = storage.describe_backup(req.context, table_name, backup_id)
+        href_prefix = req.path_url.rsplit('/', 1)[0]
         response = parser.Parser.format_backup(backup, href_prefix)
 
         return response
@@ -0,0 +1,39 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from magnetodb.api import validation
+from magnetodb.api.openstack.v1 import parser
+from magnetodb.api.openstack.v1 import utils
+from magnetodb.common import probe
+from magnetodb import storage
+
+
+class DescribeExportController(object):
+    """ Describes progress of table export. """
+
+    @probe.Probe(__name__)
+    def process_request(self, req, project_id, table_name, export_id):
+        utils.check_project_id(req.context, project_id)
+        req.context.tenant = project_id
+
+        validation.validate_table_name(table_name)
+        export_id = validation.validate_uuid(export_id,
+                                             parser.Props.EXPORT_ID)
+
+        export = storage.describe_export(req.context, table_name, export_id)
+        href_prefix = req.path_url.rsplit('/', 1)[0]
+        response = parser.Parser.format_export(export, href_prefix)
+
+        return response
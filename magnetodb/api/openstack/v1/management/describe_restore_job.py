@@ -17,6 +17,7 @@ from magnetodb.api import validation
 from magnetodb.api.openstack.v1 import parser
 from magnetodb.api.openstack.v1 import utils
 from magnetodb.common import probe
+from magnetodb import storage
 
 
 class DescribeRestoreJobController(object):
@@ -28,9 +29,13 @@ class DescribeRestoreJobController(object):
         req.context.tenant = project_id
 
         validation.validate_table_name(table_name)
+        restore_job_id = validation.validate_uuid(
+            restore_job_id, parser.Props.RESTORE_JOB_ID
+        )
 
-        restore_job = None
-        href_prefix = req.path_url
+        restore_job = storage.describe_restore_job(req.context, table_name,
+                                                   restore_job_id)
+        href_prefix = req.path_url.rsplit('/', 1)[0]
         response = parser.Parser.format_restore_job(restore_job, href_prefix)
 
         return response
@@ -17,6 +17,7 @@ from magnetodb.api import validation
 from magnetodb.api.openstack.v1 import parser
 from magnetodb.api.openstack.v1 import utils
 from magnetodb.common import probe
+from magnetodb import storage
 
 
 class ListBackupsController(object):
@@ -31,19 +32,28 @@ class ListBackupsController(object):
 
         params = req.params.copy()
 
-        # exclusive_start_backup_id = params.pop(
-        #     parser.Props.EXCLUSIVE_START_BACKUP_ID, None)
+        exclusive_start_backup_id = params.pop(
+            parser.Props.EXCLUSIVE_START_BACKUP_ID, None)
+        if exclusive_start_backup_id:
+            exclusive_start_backup_id = validation.validate_uuid(
+                exclusive_start_backup_id,
+                parser.Props.EXCLUSIVE_START_BACKUP_ID
+            )
 
         limit = params.pop(parser.Props.LIMIT, None)
         if limit:
             limit = validation.validate_integer(limit, parser.Props.LIMIT,
                                                 min_val=0)
 
-        backups = []
+        backups = storage.list_backups(
+            req.context, table_name, exclusive_start_backup_id, limit
+        )
         response = {}
 
         if backups and str(limit) == str(len(backups)):
-            response[parser.Props.LAST_EVALUATED_BACKUP_ID] = backups[-1].id
+            response[parser.Props.LAST_EVALUATED_BACKUP_ID] = str(
+                backups[-1].id
+            )
 
         self_link_prefix = req.path_url
 
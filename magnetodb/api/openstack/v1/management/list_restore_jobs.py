@@ -17,6 +17,7 @@ from magnetodb.api import validation
 from magnetodb.api.openstack.v1 import parser
 from magnetodb.api.openstack.v1 import utils
 from magnetodb.common import probe
+from magnetodb import storage
 
 
 class ListRestoreJobsController(object):
@@ -31,21 +32,28 @@ class ListRestoreJobsController(object):
 
         params = req.params.copy()
 
-        # exclusive_start_restore_job_id = params.pop(
-        #     parser.Props.EXCLUSIVE_START_RESTORE_JOB_ID, None)
+        exclusive_start_restore_job_id = params.pop(
+            parser.Props.EXCLUSIVE_START_RESTORE_JOB_ID, None)
+        if exclusive_start_restore_job_id:
+            exclusive_start_restore_job_id = validation.validate_uuid(
+                exclusive_start_restore_job_id,
+                parser.Props.EXCLUSIVE_START_RESTORE_JOB_ID
+            )
 
         limit = params.pop(parser.Props.LIMIT, None)
         if limit:
             limit = validation.validate_integer(limit, parser.Props.LIMIT,
                                                 min_val=0)
 
-        restore_jobs = []
+        restore_jobs = storage.list_restore_jobs(
+            req.context, table_name, exclusive_start_restore_job_id, limit
+        )
         response = {}
 
         if restore_jobs and str(limit) == str(len(restore_jobs)):
             response[
                 parser.Props.LAST_EVALUATED_RESTORE_JOB_ID
-            ] = restore_jobs[-1].id
+            ] = str(restore_jobs[-1].id)
 
         self_link_prefix = req.path_url
 
@@ -0,0 +1,46 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import webob
+
+from magnetodb.common import metrics
+from magnetodb.common.exception import ValidationError
+from magnetodb.openstack.common.gettextutils import _
+
+FORMAT_JSON = "json"
+FORMAT_PROMETHEUS = "prometheus"
+
+
+class MetricsController():
+    """Returns call counts and latency percentiles of probes collected by
+    the API process.
+    """
+
+    def metrics(self, req):
+        output_format = req.params.get("format", FORMAT_JSON)
+
+        if output_format == FORMAT_PROMETHEUS:
+            return webob.Response(
+                body=metrics.REGISTRY.to_prometheus(),
+                content_type="text/plain", charset="utf-8"
+            )
+
+        if output_format != FORMAT_JSON:
+            raise ValidationError(
+                _("Unsupported metrics format '%(format)s'"),
+                format=output_format
+            )
+
+        return {"metrics": metrics.REGISTRY.snapshot()}
@@ -29,6 +29,7 @@ from magnetodb.storage.models import SelectType
 from magnetodb.storage.models import AttributeType
 from magnetodb.storage.models import AttributeValue
 from magnetodb.storage.models import GetItemRequest
+from magnetodb.storage.models import ConsistencyLevels
 
 from magnetodb.common.exception import ValidationError
 
@@ -42,6 +43,11 @@ class Props():
     KEY_SCHEMA = "key_schema"
     KEY_TYPE = "key_type"
     LOCAL_SECONDARY_INDEXES = "local_secondary_indexes"
+    COUNTER_ATTRIBUTES = "counter_attributes"
+    CONSISTENCY_LEVELS = "consistency_levels"
+    READ = "read"
+    WRITE = "write"
+    SERIAL = "serial"
     GLOBAL_SECONDARY_INDEXES = "global_secondary_indexes"
     INDEX_NAME = "index_name"
     PROJECTION = "projection"
@@ -74,6 +80,7 @@ class Props():
 
     ATTRIBUTES_TO_GET = "attributes_to_get"
     CONSISTENT_READ = "consistent_read"
+    CONSISTENCY_LEVEL = "consistency_level"
     KEY = "key"
     KEYS = "keys"
 
@@ -116,6 +123,8 @@ class Props():
     EXCLUSIVE_START_BACKUP_ID = "exclusive_start_backup_id"
     LAST_EVALUATED_BACKUP_ID = "last_evaluated_backup_id"
     LOCATION = "location"
+    COMPLETED_SEGMENTS = "completed_segments"
+    FAILED_ITEM_COUNT = "failed_item_count"
 
     RESTORE_JOBS = "restore_jobs"
     RESTORE_JOB_ID = "restore_job_id"
@@ -123,6 +132,15 @@ class Props():
     LAST_EVALUATED_RESTORE_JOB_ID = "last_evaluated_restore_job_id"
     SOURCE = "source"
 
+    EXPORT_ID = "export_id"
+    COMPRESS = "compress"
+    SHARDS = "shards"
+    ERROR = "error"
+
+    RETURN_CONSUMED_CAPACITY = "return_consumed_capacity"
+    CONSUMED_CAPACITY = "consumed_capacity"
+    CAPACITY_UNITS = "capacity_units"
+
 
 class Values():
     KEY_TYPE_HASH = "HASH"
@@ -175,6 +193,10 @@ class Values():
     BOOKMARK = "bookmark"
     SELF = "self"
 
+    RETURN_CONSUMED_CAPACITY_NONE = "NONE"
+    RETURN_CONSUMED_CAPACITY_TOTAL = "TOTAL"
+    RETURN_CONSUMED_CAPACITY_INDEXES = "INDEXES"
+
 
 ATTRIBUTE_NAME_PATTERN = "^\w+"
 TABLE_NAME_PATTERN = "^\w+"
@@ -754,45 +776,130 @@ class Parser():
                 table_res[Props.CONSISTENT_READ] = consistent
         return res
 
+    @classmethod
+    def parse_consistency_level(cls, consistency_level_json):
+        validation.validate_string(consistency_level_json,
+                                   Props.CONSISTENCY_LEVEL)
+        ConsistencyLevels.validate_level(consistency_level_json)
+        return consistency_level_json
+
+    @classmethod
+    def parse_consistency_levels(cls, consistency_levels_json):
+        validation.validate_object(consistency_levels_json,
+                                   Props.CONSISTENCY_LEVELS)
+        levels = {}
+        for prop in (Props.READ, Props.WRITE, Props.SERIAL):
+            level = consistency_levels_json.pop(prop, None)
+            if level is not None:
+                validation.validate_string(level, prop)
+            levels[prop] = level
+        validation.validate_unexpected_props(consistency_levels_json,
+                                             Props.CONSISTENCY_LEVELS)
+        return ConsistencyLevels(read=levels[Props.READ],
+                                 write=levels[Props.WRITE],
+                                 serial=levels[Props.SERIAL])
+
+    @classmethod
+    def format_consistency_levels(cls, consistency_levels):
+        res = {}
+        for prop, level in ((Props.READ, consistency_levels.read),
+                            (Props.WRITE, consistency_levels.write),
+                            (Props.SERIAL, consistency_levels.serial)):
+            if level is not None:
+                res[prop] = level
+        return res
+
     @classmethod
     def format_table_status(cls, table_status):
         return table_status
 
+    @classmethod
+    def parse_return_consumed_capacity(cls, return_consumed_capacity_json):
+        validation.validate_string(return_consumed_capacity_json,
+                                   Props.RETURN_CONSUMED_CAPACITY)
+        if return_consumed_capacity_json not in (
+                Values.RETURN_CONSUMED_CAPACITY_NONE,
+                Values.RETURN_CONSUMED_CAPACITY_TOTAL,
+                Values.RETURN_CONSUMED_CAPACITY_INDEXES):
+            raise ValidationError(
+                _("Unsupported %(prop)s value: %(value)s"),
+                prop=Props.RETURN_CONSUMED_CAPACITY,
+                value=return_consumed_capacity_json
+            )
+        return return_consumed_capacity_json
+
+    @classmethod
+    def format_consumed_capacity(cls, return_consumed_capacity,
+                                 consumed_capacity):
+        """
+        :param return_consumed_capacity: return_consumed_capacity value
+        :param consumed_capacity: storage.capacity.ConsumedCapacity of the
+                    table
+        """
+        if return_consumed_capacity == Values.RETURN_CONSUMED_CAPACITY_NONE:
+            return None
+
+        res = {
+            Props.TABLE_NAME: consumed_capacity.table_name,
+            Props.CAPACITY_UNITS: consumed_capacity.capacity_units
+        }
+
+        if return_consumed_capacity == Values.RETURN_CONSUMED_CAPACITY_INDEXES:
+            res[Props.TABLE] = {
+                Props.CAPACITY_UNITS: consumed_capacity.table_units
+            }
+            res[Props.LOCAL_SECONDARY_INDEXES] = dict(
+                (index_name, {Props.CAPACITY_UNITS: units})
+                for index_name, units in
+                consumed_capacity.index_units.iteritems()
+            )
+
+        return res
+
     @classmethod
     def format_backup(cls, backup, self_link_prefix):
         if not backup:
             return {}
 
         res = {
-            Props.BACKUP_ID: backup.id,
+            Props.BACKUP_ID: str(backup.id),
             Props.BACKUP_NAME: backup.name,
             Props.TABLE_NAME: backup.table_name,
             Props.STATUS: backup.status,
             Props.STRATEGY: backup.strategy,
             Props.START_DATE_TIME: backup.start_date_time,
+            Props.ITEM_COUNT: backup.item_count,
+            Props.COMPLETED_SEGMENTS: backup.completed_segments,
         }
 
-        if backup.finish_datetime:
-            res[Props.FINISH_DATE_TIME] = backup.finish_datetime
+        if backup.total_segments:
+            res[Props.TOTAL_SEGMENTS] = backup.total_segments
+
+        if backup.finish_date_time:
+            res[Props.FINISH_DATE_TIME] = backup.finish_date_time
 
         links = [
             {
                 Props.REL: Props.SELF,
                 Props.HREF: cls.format_backup_href(backup, self_link_prefix)
-            },
-            {
-                Props.REL: Props.LOCATION,
-                Props.HREF: backup.location
             }
         ]
 
+        if backup.location:
+            links.append(
+                {
+                    Props.REL: Props.LOCATION,
+                    Props.HREF: backup.location
+                }
+            )
+
         res[Props.LINKS] = links
 
         return res
 
     @classmethod
     def format_backup_href(cls, backup, self_link_prefix):
-        return '{}/{}'.format(self_link_prefix, backup.id)
+        return '{}/{}'.format(self_link_prefix, str(backup.id))
 
     @classmethod
     def format_restore_job(cls, restore_job, self_link_prefix):
@@ -800,15 +907,19 @@ class Parser():
             return {}
 
         res = {
-            Props.RESTORE_JOB_ID: restore_job.id,
-            Props.BACKUP_ID: restore_job.backup_id,
+            Props.RESTORE_JOB_ID: str(restore_job.id),
             Props.TABLE_NAME: restore_job.table_name,
             Props.STATUS: restore_job.status,
             Props.STRATEGY: restore_job.strategy,
             Props.START_DATE_TIME: restore_job.start_date_time,
+            Props.ITEM_COUNT: restore_job.item_count,
+            Props.FAILED_ITEM_COUNT: restore_job.failed_item_count,
         }
 
-        if restore_job.finish_datetime:
+        if restore_job.backup_id:
+            res[Props.BACKUP_ID] = str(restore_job.backup_id)
+
+        if restore_job.finish_date_time:
             res[Props.FINISH_DATE_TIME] = restore_job.finish_date_time
 
         links = [
@@ -829,4 +940,51 @@ class Parser():
 
     @classmethod
     def format_restore_job_href(cls, restore_job, self_link_prefix):
-        return '{}/{}'.format(self_link_prefix, restore_job.id)
+        return '{}/{}'.format(self_link_prefix, str(restore_job.id))
+
+    @classmethod
+    def format_export(cls, export, self_link_prefix):
+        if not export:
+            return {}
+
+        res = {
+            Props.EXPORT_ID: str(export.id),
+            Props.TABLE_NAME: export.table_name,
+            Props.STATUS: export.status,
+            Props.COMPRESS: export.compress,
+            Props.ITEM_COUNT: export.item_count,
+            Props.SHARDS: export.completed_segments,
+            Props.START_DATE_TIME: export.start_date_time,
+        }
+
+        if export.total_segments:
+            res[Props.TOTAL_SEGMENTS] = export.total_segments
+
+        if export.finish_date_time:
+            res[Props.FINISH_DATE_TIME] = export.finish_date_time
+
+        if export.error:
+            res[Props.ERROR] = export.error
+
+        links = [
+            {
+                Props.REL: Props.SELF,
+                Props.HREF: cls.format_export_href(export, self_link_prefix)
+            }
+        ]
+
+        if export.location:
+            links.append(
+                {
+                    Props.REL: Props.LOCATION,
+                    Props.HREF: export.location
+                }
+            )
+
+        res[Props.LINKS] = links
+
+        return res
+
+    @classmethod
+    def format_export_href(cls, export, self_link_prefix):
+        return '{}/{}'.format(self_link_prefix, str(export.id))
@@ -13,9 +13,83 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from oslo.config import cfg
+import webob
+
 from magnetodb.common import exception
+from magnetodb.openstack.common import jsonutils
+from magnetodb.openstack.common import log as logging
+
+LOG = logging.getLogger(__name__)
+
+stream_opts = [
+    cfg.BoolOpt('stream_read_results', default=False,
+                help='Write items of Scan and Query responses while they '
+                     'are read from the storage instead of building the '
+                     'whole response in memory'),
+    cfg.IntOpt('stream_chunk_size', default=64 * 1024,
+               help='Size of response body chunk in bytes written to '
+                    'client by streamed responses'),
+]
+
+CONF = cfg.CONF
+CONF.register_opts(stream_opts)
 
 
 def check_project_id(ctx, project_id):
     if not ctx.tenant or ctx.tenant != project_id:
         raise exception.Forbidden('No access to project')
+
+
+def stream_items_response(items_prop, items, format_item, get_other_props):
+    """
+    Creates response with JSON object body, which items list property is
+    written while items are produced
+
+    :param items_prop: name of property containing items list
+    :param items: iterable of items
+    :param format_item: function which formats item to JSON serializable
+                object
+    :param get_other_props: function which returns dict of other properties
+                of response object. It is called after items are exhausted
+
+    :returns: webob.Response instance
+    """
+    items = iter(items)
+
+    # errors raised before the first item is produced are reported with
+    # usual error response
+    first_items = []
+    for item in items:
+        first_items.append(item)
+        break
+
+    chunk_size = CONF.stream_chunk_size
+
+    def write_body():
+        buf = ['{', jsonutils.dumps(items_prop), ': [']
+        buf_size = 0
+        prefix = ''
+        try:
+            for item_list in (first_items, items):
+                for item in item_list:
+                    data = prefix + jsonutils.dumps(format_item(item))
+                    prefix = ', '
+                    buf.append(data)
+                    buf_size += len(data)
+                    if buf_size >= chunk_size:
+                        yield ''.join(buf)
+                        buf = []
+                        buf_size = 0
+        except Exception:
+            LOG.exception("Streamed response was interrupted")
+            raise
+
+        buf.append(']')
+        for name, value in get_other_props().iteritems():
+            buf += (', ', jsonutils.dumps(name), ': ', jsonutils.dumps(value))
+        buf.append('}')
+        yield ''.join(buf)
+
+    return webob.Response(content_type='application/json',
+                          app_iter=write_body())
@@ -16,8 +16,7 @@
 import json
 import re
 
-from threading import Event
-import Queue
+from oslo.config import cfg
 
 from magnetodb.api import with_global_env
 from magnetodb.openstack.common import log as logging
@@ -29,7 +28,20 @@ from magnetodb.api.openstack.v1 import utils
 
 LOG = logging.getLogger(__name__)
 
-MAX_FUTURES = 100
+bulk_load_opts = [
+    cfg.IntOpt('bulk_load_max_in_flight', default=100,
+               help='Max number of batches written concurrently by single '
+                    'bulk load request. Request body is not read while '
+                    'this number of batches is in flight'),
+    cfg.IntOpt('bulk_load_buffer_size', default=1000,
+               help='Number of items collected to be grouped by partition '
+                    'before writing'),
+    cfg.IntOpt('bulk_load_progress_interval', default=0,
+               help='If positive, progress of bulk load is written to the '
+                    'response each time this number of items is processed'),
+]
+
+cfg.CONF.register_opts(bulk_load_opts)
 
 
 @with_global_env(default_program='magnetodb-streaming-api')
@@ -37,14 +49,6 @@ def app_factory(global_conf, **local_conf):
     return bulk_load_app
 
 
-def make_callback(queue, event, done_count, chunk):
-    def callback(future):
-        done_count[0] += 1
-        queue.put_nowait((future, chunk))
-        event.set()
-    return callback
-
-
 def make_put_item(item):
     data = json.loads(item)
     return parser.Parser.parse_item_attributes(data)
@@ -81,115 +85,103 @@ def bulk_load_app(environ, start_response):
         notifier.EVENT_TYPE_STREAMING_DATA_START,
         {'path': path})
 
-    read_count = 0
+    conf = cfg.CONF
+
+    read_count = [0]
     processed_count = 0
     unprocessed_count = 0
     failed_count = 0
-    put_count = 0
-    done_count = [0]
-    last_read = None
+    last_read = [None]
     failed_items = {}
 
-    dont_process = False
-
-    future_ready_event = Event()
-    future_ready_queue = Queue.Queue()
+    dont_process = [False]
 
     stream = environ['wsgi.input']
-    while True:
-        chunk = stream.readline()
 
-        if not chunk:
-            break
+    def read_items():
+        while True:
+            chunk = stream.readline()
 
-        read_count += 1
+            if not chunk:
+                return
 
-        if dont_process:
-            LOG.debug('Skipping item #%d', read_count)
-            unprocessed_count += 1
-            continue
+            read_count[0] += 1
+            last_read[0] = chunk
+
+            try:
+                item = make_put_item(chunk)
+            except Exception as e:
+                stop_processing(chunk, e)
+                return
 
-        last_read = chunk
+            yield item
 
-        try:
-            future = storage.put_item_async(
-                context, table_name, make_put_item(chunk)
-            )
+    def stop_processing(chunk, e):
+        failed_items[chunk] = repr(e)
+        dont_process[0] = True
+        LOG.debug('Error inserting item: %s, message: %s',
+                  chunk, repr(e))
 
-            put_count += 1
+        _notifier.error(
+            context,
+            notifier.EVENT_TYPE_STREAMING_DATA_ERROR,
+            {'path': path, 'item': chunk, 'error': e.message})
 
-            future.add_done_callback(make_callback(
-                future_ready_queue,
-                future_ready_event,
-                done_count,
-                chunk
-            ))
+    start_response('200 OK', [('Content-Type', 'application/json')])
 
-            # try to get result of finished futures
-            try:
-                while True:
-                    finished_future, chunk = future_ready_queue.get_nowait()
-                    finished_future.result()
-                    processed_count += 1
-            except Queue.Empty:
-                pass
-
-        except Exception as e:
-            failed_items[chunk] = repr(e)
-            dont_process = True
-            LOG.debug('Error inserting item: %s, message: %s',
-                      chunk, repr(e))
-
-            _notifier.error(
-                context,
-                notifier.EVENT_TYPE_STREAMING_DATA_ERROR,
-                {'path': path, 'item': chunk, 'error': e.message})
-
-    LOG.debug('Request body has been read completely')
-
-    # wait for all futures to be finished
-    while done_count[0] < put_count:
-        LOG.debug('Waiting for %d item(s) to be processed...',
-                  put_count - done_count[0])
-        future_ready_event.wait()
-        future_ready_event.clear()
-
-    LOG.debug('All items are processed. Getting results of item processing...')
-
-    # get results of finished futures
-    while done_count[0] > processed_count + failed_count:
-        LOG.debug('Waiting for %d result(s)...',
-                  done_count[0] - processed_count - failed_count)
-        chunk = None
-        try:
-            finished_future, chunk = future_ready_queue.get_nowait()
-            finished_future.result()
-            processed_count += 1
-        except Queue.Empty:
-            break
-        except Exception as e:
-            failed_count += 1
-            failed_items[chunk] = repr(e)
-            LOG.debug('Error inserting item: %s, message: %s',
-                      chunk, repr(e))
-
-            _notifier.error(
-                context,
-                notifier.EVENT_TYPE_STREAMING_DATA_ERROR,
-                {'path': path, 'item': chunk, 'error': e.message})
-
-    # Update count if error happened before put_item_async was invoked
-    if dont_process:
+    progress_interval = conf.bulk_load_progress_interval
+    next_progress = progress_interval
+
+    try:
+        for processed, failed in storage.bulk_load(
+                context, table_name, read_items(),
+                conf.bulk_load_max_in_flight, conf.bulk_load_buffer_size):
+            processed_count += processed
+
+            for item, error in failed:
+                failed_count += 1
+                chunk = json.dumps(parser.Parser.format_item_attributes(item))
+                failed_items[chunk] = error
+                LOG.debug('Error inserting item: %s, message: %s',
+                          chunk, error)
+
+                _notifier.error(
+                    context,
+                    notifier.EVENT_TYPE_STREAMING_DATA_ERROR,
+                    {'path': path, 'item': chunk, 'error': error})
+
+            if 0 < next_progress <= processed_count + failed_count:
+                next_progress = (
+                    processed_count + failed_count + progress_interval
+                )
+                yield json.dumps({
+                    'read': read_count[0],
+                    'processed': processed_count,
+                    'failed': failed_count
+                }) + '\n'
+    except Exception as e:
+        # table can't be loaded, the error is reported for current item
+        if last_read[0] is None:
+            last_read[0] = stream.readline() or None
+            if last_read[0]:
+                read_count[0] += 1
+        stop_processing(last_read[0], e)
+
+    # Count items which weren't processed because of the error
+    if dont_process[0]:
         failed_count += 1
+        while stream.readline():
+            read_count[0] += 1
+            unprocessed_count += 1
 
-    start_response('200 OK', [('Content-Type', 'application/json')])
+    LOG.debug('All items are processed')
 
     resp = {
-        'read': read_count,
+        'read': read_count[0],
         'processed': processed_count,
         'unprocessed': unprocessed_count,
         'failed': failed_count,
-        'last_item': last_read,
+        'last_item': last_read[0],
         'failed_items': failed_items
     }
 
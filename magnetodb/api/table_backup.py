@@ -0,0 +1,206 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Backup and restore jobs executed by magnetodb-async-task-executor.
+
+Backup is table export (see table_export) to local directory of the
+executor, progress of the job is saved to backup info repository after
+each shard. Restore job replays items of backup shards through bulk load
+of storage manager with limited number of batches in flight and optional
+limit of written items per second.
+"""
+
+from datetime import datetime
+import os
+import shutil
+import time
+
+from oslo.config import cfg
+
+from magnetodb.api import table_export
+from magnetodb.openstack.common import log as logging
+from magnetodb.storage.backup_info_repo import BackupInfo
+from magnetodb.storage.backup_info_repo import RestoreJobInfo
+
+LOG = logging.getLogger(__name__)
+
+backup_opts = [
+    cfg.StrOpt('backup_dir', default='/var/lib/magnetodb/backup',
+               help='Directory to write backups to'),
+    cfg.IntOpt('backup_total_segments', default=16,
+               help='Default number of shard files of backup'),
+    cfg.IntOpt('backup_parallelism', default=4,
+               help='Number of backup shards written concurrently'),
+    cfg.IntOpt('restore_max_in_flight', default=10,
+               help='Max number of batches written concurrently by '
+                    'restore job'),
+    cfg.IntOpt('restore_max_items_per_second', default=0,
+               help='If positive, restore job writes not more than this '
+                    'number of items per second'),
+    cfg.IntOpt('restore_progress_interval', default=10000,
+               help='Number of items restored between progress updates'),
+]
+
+cfg.CONF.register_opts(backup_opts)
+
+
+def get_backup_dir(tenant, table_name, backup_id):
+    return os.path.join(cfg.CONF.backup_dir, tenant, table_name,
+                        str(backup_id))
+
+
+def create_backup(context, storage_driver, table_info_repo,
+                  backup_info_repo, table_name, backup_id):
+    """
+    Writes backup of the table items with consistent reads of hash key
+    token ranges
+
+    :returns: BackupInfo instance
+    """
+    backup_info = backup_info_repo.get_backup(context, table_name,
+                                              backup_id)
+    table_info = table_info_repo.get(context, table_name)
+
+    strategy = backup_info.strategy
+    backup_info.location = get_backup_dir(context.tenant, table_name,
+                                          backup_id)
+    backup_info.total_segments = strategy.get(
+        "total_segments", cfg.CONF.backup_total_segments
+    )
+    backup_info_repo.update_backup(context, backup_info,
+                                   ["location", "total_segments"])
+
+    def scan_segment(segment, total_segments):
+        return storage_driver.scan_stream(
+            context, table_info, {}, consistent=True, segment=segment,
+            total_segments=total_segments
+        ).items
+
+    def report_progress(manifest):
+        backup_info.completed_segments = len(manifest["shards"])
+        backup_info.item_count = manifest["item_count"]
+        backup_info_repo.update_backup(
+            context, backup_info, ["completed_segments", "item_count"]
+        )
+
+    try:
+        table_export.export_table(
+            scan_segment, backup_info.location,
+            total_segments=backup_info.total_segments,
+            parallelism=cfg.CONF.backup_parallelism,
+            compress=strategy.get("compress", True),
+            manifest_extra=dict(
+                tenant=context.tenant, table_name=table_name,
+                backup_id=str(backup_id), schema=table_info.schema.to_json()
+            ),
+            progress_callback=report_progress
+        )
+        backup_info.status = BackupInfo.STATUS_ACTIVE
+    except Exception:
+        LOG.exception("Backup '%s' of table '%s' failed", backup_id,
+                      table_name)
+        backup_info.status = BackupInfo.STATUS_CREATE_FAILED
+
+    backup_info.finish_date_time = datetime.now()
+    backup_info_repo.update_backup(context, backup_info,
+                                   ["status", "finish_date_time"])
+    return backup_info
+
+
+def delete_backup(context, backup_info_repo, table_name, backup_id):
+    backup_info = backup_info_repo.get_backup(context, table_name,
+                                              backup_id)
+    if backup_info.location and os.path.isdir(backup_info.location):
+        shutil.rmtree(backup_info.location)
+    backup_info_repo.delete_backup(context, table_name, backup_id)
+
+
+def _throttle(items, max_items_per_second):
+    start_time = time.time()
+    for count, item in enumerate(items):
+        delay = start_time + float(count) / max_items_per_second - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        yield item
+
+
+def restore_table(context, storage_manager, backup_info_repo, table_name,
+                  restore_job_id):
+    """
+    Writes items of backup located in restore job source to the table
+
+    :returns: RestoreJobInfo instance
+    """
+    restore_job = backup_info_repo.get_restore_job(context, table_name,
+                                                   restore_job_id)
+    strategy = restore_job.strategy
+    max_items_per_second = strategy.get(
+        "max_items_per_second", cfg.CONF.restore_max_items_per_second
+    )
+
+    def read_items():
+        for item, error in table_export.iter_items(restore_job.source,
+                                                   manifest):
+            if error is None:
+                yield item
+            else:
+                LOG.error("Can't restore item. %s", error)
+                restore_job.failed_item_count += 1
+
+    try:
+        backup_dir = os.path.realpath(cfg.CONF.backup_dir)
+        if not os.path.realpath(restore_job.source).startswith(
+                os.path.join(backup_dir, "")):
+            raise ValueError(
+                "Restore source '{}' is out of backup directory".format(
+                    restore_job.source)
+            )
+
+        manifest = table_export.read_manifest(restore_job.source)
+        if manifest["status"] != table_export.STATUS_DONE:
+            raise ValueError(
+                "Backup at '{}' is not complete".format(restore_job.source)
+            )
+
+        items = read_items()
+        if max_items_per_second > 0:
+            items = _throttle(items, max_items_per_second)
+
+        reported_count = 0
+        for processed, failed in storage_manager.bulk_load(
+                context, table_name, items,
+                max_in_flight=cfg.CONF.restore_max_in_flight):
+            restore_job.item_count += processed
+            restore_job.failed_item_count += len(failed)
+            for item, error in failed:
+                LOG.error("Can't restore item. %s", error)
+            count = restore_job.item_count + restore_job.failed_item_count
+            if count - reported_count >= cfg.CONF.restore_progress_interval:
+                reported_count = count
+                backup_info_repo.update_restore_job(
+                    context, restore_job, ["item_count", "failed_item_count"]
+                )
+        restore_job.status = RestoreJobInfo.STATUS_DONE
+    except Exception:
+        LOG.exception("Restore job '%s' of table '%s' failed",
+                      restore_job_id, table_name)
+        restore_job.status = RestoreJobInfo.STATUS_FAILED
+
+    restore_job.finish_date_time = datetime.now()
+    backup_info_repo.update_restore_job(
+        context, restore_job,
+        ["status", "item_count", "failed_item_count", "finish_date_time"]
+    )
+    return restore_job
@@ -0,0 +1,275 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Export of table items to sharded NDJSON files.
+
+Each line of shard file is item in the format of
+Parser.format_item_attributes, so shard files can be loaded back with
+bulk load API or bin/data-load as is. Each shard is the contiguous hash key
+token range of the table (scan segment), shards are written concurrently.
+Export state is saved to the manifest file in the export directory.
+
+Exports started by management API are executed by
+magnetodb-async-task-executor (see create_export), their progress is saved
+to backup info repository, so it can be tracked from any API node.
+"""
+
+from datetime import datetime
+import gzip
+import json
+import os
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from oslo.config import cfg
+
+from magnetodb.api.openstack.v1 import parser
+from magnetodb.openstack.common import log as logging
+from magnetodb.storage.backup_info_repo import ExportInfo
+
+LOG = logging.getLogger(__name__)
+
+table_export_opts = [
+    cfg.StrOpt('table_export_dir', default='/var/lib/magnetodb/export',
+               help='Directory to write table exports started by '
+                    'management API to'),
+    cfg.IntOpt('table_export_total_segments', default=16,
+               help='Default number of shard files of table export'),
+    cfg.IntOpt('table_export_parallelism', default=4,
+               help='Number of shards of table export written '
+                    'concurrently'),
+]
+
+cfg.CONF.register_opts(table_export_opts)
+
+MANIFEST_FILE_NAME = "manifest.json"
+
+STATUS_IN_PROGRESS = "in_progress"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+def get_shard_file_name(segment, total_segments, compress=False):
+    file_name = "part-{:05d}-of-{:05d}.json".format(segment, total_segments)
+    return file_name + ".gz" if compress else file_name
+
+
+def get_export_dir(tenant, table_name, export_id):
+    return os.path.join(cfg.CONF.table_export_dir, tenant, table_name,
+                        str(export_id))
+
+
+def open_shard(file_path, mode='rb'):
+    if file_path.endswith(".gz"):
+        return gzip.open(file_path, mode)
+    return open(file_path, mode)
+
+
+def iter_items(output_dir, manifest):
+    """
+    Reads items of all shards listed in manifest
+
+    :returns: iterator over (item, error) tuples, where one of values is
+              None. Error is reported for lines which can't be parsed
+    """
+    for shard in manifest["shards"]:
+        with open_shard(os.path.join(output_dir, shard["file"])) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield parser.Parser.parse_item_attributes(
+                        json.loads(line)
+                    ), None
+                except Exception as e:
+                    yield None, "{}: {}".format(line.strip(), e)
+
+
+def read_manifest(output_dir):
+    with open(os.path.join(output_dir, MANIFEST_FILE_NAME)) as f:
+        return json.load(f)
+
+
+def _write_manifest(output_dir, manifest):
+    file_path = os.path.join(output_dir, MANIFEST_FILE_NAME)
+    tmp_file_path = file_path + ".tmp"
+    with open(tmp_file_path, 'w') as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+    os.rename(tmp_file_path, file_path)
+
+
+def write_shard(items, file_path):
+    """
+    Writes items to the shard file, compressed if file name ends with .gz
+
+    :returns: number of written items
+    """
+    count = 0
+    with open_shard(file_path, 'wb') as f:
+        for item in items:
+            f.write(json.dumps(parser.Parser.format_item_attributes(item)))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def _start_export(output_dir, total_segments, compress, manifest_extra):
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+
+    manifest = dict(manifest_extra or {})
+    manifest.update(
+        status=STATUS_IN_PROGRESS,
+        total_segments=total_segments,
+        compress=compress,
+        start_date_time=time.time(),
+        item_count=0,
+        shards=[]
+    )
+    _write_manifest(output_dir, manifest)
+    return manifest
+
+
+def _export_segments(scan_segment, output_dir, manifest, parallelism,
+                     progress_callback=None):
+    total_segments = manifest["total_segments"]
+    compress = manifest["compress"]
+    lock = threading.Lock()
+
+    def export_segment(segment):
+        file_name = get_shard_file_name(segment, total_segments, compress)
+        count = write_shard(scan_segment(segment, total_segments),
+                            os.path.join(output_dir, file_name))
+        with lock:
+            manifest["item_count"] += count
+            manifest["shards"].append(
+                dict(segment=segment, file=file_name, item_count=count)
+            )
+            manifest["shards"].sort(key=lambda shard: shard["segment"])
+            _write_manifest(output_dir, manifest)
+            if progress_callback:
+                progress_callback(manifest)
+        return count
+
+    executor = ThreadPoolExecutor(parallelism)
+    futures = []
+    try:
+        for segment in xrange(total_segments):
+            futures.append(executor.submit(export_segment, segment))
+        for future in futures:
+            future.result()
+    except Exception as e:
+        LOG.exception("Export to '%s' failed", output_dir)
+        for future in futures:
+            future.cancel()
+        with lock:
+            manifest.update(status=STATUS_FAILED, error=str(e),
+                            finish_date_time=time.time())
+            _write_manifest(output_dir, manifest)
+        raise
+    finally:
+        executor.shutdown(wait=False)
+
+    manifest.update(status=STATUS_DONE, finish_date_time=time.time())
+    _write_manifest(output_dir, manifest)
+    return manifest
+
+
+def export_table(scan_segment, output_dir, total_segments=16,
+                 parallelism=4, compress=False, manifest_extra=None,
+                 progress_callback=None):
+    """
+    Exports table items to shard files in output_dir
+
+    :param scan_segment: function, which takes segment and total_segments
+                arguments and returns iterator over items of the segment
+    :param output_dir: directory to write shard files and manifest to,
+                created if it doesn't exist
+    :param total_segments: number of hash key token ranges, each range is
+                written to separate shard file
+    :param parallelism: number of shards written concurrently
+    :param compress: write gzip compressed shard files
+    :param manifest_extra: dict of additional properties to save in
+                manifest, like table name
+    :param progress_callback: function called with manifest each time
+                shard is written
+
+    :returns: manifest dict
+    """
+    manifest = _start_export(output_dir, total_segments, compress,
+                             manifest_extra)
+    return _export_segments(scan_segment, output_dir, manifest, parallelism,
+                            progress_callback)
+
+
+def create_export(context, storage_driver, table_info_repo,
+                  backup_info_repo, table_name, export_id):
+    """
+    Exports the table items to table_export_dir with consistent reads of
+    hash key token ranges
+
+    :returns: ExportInfo instance
+    """
+    export_info = backup_info_repo.get_export(context, table_name,
+                                              export_id)
+
+    def scan_segment(segment, total_segments):
+        return storage_driver.scan_stream(
+            context, table_info, {}, consistent=True, segment=segment,
+            total_segments=total_segments
+        ).items
+
+    def report_progress(manifest):
+        export_info.completed_segments = len(manifest["shards"])
+        export_info.item_count = manifest["item_count"]
+        backup_info_repo.update_export(
+            context, export_info, ["completed_segments", "item_count"]
+        )
+
+    try:
+        table_info = table_info_repo.get(context, table_name)
+
+        export_info.location = get_export_dir(context.tenant, table_name,
+                                              export_id)
+        if not export_info.total_segments:
+            export_info.total_segments = (
+                cfg.CONF.table_export_total_segments
+            )
+        backup_info_repo.update_export(context, export_info,
+                                       ["location", "total_segments"])
+
+        export_table(
+            scan_segment, export_info.location,
+            total_segments=export_info.total_segments,
+            parallelism=cfg.CONF.table_export_parallelism,
+            compress=export_info.compress,
+            manifest_extra=dict(
+                tenant=context.tenant, table_name=table_name,
+                export_id=str(export_id)
+            ),
+            progress_callback=report_progress
+        )
+        export_info.status = ExportInfo.STATUS_DONE
+    except Exception as e:
+        LOG.exception("Export '%s' of table '%s' failed", export_id,
+                      table_name)
+        export_info.status = ExportInfo.STATUS_FAILED
+        export_info.error = str(e)
+
+    export_info.finish_date_time = datetime.now()
+    backup_info_repo.update_export(context, export_info,
+                                   ["status", "error", "finish_date_time"])
+    return export_info
@@ -15,6 +15,7 @@
 import json
 from magnetodb.openstack.common.gettextutils import _
 import re
+import uuid
 
 from magnetodb.common.exception import ValidationError
 from magnetodb.openstack.common.log import logging
@@ -87,6 +88,19 @@ def validate_integer(value, property_name, min_val=None, max_val=None):
     return value
 
 
+def validate_uuid(value, property_name):
+    validate_string(value, property_name)
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        raise ValidationError(
+            _("Wrong '%(property_name)s' value '%(prop_value)s' found, "
+              "UUID is expected"),
+            property_name=property_name,
+            prop_value=value
+        )
+
+
 def validate_object(value, property_name):
     return __validate_type(value, property_name, dict, "Object")
 
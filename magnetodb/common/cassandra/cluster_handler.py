@@ -13,23 +13,53 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import heapq
+import itertools
 import logging
 
 from threading import BoundedSemaphore
+from threading import Condition
+from threading import Lock
 from threading import RLock
 from threading import Thread
 
 import time
 import weakref
 
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError
+
 from cassandra import cluster as cassandra_cluster
 from cassandra import ConsistencyLevel
+from cassandra import OperationTimedOut
 from cassandra.protocol import QueryMessage
+from magnetodb.common.cassandra.policies import LatencyAwarePolicy
 from magnetodb.common import exception
 from cassandra import query as cassandra_query
 
 LOG = logging.getLogger(__name__)
 
+OPERATION_READ = "read"
+OPERATION_WRITE = "write"
+OPERATION_LWT = "lwt"
+OPERATION_SCHEMA = "schema"
+
+SCHEMA_QUERY_PREFIXES = ("CREATE", "ALTER", "DROP", "TRUNCATE")
+
+# seconds to wait for free query slot before retry of the query
+RETRY_DELAY = 0.05
+
+DEFAULT_OPERATION_PROFILES = {
+    OPERATION_READ: {},
+    OPERATION_WRITE: {},
+    # lightweight transactions aren't idempotent, so they aren't retried
+    OPERATION_LWT: {
+        "serial_consistency_level": "SERIAL",
+        "retry_attempts": 1
+    },
+    OPERATION_SCHEMA: {}
+}
+
 cassandra_cluster.ControlConnection._SELECT_SCHEMA_PEERS = (
     "SELECT rpc_address, schema_version, peer FROM system.peers"
 )
@@ -82,9 +112,341 @@ def _monitor_control_connection(cluster_handler_ref):
         time.sleep(1)
 
 
+def _get_consistency_level(name):
+    try:
+        return ConsistencyLevel.name_to_value[name]
+    except KeyError:
+        raise ValueError("Unknown consistency level '{}'".format(name))
+
+
+def _get_serial_consistency_level(name):
+    level = _get_consistency_level(name)
+    if level not in (ConsistencyLevel.SERIAL, ConsistencyLevel.LOCAL_SERIAL):
+        raise ValueError(
+            "Serial consistency level should be SERIAL or LOCAL_SERIAL"
+        )
+    return level
+
+
+class OperationProfile(object):
+    """
+    Options of execution of queries of one kind of operations
+    """
+
+    def __init__(self, consistency_level="QUORUM",
+                 serial_consistency_level=None, timeout=None,
+                 retry_attempts=3, speculative_retry_delay=None,
+                 speculative_retry_attempts=1):
+        """
+        :param consistency_level: name of consistency level of consistent
+                    queries. Not consistent queries are executed with
+                    driver's default consistency level
+        :param serial_consistency_level: name of consistency level of the
+                    condition of lightweight transaction, SERIAL or
+                    LOCAL_SERIAL
+        :param timeout: seconds to wait for response of synchronously
+                    executed query
+        :param retry_attempts: count of attempts to execute the query if
+                    no host is available. Failed attempt may be applied, so
+                    not idempotent operations shouldn't be retried
+        :param speculative_retry_delay: seconds after which one more
+                    attempt of the query is sent to another host, if no
+                    response is received yet. None disables speculative
+                    retries
+        :param speculative_retry_attempts: max count of speculative
+                    attempts of the query
+        """
+        self.consistency_level = _get_consistency_level(consistency_level)
+        self.serial_consistency_level = (
+            None if serial_consistency_level is None else
+            _get_serial_consistency_level(serial_consistency_level)
+        )
+        self.timeout = timeout
+        self.retry_attempts = max(1, retry_attempts)
+        self.speculative_retry_delay = speculative_retry_delay
+        self.speculative_retry_attempts = speculative_retry_attempts
+
+
+class _Scheduler(object):
+    """
+    Calls functions after given delay in single daemon thread, which is
+    started by the first scheduled call
+    """
+
+    def __init__(self):
+        self._condition = Condition(Lock())
+        self._queue = []
+        self._counter = itertools.count()
+        self._thread = None
+        self._closed = False
+
+    def schedule(self, delay, func):
+        with self._condition:
+            if self._closed:
+                return
+            heapq.heappush(self._queue,
+                           (time.time() + delay, next(self._counter), func))
+            if self._thread is None:
+                self._thread = Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+            self._condition.notify()
+
+    def shutdown(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        return
+                    if not self._queue:
+                        self._condition.wait()
+                        continue
+                    delay = self._queue[0][0] - time.time()
+                    if delay <= 0:
+                        break
+                    self._condition.wait(delay)
+                _, _, func = heapq.heappop(self._queue)
+            try:
+                func()
+            except Exception:
+                LOG.exception("Error during scheduled call")
+
+
+class _QueryExecution(object):
+    """
+    Execution of the query by one or more attempts. Attempt is retried if
+    no host is available. If speculative retries are enabled by operation
+    profile, one more attempt is sent to another host when no response is
+    received within the delay. The first successful response is used,
+    responses of other attempts are ignored
+    """
+
+    def __init__(self, cluster_handler, query, profile,
+                 fetch_all_pages=False):
+        """
+        :param cluster_handler: ClusterHandler instance
+        :param query: cassandra Statement instance
+        :param profile: OperationProfile of the query
+        :param fetch_all_pages: if True, result future is completed with
+                    list of rows of all pages, otherwise with cassandra
+                    ResponseFuture which received the first page
+        """
+        self._cluster_handler = cluster_handler
+        self._query = query
+        self._profile = profile
+        self._fetch_all_pages = fetch_all_pages
+
+        self._lock = Lock()
+        self._hosts = []
+        self._pending = 0
+        self._retries_left = profile.retry_attempts - 1
+        self._speculations_left = (
+            0 if profile.speculative_retry_delay is None else
+            profile.speculative_retry_attempts
+        )
+        self._winner = None
+        self._done = False
+        self._rows = []
+        self.result_future = Future()
+
+    def start(self):
+        self._send_attempt(blocking=True)
+        return self.result_future
+
+    def abort(self, error):
+        self._finish(error=error)
+
+    def _finish(self, result=None, error=None):
+        with self._lock:
+            if self._done:
+                return
+            self._done = True
+        if error is None:
+            self.result_future.set_result(result)
+        else:
+            self.result_future.set_exception(error)
+
+    def _fail(self, error):
+        LOG.error("Error executing query {}:{}".format(self._query,
+                                                       repr(error)))
+        self._finish(error=error)
+
+    def _send_attempt(self, blocking):
+        """
+        Sends one more attempt of the query
+
+        :returns: False if concurrent queries limit is reached and attempt
+                    isn't sent, otherwise True
+        """
+        cluster_handler = self._cluster_handler
+        if not cluster_handler._acquire_task(blocking):
+            return False
+
+        with self._lock:
+            self._pending += 1
+            deferred_hosts = list(self._hosts)
+
+        start = time.time()
+        try:
+            response_future = cluster_handler._send(self._query,
+                                                    deferred_hosts)
+        except Exception as e:
+            self._on_error(e, None)
+            return True
+
+        with self._lock:
+            self._hosts.append(response_future._current_host)
+            speculate = self._speculations_left > 0
+
+        if speculate:
+            cluster_handler._schedule(self._profile.speculative_retry_delay,
+                                      self._speculate)
+
+        response_future.add_callbacks(
+            self._on_page, self._on_error,
+            callback_args=(response_future, start),
+            errback_args=(response_future,)
+        )
+        return True
+
+    def _speculate(self):
+        with self._lock:
+            if (self._done or self._winner is not None or
+                    self._speculations_left <= 0):
+                return
+            self._speculations_left -= 1
+        LOG.debug("Sending speculative attempt of query {}".format(
+            self._query))
+        # if concurrent queries limit is reached, speculative attempt
+        # would only overload the cluster
+        self._send_attempt(blocking=False)
+
+    def _retry(self):
+        with self._lock:
+            if self._done:
+                return
+        # retry is sent from callback of driver's event loop or scheduler
+        # thread, so it can't wait for free query slot: slots are
+        # released by callbacks of the same event loop
+        if not self._send_attempt(blocking=False):
+            self._cluster_handler._schedule(RETRY_DELAY, self._retry)
+
+    def _on_page(self, page, response_future, start):
+        # callback is invoked for each fetched page of the result
+        cluster_handler = self._cluster_handler
+        with self._lock:
+            is_winner = response_future is self._winner
+            is_first_page = not is_winner
+            if is_first_page:
+                self._pending -= 1
+                if self._winner is None and not self._done:
+                    self._winner = response_future
+                    is_winner = True
+
+        if is_first_page:
+            cluster_handler._record_latency(response_future._current_host,
+                                            time.time() - start)
+            if not is_winner:
+                cluster_handler._release_task()
+                return
+            if not self._fetch_all_pages:
+                cluster_handler._release_task()
+                self._finish(response_future)
+                return
+        elif not self._fetch_all_pages:
+            # next pages are fetched by the caller
+            return
+
+        if page:
+            self._rows.extend(page)
+        if response_future.has_more_pages and not self._done:
+            response_future.start_fetching_next_page()
+            return
+        cluster_handler._release_task()
+        self._finish(self._rows)
+
+    def _on_error(self, error, response_future):
+        cluster_handler = self._cluster_handler
+        with self._lock:
+            is_winner = (response_future is not None and
+                         response_future is self._winner)
+            if not is_winner:
+                self._pending -= 1
+            completed = self._done or self._winner is not None
+            pending = self._pending
+
+        if is_winner:
+            # error of fetching of the next page
+            if self._fetch_all_pages:
+                cluster_handler._release_task()
+                self._fail(error)
+            return
+
+        cluster_handler._release_task()
+        if completed or pending:
+            # other attempt succeeded or is still running
+            return
+
+        if isinstance(error, cassandra_cluster.NoHostAvailable):
+            with self._lock:
+                retry = self._retries_left > 0
+                if retry:
+                    self._retries_left -= 1
+            if retry:
+                LOG.warning("It seems connection was lost. Retrying...")
+                self._retry()
+                return
+
+        self._fail(error)
+
+
 class ClusterHandler(object):
     def __init__(self, cluster_params, query_timeout=2,
-                 concurrent_queries=100):
+                 concurrent_queries=100, operation_profiles=None):
+        """
+        :param cluster_params: kwargs of cassandra Cluster
+        :param query_timeout: seconds to wait for response of synchronously
+                    executed query, if it isn't set by operation profile
+        :param concurrent_queries: max number of started but not completed
+                    queries
+        :param operation_profiles: dict of operation ('read', 'write',
+                    'lwt' or 'schema') to kwargs of its OperationProfile.
+                    Speculative retries are allowed for idempotent reads
+                    only
+        """
+        operation_profiles = operation_profiles or {}
+        unknown_operations = (set(operation_profiles) -
+                              set(DEFAULT_OPERATION_PROFILES))
+        if unknown_operations:
+            raise ValueError("Unknown operations: {}".format(
+                ", ".join(sorted(unknown_operations))))
+
+        self.__operation_profiles = {}
+        for operation, defaults in DEFAULT_OPERATION_PROFILES.iteritems():
+            kwargs = dict(timeout=query_timeout)
+            kwargs.update(defaults)
+            kwargs.update(operation_profiles.get(operation, {}))
+            profile = OperationProfile(**kwargs)
+            if (operation != OPERATION_READ and
+                    profile.speculative_retry_delay is not None):
+                raise ValueError(
+                    "Speculative retries are allowed for reads only"
+                )
+            self.__operation_profiles[operation] = profile
+
+        load_balancing_policy = cluster_params.get("load_balancing_policy")
+        self.__latency_aware_policy = (
+            load_balancing_policy
+            if isinstance(load_balancing_policy, LatencyAwarePolicy) else
+            None
+        )
+        self.__scheduler = _Scheduler()
+
         self.__closed = False
         self.__task_semaphore = BoundedSemaphore(concurrent_queries)
 
@@ -93,6 +455,7 @@ class ClusterHandler(object):
         self.__connection_lock = RLock()
         self.__cluster = None
         self.__session = None
+        self.__prepared_statement_cache = {}
         self.__connection_monitor_thread = Thread(
             target=_monitor_control_connection, args=(weakref.ref(self),)
         )
@@ -104,6 +467,7 @@ class ClusterHandler(object):
     def shutdown(self):
         self.__closed = True
         self.__connection_monitor_thread.join()
+        self.__scheduler.shutdown()
         if self.__cluster:
             self.__cluster.shutdown()
 
@@ -128,6 +492,8 @@ class ClusterHandler(object):
             session.default_timeout = self.__query_timeout
             self.__cluster = cluster
             self.__session = session
+            # statements are prepared per cluster connection
+            self.__prepared_statement_cache = {}
 
     def _disconnect(self):
         with self.__connection_lock:
@@ -136,32 +502,194 @@ class ClusterHandler(object):
             self.__cluster.shutdown()
             self.__cluster = None
             self.__session = None
-
-    def execute_query(self, query, consistent=False):
+            self.__prepared_statement_cache = {}
+
+    def prepare_query(self, query):
+        """
+        Returns PreparedStatement for given CQL query string. Statements are
+        cached per query string until reconnect or explicit invalidation
+
+        :param query: CQL query string with '?' parameter markers
+        """
+        prepared = self.__prepared_statement_cache.get(query)
+        if prepared is None:
+            session = self.__session
+            if session is None:
+                raise ClusterIsNotConnectedException()
+            LOG.debug("Preparing query {}".format(query))
+            prepared = session.prepare(query)
+            self.__prepared_statement_cache[query] = prepared
+        return prepared
+
+    def invalidate_prepared_queries(self, queries):
+        for query in queries:
+            self.__prepared_statement_cache.pop(query, None)
+
+    def bind_query(self, query, values):
+        return self.prepare_query(query).bind(values)
+
+    def execute_prepared_query(self, query, values, consistent=False,
+                               operation=None, serial_consistency_level=None):
+        return self.execute_query(self.bind_query(query, values), consistent,
+                                  operation, serial_consistency_level)
+
+    @staticmethod
+    def _get_operation(query):
+        """
+        Returns operation of the query, which isn't specified explicitly.
+        Lightweight transactions can't be recognized by query kind, so
+        OPERATION_LWT should always be passed explicitly
+        """
+        if isinstance(query, cassandra_query.BatchStatement):
+            return OPERATION_WRITE
+        if isinstance(query, cassandra_query.BoundStatement):
+            query = query.prepared_statement.query_string
+        elif isinstance(query, cassandra_query.Statement):
+            query = query.query_string
+        query = query.lstrip()[:8].upper()
+        if query.startswith("SELECT"):
+            return OPERATION_READ
+        if query.startswith(SCHEMA_QUERY_PREFIXES):
+            return OPERATION_SCHEMA
+        return OPERATION_WRITE
+
+    def get_operation_profile(self, operation):
+        return self.__operation_profiles[operation]
+
+    def _get_profile(self, query, operation):
+        if operation is None:
+            operation = self._get_operation(query)
+        return self.__operation_profiles[operation]
+
+    @staticmethod
+    def _make_statement(query, consistent, profile,
+                        serial_consistency_level=None):
+        if not isinstance(query, cassandra_query.Statement):
+            query = cassandra_cluster.SimpleStatement(query)
+        if isinstance(consistent, basestring):
+            query.consistency_level = _get_consistency_level(consistent)
+        elif consistent:
+            query.consistency_level = profile.consistency_level
+        if serial_consistency_level is not None:
+            serial_consistency_level = _get_serial_consistency_level(
+                serial_consistency_level
+            )
+        else:
+            serial_consistency_level = profile.serial_consistency_level
+        if serial_consistency_level is not None:
+            # setter of Statement.serial_consistency_level of cassandra
+            # driver 2.1 validates the value but doesn't save it
+            query._serial_consistency_level = serial_consistency_level
+        return query
+
+    def _acquire_task(self, blocking=True):
+        return self.__task_semaphore.acquire(blocking)
+
+    def _release_task(self):
+        self.__task_semaphore.release()
+
+    def _send(self, query, deferred_hosts=()):
+        session = self.__session
+        if session is None:
+            raise ClusterIsNotConnectedException()
+        policy = self.__latency_aware_policy
+        if policy is not None and deferred_hosts:
+            with policy.deferring(deferred_hosts):
+                return session.execute_async(query)
+        return session.execute_async(query)
+
+    def _record_latency(self, host, latency):
+        policy = self.__latency_aware_policy
+        if policy is not None and host is not None:
+            policy.record_latency(host, latency)
+
+    def _schedule(self, delay, func):
+        self.__scheduler.schedule(delay, func)
+
+    def execute_query(self, query, consistent=False, operation=None,
+                      serial_consistency_level=None):
+        """
+        Executes query and waits for its result
+
+        :param query: CQL query string or cassandra Statement instance
+        :param consistent: if True query is executed with consistency level
+                    of operation profile, if name of consistency level -
+                    with this level, otherwise with driver's default level
+        :param operation: operation of the query, it is recognized by the
+                    query if None
+        :param serial_consistency_level: name of consistency level of the
+                    condition of lightweight transaction, level of
+                    operation profile is used if None
+
+        :returns: list of result rows or cassandra PagedResult if result
+                    has more pages
+        """
         if self.__cluster is None:
             raise ClusterIsNotConnectedException()
-        ex = None
-        if consistent:
-            query = cassandra_cluster.SimpleStatement(
-                query,
-                consistency_level=cassandra_cluster.ConsistencyLevel.QUORUM
-            )
+        profile = self._get_profile(query, operation)
+        query = self._make_statement(query, consistent, profile,
+                                     serial_consistency_level)
         LOG.debug("Executing query {}".format(query))
-        for x in range(3):
-            try:
-                with self.__task_semaphore:
-                    return self.__session.execute(query)
-            except cassandra_cluster.NoHostAvailable as e:
-                LOG.warning("It seems connection was lost. Retrying...",
-                            exc_info=1)
-                ex = e
-            except Exception as e:
-                ex = e
-                break
-        if ex:
-            msg = "Error executing query {}:{}".format(query, e.message)
-            LOG.exception(msg)
-            raise ex
+        execution = _QueryExecution(self, query, profile)
+        try:
+            response_future = execution.start().result(profile.timeout)
+        except TimeoutError:
+            e = OperationTimedOut()
+            execution.abort(e)
+            LOG.exception("Error executing query {}:{}".format(query,
+                                                               repr(e)))
+            raise e
+        return response_future.result()
+
+    def execute_query_paged(self, query, consistent=False, fetch_size=None,
+                            operation=None):
+        """
+        Executes query fetching its result by pages
+
+        :param query: CQL query string or cassandra Statement instance
+        :param consistent: if True query is executed with consistency level
+                    of operation profile, if name of consistency level -
+                    with this level, otherwise with driver's default level
+        :param fetch_size: count of rows in page, driver's default is used
+                    if None
+        :param operation: operation of the query, it is recognized by the
+                    query if None
+
+        :returns: iterator over result rows. Next page is fetched when rows
+                    of the previous one are consumed
+        """
+        if not isinstance(query, cassandra_query.Statement):
+            query = cassandra_cluster.SimpleStatement(query)
+        if fetch_size is not None:
+            query.fetch_size = fetch_size
+        return iter(self.execute_query(query, consistent, operation))
+
+    def execute_query_async(self, query, consistent=False, operation=None,
+                            serial_consistency_level=None):
+        """
+        Sends query to the cluster without waiting for the response. Caller
+        is blocked only if concurrent_queries limit is already reached
+
+        :param query: CQL query string or cassandra Statement instance
+        :param consistent: if True query is executed with consistency level
+                    of operation profile, if name of consistency level -
+                    with this level, otherwise with driver's default level
+        :param operation: operation of the query, it is recognized by the
+                    query if None
+        :param serial_consistency_level: name of consistency level of the
+                    condition of lightweight transaction, level of
+                    operation profile is used if None
+
+        :returns: Future instance with list of result rows
+        """
+        if self.__cluster is None:
+            raise ClusterIsNotConnectedException()
+        profile = self._get_profile(query, operation)
+        query = self._make_statement(query, consistent, profile,
+                                     serial_consistency_level)
+        LOG.debug("Executing query asynchronously {}".format(query))
+        return _QueryExecution(self, query, profile,
+                               fetch_all_pages=True).start()
 
     def check_table_status(self, keyspace_name, table_name, expected_exists):
         LOG.debug("Checking table status ...")
@@ -0,0 +1,162 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import contextlib
+import threading
+import time
+
+from cassandra import policies
+
+
+class LatencyAwarePolicy(policies.LoadBalancingPolicy):
+    """
+    Wrapper of child load balancing policy, which moves hosts much slower
+    than the fastest one to the end of query plan, so replica which is
+    slow at the moment doesn't serve queries while faster ones are up.
+
+    Latencies of hosts are measured by ClusterHandler, which uses the
+    policy, and averaged by exponentially weighted moving average. Slow
+    host receives less queries and its latency isn't measured, so after
+    retry_period it is used as usual again to check if it is still slow.
+    """
+
+    def __init__(self, child_policy, exclusion_threshold=2.0,
+                 update_rate=0.1, retry_period=10, min_measured=50,
+                 update_interval=0.1):
+        """
+        :param child_policy: LoadBalancingPolicy instance, which makes
+                    query plans reordered by the policy, for example
+                    TokenAwarePolicy
+        :param exclusion_threshold: host is considered slow if its average
+                    latency is greater than average latency of the fastest
+                    host multiplied by this value
+        :param update_rate: weight of new latency measurement in average
+        :param retry_period: seconds after which measured latency of the
+                    host is considered outdated
+        :param min_measured: count of measurements after which latency of
+                    the host is taken into account
+        :param update_interval: seconds the set of slow hosts is cached for
+        """
+        super(LatencyAwarePolicy, self).__init__()
+        self._child_policy = child_policy
+        self._exclusion_threshold = exclusion_threshold
+        self._update_rate = update_rate
+        self._retry_period = retry_period
+        self._min_measured = min_measured
+        self._update_interval = update_interval
+
+        self._lock = threading.Lock()
+        self._host_latency_map = {}
+        self._slow_hosts = frozenset()
+        self._slow_hosts_updated_at = 0
+        self._local = threading.local()
+
+    def populate(self, cluster, hosts):
+        self._child_policy.populate(cluster, hosts)
+
+    def check_supported(self):
+        self._child_policy.check_supported()
+
+    def distance(self, host):
+        return self._child_policy.distance(host)
+
+    def record_latency(self, host, latency):
+        """
+        Updates average latency of the host
+
+        :param host: Host which executed the query
+        :param latency: seconds between sending the query and receiving
+                    its response
+        """
+        now = time.time()
+        with self._lock:
+            stats = self._host_latency_map.get(host)
+            if stats is None:
+                self._host_latency_map[host] = [latency, 1, now]
+            else:
+                stats[0] += (latency - stats[0]) * self._update_rate
+                stats[1] += 1
+                stats[2] = now
+
+    def get_slow_hosts(self):
+        now = time.time()
+        if now - self._slow_hosts_updated_at < self._update_interval:
+            return self._slow_hosts
+
+        with self._lock:
+            measured = [
+                (host, average)
+                for host, (average, count, measured_at) in (
+                    self._host_latency_map.iteritems())
+                if count >= self._min_measured and
+                now - measured_at <= self._retry_period
+            ]
+        slow_hosts = frozenset()
+        if measured:
+            threshold = (min(average for _, average in measured) *
+                         self._exclusion_threshold)
+            slow_hosts = frozenset(
+                host for host, average in measured if average > threshold
+            )
+        self._slow_hosts = slow_hosts
+        self._slow_hosts_updated_at = now
+        return slow_hosts
+
+    @contextlib.contextmanager
+    def deferring(self, hosts):
+        """
+        Moves given hosts to the very end of query plans made by the
+        current thread in the context, so speculative attempt of the
+        query is sent to another host
+        """
+        self._local.deferred_hosts = hosts
+        try:
+            yield
+        finally:
+            self._local.deferred_hosts = ()
+
+    def make_query_plan(self, working_keyspace=None, query=None):
+        deferred_hosts = getattr(self._local, "deferred_hosts", ())
+        slow_hosts = self.get_slow_hosts()
+        postponed = []
+        deferred = []
+        for host in self._child_policy.make_query_plan(working_keyspace,
+                                                       query):
+            if host in deferred_hosts:
+                deferred.append(host)
+            elif host in slow_hosts:
+                postponed.append(host)
+            else:
+                yield host
+        for host in postponed:
+            yield host
+        for host in deferred:
+            yield host
+
+    def on_up(self, host):
+        self._child_policy.on_up(host)
+
+    def on_down(self, host):
+        with self._lock:
+            self._host_latency_map.pop(host, None)
+        self._child_policy.on_down(host)
+
+    def on_add(self, host):
+        self._child_policy.on_add(host)
+
+    def on_remove(self, host):
+        with self._lock:
+            self._host_latency_map.pop(host, None)
+        self._child_policy.on_remove(host)
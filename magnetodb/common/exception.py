@@ -63,6 +63,18 @@ class ResourceInUseException(BackendInteractionException):
     pass
 
 
+class ExportNotExistsException(BackendInteractionException):
+    pass
+
+
+class BackupNotExistsException(BackendInteractionException):
+    pass
+
+
+class RestoreJobNotExistsException(BackendInteractionException):
+    pass
+
+
 class InvalidQueryParameter(BackendInteractionException):
     pass
 
@@ -0,0 +1,196 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""In-process registry of latency metrics fed by probe.Probe.
+
+Latencies are recorded to histograms with log-linear buckets like HDR
+histogram: each power of 2 range of values is split to the same number of
+sub-buckets, so relative error of reported percentiles is bounded by
+1 / SUB_BUCKET_HALF_COUNT, memory and recording time don't depend on
+number of recorded values.
+"""
+
+import math
+import threading
+
+# values below 2 ** SUB_BUCKET_BITS are counted exactly
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF_COUNT = SUB_BUCKET_COUNT >> 1
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+STATUS_OK = "ok"
+
+
+def _bucket_index(value):
+    if value < SUB_BUCKET_COUNT:
+        return value
+    exponent = value.bit_length() - SUB_BUCKET_BITS
+    return exponent * SUB_BUCKET_HALF_COUNT + (value >> exponent)
+
+
+def _bucket_highest_value(index):
+    if index < SUB_BUCKET_COUNT:
+        return index
+    exponent = index // SUB_BUCKET_HALF_COUNT - 1
+    sub_bucket = index - exponent * SUB_BUCKET_HALF_COUNT
+    return ((sub_bucket + 1) << exponent) - 1
+
+
+class Histogram(object):
+    """Histogram of non negative integer values, latencies are recorded in
+    microseconds
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value):
+        value = max(0, int(value))
+        index = _bucket_index(value)
+        with self._lock:
+            self._buckets[index] = self._buckets.get(index, 0) + 1
+            self.count += 1
+            self.total += value
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    def percentiles(self, percentiles=PERCENTILES):
+        """
+        :returns: list of values, which are not less than given percent of
+                  recorded values, with precision of the bucket
+        """
+        with self._lock:
+            count = self.count
+            buckets = sorted(self._buckets.iteritems())
+            max_value = self.max
+
+        res = []
+        if not count:
+            return [0] * len(percentiles)
+
+        bucket_iter = iter(buckets)
+        index, bucket_count = next(bucket_iter)
+        cumulative_count = bucket_count
+        for percentile in sorted(percentiles):
+            rank = max(1, int(math.ceil(percentile / 100.0 * count)))
+            while cumulative_count < rank:
+                index, bucket_count = next(bucket_iter)
+                cumulative_count += bucket_count
+            res.append(min(_bucket_highest_value(index), max_value))
+        return res
+
+
+class MetricsRegistry(object):
+    """Latency histograms per name and status"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def histogram(self, name, status=STATUS_OK):
+        key = (name, status)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram())
+        return histogram
+
+    def record(self, name, status, elapsed):
+        """
+        :param name: name of probe
+        :param status: status of the call, 'ok' or exception class name
+        :param elapsed: time in seconds
+        """
+        self.histogram(name, status).record(elapsed * 1000000)
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def snapshot(self):
+        """
+        :returns: list of dicts with counters and latency percentiles in
+                  milliseconds sorted by name and status
+        """
+        with self._lock:
+            items = sorted(self._histograms.items())
+
+        res = []
+        for (name, status), histogram in items:
+            values = histogram.percentiles()
+            count = histogram.count
+            metric = {
+                "name": name,
+                "status": status,
+                "count": count,
+                "sum_ms": histogram.total / 1000.0,
+                "mean_ms": (
+                    histogram.total / 1000.0 / count if count else 0.0
+                ),
+                "min_ms": (histogram.min or 0) / 1000.0,
+                "max_ms": (histogram.max or 0) / 1000.0,
+            }
+            for percentile, value in zip(PERCENTILES, values):
+                metric["p{}_ms".format(percentile).replace(".", "")] = (
+                    value / 1000.0
+                )
+            res.append(metric)
+        return res
+
+    def to_prometheus(self, prefix="magnetodb_probe_duration_seconds"):
+        """
+        :returns: metrics in Prometheus text exposition format
+        """
+        def labels(metric, **extra):
+            label_map = dict(probe=metric["name"], status=metric["status"])
+            label_map.update(extra)
+            return "{" + ",".join(
+                '{}="{}"'.format(key, _escape_label_value(label_map[key]))
+                for key in sorted(label_map)
+            ) + "}"
+
+        lines = ["# TYPE {} summary".format(prefix)]
+        for metric in self.snapshot():
+            for percentile in PERCENTILES:
+                key = "p{}_ms".format(percentile).replace(".", "")
+                lines.append("{}{} {!r}".format(
+                    prefix,
+                    labels(metric, quantile=str(percentile / 100.0)),
+                    metric[key] / 1000.0
+                ))
+            lines.append("{}_sum{} {!r}".format(
+                prefix, labels(metric), metric["sum_ms"] / 1000.0
+            ))
+            lines.append("{}_count{} {}".format(
+                prefix, labels(metric), metric["count"]
+            ))
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label_value(value):
+    return (str(value).replace("\\", "\\\\").replace("\n", "\\n")
+            .replace('"', '\\"'))
+
+
+REGISTRY = MetricsRegistry()
@@ -63,6 +63,11 @@ class FaultWrapper(wsgi.Middleware):
         'TableAlreadyExistsException': webob.exc.HTTPBadRequest,
         'TableNotExistsException': webob.exc.HTTPNotFound,
 
+        # Export and backup errors
+        'ExportNotExistsException': webob.exc.HTTPNotFound,
+        'BackupNotExistsException': webob.exc.HTTPNotFound,
+        'RestoreJobNotExistsException': webob.exc.HTTPNotFound,
+
         # data item error
         'ConditionalCheckFailedException': webob.exc.HTTPBadRequest,
     }
@@ -32,7 +32,8 @@ class ProbeFilter(wsgi.Middleware):
     """
     def __init__(self, app, options):
         self.options = options
-        self.probe = probe.Probe(app.__class__)
+        self.probe = probe.Probe('.'.join([app.__class__.__module__,
+                                           app.__class__.__name__]))
         super(ProbeFilter, self).__init__(app)
 
     @webob.dec.wsgify
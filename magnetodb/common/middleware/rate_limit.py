@@ -14,49 +14,268 @@
 
 """A middleware that limits amount of processed requests per tenant
 up to configured value
+
+Limits are enforced by token buckets: bucket of each tenant is refilled
+with rps_per_tenant tokens per second up to burst_per_tenant tokens and
+each request takes one token, so tenant can make short bursts of requests
+while average rate is still limited. Additional buckets can be configured
+for each operation class (read, write and scan), request has to take token
+from both tenant and operation class buckets.
+
+State of buckets is kept by backend. 'local' backend keeps it in memory of
+the process, 'shared_memory' backend keeps it in memory mapped file, so
+all worker processes of the host share the same limits. Backend can also
+be given as full class name.
 """
 
+import fcntl
+import hashlib
+import mmap
+import os
 import re
+import struct
+import threading
 import time
 
 from magnetodb.common import exception
 from magnetodb.common import wsgi
 from magnetodb import notifier
+from magnetodb.openstack.common import importutils
 from magnetodb.openstack.common import log as logging
 
 LOG = logging.getLogger(__name__)
 
+OPERATION_CLASS_READ = "read"
+OPERATION_CLASS_WRITE = "write"
+OPERATION_CLASS_SCAN = "scan"
+
+OPERATION_CLASSES = (
+    OPERATION_CLASS_READ, OPERATION_CLASS_WRITE, OPERATION_CLASS_SCAN
+)
+
+READ_ACTIONS = frozenset([
+    "get_item", "batch_get_item", "query", "describe_table", "list_tables"
+])
+
+SCAN_ACTIONS = frozenset(["scan"])
+
+
+def refill(tokens, last_time, now, rate, burst):
+    """
+    Returns number of tokens in the bucket at the moment now
+    """
+    if now <= last_time:
+        return tokens
+    return min(float(burst), tokens + (now - last_time) * rate)
+
+
+class LocalBackend(object):
+    """Keeps buckets in the dict of the process. Buckets which weren't
+    used for idle_timeout seconds are evicted
+    """
+
+    def __init__(self, options):
+        self.idle_timeout = float(options.get('idle_timeout', 300))
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._next_eviction_time = 0
+
+    def consume(self, buckets, now):
+        """
+        Takes one token from each of buckets if all of them have it
+
+        :param buckets: list of (key, rate, burst) tuples
+        :param now: current time
+
+        :returns: True if tokens were taken, False otherwise
+        """
+        with self._lock:
+            self._evict(now)
+
+            states = []
+            for key, rate, burst in buckets:
+                tokens, last_time = self._buckets.get(key, (burst, now))
+                states.append(refill(tokens, last_time, now, rate, burst))
+
+            allowed = all(tokens >= 1 for tokens in states)
+            for (key, rate, burst), tokens in zip(buckets, states):
+                self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+            return allowed
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def _evict(self, now):
+        if now < self._next_eviction_time:
+            return
+        self._next_eviction_time = now + self.idle_timeout
+        expired = [key for key, (tokens, last_time)
+                   in self._buckets.iteritems()
+                   if now - last_time >= self.idle_timeout]
+        for key in expired:
+            del self._buckets[key]
+
+
+class SharedMemoryBackend(object):
+    """Keeps buckets in the file mapped to memory of all worker processes.
+    File is open addressing hash table with fixed number of slots, slot
+    which wasn't used for idle_timeout seconds can be taken by another key.
+    Access to the table is serialized by lock of the file
+    """
+
+    SLOT_FORMAT = "<Qdd"
+    SLOT_SIZE = struct.calcsize(SLOT_FORMAT)
+    MAX_PROBES = 16
+
+    def __init__(self, options):
+        self.idle_timeout = float(options.get('idle_timeout', 300))
+        self.path = options.get('shared_memory_file',
+                                '/dev/shm/magnetodb-rate-limit')
+        self.slots = int(options.get('shared_memory_slots', 65536))
+        self._lock = threading.Lock()
+
+        size = self.slots * self.SLOT_SIZE
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._file_lock()
+        try:
+            if os.fstat(self._fd).st_size != size:
+                os.ftruncate(self._fd, size)
+        finally:
+            self._file_unlock()
+        self._mmap = mmap.mmap(self._fd, size, mmap.MAP_SHARED,
+                               mmap.PROT_READ | mmap.PROT_WRITE)
+
+    def _file_lock(self):
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+
+    def _file_unlock(self):
+        fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _hash(key):
+        digest = hashlib.md5(repr(key)).digest()
+        return struct.unpack("<Q", digest[:8])[0] or 1
+
+    def _read_slot(self, index):
+        return struct.unpack_from(self.SLOT_FORMAT, self._mmap,
+                                  index * self.SLOT_SIZE)
+
+    def _write_slot(self, index, key_hash, tokens, last_time):
+        struct.pack_into(self.SLOT_FORMAT, self._mmap,
+                         index * self.SLOT_SIZE, key_hash, tokens, last_time)
+
+    def _find_slot(self, key_hash, now):
+        """
+        Returns index of the slot of the key and its state. If key has no
+        slot yet, free or expired slot is returned, if there is no such
+        slot, least recently used one is taken
+        """
+        start = key_hash % self.slots
+        candidate = None
+        candidate_time = None
+        for i in xrange(min(self.MAX_PROBES, self.slots)):
+            index = (start + i) % self.slots
+            slot_hash, tokens, last_time = self._read_slot(index)
+            if slot_hash == key_hash:
+                return index, (tokens, last_time)
+            if slot_hash == 0:
+                return index, None
+            if candidate is None or last_time < candidate_time:
+                candidate, candidate_time = index, last_time
+
+        if now - candidate_time < self.idle_timeout:
+            LOG.warning("Rate limit shared memory table is full, bucket "
+                        "used %s seconds ago is evicted",
+                        now - candidate_time)
+        return candidate, None
+
+    def consume(self, buckets, now):
+        with self._lock:
+            self._file_lock()
+            try:
+                slots = []
+                for key, rate, burst in buckets:
+                    key_hash = self._hash(key)
+                    index, state = self._find_slot(key_hash, now)
+                    tokens, last_time = state or (burst, now)
+                    tokens = refill(tokens, last_time, now, rate, burst)
+                    # slot is taken at once, so the next key of the request
+                    # can't get the same free slot
+                    self._write_slot(index, key_hash, tokens, now)
+                    slots.append((index, key_hash, tokens))
+
+                allowed = all(tokens >= 1 for _, _, tokens in slots)
+                if allowed:
+                    for index, key_hash, tokens in slots:
+                        self._write_slot(index, key_hash, tokens - 1, now)
+                return allowed
+            finally:
+                self._file_unlock()
+
+
+BACKENDS = {
+    'local': LocalBackend,
+    'shared_memory': SharedMemoryBackend,
+}
+
 
 class RateLimitMiddleware(wsgi.Middleware):
     def __init__(self, app, options):
         self.options = options
-        self.last_time = {}
+        self.limits = {}
 
         try:
-            self.rps_per_tenant = int(self.options.get('rps_per_tenant', 0))
+            self.rps_per_tenant, self.burst_per_tenant = self._get_limit(
+                '', options)
+            for operation_class in OPERATION_CLASSES:
+                rate, burst = self._get_limit(operation_class + '_',
+                                              options)
+                if rate:
+                    self.limits[operation_class] = (rate, burst)
+
+            backend = options.get('backend', 'local')
+            backend_cls = (BACKENDS[backend] if backend in BACKENDS else
+                           importutils.import_class(backend))
+            self.backend = backend_cls(options)
         except Exception as e:
-            LOG.error('Error defining request rate, {}', e)
+            LOG.error('Error defining request rate, %s', e)
             LOG.error('Rate limiting disabled')
             self.rps_per_tenant = 0
+            self.limits = {}
 
         super(RateLimitMiddleware, self).__init__(app)
 
+    @staticmethod
+    def _get_limit(prefix, options):
+        rate = float(options.get(prefix + 'rps_per_tenant', 0))
+        burst = float(options.get(prefix + 'burst_per_tenant', 0) or
+                      max(rate, 1))
+        return rate, burst
+
     def process_request(self, req):
+        if not self.rps_per_tenant and not self.limits:
+            return
+
         tenant_id = self._get_tenant_id(req)
+        operation_class = self._get_operation_class(req)
 
-        now = time.time()
-        prev = self.last_time.get(tenant_id, 0)
+        buckets = []
+        if self.rps_per_tenant:
+            buckets.append(
+                (tenant_id, self.rps_per_tenant, self.burst_per_tenant)
+            )
+        if operation_class in self.limits:
+            rate, burst = self.limits[operation_class]
+            buckets.append(((tenant_id, operation_class), rate, burst))
 
-        if self.rps_per_tenant and now - prev < 1. / self.rps_per_tenant:
-            LOG.debug('Request rate for tenant {} exceeded preconfigured'
-                      ' limit {}. Request rejected.',
-                      tenant_id, self.rps_per_tenant)
+        if buckets and not self.backend.consume(buckets, time.time()):
+            LOG.debug('Request rate for tenant %s exceeded preconfigured'
+                      ' limit for %s requests. Request rejected.',
+                      tenant_id, operation_class)
             notifier.get_notifier().info(
                 {}, notifier.EVENT_TYPE_REQUEST_RATE_LIMITED, tenant_id)
             raise exception.RequestQuotaExceeded()
 
-        self.last_time[tenant_id] = now
-
     @classmethod
     def factory_method(cls, global_config, **local_config):
         return lambda application: cls(application, local_config)
@@ -69,10 +288,25 @@ class RateLimitMiddleware(wsgi.Middleware):
 
         tenant_id = None
 
-        if re.match("^/v1/\w+", path):
-            url_comp = path.split('/')
-            tenant_id = url_comp[2]
+        match = re.match("^/v1/\w+/([^/]+)", path)
+        if match:
+            tenant_id = match.group(1)
         else:
             tenant_id = req.headers.get('X-Tenant-Id', None)
 
         return tenant_id
+
+    @staticmethod
+    def _get_operation_class(req):
+        target = req.headers.get('X-Amz-Target', None)
+        if target:
+            action = re.sub("(?<!^)([A-Z])", r"_\1",
+                            target.rsplit('.', 1)[-1]).lower()
+        else:
+            action = req.path.rstrip('/').rsplit('/', 1)[-1]
+
+        if action in SCAN_ACTIONS:
+            return OPERATION_CLASS_SCAN
+        if action in READ_ACTIONS or req.method == 'GET':
+            return OPERATION_CLASS_READ
+        return OPERATION_CLASS_WRITE
@@ -19,6 +19,7 @@ import threading
 
 from oslo.config import cfg
 
+from magnetodb.common import metrics
 from magnetodb.openstack.common.log import logging
 
 LOG = logging.getLogger(__name__)
@@ -30,6 +31,11 @@ probe_opts = [
     cfg.BoolOpt('suppress_args',
                 default=True,
                 help='Suppresses args output'),
+    cfg.BoolOpt('metrics_enabled',
+                default=True,
+                help='Enables recording of call counts and latency '
+                     'histograms to in-process metrics registry, exposed '
+                     'by monitoring API'),
 ]
 
 probe_group = cfg.OptGroup(name='probe',
@@ -54,6 +60,10 @@ class Probe(object):
     """ Probe can be used to instrument code to get execution time
     in miliseconds. It should be used with context manager.
 
+    Execution time is logged if probe is enabled and recorded to
+    metrics.REGISTRY per probe name and status ('ok' or name of exception
+    class) if metrics are enabled.
+
     Usage example:
         with Probe("query") as t:
             query(req, body, project_id, table_name)
@@ -73,18 +83,25 @@ class Probe(object):
 
     def __enter__(self):
         self.enabled = CONF.probe.enabled
-        if self.enabled:
+        self.metrics_enabled = CONF.probe.metrics_enabled
+        if self.enabled or self.metrics_enabled:
             self.thread_var.thread_id = threading.current_thread()
             self.thread_var.start = time.time()
 
-    def __exit__(self, *args):
-        if self.enabled:
-            name = self.name
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.enabled or self.metrics_enabled:
+            name = str(self.name)
             if self.func_name:
                 name = '.'.join([name, self.func_name])
-            # miliseconds
-            ms = (time.time() - self.thread_var.start) * 1000
-            checkpoint(name, self.thread_var.thread_id, ms, 'finished')
+            elapsed = time.time() - self.thread_var.start
+            if self.metrics_enabled:
+                status = (metrics.STATUS_OK if exc_type is None else
+                          exc_type.__name__)
+                metrics.REGISTRY.record(name, status, elapsed)
+            if self.enabled:
+                # miliseconds
+                checkpoint(name, self.thread_var.thread_id, elapsed * 1000,
+                           'finished')
 
     def __call__(self, f):
         @functools.wraps(f)
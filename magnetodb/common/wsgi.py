@@ -242,6 +242,9 @@ class Resource(object):
             return webob.exc.HTTPBadRequest(explanation=msg)
 
         action_result = self.execute_action(action, request, **action_args)
+        if isinstance(action_result, webob.Response):
+            # response is already built by controller
+            return action_result
         try:
             return self.serialize_response(action, action_result, accept)
         # return unserializable result (typically a webob exc)
@@ -13,7 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import Queue
+import random
 import socket
+import threading
 from magnetodb.openstack.common.context import RequestContext
 
 from oslo.config import cfg
@@ -23,8 +26,11 @@ from oslo.messaging import serializer
 
 
 from magnetodb.common import PROJECT_NAME
+from magnetodb.openstack.common import log as logging
 from oslo.serialization import jsonutils
 
+LOG = logging.getLogger(__name__)
+
 extra_notifier_opts = [
     cfg.StrOpt('notification_service',
                default=PROJECT_NAME,
@@ -32,7 +38,27 @@ extra_notifier_opts = [
     cfg.StrOpt('default_publisher_id',
                default=None,
                help='Default publisher_id for outgoing notifications'),
-
+    cfg.BoolOpt('notification_async',
+                default=False,
+                help='Send notifications from background thread. Events '
+                     'are put to bounded queue and dropped if it is full'),
+    cfg.IntOpt('notification_queue_size',
+               default=10000,
+               help='Max number of events waiting to be sent if '
+                    'notification_async is enabled'),
+    cfg.IntOpt('notification_batch_size',
+               default=100,
+               help='Max number of queued events taken by background '
+                    'sender at once'),
+    cfg.DictOpt('notification_sample_rates',
+                default={},
+                help='Event type to share of events to be sent mapping, '
+                     'e.g. magnetodb.data.getitem:0.01. All events of not '
+                     'listed types are sent'),
+    cfg.BoolOpt('notification_payload_keys_only',
+                default=False,
+                help='Send only key attributes of items in data operation '
+                     'notifications'),
 ]
 
 cfg.CONF.register_opts(extra_notifier_opts)
@@ -96,9 +122,135 @@ def get_notifier():
             serializer=RequestContextSerializer(JsonPayloadSerializer())
         )
 
+        sample_rates = dict(
+            (event_type, float(rate))
+            for event_type, rate in cfg.CONF.notification_sample_rates.items()
+        )
+
+        if cfg.CONF.notification_async:
+            __NOTIFIER = AsyncNotifier(
+                __NOTIFIER, sample_rates, cfg.CONF.notification_queue_size,
+                cfg.CONF.notification_batch_size
+            )
+        elif sample_rates:
+            __NOTIFIER = SamplingNotifier(__NOTIFIER, sample_rates)
+
     return __NOTIFIER
 
 
+class SamplingNotifier(object):
+    """
+    Notifier wrapper which sends only given share of events of each type
+    """
+
+    def __init__(self, notifier, sample_rates=None):
+        """
+        :param notifier: oslo.messaging Notifier instance to send events
+        :param sample_rates: event type to share of events to be sent
+                    mapping, all events of not listed types are sent
+        """
+        self._notifier = notifier
+        self._sample_rates = sample_rates or {}
+        self.sampled_out_count = 0
+
+    def _notify(self, priority, ctxt, event_type, payload):
+        rate = self._sample_rates.get(event_type)
+        if rate is not None and random.random() >= rate:
+            self.sampled_out_count += 1
+            return
+        self._send(priority, ctxt, event_type, payload)
+
+    def _send(self, priority, ctxt, event_type, payload):
+        getattr(self._notifier, priority)(ctxt, event_type, payload)
+
+    def audit(self, ctxt, event_type, payload):
+        self._notify('audit', ctxt, event_type, payload)
+
+    def debug(self, ctxt, event_type, payload):
+        self._notify('debug', ctxt, event_type, payload)
+
+    def info(self, ctxt, event_type, payload):
+        self._notify('info', ctxt, event_type, payload)
+
+    def warn(self, ctxt, event_type, payload):
+        self._notify('warn', ctxt, event_type, payload)
+
+    warning = warn
+
+    def error(self, ctxt, event_type, payload):
+        self._notify('error', ctxt, event_type, payload)
+
+    def critical(self, ctxt, event_type, payload):
+        self._notify('critical', ctxt, event_type, payload)
+
+    def sample(self, ctxt, event_type, payload):
+        self._notify('sample', ctxt, event_type, payload)
+
+
+class AsyncNotifier(SamplingNotifier):
+    """
+    Notifier wrapper which puts events to bounded queue, so serialization
+    and sending of events don't delay requests. Events are taken from the
+    queue and sent by background thread in batches. If the queue is full,
+    events are dropped and counted
+    """
+
+    DROPPED_REPORT_INTERVAL = 1000
+
+    def __init__(self, notifier, sample_rates=None, queue_size=10000,
+                 batch_size=100):
+        """
+        :param notifier: oslo.messaging Notifier instance to send events
+        :param sample_rates: event type to share of events to be sent
+                    mapping, all events of not listed types are sent
+        :param queue_size: max number of events waiting to be sent
+        :param batch_size: max number of events taken from queue at once
+        """
+        super(AsyncNotifier, self).__init__(notifier, sample_rates)
+        self._queue = Queue.Queue(queue_size)
+        self._batch_size = batch_size
+        self.dropped_count = 0
+        self.sent_count = 0
+
+        self._sender = threading.Thread(target=self._send_events)
+        self._sender.daemon = True
+        self._sender.start()
+
+    def _send(self, priority, ctxt, event_type, payload):
+        try:
+            self._queue.put_nowait((priority, ctxt, event_type, payload))
+        except Queue.Full:
+            self.dropped_count += 1
+            if self.dropped_count % self.DROPPED_REPORT_INTERVAL == 1:
+                LOG.warning("Notification queue is full, %s events dropped "
+                            "so far", self.dropped_count)
+
+    def _send_events(self):
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < self._batch_size:
+                    batch.append(self._queue.get_nowait())
+            except Queue.Empty:
+                pass
+
+            for priority, ctxt, event_type, payload in batch:
+                try:
+                    getattr(self._notifier, priority)(ctxt, event_type,
+                                                      payload)
+                    self.sent_count += 1
+                except Exception:
+                    LOG.exception("Can't send notification '%s'", event_type)
+                finally:
+                    self._queue.task_done()
+
+    def flush(self):
+        """
+        Waits until all queued events are sent
+        """
+        self._queue.join()
+
+
 class JsonPayloadSerializer(serializer.NoOpSerializer):
     @staticmethod
     def serialize_entity(context, entity):
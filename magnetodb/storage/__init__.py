@@ -156,7 +156,8 @@ def list_tables(context, exclusive_start_table_name=None, limit=None):
 
 
 def put_item(context, table_name, attribute_map, return_values=None,
-             if_not_exist=False, expected_condition_map=None):
+             if_not_exist=False, expected_condition_map=None,
+             consistency_level=None):
     """
     :param context: current request context
     :param table_name: name of the table
@@ -170,6 +171,9 @@ def put_item(context, table_name, attribute_map, return_values=None,
                 ExpectedCondition instance mapping. It provides
                 preconditions to make decision about should item be put or
                 not
+    :param consistency_level: name of consistency level of the request,
+                overrides level set for the table. SERIAL and LOCAL_SERIAL
+                define level of conditions
 
     :returns: True if operation performed, otherwise False
 
@@ -177,12 +181,13 @@ def put_item(context, table_name, attribute_map, return_values=None,
     """
     return __STORAGE_MANAGER_IMPL.put_item(
         context, table_name, attribute_map, return_values,
-        if_not_exist, expected_condition_map
+        if_not_exist, expected_condition_map, consistency_level
     )
 
 
 def put_item_async(context, table_name, attribute_map, return_values=None,
-                   if_not_exist=False, expected_condition_map=None):
+                   if_not_exist=False, expected_condition_map=None,
+                   consistency_level=None):
     """
     :param context: current request context
     :param table_name: name of the table
@@ -196,6 +201,9 @@ def put_item_async(context, table_name, attribute_map, return_values=None,
                 ExpectedCondition instance mapping. It provides
                 preconditions to make decision about should item be put or
                 not
+    :param consistency_level: name of consistency level of the request,
+                overrides level set for the table. SERIAL and LOCAL_SERIAL
+                define level of conditions
 
     :returns: Future instance
 
@@ -203,12 +211,12 @@ def put_item_async(context, table_name, attribute_map, return_values=None,
     """
     return __STORAGE_MANAGER_IMPL.put_item_async(
         context, table_name, attribute_map, return_values,
-        if_not_exist, expected_condition_map
+        if_not_exist, expected_condition_map, consistency_level
     )
 
 
 def delete_item(context, table_name, key_attribute_map,
-                expected_condition_map=None):
+                expected_condition_map=None, consistency_level=None):
     """
     :param context: current request context
     :param table_name: name of the table
@@ -219,6 +227,9 @@ def delete_item(context, table_name, key_attribute_map,
                 ExpectedCondition instance mapping. It provides
                 preconditions to make decision about should item be deleted
                 or not
+    :param consistency_level: name of consistency level of the request,
+                overrides level set for the table. SERIAL and LOCAL_SERIAL
+                define level of conditions
 
     :returns: True if operation performed, otherwise False (if operation was
                 skipped by out of date timestamp, it is considered as
@@ -227,12 +238,13 @@ def delete_item(context, table_name, key_attribute_map,
     :raises: BackendInteractionException
     """
     return __STORAGE_MANAGER_IMPL.delete_item(
-        context, table_name, key_attribute_map, expected_condition_map
+        context, table_name, key_attribute_map, expected_condition_map,
+        consistency_level
     )
 
 
 def delete_item_async(context, table_name, key_attribute_map,
-                      expected_condition_map=None):
+                      expected_condition_map=None, consistency_level=None):
     """
     :param context: current request context
     :param table_name: name of the table
@@ -243,13 +255,17 @@ def delete_item_async(context, table_name, key_attribute_map,
                 ExpectedCondition instance mapping. It provides
                 preconditions to make decision about should item be deleted
                 or not
+    :param consistency_level: name of consistency level of the request,
+                overrides level set for the table. SERIAL and LOCAL_SERIAL
+                define level of conditions
 
     :returns: Future instance
 
     :raises: BackendInteractionException
     """
     return __STORAGE_MANAGER_IMPL.delete_item_async(
-        context, table_name, key_attribute_map, expected_condition_map
+        context, table_name, key_attribute_map, expected_condition_map,
+        consistency_level
     )
 
 
@@ -276,8 +292,28 @@ def execute_get_batch(context, get_request_list):
     return __STORAGE_MANAGER_IMPL.execute_get_batch(context, get_request_list)
 
 
+def bulk_load(context, table_name, item_iter, max_in_flight=100,
+              buffer_size=1000):
+    """
+    :param context: current request context
+    :param table_name: String, name of table to put items to
+    :param item_iter: iterator over attribute name to AttributeValue
+                mappings, which represent items to put
+    :param max_in_flight: max number of batches written concurrently
+    :param buffer_size: number of items collected to be grouped by
+                partition before writing
+
+    :returns: iterator over (processed item count, failed items) tuples,
+                failed items is list of (item, error) tuples
+    """
+    return __STORAGE_MANAGER_IMPL.bulk_load(
+        context, table_name, item_iter, max_in_flight, buffer_size
+    )
+
+
 def update_item(context, table_name, key_attribute_map,
-                attribute_action_map, expected_condition_map=None):
+                attribute_action_map, expected_condition_map=None,
+                return_values=None, consistency_level=None):
     """
     :param context: current request context
     :param table_name: String, name of table to delete item from
@@ -290,13 +326,17 @@ def update_item(context, table_name, key_attribute_map,
                 ExpectedCondition instance mapping. It provides
                 preconditions
                 to make decision about should item be updated or not
+    :param return_values: model that defines what values should be returned
+    :param consistency_level: name of consistency level of the request,
+                overrides level set for the table. SERIAL and LOCAL_SERIAL
+                define level of conditions
     :returns: True if operation performed, otherwise False
 
     :raises: BackendInteractionException
     """
     return __STORAGE_MANAGER_IMPL.update_item(
         context, table_name, key_attribute_map, attribute_action_map,
-        expected_condition_map
+        expected_condition_map, return_values, consistency_level
     )
 
 
@@ -319,7 +359,7 @@ def query(context, table_name, indexed_condition_map=None,
     :param exclusive_start_key: key attribute names to AttributeValue
                 instance
     :param consistent: define is operation consistent or not (by default it
-                is not consistent)
+                is not consistent) or name of consistency level
     :param order_type: defines order of returned rows, if 'None' - default
                 order will be used
 
@@ -334,6 +374,24 @@ def query(context, table_name, indexed_condition_map=None,
     )
 
 
+def query_stream(context, table_name, indexed_condition_map=None,
+                 select_type=None, index_name=None, limit=None,
+                 exclusive_start_key=None, consistent=True,
+                 order_type=None):
+    """
+    The same as query but items are read from the backend while result is
+    iterated. Count select type isn't supported
+
+    :returns: ScanResultStream instance
+
+    :raises: BackendInteractionException
+    """
+    return __STORAGE_MANAGER_IMPL.query_stream(
+        context, table_name, indexed_condition_map, select_type, index_name,
+        limit, exclusive_start_key, consistent, order_type
+    )
+
+
 def get_item(context, table_name, key_attribute_map=None,
              select_type=None, consistent=True):
     """
@@ -346,7 +404,7 @@ def get_item(context, table_name, key_attribute_map=None,
                 SelectType.all() for query on table and
                 SelectType.all_projected() for query on index
     :param consistent: define is operation consistent or not (by default it
-                is not consistent)
+                is not consistent) or name of consistency level
 
     :returns: SelectResult instance
 
@@ -359,7 +417,7 @@ def get_item(context, table_name, key_attribute_map=None,
 
 def scan(context, table_name, condition_map, attributes_to_get=None,
          limit=None, exclusive_start_key=None,
-         consistent=False):
+         consistent=False, segment=None, total_segments=None):
     """
     :param context: current request context
     :param table_name: String, name of table to get item from
@@ -372,7 +430,10 @@ def scan(context, table_name, condition_map, attributes_to_get=None,
     :param exclusive_start_key: key attribute names to AttributeValue
                 instance
     :param consistent: define is operation consistent or not (by default it
-                is not consistent)
+                is not consistent) or name of consistency level
+    :param segment: number of the segment to be scanned by this request
+    :param total_segments: total number of segments the table is divided
+                into for parallel scan
 
     :returns: list of attribute name to AttributeValue mappings
 
@@ -380,7 +441,26 @@ def scan(context, table_name, condition_map, attributes_to_get=None,
     """
     return __STORAGE_MANAGER_IMPL.scan(
         context, table_name, condition_map, attributes_to_get, limit,
-        exclusive_start_key, consistent=False
+        exclusive_start_key, consistent=consistent, segment=segment,
+        total_segments=total_segments
+    )
+
+
+def scan_stream(context, table_name, condition_map, attributes_to_get=None,
+                limit=None, exclusive_start_key=None,
+                consistent=False, segment=None, total_segments=None):
+    """
+    The same as scan but items are read from the backend while result is
+    iterated
+
+    :returns: ScanResultStream instance
+
+    :raises: BackendInteractionException
+    """
+    return __STORAGE_MANAGER_IMPL.scan_stream(
+        context, table_name, condition_map, attributes_to_get, limit,
+        exclusive_start_key, consistent=consistent, segment=segment,
+        total_segments=total_segments
     )
 
 
@@ -406,3 +486,122 @@ def get_table_statistics(context, table_name, keys):
     return __STORAGE_MANAGER_IMPL.get_table_statistics(context,
                                                        table_name,
                                                        keys)
+
+
+def create_backup(context, table_name, backup_name, strategy=None):
+    """
+    Starts backup of the table items
+
+    :param context: current request context
+    :param table_name: String, name of the table to backup
+    :param backup_name: String, name of the backup
+    :param strategy: dict of backup options
+
+    :returns: BackupInfo instance
+
+    :raises: TableNotExistsException, ValidationError
+    """
+    return __STORAGE_MANAGER_IMPL.create_backup(context, table_name,
+                                                backup_name, strategy)
+
+
+def describe_backup(context, table_name, backup_id):
+    """
+    :returns: BackupInfo instance
+
+    :raises: BackupNotExistsException
+    """
+    return __STORAGE_MANAGER_IMPL.describe_backup(context, table_name,
+                                                  backup_id)
+
+
+def list_backups(context, table_name, exclusive_start_backup_id=None,
+                 limit=None):
+    """
+    :returns: list of BackupInfo instances
+    """
+    return __STORAGE_MANAGER_IMPL.list_backups(
+        context, table_name, exclusive_start_backup_id, limit
+    )
+
+
+def delete_backup(context, table_name, backup_id):
+    """
+    Starts deletion of the backup
+
+    :returns: BackupInfo instance
+
+    :raises: BackupNotExistsException
+    """
+    return __STORAGE_MANAGER_IMPL.delete_backup(context, table_name,
+                                                backup_id)
+
+
+def create_restore_job(context, table_name, backup_id=None, source=None,
+                       strategy=None):
+    """
+    Starts restore of the table items from the backup
+
+    :param context: current request context
+    :param table_name: String, name of the table to restore items to
+    :param backup_id: id of the backup to restore
+    :param source: location of backup files, used if backup_id isn't
+                specified
+    :param strategy: dict of restore options
+
+    :returns: RestoreJobInfo instance
+
+    :raises: TableNotExistsException, BackupNotExistsException,
+                ValidationError
+    """
+    return __STORAGE_MANAGER_IMPL.create_restore_job(
+        context, table_name, backup_id, source, strategy
+    )
+
+
+def describe_restore_job(context, table_name, restore_job_id):
+    """
+    :returns: RestoreJobInfo instance
+
+    :raises: RestoreJobNotExistsException
+    """
+    return __STORAGE_MANAGER_IMPL.describe_restore_job(context, table_name,
+                                                       restore_job_id)
+
+
+def list_restore_jobs(context, table_name,
+                      exclusive_start_restore_job_id=None, limit=None):
+    """
+    :returns: list of RestoreJobInfo instances
+    """
+    return __STORAGE_MANAGER_IMPL.list_restore_jobs(
+        context, table_name, exclusive_start_restore_job_id, limit
+    )
+
+
+def create_export(context, table_name, total_segments=None, compress=False):
+    """
+    Starts export of the table items to sharded NDJSON files
+
+    :param context: current request context
+    :param table_name: String, name of the table to export
+    :param total_segments: number of shard files, default is used if not
+                specified
+    :param compress: write gzip compressed shard files
+
+    :returns: ExportInfo instance
+
+    :raises: TableNotExistsException, ValidationError
+    """
+    return __STORAGE_MANAGER_IMPL.create_export(context, table_name,
+                                                total_segments, compress)
+
+
+def describe_export(context, table_name, export_id):
+    """
+    :returns: ExportInfo instance
+
+    :raises: ExportNotExistsException
+    """
+    return __STORAGE_MANAGER_IMPL.describe_export(context, table_name,
+                                                  export_id)
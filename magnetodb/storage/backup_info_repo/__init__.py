@@ -0,0 +1,119 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+class BackupInfo(object):
+    STATUS_CREATING = "CREATING"
+    STATUS_ACTIVE = "ACTIVE"
+    STATUS_CREATE_FAILED = "CREATE_FAILED"
+    STATUS_DELETING = "DELETING"
+
+    def __init__(self, id, name, table_name, status, strategy=None,
+                 location=None, total_segments=None, completed_segments=0,
+                 item_count=0, start_date_time=None, finish_date_time=None):
+        self.id = id
+        self.name = name
+        self.table_name = table_name
+        self.status = status
+        self.strategy = strategy or {}
+        self.location = location
+        self.total_segments = total_segments
+        self.completed_segments = completed_segments
+        self.item_count = item_count
+        self.start_date_time = start_date_time
+        self.finish_date_time = finish_date_time
+
+
+class RestoreJobInfo(object):
+    STATUS_RESTORING = "RESTORING"
+    STATUS_DONE = "DONE"
+    STATUS_FAILED = "FAILED"
+
+    def __init__(self, id, backup_id, table_name, status, strategy=None,
+                 source=None, item_count=0, failed_item_count=0,
+                 start_date_time=None, finish_date_time=None):
+        self.id = id
+        self.backup_id = backup_id
+        self.table_name = table_name
+        self.status = status
+        self.strategy = strategy or {}
+        self.source = source
+        self.item_count = item_count
+        self.failed_item_count = failed_item_count
+        self.start_date_time = start_date_time
+        self.finish_date_time = finish_date_time
+
+
+class ExportInfo(object):
+    STATUS_IN_PROGRESS = "in_progress"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    def __init__(self, id, table_name, status, total_segments=None,
+                 compress=False, location=None, completed_segments=0,
+                 item_count=0, error=None, start_date_time=None,
+                 finish_date_time=None):
+        self.id = id
+        self.table_name = table_name
+        self.status = status
+        self.total_segments = total_segments
+        self.compress = compress
+        self.location = location
+        self.completed_segments = completed_segments
+        self.item_count = item_count
+        self.error = error
+        self.start_date_time = start_date_time
+        self.finish_date_time = finish_date_time
+
+
+class BackupInfoRepository(object):
+
+    def get_backup(self, context, table_name, backup_id):
+        raise NotImplementedError()
+
+    def list_backups(self, context, table_name, exclusive_start_backup_id=None,
+                     limit=None):
+        raise NotImplementedError()
+
+    def save_backup(self, context, backup_info):
+        raise NotImplementedError()
+
+    def update_backup(self, context, backup_info, field_list=None):
+        raise NotImplementedError()
+
+    def delete_backup(self, context, table_name, backup_id):
+        raise NotImplementedError()
+
+    def get_restore_job(self, context, table_name, restore_job_id):
+        raise NotImplementedError()
+
+    def list_restore_jobs(self, context, table_name,
+                          exclusive_start_restore_job_id=None, limit=None):
+        raise NotImplementedError()
+
+    def save_restore_job(self, context, restore_job_info):
+        raise NotImplementedError()
+
+    def update_restore_job(self, context, restore_job_info, field_list=None):
+        raise NotImplementedError()
+
+    def get_export(self, context, table_name, export_id):
+        raise NotImplementedError()
+
+    def save_export(self, context, export_info):
+        raise NotImplementedError()
+
+    def update_export(self, context, export_info, field_list=None):
+        raise NotImplementedError()
@@ -0,0 +1,250 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import json
+
+from cassandra import encoder
+
+from magnetodb.common.cassandra.cluster_handler import OPERATION_LWT
+from magnetodb.common import exception
+from magnetodb.storage.backup_info_repo import BackupInfo
+from magnetodb.storage.backup_info_repo import BackupInfoRepository
+from magnetodb.storage.backup_info_repo import ExportInfo
+from magnetodb.storage.backup_info_repo import RestoreJobInfo
+
+
+class CassandraBackupInfoRepository(BackupInfoRepository):
+    SYSTEM_TABLE_BACKUP_INFO = 'magnetodb.backup_info'
+    SYSTEM_TABLE_RESTORE_JOB_INFO = 'magnetodb.restore_job_info'
+    SYSTEM_TABLE_EXPORT_INFO = 'magnetodb.export_info'
+
+    __backup_field_list = (
+        "name", "status", "strategy", "location", "total_segments",
+        "completed_segments", "item_count", "start_date_time",
+        "finish_date_time"
+    )
+    __restore_job_field_list = (
+        "backup_id", "status", "strategy", "source", "item_count",
+        "failed_item_count", "start_date_time", "finish_date_time"
+    )
+    __export_field_list = (
+        "status", "total_segments", "compress", "location",
+        "completed_segments", "item_count", "error", "start_date_time",
+        "finish_date_time"
+    )
+
+    def __init__(self, cluster_handler):
+        """
+        :param cluster_handler: ClusterHandler instance
+        """
+        self.__cluster_handler = cluster_handler
+
+    @staticmethod
+    def __encode_field(enc, info, field):
+        value = getattr(info, field)
+        if field == "strategy":
+            value = json.dumps(value)
+        return enc.cql_encode_all_types(value)
+
+    @staticmethod
+    def __decode_row(info_class, table_name, row):
+        row = dict(row)
+        del row["tenant"]
+        del row["exists"]
+        row["table_name"] = table_name
+        if "strategy" in row:
+            row["strategy"] = json.loads(row["strategy"] or "{}")
+        return info_class(**row)
+
+    def __get(self, context, system_table, info_class, table_name, info_id,
+              not_exists_exception):
+        enc = encoder.Encoder()
+        result = self.__cluster_handler.execute_query(
+            "SELECT * FROM {} WHERE tenant={} AND table_name={}"
+            " AND id={}".format(
+                system_table,
+                enc.cql_encode_all_types(context.tenant),
+                enc.cql_encode_all_types(table_name),
+                enc.cql_encode_all_types(info_id)
+            ),
+            consistent=True
+        )
+        if not result:
+            raise not_exists_exception(
+                "'{}' does not exist for table '{}'".format(
+                    info_id, table_name)
+            )
+        return self.__decode_row(info_class, table_name, result[0])
+
+    def __list(self, context, system_table, info_class, table_name,
+               exclusive_start_id, limit):
+        enc = encoder.Encoder()
+        query_builder = collections.deque()
+        query_builder.append(
+            "SELECT * FROM {} WHERE tenant={} AND table_name={}".format(
+                system_table,
+                enc.cql_encode_all_types(context.tenant),
+                enc.cql_encode_all_types(table_name)
+            )
+        )
+
+        if exclusive_start_id:
+            query_builder.append(
+                " AND id>{}".format(enc.cql_encode_all_types(
+                    exclusive_start_id))
+            )
+
+        if limit:
+            query_builder.append(" LIMIT {}".format(limit))
+
+        rows = self.__cluster_handler.execute_query(
+            "".join(query_builder), consistent=True
+        )
+        return [self.__decode_row(info_class, table_name, row)
+                for row in rows or ()]
+
+    def __save(self, context, system_table, info, field_list):
+        enc = encoder.Encoder()
+        query = "INSERT INTO {} (exists,tenant,table_name,id,{})" \
+                " VALUES(1,{}) IF NOT EXISTS".format(
+                    system_table,
+                    ",".join(map('"{}"'.format, field_list)),
+                    ",".join(
+                        [
+                            enc.cql_encode_all_types(context.tenant),
+                            enc.cql_encode_all_types(info.table_name),
+                            enc.cql_encode_all_types(info.id)
+                        ] +
+                        [self.__encode_field(enc, info, field)
+                         for field in field_list]
+                    )
+                )
+
+        result = self.__cluster_handler.execute_query(
+            query, consistent=True, operation=OPERATION_LWT
+        )
+        if not result[0]['[applied]']:
+            raise exception.ResourceInUseException(
+                "'{}' already exists".format(info.id)
+            )
+        return True
+
+    def __update(self, context, system_table, info, field_list,
+                 not_exists_exception):
+        enc = encoder.Encoder()
+        query = "UPDATE {} SET {} WHERE tenant={} AND table_name={}" \
+                " AND id={} IF exists=1".format(
+                    system_table,
+                    ",".join(
+                        '"{}"={}'.format(
+                            field, self.__encode_field(enc, info, field)
+                        )
+                        for field in field_list
+                    ),
+                    enc.cql_encode_all_types(context.tenant),
+                    enc.cql_encode_all_types(info.table_name),
+                    enc.cql_encode_all_types(info.id)
+                )
+
+        result = self.__cluster_handler.execute_query(
+            query, consistent=True, operation=OPERATION_LWT
+        )
+        if not result[0]['[applied]']:
+            raise not_exists_exception(
+                "'{}' does not exist for table '{}'".format(
+                    info.id, info.table_name)
+            )
+        return True
+
+    def get_backup(self, context, table_name, backup_id):
+        return self.__get(
+            context, self.SYSTEM_TABLE_BACKUP_INFO, BackupInfo, table_name,
+            backup_id, exception.BackupNotExistsException
+        )
+
+    def list_backups(self, context, table_name, exclusive_start_backup_id=None,
+                     limit=None):
+        return self.__list(
+            context, self.SYSTEM_TABLE_BACKUP_INFO, BackupInfo, table_name,
+            exclusive_start_backup_id, limit
+        )
+
+    def save_backup(self, context, backup_info):
+        return self.__save(context, self.SYSTEM_TABLE_BACKUP_INFO,
+                           backup_info, self.__backup_field_list)
+
+    def update_backup(self, context, backup_info, field_list=None):
+        return self.__update(
+            context, self.SYSTEM_TABLE_BACKUP_INFO, backup_info,
+            field_list or self.__backup_field_list,
+            exception.BackupNotExistsException
+        )
+
+    def delete_backup(self, context, table_name, backup_id):
+        enc = encoder.Encoder()
+        self.__cluster_handler.execute_query(
+            "DELETE FROM {} WHERE tenant={} AND table_name={}"
+            " AND id={}".format(
+                self.SYSTEM_TABLE_BACKUP_INFO,
+                enc.cql_encode_all_types(context.tenant),
+                enc.cql_encode_all_types(table_name),
+                enc.cql_encode_all_types(backup_id)
+            ),
+            consistent=True
+        )
+        return True
+
+    def get_restore_job(self, context, table_name, restore_job_id):
+        return self.__get(
+            context, self.SYSTEM_TABLE_RESTORE_JOB_INFO, RestoreJobInfo,
+            table_name, restore_job_id,
+            exception.RestoreJobNotExistsException
+        )
+
+    def list_restore_jobs(self, context, table_name,
+                          exclusive_start_restore_job_id=None, limit=None):
+        return self.__list(
+            context, self.SYSTEM_TABLE_RESTORE_JOB_INFO, RestoreJobInfo,
+            table_name, exclusive_start_restore_job_id, limit
+        )
+
+    def save_restore_job(self, context, restore_job_info):
+        return self.__save(context, self.SYSTEM_TABLE_RESTORE_JOB_INFO,
+                           restore_job_info, self.__restore_job_field_list)
+
+    def update_restore_job(self, context, restore_job_info, field_list=None):
+        return self.__update(
+            context, self.SYSTEM_TABLE_RESTORE_JOB_INFO, restore_job_info,
+            field_list or self.__restore_job_field_list,
+            exception.RestoreJobNotExistsException
+        )
+
+    def get_export(self, context, table_name, export_id):
+        return self.__get(
+            context, self.SYSTEM_TABLE_EXPORT_INFO, ExportInfo, table_name,
+            export_id, exception.ExportNotExistsException
+        )
+
+    def save_export(self, context, export_info):
+        return self.__save(context, self.SYSTEM_TABLE_EXPORT_INFO,
+                           export_info, self.__export_field_list)
+
+    def update_export(self, context, export_info, field_list=None):
+        return self.__update(
+            context, self.SYSTEM_TABLE_EXPORT_INFO, export_info,
+            field_list or self.__export_field_list,
+            exception.ExportNotExistsException
+        )
@@ -0,0 +1,254 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Accounting of capacity units consumed by data operations.
+
+Read capacity unit is strongly consistent read of up to 4 KB of items,
+eventually consistent read costs half of unit. Read is strongly consistent
+if it is executed at QUORUM or stronger consistency level (see
+is_strong_read). Read size is size of returned items, so for query and
+scan items filtered out by conditions and attributes not selected aren't
+billed. Write capacity unit is write of up to 1 KB item row, each local
+secondary index row of the item costs the same as table row. Item size is
+sum of lengths of attribute names and values.
+
+Units consumed by the request are collected in request context, so API can
+report them, and aggregated per tenant and table in memory of the process
+for monitoring API.
+"""
+
+import math
+import threading
+
+from magnetodb.storage.models import AttributeType
+from magnetodb.storage.models import ConsistencyLevels
+
+READ_UNIT_SIZE = 4096
+WRITE_UNIT_SIZE = 1024
+
+METRIC_READ_CAPACITY_UNITS = "read_capacity_units"
+METRIC_WRITE_CAPACITY_UNITS = "write_capacity_units"
+
+METRICS = frozenset(
+    [METRIC_READ_CAPACITY_UNITS, METRIC_WRITE_CAPACITY_UNITS]
+)
+
+
+def _primitive_value_size(value_type, value):
+    if value_type == AttributeType.PRIMITIVE_TYPE_NUMBER:
+        return len(str(value))
+    if isinstance(value, unicode):
+        return len(value.encode('utf-8'))
+    return len(value)
+
+
+def value_size(attr_value):
+    attr_type = attr_value.attr_type
+    value = attr_value.decoded_value
+    if attr_type.collection_type is None:
+        return _primitive_value_size(attr_type.type, value)
+    if attr_type.collection_type == AttributeType.COLLECTION_TYPE_MAP:
+        return sum(
+            _primitive_value_size(attr_type.key_type, key) +
+            _primitive_value_size(attr_type.value_type, val)
+            for key, val in value.iteritems()
+        )
+    return sum(_primitive_value_size(attr_type.element_type, val)
+               for val in value)
+
+
+def item_size(attribute_map):
+    return sum(len(name) + value_size(value)
+               for name, value in attribute_map.iteritems())
+
+
+def is_strong_read(table_info, consistent):
+    """
+    Checks if read is strongly consistent
+
+    :param table_info: TableInfo of the table read
+    :param consistent: consistency of the read as it is given to storage:
+                boolean or name of consistency level. True means level set
+                for consistent reads of the table or level of read
+                operation profile of the cluster handler if it isn't set
+    """
+    if isinstance(consistent, basestring):
+        return ConsistencyLevels.is_strong_read(consistent)
+    if not consistent:
+        return False
+    level = table_info.schema.consistency_levels.read
+    return level is None or ConsistencyLevels.is_strong_read(level)
+
+
+def read_units(size, consistent=True):
+    units = max(1, int(math.ceil(float(size) / READ_UNIT_SIZE)))
+    return float(units) if consistent else units / 2.0
+
+
+def write_units(size):
+    return float(max(1, int(math.ceil(float(size) / WRITE_UNIT_SIZE))))
+
+
+class ConsumedCapacity(object):
+    """Capacity units consumed by the request for one table"""
+
+    def __init__(self, table_name):
+        self.table_name = table_name
+        self.read_units = 0.0
+        self.write_units = 0.0
+        self.index_units = {}
+
+    @property
+    def table_units(self):
+        return self.read_units + self.write_units
+
+    @property
+    def capacity_units(self):
+        return self.table_units + sum(self.index_units.itervalues())
+
+    def add(self, read_units=0.0, write_units=0.0, index_name=None):
+        if index_name is None:
+            self.read_units += read_units
+            self.write_units += write_units
+        else:
+            self.index_units[index_name] = (
+                self.index_units.get(index_name, 0.0) +
+                read_units + write_units
+            )
+
+
+class CapacityUsage(object):
+    """Capacity units consumed since start of the process per tenant and
+    table
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._usage = {}
+
+    def add(self, tenant, table_name, read_units=0.0, write_units=0.0):
+        with self._lock:
+            usage = self._usage.setdefault((tenant, table_name), [0.0, 0.0])
+            usage[0] += read_units
+            usage[1] += write_units
+
+    def get(self, tenant, table_name):
+        with self._lock:
+            read, write = self._usage.get((tenant, table_name), (0.0, 0.0))
+        return {
+            METRIC_READ_CAPACITY_UNITS: read,
+            METRIC_WRITE_CAPACITY_UNITS: write
+        }
+
+    def clear(self):
+        with self._lock:
+            self._usage.clear()
+
+
+USAGE = CapacityUsage()
+
+
+def _add(context, table_name, read_units=0.0, write_units=0.0,
+         index_name=None):
+    consumed_capacity_map = context.__dict__.setdefault(
+        "consumed_capacity", {}
+    )
+    consumed_capacity = consumed_capacity_map.get(table_name)
+    if consumed_capacity is None:
+        consumed_capacity = consumed_capacity_map.setdefault(
+            table_name, ConsumedCapacity(table_name)
+        )
+    consumed_capacity.add(read_units, write_units, index_name)
+    USAGE.add(context.tenant, table_name, read_units, write_units)
+
+
+def add_read(context, table_info, items, consistent=True, index_name=None):
+    """
+    Accounts read of items. Read units are calculated for total size of
+    items, so empty result costs one unit too
+
+    :param context: current request context
+    :param table_info: TableInfo of the table read
+    :param items: list of attribute maps of read items
+    :param consistent: if True, read is strongly consistent, see
+                is_strong_read
+    :param index_name: name of the index used for the read, if any
+    """
+    add_read_size(context, table_info,
+                  sum(item_size(item) for item in items), consistent,
+                  index_name)
+
+
+def add_read_size(context, table_info, size, consistent=True,
+                  index_name=None):
+    """
+    The same as add_read, but takes total size of read items
+    """
+    _add(context, table_info.name,
+         read_units=read_units(size, consistent), index_name=index_name)
+
+
+def add_write(context, table_info, attribute_map, index_attributes=None):
+    """
+    Accounts write of the item row and rows of indexes, which alternative
+    range key attribute is written
+
+    :param context: current request context
+    :param table_info: TableInfo of the table written
+    :param attribute_map: attributes written to the row
+    :param index_attributes: names of written attributes, if attribute_map
+                doesn't contain all of them, like for update
+    """
+    units = write_units(item_size(attribute_map))
+    _add(context, table_info.name, write_units=units)
+
+    if index_attributes is None:
+        index_attributes = attribute_map
+    for index_name, index_def in (
+            table_info.schema.index_def_map.iteritems()):
+        if index_def.alt_range_key_attr in index_attributes:
+            _add(context, table_info.name, write_units=units,
+                 index_name=index_name)
+
+
+def add_delete(context, table_info, key_attribute_map):
+    """
+    Accounts deletion of the item row and all its index rows
+
+    :param context: current request context
+    :param table_info: TableInfo of the table written
+    :param key_attribute_map: key attributes of deleted item
+    """
+    add_write(context, table_info, key_attribute_map, index_attributes=[
+        index_def.alt_range_key_attr
+        for index_def in table_info.schema.index_def_map.itervalues()
+    ])
+
+
+def get_consumed_capacity(context, table_name=None):
+    """
+    :param context: current request context
+    :param table_name: name of the table. If None, capacity of all tables
+                is returned
+
+    :returns: ConsumedCapacity of the table or list of ConsumedCapacity
+              of all tables used by the request sorted by table name
+    """
+    consumed_capacity_map = getattr(context, "consumed_capacity", {})
+    if table_name is not None:
+        return consumed_capacity_map.get(table_name,
+                                         ConsumedCapacity(table_name))
+    return [consumed_capacity_map[name]
+            for name in sorted(consumed_capacity_map)]
@@ -52,7 +52,8 @@ class StorageDriver(object):
         raise NotImplementedError()
 
     def put_item(self, context, table_info, attribute_map, return_values=None,
-                 if_not_exist=False, expected_condition_map=None):
+                 if_not_exist=False, expected_condition_map=None,
+                 consistency_level=None):
         """
         :param context: current request context
         :param table_info: TableInfo instance with table's meta information
@@ -67,6 +68,9 @@ class StorageDriver(object):
                     ExpectedCondition instance mapping. It provides
                     preconditions to make decision about should item be put or
                     not
+        :param consistency_level: name of consistency level of the request,
+                    overrides level set for the table. SERIAL and
+                    LOCAL_SERIAL define level of conditions
 
         :returns: True if operation performed, otherwise False
 
@@ -75,7 +79,7 @@ class StorageDriver(object):
         raise NotImplementedError()
 
     def delete_item(self, context, table_info, key_attribute_map,
-                    expected_condition_map=None):
+                    expected_condition_map=None, consistency_level=None):
         """
         :param context: current request context
         :param table_info: TableInfo instance with table's meta information
@@ -85,6 +89,9 @@ class StorageDriver(object):
                     ExpectedCondition instance mapping. It provides
                     preconditions to make decision about should item be
                     deleted or not
+        :param consistency_level: name of consistency level of the request,
+                    overrides level set for the table. SERIAL and
+                    LOCAL_SERIAL define level of conditions
 
         :returns: True if operation performed, otherwise False (if operation
                     was skipped by out of date timestamp, it is considered as
@@ -94,8 +101,51 @@ class StorageDriver(object):
         """
         raise NotImplementedError()
 
+    def batch_write_async(self, context, write_request_list):
+        """
+        Execute batch on storage backend side without waiting for completion
+
+        :param context: current request context
+        :param write_request_list: (TableInfo, WriteItemRequest) list,
+                    represents write requests set to be perform
+
+        :returns: Future instance. It is completed with NotImplementedError
+                    if batch can't be executed natively by the backend
+
+        :raises: NotImplementedError if driver can't execute batch
+                    asynchronously
+        """
+        raise NotImplementedError()
+
+    def put_item_async(self, context, table_info, attribute_map,
+                       return_values=None, if_not_exist=False,
+                       expected_condition_map=None, consistency_level=None):
+        """
+        The same as put_item but doesn't wait for operation completion
+
+        :returns: Future instance with put_item result
+
+        :raises: NotImplementedError if driver can't execute request
+                    asynchronously
+        """
+        raise NotImplementedError()
+
+    def delete_item_async(self, context, table_info, key_attribute_map,
+                          expected_condition_map=None,
+                          consistency_level=None):
+        """
+        The same as delete_item but doesn't wait for operation completion
+
+        :returns: Future instance with delete_item result
+
+        :raises: NotImplementedError if driver can't execute request
+                    asynchronously
+        """
+        raise NotImplementedError()
+
     def update_item(self, context, table_info, key_attribute_map,
-                    attribute_action_map, expected_condition_map=None):
+                    attribute_action_map, expected_condition_map=None,
+                    return_values=None, consistency_level=None):
         """
         :param context: current request context
         :param table_info: TableInfo instance with table's meta information
@@ -108,6 +158,11 @@ class StorageDriver(object):
                     ExpectedCondition instance mapping. It provides
                     preconditions
                     to make decision about should item be updated or not
+        :param return_values: model that defines what values should be
+                    returned. Old item is read only if it's required
+        :param consistency_level: name of consistency level of the request,
+                    overrides level set for the table. SERIAL and
+                    LOCAL_SERIAL define level of conditions
         :returns: True if operation performed, otherwise False
 
         :raises: BackendInteractionException
@@ -135,7 +190,7 @@ class StorageDriver(object):
         :param exclusive_start_key: key attribute names to AttributeValue
                     instance
         :param consistent: define is operation consistent or not (by default it
-                    is not consistent)
+                    is not consistent) or name of consistency level
         :param order_type: defines order of returned rows, if 'None' - default
                     order will be used
 
@@ -145,9 +200,64 @@ class StorageDriver(object):
         """
         raise NotImplementedError()
 
+    def select_item_async(self, context, table_info, hash_key_condition_list,
+                          range_key_to_query_condition_list, select_type,
+                          index_name=None, limit=None,
+                          exclusive_start_key=None, consistent=True,
+                          order_type=None):
+        """
+        The same as select_item but doesn't wait for operation completion
+
+        :returns: Future instance with SelectResult
+
+        :raises: NotImplementedError if driver can't execute request
+                    asynchronously
+        """
+        raise NotImplementedError()
+
+    def select_items_async(self, context, table_info, key_attribute_map_list,
+                           select_type, consistent=True):
+        """
+        Selects items with given primary keys without waiting for operation
+        completion
+
+        :param context: current request context
+        :param table_info: TableInfo instance with table's meta information
+        :param key_attribute_map_list: list of key attribute name to
+                    AttributeValue mappings of items to select
+        :param select_type: SelectType instance. It defines with attributes
+                    will be returned
+        :param consistent: define is operation consistent or not or name of
+                    consistency level
+
+        :returns: Future instance with list of items (attribute name to
+                    AttributeValue mappings, None if item doesn't exist) in
+                    order of given keys
+
+        :raises: NotImplementedError if driver can't execute request
+                    asynchronously
+        """
+        raise NotImplementedError()
+
+    def select_item_stream(self, context, table_info,
+                           hash_key_condition_list,
+                           range_key_to_query_condition_list, select_type,
+                           index_name=None, limit=None,
+                           exclusive_start_key=None, consistent=True,
+                           order_type=None):
+        """
+        The same as select_item but items are read from the backend while
+        result is iterated. Count select type isn't supported
+
+        :returns: ScanResultStream instance
+
+        :raises: BackendInteractionException
+        """
+        raise NotImplementedError()
+
     def scan(self, context, table_info, condition_map, attributes_to_get=None,
              limit=None, exclusive_start_key=None,
-             consistent=False):
+             consistent=False, segment=None, total_segments=None):
         """
         :param context: current request context
         :param table_info: TableInfo instance with table's meta information
@@ -159,7 +269,10 @@ class StorageDriver(object):
         :param exclusive_start_key: key attribute names to AttributeValue
                     instance
         :param consistent: define is operation consistent or not (by default it
-                    is not consistent)
+                    is not consistent) or name of consistency level
+        :param segment: number of the segment to be scanned by this request
+        :param total_segments: total number of segments the table is divided
+                    into for parallel scan
 
         :returns: list of attribute name to AttributeValue mappings
 
@@ -167,6 +280,20 @@ class StorageDriver(object):
         """
         raise NotImplementedError()
 
+    def scan_stream(self, context, table_info, condition_map,
+                    attributes_to_get=None, limit=None,
+                    exclusive_start_key=None, consistent=False,
+                    segment=None, total_segments=None):
+        """
+        The same as scan but items are read from the backend while result is
+        iterated
+
+        :returns: ScanResultStream instance
+
+        :raises: BackendInteractionException
+        """
+        raise NotImplementedError()
+
     def get_table_statistics(self, context, table_info, keys):
         """
         :param context: current request context
@@ -178,3 +305,19 @@ class StorageDriver(object):
         :raises: BackendInteractionException
         """
         raise NotImplementedError()
+
+    def rewrite_index_rows(self, context, table_info, attribute_map):
+        """
+        Rewrites index rows of the item according to the index layout of
+        the table, used to migrate existing tables to another layout
+
+        :param context: current request context
+        :param table_info: TableInfo instance with table's meta information
+        :param attribute_map: attribute name to AttributeValue mapping of
+                    the item read from the table
+
+        :returns: number of rewritten index rows
+
+        :raises: BackendInteractionException
+        """
+        raise NotImplementedError()
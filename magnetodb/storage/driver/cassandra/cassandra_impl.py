@@ -13,10 +13,14 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
-import json
-
 from collections import deque
+from collections import OrderedDict
+import itertools
+from threading import Lock
+
+from concurrent.futures import Future
 
+from magnetodb.common.cassandra.cluster_handler import OPERATION_LWT
 from magnetodb.common import exception
 from magnetodb.common.exception import ConditionalCheckFailedException
 from magnetodb.common.exception import InvalidQueryParameter
@@ -26,10 +30,14 @@ from magnetodb.openstack.common import log as logging
 from magnetodb.storage import models
 from magnetodb.storage.driver import StorageDriver
 from magnetodb.storage.driver.cassandra.encoder import (
-    encode_predefined_attr_value, encode_dynamic_attr_value
+    encode_predefined_attr_value, encode_dynamic_attr_value,
+    encode_dynamic_attr_value_json, bind_predefined_attr_value,
+    bind_dynamic_attr_value, unpack_dynamic_attr_value,
+    is_dynamic_attr_value_json
 )
 
 from cassandra.encoder import cql_quote
+from cassandra import query as cassandra_query
 from pyjolokia import Jolokia
 from oslo.config import cfg
 
@@ -83,6 +91,17 @@ DEFAULT_STRING_VALUE = models.AttributeValue('S', decoded_value='')
 DEFAULT_NUMBER_VALUE = models.AttributeValue('N', decoded_value=0)
 DEFAULT_BLOB_VALUE = models.AttributeValue('B', decoded_value='')
 
+# token range of Murmur3Partitioner
+MIN_TOKEN = -2 ** 63
+MAX_TOKEN = 2 ** 63 - 1
+
+PREPARED_QUERY_INSERT = "insert"
+PREPARED_QUERY_DELETE = "delete"
+PREPARED_QUERY_SELECT = "select"
+PREPARED_QUERY_SELECT_COUNT = "select_count"
+
+INDEXED_BATCH_WRITE_ATTEMPTS = 3
+
 
 def _decode_predefined_attr(table_info, cas_name, cas_val, prefix=USER_PREFIX):
     assert cas_name.startswith(prefix) and cas_val
@@ -92,12 +111,6 @@ def _decode_predefined_attr(table_info, cas_name, cas_val, prefix=USER_PREFIX):
     return name, models.AttributeValue(storage_type, decoded_value=cas_val)
 
 
-def _decode_dynamic_attr_value(value, storage_type):
-    value = json.loads(value)
-
-    return models.AttributeValue(storage_type, encoded_value=value)
-
-
 ENCODED_DEFAULT_STRING_VALUE = encode_predefined_attr_value(
     DEFAULT_STRING_VALUE
 )
@@ -134,10 +147,308 @@ def _storage_to_cassandra_type(storage_type):
         )
 
 
+def _split_token_range(start_token, end_token, parts):
+    """
+    Splits inclusive token range into given number of contiguous
+    inclusive subranges
+
+    :returns: list of (start_token, end_token) tuples in token order
+    """
+    span = end_token - start_token + 1
+    parts = max(1, min(parts, span))
+    bounds = [start_token + span * i // parts for i in xrange(parts + 1)]
+    return [(bounds[i], bounds[i + 1] - 1) for i in xrange(parts)]
+
+
+def _get_segment_token_range(segment, total_segments):
+    if total_segments is None:
+        return MIN_TOKEN, MAX_TOKEN
+    return _split_token_range(MIN_TOKEN, MAX_TOKEN, total_segments)[segment]
+
+
+def _map_future(future, func):
+    """
+    Returns new Future completed with func(future.result()) or with the
+    exception of given future
+    """
+    result_future = Future()
+
+    def callback(done_future):
+        try:
+            result_future.set_result(func(done_future.result()))
+        except Exception as e:
+            result_future.set_exception(e)
+
+    future.add_done_callback(callback)
+    return result_future
+
+
+def _chain_future(future, func):
+    """
+    Returns new Future completed with the result of Future returned by
+    func(future.result()) or with the exception raised on the way
+    """
+    result_future = Future()
+
+    def inner_callback(inner_future):
+        try:
+            result_future.set_result(inner_future.result())
+        except Exception as e:
+            result_future.set_exception(e)
+
+    def callback(done_future):
+        try:
+            func(done_future.result()).add_done_callback(inner_callback)
+        except Exception as e:
+            result_future.set_exception(e)
+
+    future.add_done_callback(callback)
+    return result_future
+
+
+def _gather_futures(futures, func):
+    """
+    Returns new Future completed with func(list of results of given futures)
+    or with the first exception of given futures
+    """
+    result_future = Future()
+    if not futures:
+        result_future.set_result(func([]))
+        return result_future
+
+    lock = Lock()
+    pending = [len(futures)]
+
+    def callback(done_future):
+        with lock:
+            if result_future.done():
+                return
+            exception = done_future.exception()
+            if exception is not None:
+                result_future.set_exception(exception)
+                return
+            pending[0] -= 1
+            if pending[0]:
+                return
+        try:
+            result_future.set_result(
+                func([future.result() for future in futures])
+            )
+        except Exception as e:
+            result_future.set_exception(e)
+
+    for future in futures:
+        future.add_done_callback(callback)
+    return result_future
+
+
+class _IndexQueryPlan(object):
+    """
+    Compiled parts of select_item queries on local secondary index
+    """
+
+    def __init__(self, attr_name, value_column, row_conditions,
+                 value_conditions, asc_tail_conditions,
+                 desc_tail_conditions, projection, projected_columns):
+        """
+        :param attr_name: name of alternative range key attribute
+        :param value_column: name of column which stores value of
+                    alternative range key
+        :param row_conditions: CQL conditions selecting rows of the index
+        :param value_conditions: row_conditions with conditions on index
+                    value columns preceding value_column
+        :param asc_tail_conditions: CQL conditions on index value columns
+                    following value_column for ascending range query
+        :param desc_tail_conditions: the same for descending range query
+        :param projection: set of attribute names of ALL_PROJECTED select
+                    or None if all attributes are projected
+        :param projected_columns: CQL selection of ALL_PROJECTED select
+        """
+        self.attr_name = attr_name
+        self.value_column = value_column
+        self.row_conditions = row_conditions
+        self.value_conditions = value_conditions
+        self.asc_tail_conditions = asc_tail_conditions
+        self.desc_tail_conditions = desc_tail_conditions
+        self.projection = projection
+        self.projected_columns = projected_columns
+
+
+class _SelectQueryPlan(object):
+    """
+    Parts of select_item queries, which depend on table schema only.
+    Plan is compiled once per table and reused until schema is changed
+    """
+
+    def __init__(self, schema, from_clause, item_row_conditions,
+                 item_row_range_conditions, order_clause, index_plan_map):
+        """
+        :param schema: TableSchema the plan is compiled for
+        :param from_clause: CQL FROM clause
+        :param item_row_conditions: CQL conditions selecting item rows
+        :param item_row_range_conditions: the same for query with range
+                    key conditions
+        :param order_clause: CQL ORDER BY clause without order type or
+                    None if order is not supported
+        :param index_plan_map: index name to _IndexQueryPlan
+        """
+        self.schema = schema
+        self.hash_name = schema.hash_key_name
+        self.range_name = schema.range_key_name
+        self.from_clause = from_clause
+        self.item_row_conditions = item_row_conditions
+        self.item_row_range_conditions = item_row_range_conditions
+        self.order_clause = order_clause
+        self.index_plan_map = index_plan_map
+
+
 class CassandraStorageDriver(StorageDriver):
-    def __init__(self, cluster_handler, default_keyspace_opts):
+    def __init__(self, cluster_handler, default_keyspace_opts,
+                 scan_parallelism=1, fetch_size=1000, batch_get_fan_out=10):
+        """
+        :param cluster_handler: ClusterHandler instance
+        :param default_keyspace_opts: options of keyspace created for tenant
+        :param scan_parallelism: number of token subranges queried
+                    concurrently by unlimited scan over token range
+        :param fetch_size: count of rows fetched from Cassandra at once by
+                    streamed scan and query
+        :param batch_get_fan_out: max number of partitions read by single
+                    query of batch get on table without range key
+        """
         self.__cluster_handler = cluster_handler
         self.__default_keyspace_opts = default_keyspace_opts
+        self.__scan_parallelism = scan_parallelism
+        self.__fetch_size = fetch_size
+        self.__batch_get_fan_out = batch_get_fan_out
+        self.__prepared_query_cache = {}
+        self.__select_query_plan_cache = {}
+
+    def _get_prepared_query(self, table_info, shape, query_factory):
+        """
+        Returns (query, bind_attr_names) tuple cached per table and query
+        shape. query is CQL string with '?' parameter markers which is
+        prepared by cluster handler, bind_attr_names is the list of
+        attribute names in order of their parameter markers
+        """
+        table_query_cache = self.__prepared_query_cache.get(
+            table_info.internal_name
+        )
+        if table_query_cache is None:
+            table_query_cache = self.__prepared_query_cache.setdefault(
+                table_info.internal_name, {}
+            )
+
+        prepared_query = table_query_cache.get(shape)
+        if prepared_query is None:
+            prepared_query = query_factory(table_info, shape)
+            table_query_cache[shape] = prepared_query
+        return prepared_query
+
+    def _get_select_query_plan(self, table_info):
+        """
+        Returns _SelectQueryPlan cached per table. Cached plan is compiled
+        again if schema of given table info is another one
+        """
+        plan = self.__select_query_plan_cache.get(table_info.internal_name)
+        if plan is None or plan.schema is not table_info.schema:
+            plan = self._build_select_query_plan(table_info)
+            self.__select_query_plan_cache[table_info.internal_name] = plan
+        return plan
+
+    def _build_select_query_plan(self, table_info):
+        schema = table_info.schema
+
+        def compile_conditions(conditions):
+            return tuple(
+                "".join(self._append_indexed_condition(
+                    column, condition, None, column_prefix=""
+                ))
+                for column, condition in conditions
+            )
+
+        default_index_values = [
+            DEFAULT_STRING_VALUE,
+            DEFAULT_NUMBER_VALUE,
+            DEFAULT_BLOB_VALUE
+        ]
+
+        index_plan_map = {}
+        for index_name, index_def in schema.index_def_map.iteritems():
+            attr_name = index_def.alt_range_key_attr
+            n = INDEX_TYPE_TO_INDEX_POS_MAP[
+                schema.attribute_type_map[attr_name]
+            ]
+            row_conditions = compile_conditions([
+                (SYSTEM_COLUMN_INDEX_NAME, models.IndexedCondition.eq(
+                    models.AttributeValue('S', decoded_value=index_name)
+                ))
+            ])
+            projection = self._get_index_projection(table_info, index_name)
+            index_plan_map[index_name] = _IndexQueryPlan(
+                attr_name=attr_name,
+                value_column=LOCAL_INDEX_FIELD_LIST[n],
+                row_conditions=row_conditions,
+                value_conditions=row_conditions + compile_conditions(
+                    (LOCAL_INDEX_FIELD_LIST[i],
+                     models.IndexedCondition.eq(default_index_values[i - 1]))
+                    for i in xrange(1, n)
+                ),
+                asc_tail_conditions=compile_conditions(
+                    (LOCAL_INDEX_FIELD_LIST[i],
+                     models.IndexedCondition.gt(default_index_values[i - 1]))
+                    for i in xrange(n + 1, len(LOCAL_INDEX_FIELD_LIST))
+                ),
+                desc_tail_conditions=compile_conditions(
+                    (LOCAL_INDEX_FIELD_LIST[i],
+                     models.IndexedCondition.lt(default_index_values[i - 1]))
+                    for i in xrange(n + 1, len(LOCAL_INDEX_FIELD_LIST))
+                ),
+                projection=projection,
+                projected_columns=self._get_select_columns(
+                    table_info, projection, (attr_name,)
+                )
+            )
+
+        if schema.index_def_map:
+            # item rows are stored with default values of index columns
+            item_row_conditions = compile_conditions([
+                (SYSTEM_COLUMN_INDEX_NAME,
+                 models.IndexedCondition.eq(DEFAULT_STRING_VALUE))
+            ])
+            item_row_range_conditions = (
+                item_row_conditions + compile_conditions(
+                    (LOCAL_INDEX_FIELD_LIST[i],
+                     models.IndexedCondition.eq(default_index_values[i - 1]))
+                    for i in xrange(1, len(LOCAL_INDEX_FIELD_LIST))
+                )
+            )
+            order_clause = " ORDER BY " + SYSTEM_COLUMN_INDEX_NAME + " "
+        else:
+            item_row_conditions = ()
+            item_row_range_conditions = ()
+            order_clause = (
+                ' ORDER BY "' + USER_PREFIX + schema.range_key_name + '" '
+                if schema.range_key_name else None
+            )
+
+        return _SelectQueryPlan(
+            schema=schema,
+            from_clause=" FROM " + table_info.internal_name,
+            item_row_conditions=item_row_conditions,
+            item_row_range_conditions=item_row_range_conditions,
+            order_clause=order_clause,
+            index_plan_map=index_plan_map
+        )
+
+    def _invalidate_prepared_queries(self, table_info):
+        self.__select_query_plan_cache.pop(table_info.internal_name, None)
+        table_query_cache = self.__prepared_query_cache.pop(
+            table_info.internal_name, None
+        )
+        if table_query_cache:
+            self.__cluster_handler.invalidate_prepared_queries(
+                [query for query, _ in table_query_cache.itervalues()]
+            )
 
     @probe.Probe(__name__)
     def create_table(self, context, table_info):
@@ -187,15 +498,21 @@ class CassandraStorageDriver(StorageDriver):
 
             query_builder += (
                 '"', USER_PREFIX, attr_name, '" ',
-                _storage_to_cassandra_type(attr_type), ","
+                'counter' if attr_name in table_schema.counter_attributes
+                else _storage_to_cassandra_type(attr_type), ","
+            )
+
+        # counter tables can't contain other columns than counters, so
+        # dynamic attributes aren't supported for them
+        if not table_schema.counter_attributes:
+            query_builder += (
+                SYSTEM_COLUMN_EXTRA_ATTR_DATA, " map<text, blob>,",
+                SYSTEM_COLUMN_EXTRA_ATTR_TYPES, " map<text, text>,",
+                SYSTEM_COLUMN_ATTR_EXIST, " map<text, int>,"
             )
 
         query_builder += (
-            SYSTEM_COLUMN_EXTRA_ATTR_DATA, " map<text, blob>,",
-            SYSTEM_COLUMN_EXTRA_ATTR_TYPES, " map<text, text>,",
-            SYSTEM_COLUMN_ATTR_EXIST, " map<text, int>,"
-            'PRIMARY KEY ("',
-            USER_PREFIX, hash_key_name, '"'
+            'PRIMARY KEY ("', USER_PREFIX, hash_key_name, '"'
         )
 
         if table_schema.index_def_map:
@@ -237,6 +554,7 @@ class CassandraStorageDriver(StorageDriver):
 
         query = 'DROP TABLE ' + table_info.internal_name
 
+        self._invalidate_prepared_queries(table_info)
         self.__cluster_handler.execute_query(query)
 
         LOG.debug("Delete Table CQL request executed. "
@@ -394,6 +712,81 @@ class CassandraStorageDriver(StorageDriver):
             query_builder.append(" IF NOT EXISTS")
         return query_builder
 
+    @staticmethod
+    def _build_prepared_insert_query(table_info, shape):
+        predefined_attr_names = sorted(
+            table_info.schema.attribute_type_map.iterkeys()
+        )
+
+        query_builder = deque(
+            ('INSERT INTO ', table_info.internal_name, ' (')
+        )
+        for name in predefined_attr_names:
+            query_builder += ('"', USER_PREFIX, name, '",')
+
+        param_count = len(predefined_attr_names) + 3
+
+        if table_info.schema.index_def_map:
+            query_builder += (
+                SYSTEM_COLUMN_INDEX_NAME, ",",
+                SYSTEM_COLUMN_INDEX_VALUE_STRING, ",",
+                SYSTEM_COLUMN_INDEX_VALUE_NUMBER, ",",
+                SYSTEM_COLUMN_INDEX_VALUE_BLOB, ",",
+            )
+            param_count += len(LOCAL_INDEX_FIELD_LIST)
+
+        query_builder += (
+            SYSTEM_COLUMN_EXTRA_ATTR_DATA, ",",
+            SYSTEM_COLUMN_EXTRA_ATTR_TYPES, ",",
+            SYSTEM_COLUMN_ATTR_EXIST,
+            ") VALUES(", ",".join(("?",) * param_count), ")"
+        )
+
+        return "".join(query_builder), predefined_attr_names
+
+    def _bind_insert_query(self, table_info, attribute_map, index_name=None,
+                           index_value=None):
+        query, predefined_attr_names = self._get_prepared_query(
+            table_info, PREPARED_QUERY_INSERT,
+            self._build_prepared_insert_query
+        )
+
+        _bind_predefined_attr_value = bind_predefined_attr_value
+        _bind_dynamic_attr_value = bind_dynamic_attr_value
+
+        values = [
+            _bind_predefined_attr_value(attribute_map.get(name))
+            for name in predefined_attr_names
+        ]
+
+        if table_info.schema.index_def_map:
+            index_values = [
+                DEFAULT_STRING_VALUE, DEFAULT_STRING_VALUE,
+                DEFAULT_NUMBER_VALUE, DEFAULT_BLOB_VALUE
+            ]
+            if index_name:
+                index_values[0] = models.AttributeValue(
+                    'S', decoded_value=index_name
+                )
+                index_values[
+                    INDEX_TYPE_TO_INDEX_POS_MAP[index_value.attr_type]
+                ] = index_value
+            values += map(_bind_predefined_attr_value, index_values)
+
+        attribute_type_map = table_info.schema.attribute_type_map
+        dynamic_attr_values = {}
+        dynamic_attr_types = {}
+        attr_exist = {}
+        for name, val in attribute_map.iteritems():
+            attr_exist[name] = 1
+            if val is not None and name not in attribute_type_map:
+                dynamic_attr_values[name] = _bind_dynamic_attr_value(val)
+                dynamic_attr_types[name] = val.attr_type.type
+
+        values += (dynamic_attr_values, dynamic_attr_types, attr_exist)
+
+        return self.__cluster_handler.bind_query(query, values)
+
     def _append_update_query_with_basic_pk(self, table_info, attribute_map,
                                            query_builder=None, rewrite=False):
         if query_builder is None:
@@ -504,7 +897,7 @@ class CassandraStorageDriver(StorageDriver):
     def _append_update_query(self, table_info, attribute_map,
                              query_builder=None, index_name=None,
                              index_value=None, expected_condition_map=None,
-                             rewrite=False):
+                             rewrite=False, json_attr_names=()):
         query_builder = self._append_update_query_with_basic_pk(
             table_info, attribute_map, query_builder, rewrite=rewrite
         )
@@ -516,7 +909,7 @@ class CassandraStorageDriver(StorageDriver):
         if expected_condition_map:
             self._append_expected_conditions(
                 expected_condition_map, table_info.schema,
-                query_builder
+                query_builder, json_attr_names=json_attr_names
             )
 
         return query_builder
@@ -526,13 +919,20 @@ class CassandraStorageDriver(StorageDriver):
                                        separator=" ", rewrite=False):
         if query_builder is None:
             query_builder = deque()
-        base_update_query = None
+        # indexes with the same set of row attributes share the query
+        base_update_query_map = {}
         base_delete_query = None
 
-        def create_base_update_query():
+        def create_base_update_query(row_attributes):
+            row_attribute_map = attribute_map
+            if row_attributes is not None:
+                row_attribute_map = {
+                    name: value for name, value in attribute_map.iteritems()
+                    if name in row_attributes
+                }
             base_query_builder = (
                 self._append_update_query_with_basic_pk(
-                    table_info, attribute_map, rewrite=rewrite
+                    table_info, row_attribute_map, rewrite=rewrite
                 )
             )
             return "".join(base_query_builder)
@@ -554,9 +954,14 @@ class CassandraStorageDriver(StorageDriver):
                 index_def.alt_range_key_attr, None
             )
             if new_index_value:
-                base_update_query = (
-                    base_update_query or create_base_update_query()
-                )
+                row_attributes = self._get_index_row_attributes(table_info,
+                                                                index_name)
+                base_update_query = base_update_query_map.get(row_attributes)
+                if base_update_query is None:
+                    base_update_query = create_base_update_query(
+                        row_attributes
+                    )
+                    base_update_query_map[row_attributes] = base_update_query
                 query_builder += (separator, base_update_query)
                 self._append_index_extra_primary_key(
                     query_builder, index_name, new_index_value,
@@ -571,7 +976,134 @@ class CassandraStorageDriver(StorageDriver):
                 )
         return query_builder
 
-    def _put_item_if_not_exists(self, table_info, attribute_map):
+    @staticmethod
+    def _get_index_projection(table_info, index_name):
+        """
+        Returns set of names of key, alternative range key and projected
+        attributes of the index or None if all attributes are projected
+        """
+        schema = table_info.schema
+        index_def = schema.index_def_map[index_name]
+        if index_def.projected_attributes is None:
+            return None
+        return index_def.projected_attributes.union(
+            schema.key_attributes, (index_def.alt_range_key_attr,)
+        )
+
+    @classmethod
+    def _get_index_row_attributes(cls, table_info, index_name):
+        """
+        Returns set of attribute names stored in rows of the index or None
+        if index rows are full copies of items
+        """
+        if (table_info.schema.index_layout ==
+                models.TableSchema.INDEX_LAYOUT_FULL):
+            return None
+        return cls._get_index_projection(table_info, index_name)
+
+    @classmethod
+    def _get_attributes_to_get(cls, table_info, select_type,
+                               index_name=None):
+        """
+        Returns names of attributes to be selected or None if all
+        attributes are required. ALL_PROJECTED select type of query on
+        index selects attributes projected to the index
+        """
+        if select_type.is_all_projected and index_name is not None:
+            return cls._get_index_projection(table_info, index_name)
+        return select_type.attributes
+
+    @staticmethod
+    def _get_read_consistency(table_info, consistent):
+        """
+        Returns consistency of read query for the cluster handler: name of
+        consistency level given explicitly or set for consistent reads of
+        the table, True for level of read operation profile or False for
+        driver's default level
+        """
+        if isinstance(consistent, basestring):
+            return consistent
+        if consistent:
+            return table_info.schema.consistency_levels.read or True
+        return False
+
+    @staticmethod
+    def _get_write_options(table_info, consistency_level=None, lwt=False):
+        """
+        Returns options of write query for the cluster handler. Level given
+        for the request overrides level set for the table, serial level is
+        applied to conditions of lightweight transactions only
+        """
+        table_levels = table_info.schema.consistency_levels
+        serial_level = table_levels.serial
+        if models.ConsistencyLevels.is_serial(consistency_level):
+            serial_level = consistency_level
+            consistency_level = None
+        options = dict(
+            consistent=consistency_level or table_levels.write or True
+        )
+        if lwt:
+            options["operation"] = OPERATION_LWT
+            if serial_level is not None:
+                options["serial_consistency_level"] = serial_level
+        return options
+
+    def rewrite_index_rows(self, context, table_info, attribute_map):
+        """
+        Rewrites index rows of the item according to the index layout of
+        the table. Each row is rewritten by conditional update, which is
+        applied only if the row exists and its attributes weren't changed
+        since the item was read
+
+        :param context: current request context
+        :param table_info: TableInfo instance with table's meta information
+        :param attribute_map: attribute name to AttributeValue mapping of
+                    the item read from the table
+
+        :returns: number of rewritten index rows
+
+        :raises: BackendInteractionException
+        """
+        schema = table_info.schema
+        rewritten = 0
+        for index_name, index_def in schema.index_def_map.iteritems():
+            index_value = attribute_map.get(index_def.alt_range_key_attr)
+            row_attributes = self._get_index_row_attributes(table_info,
+                                                            index_name)
+            if index_value is None or row_attributes is None:
+                continue
+
+            row_attribute_map = {}
+            conditions = {}
+            for name in row_attributes:
+                value = attribute_map.get(name)
+                if value is not None:
+                    row_attribute_map[name] = value
+                if name not in schema.key_attributes:
+                    conditions[name] = [
+                        models.ExpectedCondition.null() if value is None else
+                        models.ExpectedCondition.eq(value)
+                    ]
+
+            json_attr_names = self._select_json_attr_names(
+                table_info, attribute_map, conditions, index_name,
+                index_value
+            )
+            query_builder = self._append_update_query(
+                table_info, row_attribute_map, index_name=index_name,
+                index_value=index_value, expected_condition_map=conditions,
+                rewrite=True, json_attr_names=json_attr_names
+            )
+            result = self.__cluster_handler.execute_query(
+                "".join(query_builder),
+                **self._get_write_options(table_info, lwt=True)
+            )
+            if result[0]['[applied]']:
+                rewritten += 1
+        return rewritten
+
+    def _put_item_if_not_exists(self, table_info, attribute_map,
+                                consistency_level=None):
         query_builder = self._append_insert_query(
             table_info, attribute_map, if_not_exists=True
         )
@@ -586,13 +1118,17 @@ class CassandraStorageDriver(StorageDriver):
                 query_builder.append(' APPLY BATCH')
 
         result = self.__cluster_handler.execute_query(
-            "".join(query_builder), consistent=True)
+            "".join(query_builder),
+            **self._get_write_options(table_info, consistency_level,
+                                      lwt=True)
+        )
 
         return result[0]['[applied]']
 
     @probe.Probe(__name__)
     def put_item(self, context, table_info, attribute_map, return_values=None,
-                 if_not_exist=False, expected_condition_map=None):
+                 if_not_exist=False, expected_condition_map=None,
+                 consistency_level=None):
         """
         :param context: current request context
         :param table_info: TableInfo instance with table's meta information
@@ -607,6 +1143,9 @@ class CassandraStorageDriver(StorageDriver):
                     ExpectedCondition instance mapping. It provides
                     preconditions to make decision about should item be put or
                     not
+        :param consistency_level: name of consistency level of the request,
+                    overrides level set for the table. SERIAL and
+                    LOCAL_SERIAL define level of conditions
 
         :returns: True if operation performed, otherwise False
 
@@ -643,18 +1182,19 @@ class CassandraStorageDriver(StorageDriver):
                     "Both expected_condition_map and "
                     "if_not_exist specified"
                 )
-            if self._put_item_if_not_exists(table_info, attribute_map):
+            if self._put_item_if_not_exists(table_info, attribute_map,
+                                            consistency_level):
                 return True, old_item
             raise ConditionalCheckFailedException()
         elif table_info.schema.index_def_map or return_old:
-            _encode_predefined_attr_value = encode_predefined_attr_value
             range_name = table_info.schema.range_key_name
 
             while True:
                 put_conditions = None
                 if return_old:
-                    old_item = self._get_item_to_update(context, table_info,
-                                                        attribute_map)
+                    old_item, json_attr_names = self._get_item_to_update(
+                        context, table_info, attribute_map
+                    )
                     if not self._conditions_satisfied(
                             old_item, expected_condition_map):
                         raise ConditionalCheckFailedException()
@@ -666,8 +1206,9 @@ class CassandraStorageDriver(StorageDriver):
                             key_attributes, old_item
                         )
                     else:
-                        if self._put_item_if_not_exists(table_info,
-                                                        attribute_map):
+                        if self._put_item_if_not_exists(
+                                table_info, attribute_map,
+                                consistency_level):
                             return True, old_item
                         continue
 
@@ -680,38 +1221,33 @@ class CassandraStorageDriver(StorageDriver):
                         if not self._conditions_satisfied(
                                 old_indexes, expected_condition_map):
                             raise ConditionalCheckFailedException()
-                        if self._put_item_if_not_exists(table_info,
-                                                        attribute_map):
+                        if self._put_item_if_not_exists(
+                                table_info, attribute_map,
+                                consistency_level):
                             return True, old_item
                         continue
 
                 conditions = put_conditions
                 if not conditions:
                     conditions = expected_condition_map
+                    json_attr_names = self._select_json_attr_names(
+                        table_info, attribute_map, conditions
+                    )
 
                 query_builder = self._append_update_query(
                     table_info, attribute_map,
-                    expected_condition_map=conditions, rewrite=True
+                    expected_condition_map=conditions, rewrite=True,
+                    json_attr_names=json_attr_names
                 )
 
                 if table_info.schema.index_def_map:
                     if return_old:
                         old_indexes = old_item
                     else:
-                        if_prefix = " AND " if conditions else " IF "
-                        for index_name, index_def in (
-                                table_info.schema.index_def_map.iteritems()):
-                            old_index_value = old_indexes.get(
-                                index_def.alt_range_key_attr, None
-                            )
-
-                            query_builder += (
-                                if_prefix, '"', USER_PREFIX,
-                                index_def.alt_range_key_attr, '"=',
-                                _encode_predefined_attr_value(old_index_value)
-                                if old_index_value else "null"
-                            )
-                            if_prefix = " AND "
+                        self._append_index_value_conditions(
+                            table_info, old_indexes, query_builder,
+                            " AND " if conditions else " IF "
+                        )
 
                     qb_len = len(query_builder)
 
@@ -724,7 +1260,9 @@ class CassandraStorageDriver(StorageDriver):
                         query_builder.append(' APPLY BATCH')
 
                 result = self.__cluster_handler.execute_query(
-                    "".join(query_builder), consistent=True
+                    "".join(query_builder),
+                    **self._get_write_options(table_info, consistency_level,
+                                              lwt=True)
                 )
 
                 if result[0]['[applied]']:
@@ -745,49 +1283,255 @@ class CassandraStorageDriver(StorageDriver):
         elif expected_condition_map:
             query_builder = self._append_update_query(
                 table_info, attribute_map,
-                expected_condition_map=expected_condition_map, rewrite=True
+                expected_condition_map=expected_condition_map, rewrite=True,
+                json_attr_names=self._select_json_attr_names(
+                    table_info, attribute_map, expected_condition_map
+                )
             )
             result = self.__cluster_handler.execute_query(
-                "".join(query_builder), consistent=True
+                "".join(query_builder),
+                **self._get_write_options(table_info, consistency_level,
+                                          lwt=True)
             )
             if result[0]['[applied]']:
                 return True, old_item
             raise ConditionalCheckFailedException()
         else:
-            query_builder = self._append_insert_query(
-                table_info, attribute_map
+            self.__cluster_handler.execute_query(
+                self._bind_insert_query(table_info, attribute_map),
+                **self._get_write_options(table_info, consistency_level)
             )
-            self.__cluster_handler.execute_query("".join(query_builder),
-                                                 consistent=True)
             return True, old_item
 
+    def put_item_async(self, context, table_info, attribute_map,
+                       return_values=None, if_not_exist=False,
+                       expected_condition_map=None, consistency_level=None):
+        return_old = (
+            return_values is not None and return_values.type ==
+            models.InsertReturnValuesType.RETURN_VALUES_TYPE_ALL_OLD
+        )
+        if (if_not_exist or expected_condition_map or return_old or
+                table_info.schema.index_def_map):
+            # read-before-write and conditional puts are executed
+            # synchronously only
+            raise NotImplementedError()
+
+        return _map_future(
+            self.__cluster_handler.execute_query_async(
+                self._bind_insert_query(table_info, attribute_map),
+                **self._get_write_options(table_info, consistency_level)
+            ),
+            lambda rows: (True, {})
+        )
+
+    def _build_batch_statement(self, write_request_list):
+        statements = []
+
+        for table_info, write_request in write_request_list:
+            if write_request.is_put:
+                statements.append(
+                    self._bind_insert_query(
+                        table_info, write_request.attribute_map
+                    )
+                )
+            elif write_request.is_delete:
+                statements.append(
+                    self._bind_delete_query(
+                        table_info, write_request.attribute_map
+                    )
+                )
+
+        if len(statements) == 1:
+            return statements[0]
+
+        batch = cassandra_query.BatchStatement(
+            batch_type=cassandra_query.BatchType.UNLOGGED
+        )
+        for statement in statements:
+            batch.add(statement)
+        return batch
+
+    @classmethod
+    def _get_batch_write_options(cls, write_request_list):
+        """
+        Returns consistency options of batch of writes to the tables.
+        Batch is executed with the level of the tables if all of them
+        have the same write level, otherwise with level of write
+        operation profile
+        """
+        levels = set(table_info.schema.consistency_levels.write
+                     for table_info, _ in write_request_list)
+        if len(levels) == 1:
+            return cls._get_write_options(write_request_list[0][0])
+        return dict(consistent=True)
+
     def batch_write(self, context, write_request_list):
         for table_info, _ in write_request_list:
             if table_info.schema.index_def_map:
-                raise NotImplementedError(
-                    "Batch isn't supported for tables with indices"
-                )
+                return self.batch_write_async(context,
+                                              write_request_list).result()
 
-        query_builder = []
+        self.__cluster_handler.execute_query(
+            self._build_batch_statement(write_request_list),
+            **self._get_batch_write_options(write_request_list)
+        )
 
+    def batch_write_async(self, context, write_request_list):
+        plain_request_list = []
+        indexed_request_map = OrderedDict()
         for table_info, write_request in write_request_list:
-            if write_request.is_put:
-                self._append_insert_query(
-                    table_info, write_request.attribute_map,
-                    query_builder=query_builder
+            if table_info.schema.index_def_map:
+                indexed_request_map.setdefault(
+                    table_info.name, (table_info, [])
+                )[1].append(write_request)
+            else:
+                plain_request_list.append((table_info, write_request))
+
+        futures = [
+            self._batch_write_indexed_async(context, table_info,
+                                            table_request_list)
+            for table_info, table_request_list in (
+                indexed_request_map.itervalues())
+        ]
+        if plain_request_list:
+            futures.append(
+                self.__cluster_handler.execute_query_async(
+                    self._build_batch_statement(plain_request_list),
+                    **self._get_batch_write_options(plain_request_list)
                 )
-            elif write_request.is_delete:
-                self._append_delete_query(
-                    table_info, write_request.attribute_map,
-                    query_builder=query_builder
+            )
+
+        return _gather_futures(futures, lambda results: None)
+
+    def _batch_write_indexed_async(self, context, table_info,
+                                   write_request_list,
+                                   attempts=INDEXED_BATCH_WRITE_ATTEMPTS):
+        """
+        Writes items to the table with indices. Current index values of all
+        items are read at once, then item and index row mutations of each
+        partition are applied by single conditional batch. Batch checks
+        that index values weren't changed since they were read, otherwise
+        writing of partition items is repeated
+        """
+        index_attr_names = set(
+            index_def.alt_range_key_attr
+            for index_def in table_info.schema.index_def_map.itervalues()
+        )
+        read_future = self.select_items_async(
+            context, table_info,
+            [write_request.attribute_map
+             for write_request in write_request_list],
+            models.SelectType.specific_attributes(index_attr_names),
+            consistent=True
+        )
+
+        hash_name = table_info.schema.hash_key_name
+
+        def write(old_items):
+            partition_map = OrderedDict()
+            for write_request, old_indexes in zip(write_request_list,
+                                                  old_items):
+                query_builder = self._append_indexed_write_queries(
+                    table_info, write_request, old_indexes
                 )
-            query_builder.append(" ")
+                if query_builder:
+                    partition_map.setdefault(
+                        write_request.attribute_map[hash_name], []
+                    ).append((write_request, "".join(query_builder)))
+
+            partitions = partition_map.values()
+            batch_futures = [
+                self.__cluster_handler.execute_query_async(
+                    "".join((
+                        "BEGIN UNLOGGED BATCH ",
+                        " ".join(query for _, query in partition),
+                        " APPLY BATCH"
+                    )),
+                    **self._get_write_options(table_info, lwt=True)
+                )
+                for partition in partitions
+            ]
+
+            def retry_not_applied(results):
+                not_applied_request_list = [
+                    write_request
+                    for partition, rows in zip(partitions, results)
+                    if not rows[0]['[applied]']
+                    for write_request, _ in partition
+                ]
+                if not not_applied_request_list:
+                    future = Future()
+                    future.set_result(None)
+                    return future
+                if attempts <= 1:
+                    raise exception.BackendInteractionException(
+                        "Index values of items were changed concurrently "
+                        "during batch write"
+                    )
+                return self._batch_write_indexed_async(
+                    context, table_info, not_applied_request_list,
+                    attempts - 1
+                )
+
+            return _chain_future(
+                _gather_futures(batch_futures, lambda results: results),
+                retry_not_applied
+            )
 
-        if len(write_request_list) > 1:
-            query_builder.insert(0, 'BEGIN UNLOGGED BATCH ')
-            query_builder.append(' APPLY BATCH')
+        return _chain_future(read_future, write)
+
+    def _append_indexed_write_queries(self, table_info, write_request,
+                                      old_indexes, query_builder=None):
+        """
+        Appends queries which write item and its index rows to the table
+        with indices. Item row query is conditional on index values of the
+        item. Returns None if there is nothing to write
+        """
+        attribute_map = write_request.attribute_map
+        if write_request.is_put:
+            if old_indexes is None:
+                query_builder = self._append_insert_query(
+                    table_info, attribute_map, query_builder,
+                    if_not_exists=True
+                )
+                old_indexes = {}
+            else:
+                query_builder = self._append_update_query(
+                    table_info, attribute_map, query_builder, rewrite=True
+                )
+                self._append_index_value_conditions(
+                    table_info, old_indexes, query_builder
+                )
+            self._append_update_indexes_queries(
+                table_info, old_indexes, attribute_map, query_builder,
+                rewrite=True
+            )
+        elif old_indexes is not None:
+            query_builder = self._append_delete_query(
+                table_info, attribute_map, query_builder
+            )
+            self._append_index_value_conditions(
+                table_info, old_indexes, query_builder
+            )
+            self._append_update_indexes_queries(
+                table_info, old_indexes, attribute_map, query_builder
+            )
+        return query_builder
 
-        self.__cluster_handler.execute_query("".join(query_builder), True)
+    @staticmethod
+    def _append_index_value_conditions(table_info, old_indexes,
+                                       query_builder, if_prefix=" IF "):
+        _encode_predefined_attr_value = encode_predefined_attr_value
+        for index_def in table_info.schema.index_def_map.itervalues():
+            index_value = old_indexes.get(index_def.alt_range_key_attr, None)
+            query_builder += (
+                if_prefix, '"', USER_PREFIX,
+                index_def.alt_range_key_attr, '"=',
+                _encode_predefined_attr_value(index_value)
+                if index_value else "null"
+            )
+            if_prefix = " AND "
+        return query_builder
 
     @classmethod
     def _append_delete_query_with_basic_pk(
@@ -804,7 +1548,8 @@ class CassandraStorageDriver(StorageDriver):
     @classmethod
     def _append_delete_query(
             cls, table_info, attribute_map, query_builder=None,
-            index_name=None, index_value=None, expected_condition_map=None):
+            index_name=None, index_value=None, expected_condition_map=None,
+            json_attr_names=()):
         query_builder = cls._append_delete_query_with_basic_pk(
             table_info, attribute_map, query_builder)
 
@@ -815,43 +1560,133 @@ class CassandraStorageDriver(StorageDriver):
         if expected_condition_map:
             cls._append_expected_conditions(
                 expected_condition_map, table_info.schema,
-                query_builder
+                query_builder, json_attr_names=json_attr_names
             )
 
         return query_builder
 
-    def _select_current_index_values(
-            self, table_info, attribute_map):
-        query_builder = ["SELECT "]
-        prefix = ""
-        for index_def in table_info.schema.index_def_map.itervalues():
-            query_builder += (
-                prefix, '"', USER_PREFIX, index_def.alt_range_key_attr, '"'
-            )
-            prefix = ","
+    @staticmethod
+    def _build_prepared_delete_query(table_info, shape):
+        key_attr_names = table_info.schema.key_attributes
+        query_builder = deque(('DELETE FROM ', table_info.internal_name))
 
-        query_builder += (
-            ' FROM ', table_info.internal_name
-        )
+        prefix = " WHERE "
+        for key_attr in key_attr_names:
+            query_builder += (prefix, '"', USER_PREFIX, key_attr, '"=?')
+            prefix = " AND "
 
-        self._append_primary_key(table_info.schema, attribute_map,
-                                 query_builder)
-        self._append_index_extra_primary_key(query_builder, prefix=" AND ")
+        if table_info.schema.index_def_map:
+            CassandraStorageDriver._append_index_extra_primary_key(
+                query_builder
+            )
 
-        select_result = self.__cluster_handler.execute_query(
-            "".join(query_builder), consistent=False
+        return "".join(query_builder), key_attr_names
+
+    def _bind_delete_query(self, table_info, key_attribute_map):
+        query, key_attr_names = self._get_prepared_query(
+            table_info, PREPARED_QUERY_DELETE,
+            self._build_prepared_delete_query
         )
+        values = [
+            bind_predefined_attr_value(key_attribute_map[name])
+            for name in key_attr_names
+        ]
+        return self.__cluster_handler.bind_query(query, values)
 
-        if not select_result:
-            return None
+    @staticmethod
+    def _build_prepared_select_by_key_query(table_info, shape):
+        select_shape, with_range_key = shape
 
-        assert len(select_result) == 1
-        index_values = {}
+        schema = table_info.schema
+        key_attr_names = [schema.hash_key_name]
 
-        for cas_attr_name, cas_attr_value in select_result[0].iteritems():
-            if cas_attr_value:
-                attr_name = cas_attr_name[USER_PREFIX_LENGTH:]
-                attr_type = table_info.schema.attribute_type_map[
+        query_builder = deque(
+            (
+                "SELECT ",
+                'COUNT(*)' if select_shape == PREPARED_QUERY_SELECT_COUNT
+                else '*',
+                ' FROM ', table_info.internal_name,
+                ' WHERE "', USER_PREFIX, schema.hash_key_name, '"=?'
+            )
+        )
+
+        if schema.index_def_map:
+            if with_range_key:
+                CassandraStorageDriver._append_index_extra_primary_key(
+                    query_builder
+                )
+            else:
+                query_builder += (
+                    " AND ", SYSTEM_COLUMN_INDEX_NAME, "=",
+                    ENCODED_DEFAULT_STRING_VALUE
+                )
+
+        if with_range_key:
+            query_builder += (
+                ' AND "', USER_PREFIX, schema.range_key_name, '"=?'
+            )
+            key_attr_names.append(schema.range_key_name)
+
+        return "".join(query_builder), key_attr_names
+
+    def _get_select_by_key_query(self, table_info, hash_key_value,
+                                 range_key_value, select_type):
+        shape = (
+            PREPARED_QUERY_SELECT_COUNT if select_type.is_count else
+            PREPARED_QUERY_SELECT,
+            range_key_value is not None
+        )
+        query, _ = self._get_prepared_query(
+            table_info, shape, self._build_prepared_select_by_key_query
+        )
+
+        values = [bind_predefined_attr_value(hash_key_value)]
+        if range_key_value is not None:
+            values.append(bind_predefined_attr_value(range_key_value))
+
+        return query, values
+
+    def _select_item_by_key(self, table_info, hash_key_value,
+                            range_key_value, select_type, consistent):
+        query, values = self._get_select_by_key_query(
+            table_info, hash_key_value, range_key_value, select_type
+        )
+        return self.__cluster_handler.execute_prepared_query(
+            query, values, consistent
+        )
+
+    def _select_current_index_values(
+            self, table_info, attribute_map):
+        query_builder = ["SELECT "]
+        prefix = ""
+        for index_def in table_info.schema.index_def_map.itervalues():
+            query_builder += (
+                prefix, '"', USER_PREFIX, index_def.alt_range_key_attr, '"'
+            )
+            prefix = ","
+
+        query_builder += (
+            ' FROM ', table_info.internal_name
+        )
+
+        self._append_primary_key(table_info.schema, attribute_map,
+                                 query_builder)
+        self._append_index_extra_primary_key(query_builder, prefix=" AND ")
+
+        select_result = self.__cluster_handler.execute_query(
+            "".join(query_builder), consistent=False
+        )
+
+        if not select_result:
+            return None
+
+        assert len(select_result) == 1
+        index_values = {}
+
+        for cas_attr_name, cas_attr_value in select_result[0].iteritems():
+            if cas_attr_value:
+                attr_name = cas_attr_name[USER_PREFIX_LENGTH:]
+                attr_type = table_info.schema.attribute_type_map[
                     attr_name
                 ]
                 index_values[attr_name] = (
@@ -860,9 +1695,50 @@ class CassandraStorageDriver(StorageDriver):
                 )
         return index_values
 
+    @staticmethod
+    def _get_json_attr_names(row):
+        attrs = row.get(SYSTEM_COLUMN_EXTRA_ATTR_DATA) or {}
+        return frozenset(
+            name for name, value in attrs.iteritems()
+            if is_dynamic_attr_value_json(value)
+        )
+
+    def _select_json_attr_names(self, table_info, attribute_map,
+                                expected_condition_map, index_name=None,
+                                index_value=None):
+        """
+        Returns names of dynamic attributes compared by EQ expected
+        conditions, which are stored in JSON format of previous versions.
+        Row is read only if there are such conditions
+        """
+        schema = table_info.schema
+        if not expected_condition_map or not any(
+                cond.type == models.ExpectedCondition.CONDITION_TYPE_EQUAL
+                for attr_name, cond_list in
+                expected_condition_map.iteritems()
+                if attr_name not in schema.attribute_type_map
+                for cond in cond_list):
+            return frozenset()
+
+        query_builder = deque((
+            "SELECT ", SYSTEM_COLUMN_EXTRA_ATTR_DATA, " FROM ",
+            table_info.internal_name
+        ))
+        self._append_primary_key(schema, attribute_map, query_builder)
+        if schema.index_def_map:
+            self._append_index_extra_primary_key(query_builder, index_name,
+                                                 index_value)
+
+        rows = self.__cluster_handler.execute_query(
+            "".join(query_builder), consistent=True
+        )
+        if not rows:
+            return frozenset()
+        return self._get_json_attr_names(rows[0])
+
     @probe.Probe(__name__)
     def delete_item(self, context, table_info, key_attribute_map,
-                    expected_condition_map=None):
+                    expected_condition_map=None, consistency_level=None):
         """
         :param context: current request context
         :param table_info: TableInfo instance with table's meta information
@@ -872,6 +1748,9 @@ class CassandraStorageDriver(StorageDriver):
                     ExpectedCondition instance mapping. It provides
                     preconditions to make decision about should item be
                     deleted or not
+        :param consistency_level: name of consistency level of the request,
+                    overrides level set for the table. SERIAL and
+                    LOCAL_SERIAL define level of conditions
 
         :returns: True if operation performed, otherwise False (if operation
                     was skipped by out of date timestamp, it is considered as
@@ -880,16 +1759,24 @@ class CassandraStorageDriver(StorageDriver):
         :raises: BackendInteractionException
         """
 
+        if not (table_info.schema.index_def_map or expected_condition_map):
+            self.__cluster_handler.execute_query(
+                self._bind_delete_query(table_info, key_attribute_map),
+                **self._get_write_options(table_info, consistency_level)
+            )
+            return True
+
         delete_query = "".join(
             self._append_delete_query(
                 table_info, key_attribute_map,
-                expected_condition_map=expected_condition_map
+                expected_condition_map=expected_condition_map,
+                json_attr_names=self._select_json_attr_names(
+                    table_info, key_attribute_map, expected_condition_map
+                )
             )
         )
 
         if table_info.schema.index_def_map:
-            _encode_predefined_attr_value = encode_predefined_attr_value
-
             while True:
                 old_indexes = self._select_current_index_values(
                     table_info, key_attribute_map
@@ -903,20 +1790,10 @@ class CassandraStorageDriver(StorageDriver):
                     return True
 
                 query_builder = deque((delete_query,))
-                if_prefix = " AND " if expected_condition_map else " IF "
-                for index_name, index_def in (
-                        table_info.schema.index_def_map.iteritems()):
-                    index_value = old_indexes.get(
-                        index_def.alt_range_key_attr, None
-                    )
-                    query_builder += (
-                        if_prefix, '"', USER_PREFIX,
-                        index_def.alt_range_key_attr, '"=',
-                        _encode_predefined_attr_value(index_value)
-                        if index_value
-                        else "null"
-                    )
-                    if_prefix = " AND "
+                self._append_index_value_conditions(
+                    table_info, old_indexes, query_builder,
+                    " AND " if expected_condition_map else " IF "
+                )
 
                 qb_len = len(query_builder)
 
@@ -928,7 +1805,9 @@ class CassandraStorageDriver(StorageDriver):
                     query_builder.appendleft('BEGIN UNLOGGED BATCH ')
                     query_builder.append(' APPLY BATCH')
                 result = self.__cluster_handler.execute_query(
-                    "".join(query_builder), consistent=True
+                    "".join(query_builder),
+                    **self._get_write_options(table_info, consistency_level,
+                                              lwt=True)
                 )
 
                 if result[0]['[applied]']:
@@ -945,12 +1824,31 @@ class CassandraStorageDriver(StorageDriver):
                     # expected condition wasn't passed
                     raise ConditionalCheckFailedException()
         else:
-            result = self.__cluster_handler.execute_query(delete_query,
-                                                          consistent=True)
+            result = self.__cluster_handler.execute_query(
+                delete_query,
+                **self._get_write_options(
+                    table_info, consistency_level,
+                    lwt=bool(expected_condition_map)
+                )
+            )
             if result and not result[0]['[applied]']:
                 raise ConditionalCheckFailedException()
             return True
 
+    def delete_item_async(self, context, table_info, key_attribute_map,
+                          expected_condition_map=None,
+                          consistency_level=None):
+        if table_info.schema.index_def_map or expected_condition_map:
+            raise NotImplementedError()
+
+        return _map_future(
+            self.__cluster_handler.execute_query_async(
+                self._bind_delete_query(table_info, key_attribute_map),
+                **self._get_write_options(table_info, consistency_level)
+            ),
+            lambda rows: True
+        )
+
     @staticmethod
     def _compact_indexed_condition(cond_list):
         left_condition = None
@@ -1028,6 +1926,19 @@ class CassandraStorageDriver(StorageDriver):
 
         return [right_condition]
 
+    @staticmethod
+    def _is_exact_key_condition(hash_key_cond_list, range_condition_list):
+        if not hash_key_cond_list or len(hash_key_cond_list) != 1 or (
+                hash_key_cond_list[0].type !=
+                models.IndexedCondition.CONDITION_TYPE_EQUAL):
+            return False
+        if not range_condition_list:
+            return True
+        return len(range_condition_list) == 1 and (
+            range_condition_list[0].type ==
+            models.IndexedCondition.CONDITION_TYPE_EQUAL
+        )
+
     def _append_indexed_condition(self, attr_name, condition, query_builder,
                                   column_prefix=USER_PREFIX):
         if query_builder is None:
@@ -1058,7 +1969,8 @@ class CassandraStorageDriver(StorageDriver):
 
     @classmethod
     def _append_expected_conditions(cls, expected_condition_map, schema,
-                                    query_builder, prefix=" IF "):
+                                    query_builder, prefix=" IF ",
+                                    json_attr_names=()):
         if query_builder is None:
             query_builder = deque()
         for attr_name, cond_list in expected_condition_map.iteritems():
@@ -1066,14 +1978,15 @@ class CassandraStorageDriver(StorageDriver):
                 query_builder.append(prefix)
                 cls._append_expected_condition(
                     attr_name, condition, query_builder,
-                    attr_name in schema.attribute_type_map
+                    attr_name in schema.attribute_type_map,
+                    attr_name in json_attr_names
                 )
                 prefix = " AND "
         return query_builder
 
     @staticmethod
     def _append_expected_condition(attr, condition, query_builder,
-                                   is_predefined):
+                                   is_predefined, is_json=False):
         if query_builder is None:
             query_builder = deque()
 
@@ -1092,9 +2005,13 @@ class CassandraStorageDriver(StorageDriver):
                     encode_predefined_attr_value(condition.arg)
                 )
             else:
+                # value is compared with the encoding it is stored in, IN
+                # isn't supported by conditions of Cassandra 2.0
+                encode = (encode_dynamic_attr_value_json if is_json else
+                          encode_dynamic_attr_value)
                 query_builder += (
                     SYSTEM_COLUMN_EXTRA_ATTR_DATA, "['", attr, "']=",
-                    encode_dynamic_attr_value(condition.arg)
+                    encode(condition.arg)
                 )
         else:
             assert False
@@ -1146,9 +2063,202 @@ class CassandraStorageDriver(StorageDriver):
 
         return query_builder
 
+    @staticmethod
+    def _is_collection_update(table_info, attr_name, attr_action):
+        attr_type = table_info.schema.attribute_type_map.get(attr_name)
+        return (
+            attr_type is not None and attr_type.collection_type is not None and
+            attr_action.value is not None and attr_action.action in (
+                models.UpdateItemAction.UPDATE_ACTION_ADD,
+                models.UpdateItemAction.UPDATE_ACTION_DELETE
+            )
+        )
+
+    @classmethod
+    def _is_blind_update(cls, table_info, attribute_action_map,
+                         expected_condition_map, return_values):
+        """
+        Checks if update can be performed by single UPDATE query without
+        reading of the current item. It is possible if new attribute values
+        don't depend on old ones or are computed by Cassandra (collection
+        ADD and DELETE for predefined attributes) and the old item isn't
+        required to check conditions, to maintain indexes or to be returned
+        """
+        if (not attribute_action_map or expected_condition_map or
+                table_info.schema.index_def_map):
+            return False
+
+        if (return_values is not None and return_values.type !=
+                models.UpdateReturnValuesType.RETURN_VALUES_TYPE_NONE):
+            return False
+
+        for attr_name, attr_action in attribute_action_map.iteritems():
+            if attr_action.action == models.UpdateItemAction.UPDATE_ACTION_PUT:
+                continue
+            if (attr_action.action ==
+                    models.UpdateItemAction.UPDATE_ACTION_DELETE and
+                    attr_action.value is None):
+                continue
+            if cls._is_collection_update(table_info, attr_name, attr_action):
+                continue
+            return False
+        return True
+
+    @staticmethod
+    def _validate_collection_update(table_info, attr_name, attr_action):
+        attr_type = table_info.schema.attribute_type_map[attr_name]
+        value_type = attr_action.value.attr_type
+        if (attr_action.action ==
+                models.UpdateItemAction.UPDATE_ACTION_DELETE and
+                attr_type.collection_type ==
+                models.AttributeType.COLLECTION_TYPE_MAP):
+            # keys to delete from map are given as set
+            if (value_type.collection_type !=
+                    models.AttributeType.COLLECTION_TYPE_SET or
+                    value_type.element_type != attr_type.key_type):
+                raise InvalidQueryParameter("Wrong type for %s" % attr_name)
+        elif value_type != attr_type:
+            raise InvalidQueryParameter("Wrong type for %s" % attr_name)
+
+    def _append_blind_update_query(self, table_info, key_attribute_map,
+                                   attribute_action_map, query_builder=None):
+        """
+        Builds UPDATE query which performs given actions without conditions.
+        Key attributes are marked as existing if any attribute is put or
+        added, so the item is created if it doesn't exist yet
+        """
+        if query_builder is None:
+            query_builder = deque()
+
+        _encode_predefined_attr_value = encode_predefined_attr_value
+        _encode_dynamic_attr_value = encode_dynamic_attr_value
+
+        schema = table_info.schema
+
+        query_builder += (
+            'UPDATE ', table_info.internal_name, ' SET '
+        )
+
+        set_prefix = ""
+        item_put = False
+
+        for name, attr_action in attribute_action_map.iteritems():
+            val = attr_action.value
+            if self._is_collection_update(table_info, name, attr_action):
+                self._validate_collection_update(table_info, name,
+                                                 attr_action)
+                attr_type = schema.attribute_type_map[name]
+                if (attr_action.action ==
+                        models.UpdateItemAction.UPDATE_ACTION_ADD):
+                    query_builder += (
+                        set_prefix, '"', USER_PREFIX, name, '"="',
+                        USER_PREFIX, name, '"+',
+                        _encode_predefined_attr_value(val), ",",
+                        SYSTEM_COLUMN_ATTR_EXIST, "['", name, "']=1"
+                    )
+                    item_put = True
+                elif (attr_type.collection_type ==
+                        models.AttributeType.COLLECTION_TYPE_MAP):
+                    # Cassandra 2.0 has no map - set operator, map entries
+                    # are deleted by key
+                    for key in val.decoded_value:
+                        query_builder += (
+                            set_prefix, '"', USER_PREFIX, name, '"[',
+                            _encode_predefined_attr_value(
+                                models.AttributeValue(attr_type.key_type,
+                                                      decoded_value=key)
+                            ),
+                            "]=null"
+                        )
+                        set_prefix = ","
+                else:
+                    query_builder += (
+                        set_prefix, '"', USER_PREFIX, name, '"="',
+                        USER_PREFIX, name, '"-',
+                        _encode_predefined_attr_value(val)
+                    )
+                set_prefix = ","
+                continue
+
+            if name in schema.attribute_type_map:
+                query_builder += (
+                    set_prefix, '"', USER_PREFIX, name, '"=',
+                    _encode_predefined_attr_value(val)
+                )
+            elif val is None:
+                query_builder += (
+                    set_prefix,
+                    SYSTEM_COLUMN_EXTRA_ATTR_DATA, "['", name, "']=null,",
+                    SYSTEM_COLUMN_EXTRA_ATTR_TYPES, "['", name, "']=null"
+                )
+            else:
+                query_builder += (
+                    set_prefix,
+                    SYSTEM_COLUMN_EXTRA_ATTR_DATA, "['", name, "']=",
+                    _encode_dynamic_attr_value(val), ",",
+                    SYSTEM_COLUMN_EXTRA_ATTR_TYPES, "['", name, "']='",
+                    val.attr_type.type, "'"
+                )
+            query_builder += (
+                ",", SYSTEM_COLUMN_ATTR_EXIST, "['", name, "']=",
+                "null" if val is None else "1"
+            )
+            set_prefix = ","
+            item_put = item_put or val is not None
+
+        if item_put:
+            for name in schema.key_attributes:
+                if name:
+                    query_builder += (
+                        ",", SYSTEM_COLUMN_ATTR_EXIST, "['", name, "']=1"
+                    )
+
+        self._append_primary_key(schema, key_attribute_map, query_builder)
+
+        return query_builder
+
+    @classmethod
+    def _append_counter_update_query(cls, table_info, key_attribute_map,
+                                     attribute_action_map, query_builder=None):
+        if query_builder is None:
+            query_builder = deque()
+
+        schema = table_info.schema
+
+        query_builder += (
+            'UPDATE ', table_info.internal_name, ' SET '
+        )
+
+        set_prefix = ""
+        for name, attr_action in attribute_action_map.iteritems():
+            if (attr_action.action !=
+                    models.UpdateItemAction.UPDATE_ACTION_ADD or
+                    name not in schema.counter_attributes):
+                raise exception.ValidationError(
+                    "Only ADD action for counter attributes is allowed "
+                    "for counter table, got %(action)s for '%(attr_name)s'",
+                    action=attr_action.action, attr_name=name
+                )
+            increment = attr_action.value.decoded_value
+            if increment != int(increment):
+                raise exception.ValidationError(
+                    "Increment of counter attribute '%(attr_name)s' should "
+                    "be integer", attr_name=name
+                )
+            increment = int(increment)
+            query_builder += (
+                set_prefix, '"', USER_PREFIX, name, '"="', USER_PREFIX, name,
+                '"', "+" if increment >= 0 else "-", str(abs(increment))
+            )
+            set_prefix = ","
+
+        cls._append_primary_key(schema, key_attribute_map, query_builder)
+        return query_builder
+
     @probe.Probe(__name__)
     def update_item(self, context, table_info, key_attribute_map,
-                    attribute_action_map, expected_condition_map={}):
+                    attribute_action_map, expected_condition_map={},
+                    return_values=None, consistency_level=None):
         """
         :param context: current request context
         :param table_info: TableInfo instance with table's meta information
@@ -1161,14 +2271,51 @@ class CassandraStorageDriver(StorageDriver):
             ExpectedCondition instance mapping. It provides
             preconditions to make decision about should item be updated
             or not
+        :param return_values: model that defines what values should be
+            returned
+        :param consistency_level: name of consistency level of the request,
+            overrides level set for the table. SERIAL and LOCAL_SERIAL
+            define level of conditions
         :returns: True if operation performed, otherwise False
         :raises: BackendInteractionException
         """
         attribute_action_map = attribute_action_map or {}
 
+        if table_info.schema.counter_attributes:
+            # counters are incremented atomically by Cassandra, but can't
+            # be changed by lightweight transactions
+            if expected_condition_map or (
+                    return_values is not None and return_values.type !=
+                    models.UpdateReturnValuesType.RETURN_VALUES_TYPE_NONE):
+                raise exception.ValidationError(
+                    "Expected conditions and return values aren't "
+                    "supported for counter tables"
+                )
+            if attribute_action_map:
+                self.__cluster_handler.execute_query(
+                    "".join(self._append_counter_update_query(
+                        table_info, key_attribute_map, attribute_action_map
+                    )),
+                    **self._get_write_options(table_info, consistency_level)
+                )
+            return True, None
+
+        if self._is_blind_update(table_info, attribute_action_map,
+                                 expected_condition_map, return_values):
+            # new values don't depend on the current item, so it isn't read
+            # and the update is written without lightweight transaction
+            self.__cluster_handler.execute_query(
+                "".join(self._append_blind_update_query(
+                    table_info, key_attribute_map, attribute_action_map
+                )),
+                **self._get_write_options(table_info, consistency_level)
+            )
+            return True, None
+
         while True:
-            old_item = self._get_item_to_update(context, table_info,
-                                                key_attribute_map)
+            old_item, json_attr_names = self._get_item_to_update(
+                context, table_info, key_attribute_map
+            )
             if not self._conditions_satisfied(old_item,
                                               expected_condition_map):
                 raise ConditionalCheckFailedException()
@@ -1189,8 +2336,8 @@ class CassandraStorageDriver(StorageDriver):
                     # ignore DELETE action only update_item request for
                     # non-existent item
                     return True, old_item
-                if self._put_item_if_not_exists(table_info,
-                                                attribute_map):
+                if self._put_item_if_not_exists(table_info, attribute_map,
+                                                consistency_level):
                     return True, old_item
             else:
                 attribute_map = key_attribute_map.copy()
@@ -1215,7 +2362,8 @@ class CassandraStorageDriver(StorageDriver):
 
                 query_builder = self._append_update_query(
                     table_info, attribute_map,
-                    expected_condition_map=update_conditions
+                    expected_condition_map=update_conditions,
+                    json_attr_names=json_attr_names
                 )
 
                 if table_info.schema.index_def_map:
@@ -1234,7 +2382,9 @@ class CassandraStorageDriver(StorageDriver):
                         query_builder.append(' APPLY BATCH')
 
                 result = self.__cluster_handler.execute_query(
-                    "".join(query_builder), consistent=True
+                    "".join(query_builder),
+                    **self._get_write_options(table_info, consistency_level,
+                                              lwt=True)
                 )
 
                 if result and not result[0]['[applied]']:
@@ -1242,23 +2392,30 @@ class CassandraStorageDriver(StorageDriver):
                 return True, old_item
 
     def _get_item_to_update(self, context, table_info, key_attribute_map):
+        """
+        Reads current item by consistent read
+
+        :returns: tuple of the item or None if it doesn't exist and names
+                    of its dynamic attributes stored in JSON format of
+                    previous versions, they are compared in conditions of
+                    the update in the same format
+        """
         hash_key_value = key_attribute_map.get(
             table_info.schema.hash_key_name, None
         )
         range_key_value = key_attribute_map.get(
             table_info.schema.range_key_name, None
         )
-        hash_condition_list = [models.IndexedCondition.eq(hash_key_value)]
-        range_condition_list = None if range_key_value is None else [
-            models.IndexedCondition.eq(range_key_value)
-        ]
 
-        items = self.select_item(
-            context, table_info, hash_condition_list,
-            range_condition_list, select_type=models.SelectType.all(),
-            consistent=True
-        ).items
-        return items[0] if items else None
+        rows = self._select_item_by_key(
+            table_info, hash_key_value, range_key_value,
+            models.SelectType.all(),
+            self._get_read_consistency(table_info, True)
+        )
+        if not rows:
+            return None, frozenset()
+        return (self._decode_row(table_info, rows[0]),
+                self._get_json_attr_names(rows[0]))
 
     def _get_del_attr_value(self, attr_name, attr_value, old_item):
         # We have no value, just remove an attr
@@ -1369,7 +2526,7 @@ class CassandraStorageDriver(StorageDriver):
         :param exclusive_start_key: key attribute names to AttributeValue
                     instance
         :param consistent: define is operation consistent or not (by default it
-                    is not consistent)
+                    is not consistent) or name of consistency level
         :param order_type: defines order of returned rows, if 'None' - default
                     order will be used
 
@@ -1377,25 +2534,175 @@ class CassandraStorageDriver(StorageDriver):
 
         :raises: BackendInteractionException
         """
-
-        query_builder = deque(
-            (
-                "SELECT ", 'COUNT(*)' if select_type.is_count else '*',
-                ' FROM ', table_info.internal_name
+        consistent = self._get_read_consistency(table_info, consistent)
+
+        if index_name is None and not (
+                limit or order_type or exclusive_start_key) and (
+                self._is_exact_key_condition(
+                    hash_key_condition_list,
+                    range_key_to_query_condition_list)):
+            rows = self._select_item_by_key(
+                table_info, hash_key_condition_list[0].arg,
+                range_key_to_query_condition_list[0].arg
+                if range_key_to_query_condition_list else None,
+                select_type, consistent
+            )
+        else:
+            query = self._build_select_query(
+                table_info, hash_key_condition_list,
+                range_key_to_query_condition_list, select_type, index_name,
+                limit, exclusive_start_key, order_type
             )
+            rows = (
+                self.__cluster_handler.execute_query(query, consistent)
+                if query else []
+            )
+
+        if not self._is_fetch_needed(table_info, index_name, select_type):
+            return self._build_select_result(table_info, rows, select_type,
+                                             index_name, limit)
+
+        result = self._build_select_result(
+            table_info, rows, models.SelectType.all(), index_name, limit
         )
+        self._fetch_items(context, table_info, result.items,
+                          select_type.attributes, consistent)
+        if select_type.attributes:
+            for item in result.items:
+                self._filter_attributes(item, select_type.attributes)
+        return result
+
+    def select_item_stream(self, context, table_info,
+                           hash_key_condition_list,
+                           range_key_to_query_condition_list, select_type,
+                           index_name=None, limit=None,
+                           exclusive_start_key=None, consistent=True,
+                           order_type=None):
+        assert not select_type.is_count
+        consistent = self._get_read_consistency(table_info, consistent)
+
+        result = models.ScanResultStream()
+        result.items = self._iter_select(
+            result, context, table_info, hash_key_condition_list,
+            range_key_to_query_condition_list, select_type, index_name,
+            limit, exclusive_start_key, consistent, order_type
+        )
+        return result
+
+    def _iter_select(self, result, context, table_info,
+                     hash_key_condition_list,
+                     range_key_to_query_condition_list, select_type,
+                     index_name, limit, exclusive_start_key, consistent,
+                     order_type):
+        query = self._build_select_query(
+            table_info, hash_key_condition_list,
+            range_key_to_query_condition_list, select_type, index_name,
+            limit, exclusive_start_key, order_type
+        )
+        if query is None:
+            return
+
+        rows = self.__cluster_handler.execute_query_paged(
+            query, consistent, self.__fetch_size
+        )
+        attributes_to_get = None
+        if self._is_fetch_needed(table_info, index_name, select_type):
+            items = self._iter_fetch_items(context, table_info, rows,
+                                           select_type.attributes,
+                                           consistent)
+            attributes_to_get = select_type.attributes
+        else:
+            projection = self._get_attributes_to_get(table_info, select_type,
+                                                     index_name)
+            items = (
+                self._decode_row(table_info, row, projection)
+                for row in rows
+            )
+
+        for item in items:
+            result.count += 1
+            result.scanned_count += 1
+            if result.count == limit:
+                result.last_evaluated_key = self._get_item_key(
+                    table_info, item, index_name
+                )
+            if attributes_to_get:
+                self._filter_attributes(item, attributes_to_get)
+            yield item
 
-        hash_name = table_info.schema.key_attributes[0]
+    @classmethod
+    def _is_fetch_needed(cls, table_info, index_name, select_type):
+        """
+        Checks if attributes to select are missing in index rows, so they
+        have to be read from item rows
+        """
+        if (index_name is None or select_type.is_count or
+                select_type.is_all_projected):
+            return False
+        row_attributes = cls._get_index_row_attributes(table_info,
+                                                       index_name)
+        if row_attributes is None:
+            return False
+        return (select_type.attributes is None or
+                not row_attributes.issuperset(select_type.attributes))
 
-        range_name = (
-            table_info.schema.key_attributes[1]
-            if len(table_info.schema.key_attributes) > 1
-            else None
+    def _fetch_items(self, context, table_info, items, attributes_to_get,
+                     consistent):
+        """
+        Completes items read from index rows with attributes of item rows.
+        Items are updated in place
+        """
+        if not items:
+            return items
+        select_type = (
+            models.SelectType.all() if attributes_to_get is None else
+            models.SelectType.specific_attributes(attributes_to_get)
         )
+        table_items = self.select_items_async(
+            context, table_info, items, select_type, consistent
+        ).result()
+        for item, table_item in zip(items, table_items):
+            if table_item:
+                item.update(table_item)
+        return items
+
+    def _iter_fetch_items(self, context, table_info, rows, attributes_to_get,
+                          consistent):
+        """
+        The same as _fetch_items but yields items while Cassandra result
+        pages are fetched, item rows are read by fetch_size chunks
+        """
+        rows = iter(rows)
+        while True:
+            items = [
+                self._decode_row(table_info, row)
+                for row in itertools.islice(rows, self.__fetch_size)
+            ]
+            if not items:
+                return
+            for item in self._fetch_items(context, table_info, items,
+                                          attributes_to_get, consistent):
+                yield item
 
-        indexed_attr_name = table_info.schema.index_def_map[
-            index_name
-        ].alt_range_key_attr if index_name else None
+    @staticmethod
+    def _filter_attributes(item, attributes_to_get):
+        for attr in item.keys():
+            if attr not in attributes_to_get:
+                del item[attr]
+        return item
+
+    def _build_select_query(self, table_info, hash_key_condition_list,
+                            range_key_to_query_condition_list, select_type,
+                            index_name=None, limit=None,
+                            exclusive_start_key=None, order_type=None):
+        """
+        Builds CQL query for select_item
+
+        :returns: CQL query string or None if it is known that query result
+                    is empty
+        """
+        plan = self._get_select_query_plan(table_info)
+        index_plan = plan.index_plan_map[index_name] if index_name else None
 
         hash_key_cond_list = []
         index_attr_cond_list = []
@@ -1404,7 +2711,7 @@ class CassandraStorageDriver(StorageDriver):
         if hash_key_condition_list is not None:
             hash_key_cond_list.extend(hash_key_condition_list)
         if range_key_to_query_condition_list is not None:
-            if index_name is not None:
+            if index_plan is not None:
                 index_attr_cond_list.extend(range_key_to_query_condition_list)
             else:
                 range_condition_list.extend(range_key_to_query_condition_list)
@@ -1413,18 +2720,18 @@ class CassandraStorageDriver(StorageDriver):
         if exclusive_start_key:
             exclusive_start_key_copy = exclusive_start_key.copy()
             exclusive_hash_key_value = exclusive_start_key_copy.pop(
-                hash_name, None
+                plan.hash_name, None
             )
             if exclusive_hash_key_value:
                 hash_key_cond_list.append(
                     models.IndexedCondition.eq(exclusive_hash_key_value)
-                    if range_name else
+                    if plan.range_name else
                     models.IndexedCondition.gt(exclusive_hash_key_value)
                 )
 
-            if index_name:
+            if index_plan is not None:
                 exclusive_indexed_value = exclusive_start_key_copy.pop(
-                    indexed_attr_name
+                    index_plan.attr_name
                 )
                 index_attr_cond_list.append(
                     models.IndexedCondition.le(exclusive_indexed_value)
@@ -1432,9 +2739,9 @@ class CassandraStorageDriver(StorageDriver):
                     models.IndexedCondition.ge(exclusive_indexed_value)
                 )
 
-            if range_name:
+            if plan.range_name:
                 exclusive_range_value = exclusive_start_key_copy.pop(
-                    range_name
+                    plan.range_name
                 )
 
                 range_condition_list.append(
@@ -1444,197 +2751,299 @@ class CassandraStorageDriver(StorageDriver):
                 )
             assert not exclusive_start_key_copy
 
-        request_needed = True
+        # conditions which can't be satisfied at the same time make result
+        # empty, so query isn't sent to Cassandra at all
         if hash_key_cond_list:
             hash_key_cond_list = self._compact_indexed_condition(
                 hash_key_cond_list
             )
             if not hash_key_cond_list:
-                request_needed = False
-        if request_needed and range_condition_list:
+                return None
+        if range_condition_list:
             range_condition_list = self._compact_indexed_condition(
                 range_condition_list
             )
             if not range_condition_list:
-                request_needed = False
-        if request_needed and index_attr_cond_list:
+                return None
+        if index_attr_cond_list:
             index_attr_cond_list = self._compact_indexed_condition(
                 index_attr_cond_list
             )
             if not index_attr_cond_list:
-                request_needed = False
+                return None
 
-        if request_needed:
-            prefix = " WHERE "
+        if select_type.is_count:
+            columns = 'COUNT(*)'
+        elif index_plan is not None and select_type.is_all_projected:
+            columns = index_plan.projected_columns
+        else:
+            columns = self._get_select_columns(
+                table_info, select_type.attributes,
+                (index_plan.attr_name,) if index_plan is not None else ()
+            )
 
-            if hash_key_cond_list:
-                for cond in hash_key_cond_list:
-                    query_builder.append(prefix)
-                    self._append_hash_key_indexed_condition(
-                        hash_name, cond, query_builder
-                    )
-                    prefix = " AND "
+        query_builder = deque(("SELECT ", columns, plan.from_clause))
 
-            if table_info.schema.index_def_map:
-                # append local secondary index related attrs
-                local_indexes_conditions = {
-                    SYSTEM_COLUMN_INDEX_NAME: [
-                        models.IndexedCondition.eq(
-                            models.AttributeValue(
-                                'S', decoded_value=index_name
-                            ) if index_name else DEFAULT_STRING_VALUE
-                        )
-                    ],
-                    SYSTEM_COLUMN_INDEX_VALUE_STRING: [],
-                    SYSTEM_COLUMN_INDEX_VALUE_NUMBER: [],
-                    SYSTEM_COLUMN_INDEX_VALUE_BLOB: []
-                }
+        prefix = " WHERE "
 
-                default_index_values = [
-                    DEFAULT_STRING_VALUE,
-                    DEFAULT_NUMBER_VALUE,
-                    DEFAULT_BLOB_VALUE
-                ]
-                if index_attr_cond_list:
-                    indexed_attr_type = table_info.schema.attribute_type_map[
-                        indexed_attr_name
-                    ]
-                    n = INDEX_TYPE_TO_INDEX_POS_MAP[indexed_attr_type]
-                    for i in xrange(1, n):
-                        local_indexes_conditions[
-                            LOCAL_INDEX_FIELD_LIST[i]
-                        ].append(
-                            models.IndexedCondition.eq(
-                                default_index_values[i - 1]
-                            )
-                        )
-                    for index_attr_cond in index_attr_cond_list:
-                        local_indexes_conditions[
-                            LOCAL_INDEX_FIELD_LIST[n]
-                        ].append(index_attr_cond)
-
-                    if range_condition_list:
-                        for i in xrange(n + 1, len(LOCAL_INDEX_FIELD_LIST)):
-                            local_indexes_conditions[
-                                LOCAL_INDEX_FIELD_LIST[i]
-                            ].append(
-                                models.IndexedCondition.lt(
-                                    default_index_values[i - 1]
-                                )
-                                if order_type == models.ORDER_TYPE_DESC else
-                                models.IndexedCondition.gt(
-                                    default_index_values[i - 1]
-                                )
-                            )
-                elif range_condition_list:
-                    for i in xrange(1, len(LOCAL_INDEX_FIELD_LIST)):
-                            local_indexes_conditions[
-                                LOCAL_INDEX_FIELD_LIST[i]
-                            ].append(
-                                models.IndexedCondition.eq(
-                                    default_index_values[i - 1]
-                                )
-                            )
-
-                if local_indexes_conditions:
-                    for cas_field_name, cond_list in (
-                            local_indexes_conditions.iteritems()):
-                        for cond in cond_list:
-                            query_builder.append(prefix)
-                            self._append_indexed_condition(
-                                cas_field_name, cond, query_builder,
-                                column_prefix=""
-                            )
-                            prefix = " AND "
+        for cond in hash_key_cond_list:
+            query_builder.append(prefix)
+            self._append_hash_key_indexed_condition(
+                plan.hash_name, cond, query_builder
+            )
+            prefix = " AND "
+
+        # append local secondary index related conditions
+        if index_plan is None:
+            static_conditions = (
+                plan.item_row_range_conditions if range_condition_list else
+                plan.item_row_conditions
+            )
+        elif index_attr_cond_list:
+            static_conditions = index_plan.value_conditions
+        else:
+            static_conditions = index_plan.row_conditions
+
+        for cond in static_conditions:
+            query_builder += (prefix, cond)
+            prefix = " AND "
+
+        if index_attr_cond_list:
+            for cond in index_attr_cond_list:
+                query_builder.append(prefix)
+                self._append_indexed_condition(
+                    index_plan.value_column, cond, query_builder,
+                    column_prefix=""
+                )
+                prefix = " AND "
 
             if range_condition_list:
-                for cond in range_condition_list:
-                    query_builder.append(prefix)
-                    self._append_indexed_condition(
-                        range_name, cond, query_builder
-                    )
-                    prefix = " AND "
+                for cond in (index_plan.desc_tail_conditions
+                             if order_type == models.ORDER_TYPE_DESC else
+                             index_plan.asc_tail_conditions):
+                    query_builder += (prefix, cond)
+
+        for cond in range_condition_list:
+            query_builder.append(prefix)
+            self._append_indexed_condition(
+                plan.range_name, cond, query_builder
+            )
+            prefix = " AND "
 
-            # add ordering
-            if order_type:
-                query_builder.append(' ORDER BY ')
-                if table_info.schema.index_def_map:
-                    query_builder += (
-                        SYSTEM_COLUMN_INDEX_NAME, " ", order_type
-                    )
-                elif range_name:
-                    query_builder += (
-                        '"', USER_PREFIX, range_name, '" ', order_type
-                    )
-                else:
-                    assert False
+        # add ordering
+        if order_type:
+            assert plan.order_clause is not None
+            query_builder += (plan.order_clause, order_type)
+
+        # add limit
+        if limit:
+            query_builder += (" LIMIT ", str(limit))
+
+        if not hash_key_cond_list or (
+                hash_key_cond_list[0].type !=
+                models.IndexedCondition.CONDITION_TYPE_EQUAL):
+            query_builder.append(" ALLOW FILTERING")
+
+        return "".join(query_builder)
+
+    def select_item_async(self, context, table_info, hash_key_condition_list,
+                          range_key_to_query_condition_list, select_type,
+                          index_name=None, limit=None,
+                          exclusive_start_key=None, consistent=True,
+                          order_type=None):
+        if index_name or limit or order_type or exclusive_start_key or (
+                not self._is_exact_key_condition(
+                    hash_key_condition_list,
+                    range_key_to_query_condition_list)):
+            # only single item lookup by primary key is supported
+            raise NotImplementedError()
+        consistent = self._get_read_consistency(table_info, consistent)
+
+        query, values = self._get_select_by_key_query(
+            table_info, hash_key_condition_list[0].arg,
+            range_key_to_query_condition_list[0].arg
+            if range_key_to_query_condition_list else None,
+            select_type
+        )
+        return _map_future(
+            self.__cluster_handler.execute_query_async(
+                self.__cluster_handler.bind_query(query, values), consistent
+            ),
+            lambda rows: self._build_select_result(table_info, rows,
+                                                   select_type)
+        )
 
-            # add limit
-            if limit:
-                query_builder += (" LIMIT ", str(limit))
+    def select_items_async(self, context, table_info, key_attribute_map_list,
+                           select_type, consistent=True):
+        if select_type.is_count:
+            raise NotImplementedError()
+        consistent = self._get_read_consistency(table_info, consistent)
+
+        schema = table_info.schema
+        key_attr_names = schema.key_attributes
+        key_list = [
+            tuple(key_attribute_map[name] for name in key_attr_names)
+            for key_attribute_map in key_attribute_map_list
+        ]
 
-            if not hash_key_cond_list or (
-                    hash_key_cond_list[0].type !=
-                    models.IndexedCondition.CONDITION_TYPE_EQUAL):
-                query_builder.append(" ALLOW FILTERING")
+        # keys of the same partition are read by single query
+        partition_map = OrderedDict()
+        for key in key_list:
+            partition_keys = partition_map.setdefault(key[0], OrderedDict())
+            partition_keys[key] = None
 
-            rows = self.__cluster_handler.execute_query(
-                "".join(query_builder), consistent
-            )
+        columns = self._get_select_columns(table_info,
+                                           select_type.attributes)
+        query_prefix = "SELECT {} FROM {} WHERE ".format(
+            columns, table_info.internal_name
+        )
+        queries = []
+        if schema.range_key_name is None:
+            hash_keys = [
+                encode_predefined_attr_value(hash_key)
+                for hash_key in partition_map
+            ]
+            fan_out = self.__batch_get_fan_out
+            for i in xrange(0, len(hash_keys), fan_out):
+                queries.append("".join((
+                    query_prefix, '"', USER_PREFIX, schema.hash_key_name,
+                    '" IN (', ",".join(hash_keys[i:i + fan_out]), ")"
+                )))
         else:
-            rows = []
+            for hash_key, partition_keys in partition_map.iteritems():
+                query_builder = deque((
+                    query_prefix, '"', USER_PREFIX, schema.hash_key_name,
+                    '"=', encode_predefined_attr_value(hash_key)
+                ))
+                if schema.index_def_map:
+                    self._append_index_extra_primary_key(query_builder)
+                query_builder += (
+                    ' AND "', USER_PREFIX, schema.range_key_name, '" IN (',
+                    ",".join(encode_predefined_attr_value(key[1])
+                             for key in partition_keys),
+                    ")"
+                )
+                queries.append("".join(query_builder))
 
-        if select_type.is_count:
-            count = rows[0]['count'] if rows else 0
-            return models.SelectResult(count=count)
+        key_types = [schema.attribute_type_map[name]
+                     for name in key_attr_names]
+        key_columns = [USER_PREFIX + name for name in key_attr_names]
+        attributes_to_get = select_type.attributes
+
+        def build_items(results):
+            item_map = {}
+            for rows in results:
+                for row in rows:
+                    item_key = tuple(
+                        models.AttributeValue(key_type,
+                                              decoded_value=row[column])
+                        for key_type, column in zip(key_types, key_columns)
+                    )
+                    item_map[item_key] = self._decode_row(
+                        table_info, row, attributes_to_get
+                    )
+            return [item_map.get(key) for key in key_list]
 
-        # process results
+        return _gather_futures(
+            [self.__cluster_handler.execute_query_async(query, consistent)
+             for query in queries],
+            build_items
+        )
 
-        result = []
+    @staticmethod
+    def _get_select_columns(table_info, attribute_names, extra_names=()):
+        """
+        Returns CQL selection which contains only columns required to
+        restore given attributes and primary key of item. Dynamic attributes
+        can't be selected separately, so whole dynamic attributes map is
+        selected if any of them is required
+
+        :param attribute_names: names of attributes to be selected or None
+                    if all attributes are required
+        :param extra_names: names of additional attributes to be selected
+        """
+        if attribute_names is None:
+            return '*'
+
+        schema = table_info.schema
+        columns = []
+        dynamic_needed = False
+        for name in sorted(set(attribute_names).union(schema.key_attributes,
+                                                      extra_names)):
+            if name in schema.attribute_type_map:
+                columns.append('"' + USER_PREFIX + name + '"')
+            else:
+                dynamic_needed = True
 
-        # TODO ikhudoshyn: if select_type.is_all_projected,
-        # get list of projected attrs by index_name from metainfo
+        if dynamic_needed:
+            columns += (SYSTEM_COLUMN_EXTRA_ATTR_DATA,
+                        SYSTEM_COLUMN_EXTRA_ATTR_TYPES)
 
-        attributes_to_get = select_type.attributes
+        return ",".join(columns)
 
-        for row in rows:
-            record = {}
-
-            # add predefined attributes
-            for cas_name, cas_val in row.iteritems():
-                if cas_name.startswith(USER_PREFIX) and cas_val:
-                    name, val = _decode_predefined_attr(table_info, cas_name,
-                                                        cas_val)
-                    if not attributes_to_get or name in attributes_to_get:
-                        record[name] = val
-
-            # add dynamic attributes (from SYSTEM_COLUMN_ATTR_DATA dict)
-            types = row[SYSTEM_COLUMN_EXTRA_ATTR_TYPES]
-            attrs = row[SYSTEM_COLUMN_EXTRA_ATTR_DATA] or {}
-            for name, val in attrs.iteritems():
+    @staticmethod
+    def _decode_row(table_info, row, attributes_to_get=None):
+        record = {}
+
+        # add predefined attributes
+        for cas_name, cas_val in row.iteritems():
+            if cas_name.startswith(USER_PREFIX) and cas_val:
+                name, val = _decode_predefined_attr(table_info, cas_name,
+                                                    cas_val)
                 if not attributes_to_get or name in attributes_to_get:
-                    typ = types[name]
-                    storage_type = models.AttributeType(typ)
-                    record[name] = _decode_dynamic_attr_value(
-                        val, storage_type
-                    )
+                    record[name] = val
+
+        # add dynamic attributes (from SYSTEM_COLUMN_ATTR_DATA dict)
+        types = row.get(SYSTEM_COLUMN_EXTRA_ATTR_TYPES)
+        attrs = row.get(SYSTEM_COLUMN_EXTRA_ATTR_DATA) or {}
+        for name, val in attrs.iteritems():
+            if not attributes_to_get or name in attributes_to_get:
+                typ = types[name]
+                storage_type = models.AttributeType(typ)
+                record[name] = unpack_dynamic_attr_value(
+                    val, storage_type
+                )
 
-            result.append(record)
+        return record
 
-        count = len(result)
-        if limit and count == limit:
-            last_evaluated_key = {hash_name: result[-1][hash_name]}
+    @staticmethod
+    def _get_item_key(table_info, item, index_name=None):
+        hash_name = table_info.schema.hash_key_name
+        range_name = table_info.schema.range_key_name
 
-            if range_name:
-                last_evaluated_key[range_name] = result[-1][range_name]
+        key = {hash_name: item[hash_name]}
 
-            if index_name:
-                indexed_attr_name = table_info.schema.index_def_map[
-                    index_name
-                ].alt_range_key_attr
-                last_evaluated_key[indexed_attr_name] = result[-1][
-                    indexed_attr_name
-                ]
+        if range_name:
+            key[range_name] = item[range_name]
+
+        if index_name:
+            indexed_attr_name = table_info.schema.index_def_map[
+                index_name
+            ].alt_range_key_attr
+            key[indexed_attr_name] = item[indexed_attr_name]
+
+        return key
+
+    @classmethod
+    def _build_select_result(cls, table_info, rows, select_type,
+                             index_name=None, limit=None):
+        if select_type.is_count:
+            count = rows[0]['count'] if rows else 0
+            return models.SelectResult(count=count)
+
+        attributes_to_get = cls._get_attributes_to_get(table_info,
+                                                       select_type,
+                                                       index_name)
+
+        result = [
+            cls._decode_row(table_info, row, attributes_to_get)
+            for row in rows
+        ]
+
+        count = len(result)
+        if limit and count == limit:
+            last_evaluated_key = cls._get_item_key(table_info, result[-1],
+                                                   index_name)
         else:
             last_evaluated_key = None
 
@@ -1644,7 +3053,8 @@ class CassandraStorageDriver(StorageDriver):
 
     @probe.Probe(__name__)
     def scan(self, context, table_info, condition_map, attributes_to_get=None,
-             limit=None, exclusive_start_key=None, consistent=False):
+             limit=None, exclusive_start_key=None, consistent=False,
+             segment=None, total_segments=None):
         """
         :param context: current request context
         :param table_info: TableInfo instance with table's meta information
@@ -1655,7 +3065,11 @@ class CassandraStorageDriver(StorageDriver):
         :param exclusive_start_key: key attribute names to AttributeValue
                     instance
         :param consistent: define is operation consistent or not (by default it
-                    is not consistent)
+                    is not consistent) or name of consistency level
+        :param segment: number of the segment to be scanned by this request
+        :param total_segments: total number of segments the table is divided
+                    into. Each segment is the contiguous token range of
+                    hash key
 
         :returns: list of attribute name to AttributeValue mappings
 
@@ -1663,52 +3077,32 @@ class CassandraStorageDriver(StorageDriver):
         """
         if not condition_map:
             condition_map = {}
-
-        hash_name = table_info.schema.hash_key_name
-        range_name = table_info.schema.range_key_name
-
-        hash_key_condition_list = condition_map.get(hash_name, None)
-        range_key_condition_list = None
-        if hash_key_condition_list:
-            hash_key_condition_list = [
-                cond for cond in hash_key_condition_list
-                if isinstance(cond, models.IndexedCondition)
-            ]
-            range_key_condition_list = (
-                condition_map.get(range_name, None) if range_name else None
-            )
-        if hash_key_condition_list:
-            if range_key_condition_list:
-                range_key_condition_list = [
-                    cond for cond in range_key_condition_list
-                    if isinstance(cond, models.IndexedCondition)
-                ]
-
-        selected = self.select_item(
-            context, table_info, hash_key_condition_list,
-            range_key_condition_list, models.SelectType.all(), limit=limit,
-            exclusive_start_key=exclusive_start_key, consistent=consistent
+        consistent = self._get_read_consistency(table_info, consistent)
+
+        scan_plan = self._get_scan_plan(table_info, condition_map,
+                                        attributes_to_get)
+        if scan_plan is None:
+            return models.ScanResult(items=[], count=0, scanned_count=0)
+        select_type, hash_key_condition_list, range_key_condition_list = (
+            scan_plan
         )
 
-        if ((not limit or limit > selected.count) and
-                exclusive_start_key is not None):
-            if hash_key_condition_list is None:
-                hash_key_condition_list = []
-            hash_key_condition_list.append(
-                models.IndexedCondition.gt(exclusive_start_key[hash_name])
-            )
-
-            limit2 = limit - selected.count if limit else None
+        if hash_key_condition_list:
+            # item with given hash key is reported by the first segment
+            if segment:
+                return models.ScanResult(items=[], count=0, scanned_count=0)
 
-            selected2 = self.select_item(
+            selected = self.select_item(
                 context, table_info, hash_key_condition_list,
-                range_key_condition_list, models.SelectType.all(),
-                limit=limit2, consistent=consistent)
-
-            selected = models.SelectResult(
-                items=selected.items + selected2.items,
-                last_evaluated_key=selected2.last_evaluated_key,
-                count=selected.count + selected2.count
+                range_key_condition_list, select_type,
+                limit=limit, exclusive_start_key=exclusive_start_key,
+                consistent=consistent
+            )
+        else:
+            selected = self._scan_token_range(
+                context, table_info, select_type, range_key_condition_list,
+                limit, exclusive_start_key, consistent,
+                *_get_segment_token_range(segment, total_segments)
             )
 
         scanned_count = selected.count
@@ -1736,6 +3130,279 @@ class CassandraStorageDriver(StorageDriver):
 
         return filtered
 
+    def _get_scan_plan(self, table_info, condition_map, attributes_to_get):
+        """
+        Chooses attributes to select and conditions which can be checked
+        by Cassandra
+
+        :returns: (select_type, hash_key_condition_list,
+                    range_key_condition_list) tuple or None if it is known
+                    that scan result is empty
+        """
+        schema = table_info.schema
+        hash_name = schema.hash_key_name
+        range_name = schema.range_key_name
+
+        if attributes_to_get:
+            # attributes required to check conditions have to be selected too
+            select_type = models.SelectType.specific_attributes(
+                set(attributes_to_get).union(
+                    condition_map.iterkeys(),
+                    table_info.schema.key_attributes
+                )
+            )
+        else:
+            select_type = models.SelectType.all()
+
+        hash_key_condition_list = [
+            cond for cond in condition_map.get(hash_name, ())
+            if cond.type == models.IndexedCondition.CONDITION_TYPE_EQUAL
+        ]
+        hash_type = schema.attribute_type_map[hash_name]
+        for cond in hash_key_condition_list:
+            if cond.arg.attr_type != hash_type:
+                # value of other type is never equal to the key
+                return None
+
+        range_key_condition_list = None
+        if range_name:
+            range_key_condition_list = [
+                cond for cond in condition_map.get(range_name, ())
+                if cond.type in CONDITION_TO_OP
+            ]
+            range_type = schema.attribute_type_map[range_name]
+            for cond in range_key_condition_list:
+                if cond.arg.attr_type != range_type:
+                    # values of different types aren't comparable
+                    return None
+            if range_key_condition_list:
+                range_key_condition_list = self._compact_indexed_condition(
+                    range_key_condition_list
+                )
+                if not range_key_condition_list:
+                    # conditions on range key are incompatible
+                    return None
+
+        return select_type, hash_key_condition_list, range_key_condition_list
+
+    def scan_stream(self, context, table_info, condition_map,
+                    attributes_to_get=None, limit=None,
+                    exclusive_start_key=None, consistent=False,
+                    segment=None, total_segments=None):
+        consistent = self._get_read_consistency(table_info, consistent)
+        result = models.ScanResultStream()
+        result.items = self._iter_scan(
+            result, context, table_info, condition_map or {},
+            attributes_to_get, limit, exclusive_start_key, consistent,
+            segment, total_segments
+        )
+        return result
+
+    def _iter_scan(self, result, context, table_info, condition_map,
+                   attributes_to_get, limit, exclusive_start_key, consistent,
+                   segment, total_segments):
+        scan_plan = self._get_scan_plan(table_info, condition_map,
+                                        attributes_to_get)
+        if scan_plan is None:
+            return
+        select_type, hash_key_condition_list, range_key_condition_list = (
+            scan_plan
+        )
+
+        if hash_key_condition_list:
+            # item with given hash key is reported by the first segment
+            if segment:
+                return
+            items = self.select_item_stream(
+                context, table_info, hash_key_condition_list,
+                range_key_condition_list, select_type, limit=limit,
+                exclusive_start_key=exclusive_start_key,
+                consistent=consistent
+            ).items
+        else:
+            items = self._iter_token_range(
+                context, table_info, select_type, range_key_condition_list,
+                limit, exclusive_start_key, consistent,
+                *_get_segment_token_range(segment, total_segments)
+            )
+
+        for item in items:
+            result.scanned_count += 1
+            if result.scanned_count == limit:
+                result.last_evaluated_key = self._get_item_key(table_info,
+                                                               item)
+
+            if not self._conditions_satisfied(item, condition_map):
+                continue
+
+            if attributes_to_get:
+                for attr in item.keys():
+                    if attr not in attributes_to_get:
+                        del item[attr]
+
+            result.count += 1
+            yield item
+
+    def _continue_token_range(self, context, table_info, select_type,
+                              range_key_condition_list, limit,
+                              exclusive_start_key, consistent):
+        """
+        Selects the rest of the partition the previous scan page was
+        stopped at
+
+        :returns: (items, start_condition) tuple, where start_condition is
+                    CQL condition on hash key token for the rest of scan
+        """
+        hash_key_value = exclusive_start_key[
+            table_info.schema.hash_key_name
+        ]
+        items = []
+        if table_info.schema.range_key_name:
+            items = self.select_item(
+                context, table_info,
+                [models.IndexedCondition.eq(hash_key_value)],
+                range_key_condition_list, select_type, limit=limit,
+                exclusive_start_key=exclusive_start_key,
+                consistent=consistent
+            ).items
+        return (
+            items,
+            ">token(" + encode_predefined_attr_value(hash_key_value) + ")"
+        )
+
+    def _iter_token_range(self, context, table_info, select_type,
+                          range_key_condition_list, limit,
+                          exclusive_start_key, consistent, start_token,
+                          end_token):
+        """
+        The same as _scan_token_range but yields items while Cassandra
+        result pages are fetched
+        """
+        start_condition = ">=" + str(start_token)
+        remaining = limit
+        if exclusive_start_key is not None:
+            items, start_condition = self._continue_token_range(
+                context, table_info, select_type, range_key_condition_list,
+                limit, exclusive_start_key, consistent
+            )
+            for item in items:
+                yield item
+            if limit:
+                remaining = limit - len(items)
+                if remaining <= 0:
+                    return
+
+        rows = self.__cluster_handler.execute_query_paged(
+            self._build_token_range_query(
+                table_info, select_type, range_key_condition_list,
+                start_condition, end_token, remaining
+            ),
+            consistent, self.__fetch_size
+        )
+        for row in rows:
+            yield self._decode_row(table_info, row, select_type.attributes)
+
+    def _scan_token_range(self, context, table_info, select_type,
+                          range_key_condition_list, limit,
+                          exclusive_start_key, consistent, start_token,
+                          end_token):
+        """
+        Selects items which hash key token is within given inclusive range,
+        continuing after exclusive_start_key if it is specified. Conditions
+        on range key are checked by Cassandra
+
+        :returns: SelectResult instance
+        """
+        items = []
+        if exclusive_start_key is None:
+            token_ranges = _split_token_range(
+                start_token, end_token,
+                1 if limit else self.__scan_parallelism
+            )
+            start_conditions = [
+                ">=" + str(range_start) for range_start, _ in token_ranges
+            ]
+            end_tokens = [range_end for _, range_end in token_ranges]
+        else:
+            items, continuation_condition = self._continue_token_range(
+                context, table_info, select_type, range_key_condition_list,
+                limit, exclusive_start_key, consistent
+            )
+            start_conditions = [continuation_condition]
+            end_tokens = [end_token]
+
+        remaining = limit - len(items) if limit else None
+        if remaining is None or remaining > 0:
+            futures = [
+                self.__cluster_handler.execute_query_async(
+                    self._build_token_range_query(
+                        table_info, select_type, range_key_condition_list,
+                        start_condition, range_end, remaining
+                    ),
+                    consistent
+                )
+                for start_condition, range_end in zip(start_conditions,
+                                                      end_tokens)
+            ]
+            for future in futures:
+                items += self._build_select_result(
+                    table_info, future.result(), select_type
+                ).items
+
+        last_evaluated_key = None
+        if limit and len(items) >= limit:
+            del items[limit:]
+            last_evaluated_key = self._get_item_key(table_info, items[-1])
+
+        return models.SelectResult(items=items,
+                                   last_evaluated_key=last_evaluated_key,
+                                   count=len(items))
+
+    def _build_token_range_query(self, table_info, select_type,
+                                 range_key_condition_list, start_condition,
+                                 end_token, limit=None):
+        hash_name = table_info.schema.hash_key_name
+        query_builder = deque(
+            (
+                'SELECT ',
+                self._get_select_columns(table_info, select_type.attributes),
+                ' FROM ', table_info.internal_name,
+                ' WHERE token("', USER_PREFIX, hash_name, '")',
+                start_condition,
+                ' AND token("', USER_PREFIX, hash_name, '")<=', str(end_token)
+            )
+        )
+
+        if table_info.schema.index_def_map:
+            query_builder += (
+                " AND ", SYSTEM_COLUMN_INDEX_NAME, "=",
+                ENCODED_DEFAULT_STRING_VALUE
+            )
+            if range_key_condition_list:
+                # range key can be restricted only if all preceding
+                # clustering columns are restricted
+                query_builder += (
+                    " AND ", SYSTEM_COLUMN_INDEX_VALUE_STRING, "=",
+                    ENCODED_DEFAULT_STRING_VALUE,
+                    " AND ", SYSTEM_COLUMN_INDEX_VALUE_NUMBER, "=",
+                    ENCODED_DEFAULT_NUMBER_VALUE,
+                    " AND ", SYSTEM_COLUMN_INDEX_VALUE_BLOB, "=",
+                    ENCODED_DEFAULT_BLOB_VALUE
+                )
+
+        if range_key_condition_list:
+            for cond in range_key_condition_list:
+                query_builder.append(" AND ")
+                self._append_indexed_condition(
+                    table_info.schema.range_key_name, cond, query_builder
+                )
+
+        if limit:
+            query_builder += (" LIMIT ", str(limit))
+
+        query_builder.append(" ALLOW FILTERING")
+        return "".join(query_builder)
+
     def _conditions_satisfied(self, row, cond_map=None):
         if not cond_map:
             return True
@@ -13,12 +13,17 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+import decimal
 import json
+import struct
 from collections import deque
 
 from binascii import hexlify
+from blist import sortedset
 from cassandra.encoder import cql_quote
 
+from magnetodb.storage import models
+
 
 def _encode_b(value):
     return "0x" + hexlify(value)
@@ -158,6 +163,220 @@ def encode_dynamic_attr_value(attr_value):
     if attr_value is None:
         return 'null'
 
+    return "0x" + hexlify(pack_dynamic_attr_value(attr_value))
+
+
+def encode_dynamic_attr_value_json(attr_value):
+    """
+    Encodes AttributeValue the way dynamic attributes were stored before
+    binary format was introduced. It is needed to match values written
+    by previous versions in conditions
+    """
+    if attr_value is None:
+        return 'null'
+
     return "0x" + hexlify(
         json.dumps(attr_value.encoded_value, sort_keys=True)
     )
+
+
+def _bind_n(value):
+    if isinstance(value, decimal.Decimal):
+        return value
+    return decimal.Decimal(value)
+
+
+def _bind_ns(value):
+    return set(map(_bind_n, value))
+
+
+def _make_map_binder(key_binder, value_binder):
+    def bind_map(value):
+        return {
+            key_binder(k): value_binder(v) for k, v in value.iteritems()
+        }
+    return bind_map
+
+
+def _bind_as_is(value):
+    return value
+
+
+_BIND_ENCODER_MAP = {
+    'S': _bind_as_is,
+    'N': _bind_n,
+    'B': _bind_as_is,
+    'SS': _bind_as_is,
+    'NS': _bind_ns,
+    'BS': _bind_as_is,
+    'SSM': _bind_as_is,
+    'SNM': _make_map_binder(_bind_as_is, _bind_n),
+    'SBM': _bind_as_is,
+    'NSM': _make_map_binder(_bind_n, _bind_as_is),
+    'NNM': _make_map_binder(_bind_n, _bind_n),
+    'NBM': _make_map_binder(_bind_n, _bind_as_is),
+    'BSM': _bind_as_is,
+    'BNM': _make_map_binder(_bind_as_is, _bind_n),
+    'BBM': _bind_as_is
+}
+
+
+def bind_predefined_attr_value(attr_value):
+    """
+    Converts AttributeValue to the python value expected by cassandra driver
+    for binding to prepared statement parameter
+    """
+    if attr_value is None:
+        return None
+
+    return (
+        _BIND_ENCODER_MAP[attr_value.attr_type.type](attr_value.decoded_value)
+    )
+
+
+def bind_dynamic_attr_value(attr_value):
+    if attr_value is None:
+        return None
+
+    return pack_dynamic_attr_value(attr_value)
+
+
+# Dynamic attribute value binary format (version 1):
+#
+#   version byte | type tag byte | payload
+#
+# Payload of primitive value is its raw bytes (utf-8 for strings, decimal
+# string for numbers, unencoded bytes for blobs). Payload of set is
+# sequence of elements, payload of map is sequence of key, value pairs
+# sorted by key, each element is prefixed with its length. Version byte
+# never starts valid JSON document, so values stored in JSON by previous
+# versions are still recognized on read.
+DYNAMIC_ATTR_FORMAT_VERSION = '\x01'
+
+# position in this tuple is type tag, so new types may be only appended
+_DYNAMIC_ATTR_TYPES = (
+    'S', 'N', 'B', 'SS', 'NS', 'BS', 'SSM', 'SNM', 'SBM', 'NSM', 'NNM',
+    'NBM', 'BSM', 'BNM', 'BBM'
+)
+
+_DYNAMIC_ATTR_TYPE_TAG_MAP = {
+    typ: chr(tag) for tag, typ in enumerate(_DYNAMIC_ATTR_TYPES)
+}
+
+_LENGTH = struct.Struct('>I')
+
+
+def _pack_s(value):
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    return value
+
+
+def _unpack_s(value):
+    return value.decode('utf-8')
+
+
+def _unpack_n(value):
+    try:
+        return int(value)
+    except ValueError:
+        return models.DECIMAL_CONTEXT.create_decimal(value)
+
+
+_PACKER_MAP = {
+    'S': _pack_s,
+    'N': str,
+    'B': str
+}
+
+_UNPACKER_MAP = {
+    'S': _unpack_s,
+    'N': _unpack_n,
+    'B': str
+}
+
+
+def pack_dynamic_attr_value(attr_value):
+    """
+    Converts AttributeValue to the bytes stored in dynamic attributes column
+    """
+    attr_type = attr_value.attr_type
+    value = attr_value.decoded_value
+    builder = [DYNAMIC_ATTR_FORMAT_VERSION,
+               _DYNAMIC_ATTR_TYPE_TAG_MAP[attr_type.type]]
+
+    collection_type = attr_type.collection_type
+    if collection_type is None:
+        builder.append(_PACKER_MAP[attr_type.type](value))
+        return "".join(builder)
+
+    if collection_type == models.AttributeType.COLLECTION_TYPE_SET:
+        pack = _PACKER_MAP[attr_type.element_type]
+        elements = (pack(element) for element in value)
+    else:
+        pack_key = _PACKER_MAP[attr_type.key_type]
+        pack_value = _PACKER_MAP[attr_type.value_type]
+        elements = (
+            packed
+            for key in sorted(value)
+            for packed in (pack_key(key), pack_value(value[key]))
+        )
+
+    pack_length = _LENGTH.pack
+    for element in elements:
+        builder.append(pack_length(len(element)))
+        builder.append(element)
+    return "".join(builder)
+
+
+def _iter_packed_elements(value, offset):
+    unpack_length = _LENGTH.unpack_from
+    length_size = _LENGTH.size
+    end = len(value)
+    while offset < end:
+        length, = unpack_length(value, offset)
+        offset += length_size
+        yield value[offset:offset + length]
+        offset += length
+
+
+def is_dynamic_attr_value_json(value):
+    """
+    Checks if bytes read from dynamic attributes column are stored in JSON
+    format of previous versions
+    """
+    return not value.startswith(DYNAMIC_ATTR_FORMAT_VERSION)
+
+
+def unpack_dynamic_attr_value(value, storage_type):
+    """
+    Converts bytes read from dynamic attributes column to AttributeValue.
+    Values stored in JSON by previous versions are supported as well
+
+    :param value: stored bytes
+    :param storage_type: type of attribute from dynamic attribute types column
+    """
+    if is_dynamic_attr_value_json(value):
+        return models.AttributeValue(storage_type,
+                                     encoded_value=json.loads(value))
+
+    attr_type = models.AttributeType(_DYNAMIC_ATTR_TYPES[ord(value[1])])
+
+    collection_type = attr_type.collection_type
+    if collection_type is None:
+        decoded_value = _UNPACKER_MAP[attr_type.type](value[2:])
+    elif collection_type == models.AttributeType.COLLECTION_TYPE_SET:
+        unpack = _UNPACKER_MAP[attr_type.element_type]
+        decoded_value = sortedset(
+            unpack(element) for element in _iter_packed_elements(value, 2)
+        )
+    else:
+        unpack_key = _UNPACKER_MAP[attr_type.key_type]
+        unpack_value = _UNPACKER_MAP[attr_type.value_type]
+        elements = _iter_packed_elements(value, 2)
+        decoded_value = {
+            unpack_key(key): unpack_value(val)
+            for key, val in zip(elements, elements)
+        }
+
+    return models.AttributeValue(attr_type, decoded_value=decoded_value)
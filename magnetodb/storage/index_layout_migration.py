@@ -0,0 +1,127 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Migration of existing tables to projected layout of index rows.
+
+Migration is done online in two steps. At first index layout saved in the
+table schema is switched, so API processes start to write index rows with
+key and projected attributes only and to read not projected attributes
+from item rows. Full index rows are still valid for this layout, so
+after table info caches of API processes are refreshed, index rows of all
+items are rewritten by scan of the table. Index rows written concurrently
+by processes with outdated table info stay full, migration can be repeated
+to rewrite them.
+"""
+
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from magnetodb.common import exception
+from magnetodb.openstack.common import log as logging
+from magnetodb.storage import models
+
+LOG = logging.getLogger(__name__)
+
+
+def switch_index_layout(context, table_info_repo, table_name, index_layout):
+    """
+    Saves new index layout to the schema of the table
+
+    :returns: tuple of TableInfo of the table and flag which is True if
+              layout was changed
+    """
+    table_info = table_info_repo.get(context, table_name)
+    if table_info.status != models.TableMeta.TABLE_STATUS_ACTIVE:
+        raise exception.ResourceInUseException(
+            "Table '%(table_name)s' is in %(status)s state",
+            table_name=table_name, status=table_info.status
+        )
+    if not table_info.schema.index_def_map:
+        raise exception.ValidationError(
+            "Table '%(table_name)s' has no indexes", table_name=table_name
+        )
+    if table_info.schema.index_layout == index_layout:
+        return table_info, False
+
+    table_info.schema = table_info.schema.with_index_layout(index_layout)
+    table_info_repo.update(context, table_info, ["schema"])
+    return table_info, True
+
+
+def migrate_table(context, storage_driver, table_info_repo, table_name,
+                  total_segments=16, parallelism=4, cache_ttl=60,
+                  progress_callback=None):
+    """
+    Migrates the table to projected index layout
+
+    :param context: request context of tenant of the table
+    :param storage_driver: StorageDriver instance
+    :param table_info_repo: TableInfoRepository instance
+    :param table_name: name of the table
+    :param total_segments: number of hash key token ranges the table is
+                scanned by
+    :param parallelism: number of segments processed concurrently
+    :param cache_ttl: seconds to wait after layout is switched, before
+                index rows are rewritten. Should be not less than table
+                info cache TTL of API processes
+    :param progress_callback: function, which is called with stats dict
+                after each segment is processed
+
+    :returns: dict with number of scanned items and rewritten index rows
+    """
+    table_info, switched = switch_index_layout(
+        context, table_info_repo, table_name,
+        models.TableSchema.INDEX_LAYOUT_PROJECTED
+    )
+    if switched:
+        LOG.info("Index layout of table '%s' is switched, waiting %s "
+                 "seconds for table info caches to be refreshed",
+                 table_name, cache_ttl)
+        time.sleep(cache_ttl)
+
+    stats = dict(item_count=0, rewritten_count=0, segment_count=0)
+    lock = threading.Lock()
+
+    def migrate_segment(segment):
+        item_count = 0
+        rewritten_count = 0
+        items = storage_driver.scan_stream(
+            context, table_info, {}, consistent=True, segment=segment,
+            total_segments=total_segments
+        ).items
+        for item in items:
+            item_count += 1
+            rewritten_count += storage_driver.rewrite_index_rows(
+                context, table_info, item
+            )
+        with lock:
+            stats["item_count"] += item_count
+            stats["rewritten_count"] += rewritten_count
+            stats["segment_count"] += 1
+            if progress_callback:
+                progress_callback(dict(stats))
+
+    executor = ThreadPoolExecutor(parallelism)
+    try:
+        futures = [executor.submit(migrate_segment, segment)
+                   for segment in xrange(total_segments)]
+        for future in futures:
+            future.result()
+    finally:
+        executor.shutdown(wait=False)
+
+    return stats
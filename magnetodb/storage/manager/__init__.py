@@ -163,6 +163,30 @@ class StorageManager(object):
         """
         raise NotImplementedError()
 
+    def bulk_load(self, context, table_name, item_iter, max_in_flight=100,
+                  buffer_size=1000):
+        """
+        Puts items to the table while they are read from the iterator.
+        Items are written by batches grouped by partition, count of batches
+        in flight is limited, so items aren't read faster than they are
+        written
+
+        :param context: current request context
+        :param table_name: name of the table
+        :param item_iter: iterator over attribute name to AttributeValue
+                    mappings, which represent items to put
+        :param max_in_flight: max number of batches written concurrently
+        :param buffer_size: number of items collected to be grouped by
+                    partition before writing
+
+        :returns: iterator over (processed item count, failed items) tuples,
+                    failed items is list of (item, error) tuples
+
+        :raises: TableNotExistsException, ValidationError if table can't be
+                    loaded
+        """
+        raise NotImplementedError()
+
     def execute_get_batch(self, context, get_request_list):
         """
         :param context: current request context
@@ -174,7 +198,8 @@ class StorageManager(object):
         raise NotImplementedError()
 
     def update_item(self, context, table_name, key_attribute_map,
-                    attribute_action_map, expected_condition_map=None):
+                    attribute_action_map, expected_condition_map=None,
+                    return_values=None):
         """
         :param context: current request context
         :param table_name: String, name of table to delete item from
@@ -187,6 +212,8 @@ class StorageManager(object):
                     ExpectedCondition instance mapping. It provides
                     preconditions
                     to make decision about should item be updated or not
+        :param return_values: model that defines what values should be
+                    returned. Old item is read only if it's required
         :returns: True if operation performed, otherwise False
 
         :raises: BackendInteractionException
@@ -243,7 +270,7 @@ class StorageManager(object):
 
     def scan(self, context, table_name, condition_map, attributes_to_get=None,
              limit=None, exclusive_start_key=None,
-             consistent=False):
+             consistent=False, segment=None, total_segments=None):
         """
         :param context: current request context
         :param table_name: String, name of table to get item from
@@ -257,6 +284,9 @@ class StorageManager(object):
                     instance
         :param consistent: define is operation consistent or not (by default it
                     is not consistent)
+        :param segment: number of the segment to be scanned by this request
+        :param total_segments: total number of segments the table is divided
+                    into for parallel scan
 
         :returns: list of attribute name to AttributeValue mappings
 
@@ -264,6 +294,34 @@ class StorageManager(object):
         """
         raise NotImplementedError()
 
+    def scan_stream(self, context, table_name, condition_map,
+                    attributes_to_get=None, limit=None,
+                    exclusive_start_key=None, consistent=False,
+                    segment=None, total_segments=None):
+        """
+        The same as scan but items are read from the backend while result is
+        iterated
+
+        :returns: ScanResultStream instance
+
+        :raises: BackendInteractionException
+        """
+        raise NotImplementedError()
+
+    def query_stream(self, context, table_name, indexed_condition_map,
+                     select_type, index_name=None, limit=None,
+                     exclusive_start_key=None, consistent=True,
+                     order_type=None):
+        """
+        The same as query but items are read from the backend while result
+        is iterated. Count select type isn't supported
+
+        :returns: ScanResultStream instance
+
+        :raises: BackendInteractionException
+        """
+        raise NotImplementedError()
+
     def get_table_statistics(self, context, table_info, keys):
         """
         :param context: current request context
@@ -275,3 +333,102 @@ class StorageManager(object):
         :raises: BackendInteractionException
         """
         raise NotImplementedError()
+
+    def create_backup(self, context, table_name, backup_name, strategy=None):
+        """
+        Starts backup of the table items
+
+        :param context: current request context
+        :param table_name: name of the table to backup
+        :param backup_name: name of the backup
+        :param strategy: dict of backup options
+
+        :returns: BackupInfo instance
+
+        :raises: TableNotExistsException, ValidationError
+        """
+        raise NotImplementedError()
+
+    def describe_backup(self, context, table_name, backup_id):
+        """
+        :returns: BackupInfo instance
+
+        :raises: BackupNotExistsException
+        """
+        raise NotImplementedError()
+
+    def list_backups(self, context, table_name,
+                     exclusive_start_backup_id=None, limit=None):
+        """
+        :returns: list of BackupInfo instances
+        """
+        raise NotImplementedError()
+
+    def delete_backup(self, context, table_name, backup_id):
+        """
+        Starts deletion of the backup files and info
+
+        :returns: BackupInfo instance
+
+        :raises: BackupNotExistsException
+        """
+        raise NotImplementedError()
+
+    def create_restore_job(self, context, table_name, backup_id=None,
+                           source=None, strategy=None):
+        """
+        Starts restore of the table items from the backup
+
+        :param context: current request context
+        :param table_name: name of the table to restore items to
+        :param backup_id: id of the backup to restore
+        :param source: location of backup files, used if backup_id isn't
+                    specified
+        :param strategy: dict of restore options
+
+        :returns: RestoreJobInfo instance
+
+        :raises: TableNotExistsException, BackupNotExistsException,
+                    ValidationError
+        """
+        raise NotImplementedError()
+
+    def describe_restore_job(self, context, table_name, restore_job_id):
+        """
+        :returns: RestoreJobInfo instance
+
+        :raises: RestoreJobNotExistsException
+        """
+        raise NotImplementedError()
+
+    def list_restore_jobs(self, context, table_name,
+                          exclusive_start_restore_job_id=None, limit=None):
+        """
+        :returns: list of RestoreJobInfo instances
+        """
+        raise NotImplementedError()
+
+    def create_export(self, context, table_name, total_segments=None,
+                      compress=False):
+        """
+        Starts export of the table items to sharded NDJSON files
+
+        :param context: current request context
+        :param table_name: name of the table to export
+        :param total_segments: number of shard files, default is used if
+                    not specified
+        :param compress: write gzip compressed shard files
+
+        :returns: ExportInfo instance
+
+        :raises: TableNotExistsException, ValidationError
+        """
+        raise NotImplementedError()
+
+    def describe_export(self, context, table_name, export_id):
+        """
+        :returns: ExportInfo instance
+
+        :raises: ExportNotExistsException
+        """
+        raise NotImplementedError()
@@ -19,6 +19,7 @@ from oslo import messaging
 
 from magnetodb.common import config
 from magnetodb.storage.manager.simple_impl import SimpleStorageManager
+from magnetodb.storage.models import TableSchema
 
 LOG = logging.getLogger(__name__)
 CONF = config.CONF
@@ -27,16 +28,20 @@ CONF = config.CONF
 class QueuedStorageManager(SimpleStorageManager):
     def __init__(self, storage_driver, table_info_repo,
                  concurrent_tasks=1000, batch_chunk_size=25,
-                 schema_operation_timeout=300):
+                 schema_operation_timeout=300, backup_info_repo=None,
+                 index_layout=TableSchema.INDEX_LAYOUT_PROJECTED):
         SimpleStorageManager.__init__(
             self, storage_driver, table_info_repo,
             concurrent_tasks, batch_chunk_size,
-            schema_operation_timeout)
+            schema_operation_timeout, backup_info_repo, index_layout)
 
         transport = messaging.get_transport(CONF)
         target = messaging.Target(topic='schema')
 
         self._rpc_client = messaging.RPCClient(transport, target)
+        self._backup_rpc_client = messaging.RPCClient(
+            transport, messaging.Target(topic='backup')
+        )
 
     def _do_create_table(self, context, table_info):
         self._rpc_client.cast(
@@ -45,3 +50,24 @@ class QueuedStorageManager(SimpleStorageManager):
     def _do_delete_table(self, context, table_info):
         self._rpc_client.cast(
             context.to_dict(), 'delete', table_name=table_info.name)
+
+    def _do_create_backup(self, context, backup_info):
+        self._backup_rpc_client.cast(
+            context.to_dict(), 'create', table_name=backup_info.table_name,
+            backup_id=str(backup_info.id))
+
+    def _do_delete_backup(self, context, backup_info):
+        self._backup_rpc_client.cast(
+            context.to_dict(), 'delete', table_name=backup_info.table_name,
+            backup_id=str(backup_info.id))
+
+    def _do_create_restore_job(self, context, restore_job_info):
+        self._backup_rpc_client.cast(
+            context.to_dict(), 'restore',
+            table_name=restore_job_info.table_name,
+            restore_job_id=str(restore_job_info.id))
+
+    def _do_create_export(self, context, export_info):
+        self._backup_rpc_client.cast(
+            context.to_dict(), 'export', table_name=export_info.table_name,
+            export_id=str(export_info.id))
@@ -15,16 +15,20 @@
 #    under the License.
 
 import logging
+from collections import deque
+from collections import OrderedDict
 from datetime import datetime
 
 from threading import BoundedSemaphore
 from threading import Event
+from threading import Lock
 
 import weakref
 import uuid
 
 from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures import Future
+from oslo.config import cfg
 
 from magnetodb.common.exception import TableAlreadyExistsException
 from magnetodb.common.exception import TableNotExistsException
@@ -35,10 +39,17 @@ from magnetodb.common.exception import ValidationError
 from magnetodb import notifier
 from magnetodb.openstack.common.gettextutils import _
 
+from magnetodb.storage import capacity
 from magnetodb.storage.models import IndexedCondition
+from magnetodb.storage.models import SelectResult
 from magnetodb.storage.models import SelectType
 from magnetodb.storage.models import TableMeta
+from magnetodb.storage.models import TableSchema
+from magnetodb.storage.models import WriteItemRequest
 
+from magnetodb.storage.backup_info_repo import BackupInfo
+from magnetodb.storage.backup_info_repo import ExportInfo
+from magnetodb.storage.backup_info_repo import RestoreJobInfo
 from magnetodb.storage.manager import StorageManager
 
 from magnetodb.storage.table_info_repo import TableInfo
@@ -49,11 +60,15 @@ LOG = logging.getLogger(__name__)
 class SimpleStorageManager(StorageManager):
 
     def __init__(self, storage_driver, table_info_repo, concurrent_tasks=1000,
-                 batch_chunk_size=25, schema_operation_timeout=300):
+                 batch_chunk_size=25, schema_operation_timeout=300,
+                 backup_info_repo=None,
+                 index_layout=TableSchema.INDEX_LAYOUT_PROJECTED):
         self._storage_driver = storage_driver
         self._table_info_repo = table_info_repo
+        self._backup_info_repo = backup_info_repo
         self._batch_chunk_size = batch_chunk_size
         self._schema_operation_timeout = schema_operation_timeout
+        self._index_layout = index_layout
         self.__task_executor = ThreadPoolExecutor(concurrent_tasks)
         self.__task_semaphore = BoundedSemaphore(concurrent_tasks)
         self._notifier = notifier.get_notifier()
@@ -91,6 +106,9 @@ class SimpleStorageManager(StorageManager):
             notifier.EVENT_TYPE_TABLE_CREATE_START,
             table_schema)
 
+        if table_schema.index_def_map:
+            table_schema = table_schema.with_index_layout(self._index_layout)
+
         table_id = self._get_table_id(table_name)
         table_info = TableInfo(table_name, table_id, table_schema,
                                TableMeta.TABLE_STATUS_CREATING)
@@ -245,6 +263,32 @@ class SimpleStorageManager(StorageManager):
         future.add_done_callback(callback)
         return future
 
+    def _execute_driver_async(self, async_func, func, *args, **kwargs):
+        """
+        Executes request using non-blocking storage driver method. If driver
+        doesn't support asynchronous execution of the request, blocking one
+        is executed using thread pool. If blocking method isn't specified,
+        NotImplementedError is raised instead
+        """
+        weak_self = weakref.proxy(self)
+
+        def callback(future):
+            weak_self.__task_semaphore.release()
+
+        self.__task_semaphore.acquire()
+        try:
+            future = async_func(*args, **kwargs)
+        except NotImplementedError:
+            self.__task_semaphore.release()
+            if func is None:
+                raise
+            return self._execute_async(func, *args, **kwargs)
+        except Exception:
+            self.__task_semaphore.release()
+            raise
+        future.add_done_callback(callback)
+        return future
+
     @staticmethod
     def _validate_table_is_active(table_info):
         if table_info.status != TableMeta.TABLE_STATUS_ACTIVE:
@@ -262,6 +306,13 @@ class SimpleStorageManager(StorageManager):
         schema_key_attributes = table_info.schema.key_attributes
         schema_attribute_type_map = table_info.schema.attribute_type_map
 
+        if not keys_only and table_info.schema.counter_attributes:
+            raise ValidationError(
+                _("Items of counter table '%(table_name)s' can be changed "
+                  "only by ADD action of update item"),
+                table_name=table_info.name
+            )
+
         key_attribute_names_to_find = set(schema_key_attributes)
         if index_name is not None:
             key_attribute_names_to_find.add(
@@ -301,7 +352,8 @@ class SimpleStorageManager(StorageManager):
             )
 
     def put_item(self, context, table_name, attribute_map, return_values=None,
-                 if_not_exist=False, expected_condition_map=None):
+                 if_not_exist=False, expected_condition_map=None,
+                 consistency_level=None):
         table_info = self._table_info_repo.get(context, table_name)
         self._validate_table_is_active(table_info)
         self._validate_table_schema(table_info, attribute_map,
@@ -310,14 +362,16 @@ class SimpleStorageManager(StorageManager):
         with self.__task_semaphore:
             result = self._storage_driver.put_item(
                 context, table_info, attribute_map, return_values,
-                if_not_exist, expected_condition_map
+                if_not_exist, expected_condition_map, consistency_level
             )
+        capacity.add_write(context, table_info, attribute_map)
         self._notifier.info(
             context,
             notifier.EVENT_TYPE_DATA_PUTITEM,
             dict(
                 table_name=table_name,
-                attribute_map=attribute_map,
+                attribute_map=self._get_notification_item(table_info,
+                                                          attribute_map),
                 return_values=return_values,
                 if_not_exist=if_not_exist,
                 expected_condition_map=expected_condition_map
@@ -328,10 +382,11 @@ class SimpleStorageManager(StorageManager):
 
     def _put_item_async(self, context, table_info, attribute_map,
                         return_values=None, if_not_exist=False,
-                        expected_condition_map=None):
+                        expected_condition_map=None, consistency_level=None):
         payload = dict(
             table_name=table_info.name,
-            attribute_map=attribute_map,
+            attribute_map=self._get_notification_item(table_info,
+                                                      attribute_map),
             return_values=return_values,
             if_not_exist=if_not_exist,
             expected_condition_map=expected_condition_map
@@ -341,10 +396,11 @@ class SimpleStorageManager(StorageManager):
             notifier.EVENT_TYPE_DATA_PUTITEM_START,
             payload)
 
-        put_future = self._execute_async(
+        put_future = self._execute_driver_async(
+            self._storage_driver.put_item_async,
             self._storage_driver.put_item,
             context, table_info, attribute_map, return_values,
-            if_not_exist, expected_condition_map
+            if_not_exist, expected_condition_map, consistency_level
         )
 
         weak_self = weakref.proxy(self)
@@ -366,26 +422,30 @@ class SimpleStorageManager(StorageManager):
         return put_future
 
     def put_item_async(self, context, table_name, attribute_map, return_values,
-                       if_not_exist=False, expected_condition_map=None):
+                       if_not_exist=False, expected_condition_map=None,
+                       consistency_level=None):
         table_info = self._table_info_repo.get(context, table_name)
         self._validate_table_is_active(table_info)
         self._validate_table_schema(table_info, attribute_map, keys_only=False)
 
+        capacity.add_write(context, table_info, attribute_map)
         return self._put_item_async(
             context, table_info, attribute_map, return_values,
-            if_not_exist, expected_condition_map
+            if_not_exist, expected_condition_map, consistency_level
         )
 
     def delete_item(self, context, table_name, key_attribute_map,
-                    expected_condition_map=None):
+                    expected_condition_map=None, consistency_level=None):
         table_info = self._table_info_repo.get(context, table_name)
         self._validate_table_is_active(table_info)
         self._validate_table_schema(table_info, key_attribute_map)
 
         with self.__task_semaphore:
             result = self._storage_driver.delete_item(
-                context, table_info, key_attribute_map, expected_condition_map
+                context, table_info, key_attribute_map, expected_condition_map,
+                consistency_level
             )
+        capacity.add_delete(context, table_info, key_attribute_map)
         self._notifier.info(
             context,
             notifier.EVENT_TYPE_DATA_DELETEITEM,
@@ -399,7 +459,8 @@ class SimpleStorageManager(StorageManager):
         return result
 
     def _delete_item_async(self, context, table_info, key_attribute_map,
-                           expected_condition_map=None):
+                           expected_condition_map=None,
+                           consistency_level=None):
         payload = dict(
             table_name=table_info.name,
             key_attribute_map=key_attribute_map,
@@ -410,9 +471,11 @@ class SimpleStorageManager(StorageManager):
             notifier.EVENT_TYPE_DATA_DELETEITEM_START,
             payload)
 
-        del_future = self._execute_async(
+        del_future = self._execute_driver_async(
+            self._storage_driver.delete_item_async,
             self._storage_driver.delete_item,
-            context, table_info, key_attribute_map, expected_condition_map
+            context, table_info, key_attribute_map, expected_condition_map,
+            consistency_level
         )
 
         weak_self = weakref.proxy(self)
@@ -435,13 +498,15 @@ class SimpleStorageManager(StorageManager):
         return del_future
 
     def delete_item_async(self, context, table_name, key_attribute_map,
-                          expected_condition_map=None):
+                          expected_condition_map=None, consistency_level=None):
         table_info = self._table_info_repo.get(context, table_name)
         self._validate_table_is_active(table_info)
         self._validate_table_schema(table_info, key_attribute_map)
 
+        capacity.add_delete(context, table_info, key_attribute_map)
         return self._delete_item_async(context, table_info, key_attribute_map,
-                                       expected_condition_map)
+                                       expected_condition_map,
+                                       consistency_level)
 
     @staticmethod
     def _key_values(table_info, attribute_map):
@@ -450,11 +515,38 @@ class SimpleStorageManager(StorageManager):
             for key in table_info.schema.key_attributes
         ]
 
+    @staticmethod
+    def _get_notification_item(table_info, attribute_map):
+        if not cfg.CONF.notification_payload_keys_only:
+            return attribute_map
+        return dict(
+            (name, attribute_map[name])
+            for name in table_info.schema.key_attributes
+            if name in attribute_map
+        )
+
+    def _get_notification_write_request_map(self, context,
+                                            write_request_map):
+        if not cfg.CONF.notification_payload_keys_only:
+            return write_request_map
+        res = {}
+        for table_name, write_request_list in write_request_map.iteritems():
+            table_info = self._table_info_repo.get(context, table_name)
+            res[table_name] = [
+                WriteItemRequest(
+                    req.type,
+                    self._get_notification_item(table_info, req.attribute_map)
+                )
+                for req in write_request_list
+            ]
+        return res
+
     def execute_write_batch(self, context, write_request_map):
         self._notifier.info(
             context,
             notifier.EVENT_TYPE_DATA_BATCHWRITE_START,
-            write_request_map)
+            self._get_notification_write_request_map(context,
+                                                     write_request_map))
         write_request_list_to_send = []
         for table_name, write_request_list in write_request_map.iteritems():
             table_info = self._table_info_repo.get(context, table_name)
@@ -520,50 +612,140 @@ class SimpleStorageManager(StorageManager):
             context,
             notifier.EVENT_TYPE_DATA_BATCHWRITE_END,
             dict(
-                write_request_map=write_request_map,
-                unprocessed_items=unprocessed_items
+                write_request_map=self._get_notification_write_request_map(
+                    context, write_request_map
+                ),
+                unprocessed_items=self._get_notification_write_request_map(
+                    context, unprocessed_items
+                )
             )
         )
 
         return unprocessed_items
 
+    def bulk_load(self, context, table_name, item_iter, max_in_flight=100,
+                  buffer_size=1000):
+        table_info = self._table_info_repo.get(context, table_name)
+        self._validate_table_is_active(table_info)
+
+        in_flight = deque()
+        # key values to item, later item with the same key replaces earlier
+        buffered_items = OrderedDict()
+        replaced_count = [0]
+
+        def write_buffered_items():
+            partition_map = OrderedDict()
+            for key_values, item in buffered_items.iteritems():
+                partition_map.setdefault(key_values[0], []).append(item)
+            buffered_items.clear()
+
+            chunk_size = self._batch_chunk_size
+            for items in partition_map.itervalues():
+                for i in xrange(0, len(items), chunk_size):
+                    if len(in_flight) >= max_in_flight:
+                        yield get_result(len(in_flight) - max_in_flight + 1)
+                    chunk = items[i:i + chunk_size]
+                    in_flight.append(
+                        (chunk, self._batch_write_async(
+                            context,
+                            [(table_info, WriteItemRequest.put(item))
+                             for item in chunk]
+                        ))
+                    )
+
+        def get_result(wait_count):
+            """
+            Returns result of batches which are done or should be waited for
+            """
+            processed_count = replaced_count[0]
+            replaced_count[0] = 0
+            failed_items = []
+            while in_flight and (wait_count > 0 or in_flight[0][1].done()):
+                chunk, future = in_flight.popleft()
+                wait_count -= 1
+                unprocessed_request_list = future.result()
+                processed_count += (
+                    len(chunk) - len(unprocessed_request_list)
+                )
+                failed_items += (
+                    (request.attribute_map, "Item wasn't processed")
+                    for _, request in unprocessed_request_list
+                )
+            return processed_count, failed_items
+
+        for item in item_iter:
+            try:
+                self._validate_table_schema(table_info, item,
+                                            keys_only=False)
+            except ValidationError as e:
+                yield 0, [(item, e.message)]
+                continue
+
+            key_values = tuple(self._key_values(table_info, item))
+            if buffered_items.pop(key_values, None) is not None:
+                replaced_count[0] += 1
+            buffered_items[key_values] = item
+
+            if len(buffered_items) >= buffer_size:
+                for result in write_buffered_items():
+                    yield result
+
+        for result in write_buffered_items():
+            yield result
+        yield get_result(len(in_flight))
+
     def _batch_write_async(self, context, write_request_list):
         future_result = Future()
 
-        batch_future = self._execute_async(
+        for table_info, req in write_request_list:
+            if req.is_put:
+                capacity.add_write(context, table_info, req.attribute_map)
+            else:
+                capacity.add_delete(context, table_info, req.attribute_map)
+
+        batch_future = self._execute_driver_async(
+            self._storage_driver.batch_write_async,
             self._storage_driver.batch_write,
             context, write_request_list
         )
 
+        def emulation_callback(res):
+            future_result.set_result(res.result())
+
         def callback(res):
             try:
                 res.result()
-                unprocessed_items = ()
+                future_result.set_result(())
             except NotImplementedError:
-                unprocessed_items = self._batch_write_in_emulation_mode(
+                self._batch_write_in_emulation_mode(
                     context, write_request_list
-                )
+                ).add_done_callback(emulation_callback)
             except Exception:
                 LOG.exception("Can't process batch write request")
-                unprocessed_items = write_request_list
-            future_result.set_result(unprocessed_items)
+                future_result.set_result(write_request_list)
 
         batch_future.add_done_callback(callback)
 
         return future_result
 
     def _batch_write_in_emulation_mode(self, context, write_request_list):
+        future_result = Future()
         request_count = len(write_request_list)
         done_count = [0]
-        done_event = Event()
+        done_lock = Lock()
         unprocessed_items = []
+
+        if not request_count:
+            future_result.set_result(unprocessed_items)
+            return future_result
+
         for write_request in write_request_list:
             table_info, req = write_request
             if req.is_put:
-                future_result = self._put_item_async(
+                future = self._put_item_async(
                     context, table_info, req.attribute_map)
             elif req.is_delete:
-                future_result = self._delete_item_async(
+                future = self._delete_item_async(
                     context, table_info, req.attribute_map
                 )
 
@@ -574,79 +756,137 @@ class SimpleStorageManager(StorageManager):
                     try:
                         res.result()
                     except Exception:
-                        unprocessed_items.append(_write_request)
                         LOG.exception("Can't process WriteItemRequest")
-                    done_count[0] += 1
-                    if done_count[0] >= request_count:
-                        done_event.set()
+                        with done_lock:
+                            unprocessed_items.append(_write_request)
+                    with done_lock:
+                        done_count[0] += 1
+                        done = done_count[0] >= request_count
+                    if done:
+                        future_result.set_result(unprocessed_items)
                 return callback
 
-            future_result.add_done_callback(make_callback())
+            future.add_done_callback(make_callback())
 
-        done_event.wait()
-        return unprocessed_items
+        return future_result
 
     def execute_get_batch(self, context, read_request_list):
         assert read_request_list
 
-        items = []
+        results = [None] * len(read_request_list)
         unprocessed_items = []
 
         request_count = len(read_request_list)
         done_count = [0]
+        done_lock = Lock()
 
         done_event = Event()
 
-        prepared_batch = []
-
-        for req in read_request_list:
-            def make_request_executor():
-                _req = req
-
-                _table_name = _req.table_name
-                _key_attribute_map = _req.key_attribute_map
-
-                _table_info = self._table_info_repo.get(context, _table_name)
-                self._validate_table_is_active(_table_info)
-                self._validate_table_schema(_table_info, _key_attribute_map)
-
-                _attributes_to_get = req.attributes_to_get
-
-                def callback(res):
-                    try:
-                        items.append((_table_name, res.result()))
-                    except Exception:
-                        unprocessed_items.append(_req)
-                        LOG.exception("Can't process GetItemRequest")
-                    done_count[0] += 1
-                    if done_count[0] >= request_count:
-                        done_event.set()
-
-                def executor():
-                    future_result = self._get_item_async(
-                        context, _table_info,
-                        _key_attribute_map.get(
-                            _table_info.schema.hash_key_name
-                        ),
-                        _key_attribute_map.get(
-                            _table_info.schema.range_key_name
-                        ),
-                        _attributes_to_get, consistent=_req.consistent
-                    )
-                    future_result.add_done_callback(callback)
-                return executor
-            prepared_batch.append(make_request_executor())
+        def make_callback(indexes, to_select_results):
+            def callback(res):
+                try:
+                    select_results = to_select_results(res.result())
+                except Exception:
+                    LOG.exception("Can't process GetItemRequest")
+                    with done_lock:
+                        unprocessed_items.extend(
+                            read_request_list[i] for i in indexes
+                        )
+                else:
+                    for i, select_result in zip(indexes, select_results):
+                        results[i] = (read_request_list[i].table_name,
+                                      select_result)
+                with done_lock:
+                    done_count[0] += len(indexes)
+                    done = done_count[0] >= request_count
+                if done:
+                    done_event.set()
+            return callback
+
+        def items_to_select_results(items):
+            return [
+                SelectResult(items=[], count=0) if item is None else
+                SelectResult(items=[item], count=1)
+                for item in items
+            ]
+
+        def select_result_to_list(select_result):
+            return [select_result]
+
+        # requests are grouped to select all items of the table, which can
+        # be selected the same way, at once
+        table_info_map = {}
+        request_group_map = OrderedDict()
+        for i, req in enumerate(read_request_list):
+            table_info = table_info_map.get(req.table_name)
+            if table_info is None:
+                table_info = self._table_info_repo.get(context,
+                                                       req.table_name)
+                self._validate_table_is_active(table_info)
+                table_info_map[req.table_name] = table_info
+            self._validate_table_schema(table_info, req.key_attribute_map)
+
+            attributes_to_get = req.attributes_to_get
+            group_key = (
+                req.table_name, req.consistent,
+                None if attributes_to_get is None else
+                frozenset(attributes_to_get)
+            )
+            request_group_map.setdefault(group_key, []).append(i)
 
         self._notifier.info(
             context,
             notifier.EVENT_TYPE_DATA_BATCHREAD_START,
             read_request_list)
 
-        for request_executor in prepared_batch:
-            request_executor()
+        for (table_name, consistent, attributes_to_get), indexes in (
+                request_group_map.iteritems()):
+            table_info = table_info_map[table_name]
+            select_type = (
+                SelectType.all() if attributes_to_get is None else
+                SelectType.specific_attributes(attributes_to_get)
+            )
+            try:
+                future = self._execute_driver_async(
+                    self._storage_driver.select_items_async, None,
+                    context, table_info,
+                    [read_request_list[i].key_attribute_map
+                     for i in indexes],
+                    select_type, consistent=consistent
+                )
+            except NotImplementedError:
+                pass
+            else:
+                future.add_done_callback(
+                    make_callback(indexes, items_to_select_results)
+                )
+                continue
+
+            for i in indexes:
+                key_attribute_map = read_request_list[i].key_attribute_map
+                future = self._get_item_async(
+                    context, table_info,
+                    key_attribute_map.get(table_info.schema.hash_key_name),
+                    key_attribute_map.get(table_info.schema.range_key_name),
+                    read_request_list[i].attributes_to_get,
+                    consistent=consistent
+                )
+                future.add_done_callback(
+                    make_callback([i], select_result_to_list)
+                )
 
         done_event.wait()
 
+        for i, result in enumerate(results):
+            if result is not None:
+                table_name, select_result = result
+                table_info = table_info_map[table_name]
+                capacity.add_read(
+                    context, table_info, select_result.items,
+                    capacity.is_strong_read(table_info,
+                                            read_request_list[i].consistent)
+                )
+
         self._notifier.info(
             context,
             notifier.EVENT_TYPE_DATA_BATCHREAD_END,
@@ -656,10 +896,12 @@ class SimpleStorageManager(StorageManager):
             )
         )
 
-        return items, unprocessed_items
+        return ([result for result in results if result is not None],
+                unprocessed_items)
 
     def update_item(self, context, table_name, key_attribute_map,
-                    attribute_action_map, expected_condition_map=None):
+                    attribute_action_map, expected_condition_map=None,
+                    return_values=None, consistency_level=None):
         table_info = self._table_info_repo.get(context, table_name)
         self._validate_table_is_active(table_info)
         self._validate_table_schema(table_info, key_attribute_map)
@@ -667,15 +909,27 @@ class SimpleStorageManager(StorageManager):
         with self.__task_semaphore:
             result = self._storage_driver.update_item(
                 context, table_info, key_attribute_map, attribute_action_map,
-                expected_condition_map
+                expected_condition_map, return_values, consistency_level
             )
+        written_attribute_map = dict(key_attribute_map)
+        written_attribute_map.update(
+            (name, action.value)
+            for name, action in attribute_action_map.iteritems()
+            if action.value is not None
+        )
+        capacity.add_write(context, table_info, written_attribute_map,
+                           index_attributes=attribute_action_map)
         self._notifier.info(
             context,
             notifier.EVENT_TYPE_DATA_UPDATEITEM,
             dict(
                 table_name=table_name,
                 key_attribute_map=key_attribute_map,
-                attribute_action_map=attribute_action_map,
+                attribute_action_map=(
+                    sorted(attribute_action_map)
+                    if cfg.CONF.notification_payload_keys_only
+                    else attribute_action_map
+                ),
                 expected_condition_map=expected_condition_map
             )
         )
@@ -691,10 +945,8 @@ class SimpleStorageManager(StorageManager):
             table_schema=table_info.schema
         )
 
-    def query(self, context, table_name, indexed_condition_map,
-              select_type, index_name=None, limit=None,
-              exclusive_start_key=None, consistent=True,
-              order_type=None):
+    def _validate_query(self, context, table_name, indexed_condition_map,
+                        index_name, exclusive_start_key):
         table_info = self._table_info_repo.get(context, table_name)
         self._validate_table_is_active(table_info)
 
@@ -762,12 +1014,26 @@ class SimpleStorageManager(StorageManager):
                 table_info, exclusive_start_key, index_name=index_name
             )
 
+        return table_info, hash_key_condition_list, range_condition_list
+
+    def query(self, context, table_name, indexed_condition_map,
+              select_type, index_name=None, limit=None,
+              exclusive_start_key=None, consistent=True,
+              order_type=None):
+        table_info, hash_key_condition_list, range_condition_list = (
+            self._validate_query(context, table_name, indexed_condition_map,
+                                 index_name, exclusive_start_key)
+        )
+
         with self.__task_semaphore:
             result = self._storage_driver.select_item(
                 context, table_info, hash_key_condition_list,
                 range_condition_list, select_type,
                 index_name, limit, exclusive_start_key, consistent, order_type
             )
+        capacity.add_read(context, table_info, result.items,
+                          capacity.is_strong_read(table_info, consistent),
+                          index_name)
         self._notifier.info(
             context,
             notifier.EVENT_TYPE_DATA_QUERY,
@@ -785,6 +1051,55 @@ class SimpleStorageManager(StorageManager):
 
         return result
 
+    def query_stream(self, context, table_name, indexed_condition_map,
+                     select_type, index_name=None, limit=None,
+                     exclusive_start_key=None, consistent=True,
+                     order_type=None):
+        table_info, hash_key_condition_list, range_condition_list = (
+            self._validate_query(context, table_name, indexed_condition_map,
+                                 index_name, exclusive_start_key)
+        )
+
+        result = self._storage_driver.select_item_stream(
+            context, table_info, hash_key_condition_list,
+            range_condition_list, select_type,
+            index_name, limit, exclusive_start_key, consistent, order_type
+        )
+        result.items = self._notify_on_stream_end(
+            context,
+            self._add_stream_read_capacity(context, table_info, result.items,
+                                           consistent, index_name),
+            notifier.EVENT_TYPE_DATA_QUERY,
+            dict(
+                table_name=table_name,
+                indexed_condition_map=indexed_condition_map,
+                select_type=select_type,
+                index_name=index_name,
+                limit=limit,
+                exclusive_start_key=exclusive_start_key,
+                consistent=consistent,
+                order_type=order_type
+            )
+        )
+        return result
+
+    def _notify_on_stream_end(self, context, items, event_type, payload):
+        for item in items:
+            yield item
+        self._notifier.info(context, event_type, payload)
+
+    @staticmethod
+    def _add_stream_read_capacity(context, table_info, items, consistent,
+                                  index_name=None):
+        size = 0
+        for item in items:
+            size += capacity.item_size(item)
+            yield item
+        capacity.add_read_size(
+            context, table_info, size,
+            capacity.is_strong_read(table_info, consistent), index_name
+        )
+
     def get_item(self, context, table_name, key_attribute_map,
                  select_type, consistent=True):
         table_info = self._table_info_repo.get(context, table_name)
@@ -815,6 +1130,8 @@ class SimpleStorageManager(StorageManager):
                 range_condition_list, select_type,
                 consistent=consistent
             )
+        capacity.add_read(context, table_info, result.items,
+                          capacity.is_strong_read(table_info, consistent))
         self._notifier.info(
             context,
             notifier.EVENT_TYPE_DATA_GETITEM,
@@ -849,7 +1166,8 @@ class SimpleStorageManager(StorageManager):
             None if range_key is None else [IndexedCondition.eq(range_key)]
         )
 
-        result = self._execute_async(
+        result = self._execute_driver_async(
+            self._storage_driver.select_item_async,
             self._storage_driver.select_item,
             context, table_info, hash_key_condition_list,
             range_key_condition_list, select_type, consistent=consistent
@@ -860,21 +1178,43 @@ class SimpleStorageManager(StorageManager):
             payload)
         return result
 
-    def scan(self, context, table_name, condition_map, attributes_to_get=None,
-             limit=None, exclusive_start_key=None,
-             consistent=False):
+    def _validate_scan(self, context, table_name, exclusive_start_key,
+                       segment, total_segments):
         table_info = self._table_info_repo.get(context, table_name)
         self._validate_table_is_active(table_info)
 
         if exclusive_start_key is not None:
             self._validate_table_schema(table_info, exclusive_start_key)
 
+        if (segment is None) != (total_segments is None):
+            raise ValidationError(
+                _("Segment and TotalSegments should be specified together")
+            )
+        if total_segments is not None and not (
+                0 <= segment < total_segments):
+            raise ValidationError(
+                _("Segment should be less than TotalSegments, "
+                  "but %(segment)s and %(total_segments)s given"),
+                segment=segment, total_segments=total_segments
+            )
+
+        return table_info
+
+    def scan(self, context, table_name, condition_map, attributes_to_get=None,
+             limit=None, exclusive_start_key=None,
+             consistent=False, segment=None, total_segments=None):
+        table_info = self._validate_scan(context, table_name,
+                                         exclusive_start_key, segment,
+                                         total_segments)
+
         payload = dict(table_name=table_name,
                        condition_map=condition_map,
                        attributes_to_get=attributes_to_get,
                        limit=limit,
                        exclusive_start_key=exclusive_start_key,
-                       consistent=consistent)
+                       consistent=consistent,
+                       segment=segment,
+                       total_segments=total_segments)
         self._notifier.info(
             context,
             notifier.EVENT_TYPE_DATA_SCAN_START,
@@ -883,8 +1223,11 @@ class SimpleStorageManager(StorageManager):
         with self.__task_semaphore:
             result = self._storage_driver.scan(
                 context, table_info, condition_map, attributes_to_get,
-                limit, exclusive_start_key, consistent
+                limit, exclusive_start_key, consistent, segment,
+                total_segments
             )
+        capacity.add_read(context, table_info, result.items,
+                          capacity.is_strong_read(table_info, consistent))
         self._notifier.info(
             context,
             notifier.EVENT_TYPE_DATA_SCAN_END,
@@ -892,6 +1235,40 @@ class SimpleStorageManager(StorageManager):
 
         return result
 
+    def scan_stream(self, context, table_name, condition_map,
+                    attributes_to_get=None, limit=None,
+                    exclusive_start_key=None, consistent=False,
+                    segment=None, total_segments=None):
+        table_info = self._validate_scan(context, table_name,
+                                         exclusive_start_key, segment,
+                                         total_segments)
+
+        payload = dict(table_name=table_name,
+                       condition_map=condition_map,
+                       attributes_to_get=attributes_to_get,
+                       limit=limit,
+                       exclusive_start_key=exclusive_start_key,
+                       consistent=consistent,
+                       segment=segment,
+                       total_segments=total_segments)
+        self._notifier.info(
+            context,
+            notifier.EVENT_TYPE_DATA_SCAN_START,
+            payload)
+
+        result = self._storage_driver.scan_stream(
+            context, table_info, condition_map, attributes_to_get,
+            limit, exclusive_start_key, consistent, segment,
+            total_segments
+        )
+        result.items = self._notify_on_stream_end(
+            context,
+            self._add_stream_read_capacity(context, table_info, result.items,
+                                           consistent),
+            notifier.EVENT_TYPE_DATA_SCAN_END, payload
+        )
+        return result
+
     def health_check(self):
         return self._storage_driver.health_check()
 
@@ -899,6 +1276,176 @@ class SimpleStorageManager(StorageManager):
         table_info = self._table_info_repo.get(context, table_name)
         self._validate_table_is_active(table_info)
 
-        return self._storage_driver.get_table_statistics(context,
-                                                         table_info,
-                                                         keys)
+        # capacity units are aggregated in memory of the process, other
+        # metrics are requested from the storage
+        storage_keys = [key for key in keys if key not in capacity.METRICS]
+        result = {}
+        if storage_keys:
+            result.update(self._storage_driver.get_table_statistics(
+                context, table_info, storage_keys
+            ))
+
+        usage = capacity.USAGE.get(context.tenant, table_name)
+        for key in keys:
+            if key in capacity.METRICS:
+                result[key] = usage[key]
+        return result
+
+    def _validate_backups_supported(self):
+        if self._backup_info_repo is None:
+            raise NotImplementedError(
+                "Backup info repository isn't configured"
+            )
+
+    def _do_create_backup(self, context, backup_info):
+        """
+        Backups are executed by magnetodb-async-task-executor, see
+        QueuedStorageManager
+        """
+        raise NotImplementedError()
+
+    def _do_delete_backup(self, context, backup_info):
+        raise NotImplementedError()
+
+    def _do_create_restore_job(self, context, restore_job_info):
+        raise NotImplementedError()
+
+    def _do_create_export(self, context, export_info):
+        raise NotImplementedError()
+
+    def create_backup(self, context, table_name, backup_name, strategy=None):
+        self._validate_backups_supported()
+
+        table_info = self._table_info_repo.get(context, table_name)
+        self._validate_table_is_active(table_info)
+
+        backup_info = BackupInfo(
+            uuid.uuid4(), backup_name, table_name,
+            BackupInfo.STATUS_CREATING, strategy=strategy,
+            start_date_time=datetime.now()
+        )
+        self._backup_info_repo.save_backup(context, backup_info)
+
+        try:
+            self._do_create_backup(context, backup_info)
+        except Exception:
+            backup_info.status = BackupInfo.STATUS_CREATE_FAILED
+            backup_info.finish_date_time = datetime.now()
+            self._backup_info_repo.update_backup(
+                context, backup_info, ["status", "finish_date_time"]
+            )
+            raise
+
+        return backup_info
+
+    def describe_backup(self, context, table_name, backup_id):
+        self._validate_backups_supported()
+        return self._backup_info_repo.get_backup(context, table_name,
+                                                 backup_id)
+
+    def list_backups(self, context, table_name,
+                     exclusive_start_backup_id=None, limit=None):
+        self._validate_backups_supported()
+        return self._backup_info_repo.list_backups(
+            context, table_name, exclusive_start_backup_id, limit
+        )
+
+    def delete_backup(self, context, table_name, backup_id):
+        self._validate_backups_supported()
+
+        backup_info = self._backup_info_repo.get_backup(context, table_name,
+                                                        backup_id)
+        if backup_info.status == BackupInfo.STATUS_CREATING:
+            raise ResourceInUseException()
+
+        backup_info.status = BackupInfo.STATUS_DELETING
+        self._backup_info_repo.update_backup(context, backup_info,
+                                             ["status"])
+        self._do_delete_backup(context, backup_info)
+        return backup_info
+
+    def create_restore_job(self, context, table_name, backup_id=None,
+                           source=None, strategy=None):
+        self._validate_backups_supported()
+
+        table_info = self._table_info_repo.get(context, table_name)
+        self._validate_table_is_active(table_info)
+
+        if backup_id is not None:
+            backup_info = self._backup_info_repo.get_backup(
+                context, table_name, backup_id
+            )
+            if backup_info.status != BackupInfo.STATUS_ACTIVE:
+                raise ValidationError(
+                    _("Can't restore backup '%(backup_id)s' in status "
+                      "'%(status)s'"),
+                    backup_id=backup_id, status=backup_info.status
+                )
+            source = backup_info.location
+        elif source is None:
+            raise ValidationError(
+                _("Backup id or source should be specified")
+            )
+
+        restore_job_info = RestoreJobInfo(
+            uuid.uuid4(), backup_id, table_name,
+            RestoreJobInfo.STATUS_RESTORING, strategy=strategy,
+            source=source, start_date_time=datetime.now()
+        )
+        self._backup_info_repo.save_restore_job(context, restore_job_info)
+
+        try:
+            self._do_create_restore_job(context, restore_job_info)
+        except Exception:
+            restore_job_info.status = RestoreJobInfo.STATUS_FAILED
+            restore_job_info.finish_date_time = datetime.now()
+            self._backup_info_repo.update_restore_job(
+                context, restore_job_info, ["status", "finish_date_time"]
+            )
+            raise
+
+        return restore_job_info
+
+    def describe_restore_job(self, context, table_name, restore_job_id):
+        self._validate_backups_supported()
+        return self._backup_info_repo.get_restore_job(context, table_name,
+                                                      restore_job_id)
+
+    def list_restore_jobs(self, context, table_name,
+                          exclusive_start_restore_job_id=None, limit=None):
+        self._validate_backups_supported()
+        return self._backup_info_repo.list_restore_jobs(
+            context, table_name, exclusive_start_restore_job_id, limit
+        )
+
+    def create_export(self, context, table_name, total_segments=None,
+                      compress=False):
+        self._validate_backups_supported()
+
+        table_info = self._table_info_repo.get(context, table_name)
+        self._validate_table_is_active(table_info)
+
+        export_info = ExportInfo(
+            uuid.uuid4(), table_name, ExportInfo.STATUS_IN_PROGRESS,
+            total_segments=total_segments, compress=compress,
+            start_date_time=datetime.now()
+        )
+        self._backup_info_repo.save_export(context, export_info)
+
+        try:
+            self._do_create_export(context, export_info)
+        except Exception as e:
+            export_info.status = ExportInfo.STATUS_FAILED
+            export_info.error = str(e)
+            export_info.finish_date_time = datetime.now()
+            self._backup_info_repo.update_export(
+                context, export_info, ["status", "error", "finish_date_time"]
+            )
+            raise
+
+        return export_info
+
+    def describe_export(self, context, table_name, export_id):
+        self._validate_backups_supported()
+        return self._backup_info_repo.get_export(context, table_name,
+                                                 export_id)
@@ -32,6 +32,8 @@ DECIMAL_CONTEXT = decimal.Context(
 
 
 class ModelBase(object):
+    # subclasses without __slots__ still get __dict__
+    __slots__ = ()
 
     def __repr__(self):
         return self.to_json(add_model_meta_info=False)
@@ -47,7 +49,10 @@ class ModelBase(object):
             raise AttributeError("Object is read only")
 
     def __getattr__(self, key):
-        return self._data[key]
+        try:
+            return self._data[key]
+        except KeyError:
+            raise AttributeError(key)
 
     def __getitem__(self, key):
         return self._data[key]
@@ -164,9 +169,15 @@ class AttributeType(ModelBase):
         return attr_type
 
     def __init__(self, type):
+        if "_data" in self.__dict__:
+            # instance is taken from cache and has been initialized already
+            return
         self.validate(type)
         super(AttributeType, self).__init__(type=type)
 
+    def __reduce__(self):
+        return AttributeType, (self.type,)
+
     @property
     def collection_type(self):
         return self.type[-1] if len(self.type) > 1 else None
@@ -189,6 +200,10 @@ ORDER_TYPE_DESC = "DESC"
 
 
 class AttributeValue(ModelBase):
+    # instance is created for each attribute of each item read from the
+    # storage, so values are kept in slots instead of per instance dict
+    __slots__ = ("attr_type", "_encoded_value", "_decoded_value", "_hash")
+
     def __init__(self, attr_type, value=None, encoded_value=None,
                  decoded_value=None):
         if not isinstance(attr_type, AttributeType):
@@ -198,10 +213,24 @@ class AttributeValue(ModelBase):
             decoded_value = self.__decode_value(attr_type, value)
             encoded_value = None
 
-        super(AttributeValue, self).__init__(
-            attr_type=attr_type, encoded_value=encoded_value,
-            decoded_value=decoded_value
-        )
+        _setattr = object.__setattr__
+        _setattr(self, "attr_type", attr_type)
+        _setattr(self, "_encoded_value", encoded_value)
+        _setattr(self, "_decoded_value", decoded_value)
+        _setattr(self, "_hash", None)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("Object is read only")
+
+    def __getattr__(self, key):
+        raise AttributeError(key)
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def __reduce__(self):
+        return AttributeValue, (self.attr_type, None, self._encoded_value,
+                                self._decoded_value)
 
     def __eq__(self, other):
         return (
@@ -212,7 +241,9 @@ class AttributeValue(ModelBase):
 
     def __hash__(self):
         if not self._hash:
-            self._hash = hash((self.attr_type, self.decoded_value))
+            object.__setattr__(
+                self, "_hash", hash((self.attr_type, self.decoded_value))
+            )
 
         return self._hash
 
@@ -282,15 +313,14 @@ class AttributeValue(ModelBase):
 
     @property
     def decoded_value(self):
-        decoded_value = self._data["decoded_value"]
+        decoded_value = self._decoded_value
         if decoded_value is not None:
             return decoded_value
-        encoded_value = self._data["encoded_value"]
-        attr_type = self._data["attr_type"]
 
-        decoded_value = self.__decode_value(attr_type, encoded_value)
+        decoded_value = self.__decode_value(self.attr_type,
+                                            self._encoded_value)
 
-        self._data["decoded_value"] = decoded_value
+        object.__setattr__(self, "_decoded_value", decoded_value)
         return decoded_value
 
     @staticmethod
@@ -326,15 +356,14 @@ class AttributeValue(ModelBase):
 
     @property
     def encoded_value(self):
-        encoded_value = self._data["encoded_value"]
+        encoded_value = self._encoded_value
         if encoded_value is not None:
             return encoded_value
-        decoded_value = self._data["decoded_value"]
-        attr_type = self._data["attr_type"]
 
-        encoded_value = self.__encode_value(attr_type, decoded_value)
+        encoded_value = self.__encode_value(self.attr_type,
+                                            self._decoded_value)
 
-        self._data["encoded_value"] = encoded_value
+        object.__setattr__(self, "_encoded_value", encoded_value)
         return encoded_value
 
     @property
@@ -764,9 +793,114 @@ class ScanResult(SelectResult):
                                          scanned_count=scanned_count)
 
 
+class ScanResultStream(object):
+    """
+    Lazily evaluated result of scan or query. Items are produced while
+    iterating over items attribute. count, scanned_count and
+    last_evaluated_key are final only after items are exhausted
+    """
+
+    def __init__(self):
+        self.items = iter(())
+        self.count = 0
+        self.scanned_count = 0
+        self.last_evaluated_key = None
+
+
+class ConsistencyLevels(ModelBase):
+    LEVEL_ONE = "ONE"
+    LEVEL_LOCAL_ONE = "LOCAL_ONE"
+    LEVEL_QUORUM = "QUORUM"
+    LEVEL_LOCAL_QUORUM = "LOCAL_QUORUM"
+    LEVEL_EACH_QUORUM = "EACH_QUORUM"
+    LEVEL_ALL = "ALL"
+    LEVEL_SERIAL = "SERIAL"
+    LEVEL_LOCAL_SERIAL = "LOCAL_SERIAL"
+
+    _allowed_levels = set([LEVEL_ONE, LEVEL_LOCAL_ONE, LEVEL_QUORUM,
+                           LEVEL_LOCAL_QUORUM, LEVEL_EACH_QUORUM, LEVEL_ALL])
+    _allowed_serial_levels = set([LEVEL_SERIAL, LEVEL_LOCAL_SERIAL])
+    # reads at these levels see all acknowledged writes of the same or
+    # stronger level
+    _strong_read_levels = set([LEVEL_QUORUM, LEVEL_LOCAL_QUORUM,
+                               LEVEL_EACH_QUORUM, LEVEL_ALL, LEVEL_SERIAL,
+                               LEVEL_LOCAL_SERIAL])
+
+    def __init__(self, read=None, write=None, serial=None):
+        """
+        :param read: name of consistency level of consistent reads
+        :param write: name of consistency level of writes, including
+                    commit of conditional writes
+        :param serial: name of consistency level of conditions of
+                    conditional writes, SERIAL or LOCAL_SERIAL
+
+        If level is 'None' - level of operation profile of the cluster
+        handler will be used
+        """
+        kwargs = {}
+        for name, level in (("read", read), ("write", write)):
+            if level is not None:
+                self.validate_level(level, allow_serial=(name == "read"))
+                kwargs[name] = level
+        if serial is not None:
+            if serial not in self._allowed_serial_levels:
+                raise ValidationError(
+                    _("Serial consistency level '%(level)s' isn't allowed"),
+                    level=serial
+                )
+            kwargs["serial"] = serial
+
+        super(ConsistencyLevels, self).__init__(**kwargs)
+
+    @classmethod
+    def validate_level(cls, level, allow_serial=True):
+        """
+        Validates name of consistency level of single request. Serial
+        levels make reads linearizable and define level of conditions of
+        conditional writes
+        """
+        if (level not in cls._allowed_levels and
+                not (allow_serial and level in cls._allowed_serial_levels)):
+            raise ValidationError(
+                _("Consistency level '%(level)s' isn't allowed"),
+                level=level
+            )
+
+    @classmethod
+    def is_serial(cls, level):
+        return level in cls._allowed_serial_levels
+
+    @classmethod
+    def is_strong_read(cls, level):
+        return level in cls._strong_read_levels
+
+    @property
+    def read(self):
+        return self._data.get("read")
+
+    @property
+    def write(self):
+        return self._data.get("write")
+
+    @property
+    def serial(self):
+        return self._data.get("serial")
+
+    def __nonzero__(self):
+        return bool(self._data)
+
+
 class TableSchema(ModelBase):
+    # each index row is full copy of the item
+    INDEX_LAYOUT_FULL = "full"
+    # index row contains only key and projected attributes of the item
+    INDEX_LAYOUT_PROJECTED = "projected"
+
+    _allowed_index_layouts = set([INDEX_LAYOUT_FULL, INDEX_LAYOUT_PROJECTED])
 
-    def __init__(self, attribute_type_map, key_attributes, index_def_map=None):
+    def __init__(self, attribute_type_map, key_attributes, index_def_map=None,
+                 counter_attributes=None, index_layout=None,
+                 consistency_levels=None):
         """
         :param attribute_type_map: attribute name to AttributeType mapping
         :param key_attrs: list of key attribute names, contains partition key
@@ -774,11 +908,30 @@ class TableSchema(ModelBase):
                     attribute names (the second and other list items, not
                     required)
         :param index_def_map: index name to IndexDefinition mapping
+        :param counter_attributes: set of counter attribute names. If it
+                    isn't empty, table is counter table: all non key
+                    attributes are numeric counters, which can be changed
+                    only by atomic increments
+        :param index_layout: layout of local secondary index rows in the
+                    storage, one of INDEX_LAYOUT_* values. If 'None' -
+                    INDEX_LAYOUT_FULL will be used
+        :param consistency_levels: ConsistencyLevels instance, default
+                    consistency levels of queries of the table
         """
 
         if index_def_map is None:
             index_def_map = {}
 
+        if index_layout is None:
+            index_layout = self.INDEX_LAYOUT_FULL
+        if index_layout not in self._allowed_index_layouts:
+            raise ValidationError(
+                _("Index layout '%(index_layout)s' isn't allowed"),
+                index_layout=index_layout
+            )
+
+        counter_attributes = frozenset(counter_attributes or ())
+
         for key_attr in key_attributes:
             if key_attr not in attribute_type_map:
                 raise ValidationError(
@@ -802,10 +955,69 @@ class TableSchema(ModelBase):
                     attr_name=index_def.alt_range_key_attr
                 )
 
+        if counter_attributes:
+            if index_def_map:
+                raise ValidationError("Local secondary indexes are not "
+                                      "allowed for counter tables")
+            for attr_name, attr_type in attribute_type_map.iteritems():
+                if attr_name in key_attributes:
+                    if attr_name in counter_attributes:
+                        raise ValidationError(
+                            "Key attribute['%(attr_name)s'] can't be "
+                            "counter", attr_name=attr_name
+                        )
+                elif attr_name not in counter_attributes:
+                    raise ValidationError(
+                        "Attribute['%(attr_name)s'] of counter table "
+                        "should be counter", attr_name=attr_name
+                    )
+                elif attr_type != AttributeType('N'):
+                    raise ValidationError(
+                        "Counter attribute['%(attr_name)s'] should be of "
+                        "type 'N'", attr_name=attr_name
+                    )
+            for attr_name in counter_attributes:
+                if attr_name not in attribute_type_map:
+                    raise ValidationError(
+                        "Definition for attribute['%(attr_name)s'] wasn't "
+                        "found", attr_name=attr_name
+                    )
+
+        kwargs = {}
+        # schemas of regular tables are kept without these properties to
+        # stay compatible with already saved ones
+        if counter_attributes:
+            kwargs["counter_attributes"] = counter_attributes
+        if index_def_map and index_layout != self.INDEX_LAYOUT_FULL:
+            kwargs["index_layout"] = index_layout
+        if consistency_levels:
+            kwargs["consistency_levels"] = consistency_levels
+
         super(TableSchema, self).__init__(
             attribute_type_map=attribute_type_map,
             key_attributes=key_attributes,
-            index_def_map=index_def_map)
+            index_def_map=index_def_map,
+            **kwargs)
+
+    @property
+    def counter_attributes(self):
+        return self._data.get("counter_attributes", frozenset())
+
+    @property
+    def index_layout(self):
+        return self._data.get("index_layout", self.INDEX_LAYOUT_FULL)
+
+    @property
+    def consistency_levels(self):
+        return self._data.get("consistency_levels", ConsistencyLevels())
+
+    def with_index_layout(self, index_layout):
+        """
+        Returns copy of the schema with given index layout
+        """
+        return TableSchema(self.attribute_type_map, self.key_attributes,
+                           self.index_def_map, self.counter_attributes,
+                           index_layout, self.consistency_levels)
 
     @property
     def hash_key_name(self):
@@ -17,17 +17,37 @@
 import collections
 from copy import copy
 from datetime import datetime
+import os
+import socket
+import time
 
 from threading import Lock
 
 from cassandra import encoder
+from oslo import messaging
 
+from magnetodb.common.cassandra.cluster_handler import OPERATION_LWT
+from magnetodb.common import config
 from magnetodb.common import exception
 from magnetodb.common import probe
+from magnetodb.openstack.common import log as logging
 from magnetodb.storage import models
 from magnetodb.storage.table_info_repo import TableInfo
 from magnetodb.storage.table_info_repo import TableInfoRepository
 
+LOG = logging.getLogger(__name__)
+CONF = config.CONF
+
+
+class _CacheInvalidationEndpoint(object):
+    def __init__(self, table_info_repo):
+        self._table_info_repo = table_info_repo
+
+    def invalidate(self, ctx, tenant, table_name):
+        self._table_info_repo._remove_table_info_from_cache_by_key(
+            (tenant, table_name)
+        )
+
 
 class CassandraTableInfoRepository(TableInfoRepository):
     SYSTEM_TABLE_TABLE_INFO = 'magnetodb.table_info'
@@ -36,47 +56,116 @@ class CassandraTableInfoRepository(TableInfoRepository):
     __creating_to_active_field_list_to_update = ("internal_name", "status")
 
     def _save_table_info_to_cache(self, context, table_info):
-        tenant_tables_cache = self.__table_info_cache.get(context.tenant)
-        if tenant_tables_cache is None:
-            tenant_tables_cache = {}
-            self.__table_info_cache[context.tenant] = tenant_tables_cache
-
-        tenant_tables_cache[table_info.name] = table_info
+        key = (context.tenant, table_info.name)
+        expires_at = time.time() + self.__cache_ttl
+        with self.__cache_lock:
+            self.__table_info_cache.pop(key, None)
+            self.__table_info_cache[key] = (table_info, expires_at)
+            while len(self.__table_info_cache) > self.__cache_size:
+                self.__table_info_cache.popitem(last=False)
 
     def _get_table_info_from_cache(self, context, table_name):
-        tenant_tables_cache = self.__table_info_cache.get(context.tenant)
-        if tenant_tables_cache is None:
-            return None
-        table_info_cached = tenant_tables_cache.get(table_name)
-        if table_info_cached is None:
-            return table_info_cached
-
-        return copy(table_info_cached)
+        """
+        Returns copy of cached table info and flag which is True if cached
+        table info should be validated against the repository
+        """
+        key = (context.tenant, table_name)
+        with self.__cache_lock:
+            entry = self.__table_info_cache.pop(key, None)
+            if entry is None:
+                return None, False
+            # move to the end of LRU order
+            self.__table_info_cache[key] = entry
+
+        table_info_cached, expires_at = entry
+        return copy(table_info_cached), expires_at <= time.time()
+
+    def _remove_table_info_from_cache_by_key(self, key):
+        with self.__cache_lock:
+            entry = self.__table_info_cache.pop(key, None)
+        return entry[0] if entry else None
 
     def _remove_table_info_from_cache(self, context, table_name):
-        tenant_tables_cache = self.__table_info_cache.get(context.tenant)
-        if tenant_tables_cache is None:
-            return None
+        return self._remove_table_info_from_cache_by_key(
+            (context.tenant, table_name)
+        )
 
-        return tenant_tables_cache.pop(table_name, None)
+    def _invalidate_table_info(self, context, table_name):
+        self._remove_table_info_from_cache(context, table_name)
+        if self.__invalidation_client is None:
+            return
+        try:
+            self.__invalidation_client.cast(
+                {}, 'invalidate', tenant=context.tenant, table_name=table_name
+            )
+        except Exception:
+            LOG.exception(
+                "Can't send table info cache invalidation for table '%s'",
+                table_name
+            )
 
-    def __init__(self, cluster_handler):
+    def __init__(self, cluster_handler, cache_size=1000, cache_ttl=60,
+                 invalidation_topic=None):
+        """
+        :param cluster_handler: ClusterHandler instance
+        :param cache_size: max number of table infos kept in the cache,
+                    least recently used ones are evicted
+        :param cache_ttl: seconds after which cached table info is validated
+                    against last_update_date_time stored in the repository
+        :param invalidation_topic: messaging topic used to notify other
+                    processes about changed table infos. If it isn't
+                    specified, other processes learn about changes only after
+                    cache_ttl
+        """
         self.__cluster_handler = cluster_handler
-        self.__table_info_cache = {}
+        self.__cache_size = cache_size
+        self.__cache_ttl = cache_ttl
+        self.__table_info_cache = collections.OrderedDict()
+        self.__cache_lock = Lock()
         self.__table_cache_lock = Lock()
 
+        self.__invalidation_client = None
+        if invalidation_topic:
+            self.__start_invalidation_listener(invalidation_topic)
+
+    def __start_invalidation_listener(self, topic):
+        transport = messaging.get_transport(CONF)
+        self.__invalidation_client = messaging.RPCClient(
+            transport, messaging.Target(topic=topic, fanout=True)
+        )
+
+        target = messaging.Target(
+            topic=topic,
+            server="{}.{}".format(socket.gethostname(), os.getpid())
+        )
+        self.__invalidation_server = messaging.get_rpc_server(
+            transport, target, [_CacheInvalidationEndpoint(self)],
+            executor='eventlet'
+        )
+        self.__invalidation_server.start()
+
     def get(self, context, table_name, fields_to_refresh=tuple()):
-        table_info = self._get_table_info_from_cache(context, table_name)
+        table_info, expired = self._get_table_info_from_cache(context,
+                                                              table_name)
         if table_info is None:
             with self.__table_cache_lock:
-                table_info = self._get_table_info_from_cache(context,
-                                                             table_name)
+                table_info, expired = self._get_table_info_from_cache(
+                    context, table_name
+                )
                 if table_info is None:
                     table_info = TableInfo(table_name, None, None, None)
                     self.__refresh(context, table_info)
-                    self._save_table_info_to_cache(context, table_info)
+                    self._save_table_info_to_cache(context, copy(table_info))
                     return table_info
 
+        if expired:
+            last_update_date_time = self.__get_last_update_date_time(
+                context, table_name
+            )
+            if last_update_date_time != table_info.last_update_date_time:
+                self.__refresh(context, table_info)
+            self._save_table_info_to_cache(context, copy(table_info))
+
         if table_info.status == models.TableMeta.TABLE_STATUS_CREATING:
             fields_to_refresh = set(fields_to_refresh)
             fields_to_refresh.update(
@@ -87,6 +176,22 @@ class CassandraTableInfoRepository(TableInfoRepository):
 
         return table_info
 
+    def __get_last_update_date_time(self, context, table_name):
+        result = self.__cluster_handler.execute_query(
+            "SELECT last_update_date_time FROM {}"
+            " WHERE tenant='{}' AND name='{}'".format(
+                self.SYSTEM_TABLE_TABLE_INFO, context.tenant, table_name
+            ),
+            consistent=True
+        )
+
+        if not result:
+            self._remove_table_info_from_cache(context, table_name)
+            raise exception.TableNotExistsException(
+                "Table '{}' does not exist".format(table_name)
+            )
+        return result[0]['last_update_date_time']
+
     @probe.Probe(__name__)
     def get_tenant_table_names(self, context, exclusive_start_table_name=None,
                                limit=None):
@@ -171,14 +276,15 @@ class CassandraTableInfoRepository(TableInfoRepository):
         )
 
         result = self.__cluster_handler.execute_query(
-            "".join(query_builder), consistent=True
+            "".join(query_builder), consistent=True,
+            operation=OPERATION_LWT
         )
 
         if not result[0]['[applied]']:
             raise exception.TableNotExistsException(
                 "Table {} is not exists".format(table_info.name)
             )
-        self._remove_table_info_from_cache(context, table_info.name)
+        self._invalidate_table_info(context, table_info.name)
         return True
 
     def save(self, context, table_info):
@@ -226,7 +332,8 @@ class CassandraTableInfoRepository(TableInfoRepository):
         query_builder.append(") IF NOT EXISTS")
 
         result = self.__cluster_handler.execute_query(
-            "".join(query_builder), consistent=True
+            "".join(query_builder), consistent=True,
+            operation=OPERATION_LWT
         )
 
         if not result[0]['[applied]']:
@@ -234,6 +341,7 @@ class CassandraTableInfoRepository(TableInfoRepository):
                 "Table {} already exists".format(table_info.name)
             )
 
+        self._invalidate_table_info(context, table_info.name)
         self._save_table_info_to_cache(context, copy(table_info))
         return True
 
@@ -245,5 +353,5 @@ class CassandraTableInfoRepository(TableInfoRepository):
             )
         )
         self.__cluster_handler.execute_query(query, consistent=True)
-        self._remove_table_info_from_cache(context, table_name)
+        self._invalidate_table_info(context, table_name)
         return True
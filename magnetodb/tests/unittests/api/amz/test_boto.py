@@ -567,7 +567,8 @@ class BotoIntegrationTest(unittest.TestCase):
             IgnoreArg(), IgnoreArg(),
             key_attribute_map=IgnoreArg(),
             attribute_action_map=IgnoreArg(),
-            expected_condition_map=IgnoreArg()).AndReturn((True, None))
+            expected_condition_map=IgnoreArg(),
+            return_values=IgnoreArg()).AndReturn((True, None))
 
         self.storage_mocker.ReplayAll()
 
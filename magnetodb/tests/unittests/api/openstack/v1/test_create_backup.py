@@ -15,13 +15,25 @@
 
 import httplib
 import json
+import uuid
 
+import mock
+
+from magnetodb.storage.backup_info_repo import BackupInfo
 from magnetodb.tests.unittests.api.openstack.v1 import test_base_testcase
 
 
 class CreateBackupTest(test_base_testcase.APITestCase):
     """The test for v1 ReST API CreateBackupController."""
-    def test_create_backup(self):
+
+    @mock.patch('magnetodb.storage.create_backup')
+    def test_create_backup(self, mock_create_backup):
+        backup_id = uuid.UUID('00000000-0000-0000-0000-000000000001')
+        mock_create_backup.return_value = BackupInfo(
+            backup_id, 'the_backup', 'default_table',
+            BackupInfo.STATUS_CREATING, strategy={}
+        )
+
         headers = {'Content-Type': 'application/json',
                    'Accept': 'application/json'}
 
@@ -40,4 +52,22 @@ class CreateBackupTest(test_base_testcase.APITestCase):
 
         json_response = response.read()
         response_model = json.loads(json_response)
-        self.assertEqual({}, response_model)
+
+        expected = {
+            'backup_id': str(backup_id),
+            'backup_name': 'the_backup',
+            'table_name': 'default_table',
+            'status': 'CREATING',
+            'strategy': {},
+            'start_date_time': None,
+            'item_count': 0,
+            'completed_segments': 0,
+            'links': [
+                {'rel': 'self',
+                 'href': 'http://localhost:8080' + url + '/' + str(backup_id)}
+            ]
+        }
+        self.assertEqual(expected, response_model)
+
+        args = mock_create_backup.call_args[0]
+        self.assertEqual(('default_table', 'the_backup', {}), args[1:])
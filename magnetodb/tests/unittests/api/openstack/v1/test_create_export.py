@@ -0,0 +1,126 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import httplib
+import json
+import uuid
+
+import mock
+
+from magnetodb.common import exception
+from magnetodb.storage.backup_info_repo import ExportInfo
+from magnetodb.tests.unittests.api.openstack.v1 import test_base_testcase
+
+
+class CreateExportTest(test_base_testcase.APITestCase):
+    """The test for v1 ReST API CreateExportController."""
+
+    EXPORT_ID = uuid.UUID('00000000-0000-0000-0000-000000000001')
+
+    def _request(self, method, url, body=None):
+        headers = {'Content-Type': 'application/json',
+                   'Accept': 'application/json'}
+        conn = httplib.HTTPConnection('localhost:8080')
+        conn.request(method, url, headers=headers, body=body)
+        response = conn.getresponse()
+        return response.status, json.loads(response.read() or 'null')
+
+    @mock.patch('magnetodb.storage.create_export')
+    def test_create_export(self, mock_create_export):
+        mock_create_export.return_value = ExportInfo(
+            self.EXPORT_ID, 'default_table', ExportInfo.STATUS_IN_PROGRESS,
+            total_segments=2, compress=True
+        )
+
+        url = '/v1/management/default_tenant/default_table/exports'
+        status, response = self._request(
+            "POST", url, '{"total_segments": 2, "compress": true}'
+        )
+
+        self.assertEqual(200, status)
+        expected = {
+            'export_id': str(self.EXPORT_ID),
+            'table_name': 'default_table',
+            'status': 'in_progress',
+            'total_segments': 2,
+            'compress': True,
+            'item_count': 0,
+            'shards': 0,
+            'start_date_time': None,
+            'links': [
+                {'rel': 'self',
+                 'href': 'http://localhost:8080{}/{}'.format(
+                     url, self.EXPORT_ID)}
+            ]
+        }
+        self.assertEqual(expected, response)
+
+        args = mock_create_export.call_args[0]
+        self.assertEqual(('default_table', 2, True), args[1:])
+
+    @mock.patch('magnetodb.storage.create_export')
+    def test_create_export_default_segments(self, mock_create_export):
+        mock_create_export.return_value = ExportInfo(
+            self.EXPORT_ID, 'default_table', ExportInfo.STATUS_IN_PROGRESS
+        )
+
+        url = '/v1/management/default_tenant/default_table/exports'
+        status, response = self._request("POST", url, '{}')
+
+        self.assertEqual(200, status)
+        args = mock_create_export.call_args[0]
+        self.assertEqual(('default_table', None, False), args[1:])
+
+    @mock.patch('magnetodb.storage.describe_export')
+    def test_describe_export(self, mock_describe_export):
+        mock_describe_export.return_value = ExportInfo(
+            self.EXPORT_ID, 'default_table', ExportInfo.STATUS_DONE,
+            total_segments=2, compress=True,
+            location='/var/lib/magnetodb/export/the_export',
+            completed_segments=2, item_count=10
+        )
+
+        url = ('/v1/management/default_tenant/default_table/exports/' +
+               str(self.EXPORT_ID))
+        status, response = self._request("GET", url)
+
+        self.assertEqual(200, status)
+        self.assertEqual('done', response['status'])
+        self.assertEqual(10, response['item_count'])
+        self.assertEqual(2, response['shards'])
+        self.assertEqual(
+            [{'rel': 'self', 'href': 'http://localhost:8080' + url},
+             {'rel': 'location',
+              'href': '/var/lib/magnetodb/export/the_export'}],
+            response['links']
+        )
+
+    @mock.patch('magnetodb.storage.describe_export')
+    def test_describe_export_not_exists(self, mock_describe_export):
+        mock_describe_export.side_effect = (
+            exception.ExportNotExistsException()
+        )
+
+        url = ('/v1/management/default_tenant/default_table/exports/' +
+               str(self.EXPORT_ID))
+        status, response = self._request("GET", url)
+
+        self.assertEqual(404, status)
+
+    def test_describe_export_bad_id(self):
+        url = '/v1/management/default_tenant/default_table/exports/the_export'
+        status, response = self._request("GET", url)
+
+        self.assertEqual(400, status)
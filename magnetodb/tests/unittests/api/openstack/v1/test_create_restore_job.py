@@ -15,13 +15,27 @@
 
 import httplib
 import json
+import uuid
 
+import mock
+
+from magnetodb.storage.backup_info_repo import RestoreJobInfo
 from magnetodb.tests.unittests.api.openstack.v1 import test_base_testcase
 
 
 class CreateRestoreJobTest(test_base_testcase.APITestCase):
     """The test for v1 ReST API CreateRestoreJobController."""
-    def test_create_restore_job(self):
+
+    @mock.patch('magnetodb.storage.create_restore_job')
+    def test_create_restore_job(self, mock_create_restore_job):
+        backup_id = uuid.UUID('00000000-0000-0000-0000-000000000001')
+        restore_job_id = uuid.UUID('00000000-0000-0000-0000-000000000002')
+        mock_create_restore_job.return_value = RestoreJobInfo(
+            restore_job_id, backup_id, 'default_table',
+            RestoreJobInfo.STATUS_RESTORING, strategy={},
+            source='/var/lib/magnetodb/backup/the_backup'
+        )
+
         headers = {'Content-Type': 'application/json',
                    'Accept': 'application/json'}
 
@@ -29,9 +43,9 @@ class CreateRestoreJobTest(test_base_testcase.APITestCase):
         url = '/v1/management/default_tenant/default_table/restores'
         body = """
             {
-                "backup_id": "the_backup"
+                "backup_id": "%s"
             }
-        """
+        """ % backup_id
 
         conn.request("POST", url, headers=headers, body=body)
 
@@ -39,4 +53,25 @@ class CreateRestoreJobTest(test_base_testcase.APITestCase):
 
         json_response = response.read()
         response_model = json.loads(json_response)
-        self.assertEqual({}, response_model)
+
+        expected = {
+            'restore_job_id': str(restore_job_id),
+            'backup_id': str(backup_id),
+            'table_name': 'default_table',
+            'status': 'RESTORING',
+            'strategy': {},
+            'start_date_time': None,
+            'item_count': 0,
+            'failed_item_count': 0,
+            'links': [
+                {'rel': 'self',
+                 'href': ('http://localhost:8080' + url + '/' +
+                          str(restore_job_id))},
+                {'rel': 'source',
+                 'href': '/var/lib/magnetodb/backup/the_backup'}
+            ]
+        }
+        self.assertEqual(expected, response_model)
+
+        args = mock_create_restore_job.call_args[0]
+        self.assertEqual(('default_table', backup_id, None, {}), args[1:])
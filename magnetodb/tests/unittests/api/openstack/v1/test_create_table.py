@@ -225,6 +225,63 @@ class CreateTableTest(test_base_testcase.APITestCase):
 
         self.assertEqual(expected_response, response_payload)
 
+    @mock.patch('magnetodb.storage.create_table')
+    def test_create_table_consistency_levels(self, mock_create_table):
+        mock_create_table.side_effect = (
+            lambda context, table_name, table_schema: models.TableMeta(
+                '00000000-0000-0000-0000-000000000000', table_schema,
+                models.TableMeta.TABLE_STATUS_ACTIVE, 123
+            )
+        )
+
+        conn = httplib.HTTPConnection('localhost:8080')
+        body = """
+            {
+                "attribute_definitions": [
+                    {
+                        "attribute_name": "ForumName",
+                        "attribute_type": "S"
+                    }
+                ],
+                "table_name": "Thread",
+                "key_schema": [
+                    {
+                        "attribute_name": "ForumName",
+                        "key_type": "HASH"
+                    }
+                ],
+                "consistency_levels": {
+                    "write": "LOCAL_QUORUM",
+                    "serial": "LOCAL_SERIAL"
+                }
+            }
+        """
+
+        conn.request("POST", self.url, headers=self.headers, body=body)
+
+        response = conn.getresponse()
+
+        table_schema = mock_create_table.call_args[0][2]
+        self.assertEqual(
+            models.ConsistencyLevels(write='LOCAL_QUORUM',
+                                     serial='LOCAL_SERIAL'),
+            table_schema.consistency_levels
+        )
+
+        response_payload = json.loads(response.read())
+        self.assertEqual(
+            {'write': 'LOCAL_QUORUM', 'serial': 'LOCAL_SERIAL'},
+            response_payload['table_description']['consistency_levels']
+        )
+
+        body = body.replace('"LOCAL_SERIAL"', '"LOCAL_QUORUM"')
+        conn.request("POST", self.url, headers=self.headers, body=body)
+
+        response = conn.getresponse()
+
+        self.assertEqual(400, response.status)
+        response.read()
+
     def test_create_table_malformed(self):
         headers = {'Content-Type': 'application/json',
                    'Accept': 'application/json'}
@@ -12,25 +12,42 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+
 import httplib
 import json
+import uuid
+
+import mock
 
+from magnetodb.storage.backup_info_repo import BackupInfo
 from magnetodb.tests.unittests.api.openstack.v1 import test_base_testcase
 
 
 class DeleteBackupTest(test_base_testcase.APITestCase):
     """The test for v1 ReST API DeleteBackupController."""
-    def test_delete_backup(self):
+
+    @mock.patch('magnetodb.storage.delete_backup')
+    def test_delete_backup(self, mock_delete_backup):
+        backup_id = uuid.UUID('00000000-0000-0000-0000-000000000001')
+        mock_delete_backup.return_value = BackupInfo(
+            backup_id, 'the_backup', 'default_table',
+            BackupInfo.STATUS_DELETING
+        )
+
         headers = {'Content-Type': 'application/json',
                    'Accept': 'application/json'}
 
         conn = httplib.HTTPConnection('localhost:8080')
-        url = '/v1/management/default_tenant/default_table/backups/the_backup'
-
+        url = ('/v1/management/default_tenant/default_table/backups/' +
+               str(backup_id))
         conn.request("DELETE", url, headers=headers)
 
         response = conn.getresponse()
 
         json_response = response.read()
         response_model = json.loads(json_response)
-        self.assertEqual({}, response_model)
+        self.assertEqual(str(backup_id), response_model['backup_id'])
+        self.assertEqual('DELETING', response_model['status'])
+
+        args = mock_delete_backup.call_args[0]
+        self.assertEqual(('default_table', backup_id), args[1:])
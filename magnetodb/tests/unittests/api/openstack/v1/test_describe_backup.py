@@ -12,25 +12,89 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+
 import httplib
 import json
+import uuid
+
+import mock
 
+from magnetodb.common import exception
+from magnetodb.storage.backup_info_repo import BackupInfo
 from magnetodb.tests.unittests.api.openstack.v1 import test_base_testcase
 
 
 class DescribeBackupTest(test_base_testcase.APITestCase):
     """The test for v1 ReST API DescribeBackupController."""
-    def test_describe_backup(self):
+
+    @mock.patch('magnetodb.storage.describe_backup')
+    def test_describe_backup(self, mock_describe_backup):
+        backup_id = uuid.UUID('00000000-0000-0000-0000-000000000001')
+        mock_describe_backup.return_value = BackupInfo(
+            backup_id, 'the_backup', 'default_table',
+            BackupInfo.STATUS_ACTIVE, strategy={},
+            location='/var/lib/magnetodb/backup/the_backup',
+            total_segments=16, completed_segments=16, item_count=100
+        )
+
         headers = {'Content-Type': 'application/json',
                    'Accept': 'application/json'}
 
         conn = httplib.HTTPConnection('localhost:8080')
-        url = '/v1/management/default_tenant/default_table/backups/the_backup'
-
+        url = ('/v1/management/default_tenant/default_table/backups/' +
+               str(backup_id))
         conn.request("GET", url, headers=headers)
 
         response = conn.getresponse()
 
         json_response = response.read()
         response_model = json.loads(json_response)
-        self.assertEqual({}, response_model)
+
+        expected = {
+            'backup_id': str(backup_id),
+            'backup_name': 'the_backup',
+            'table_name': 'default_table',
+            'status': 'ACTIVE',
+            'strategy': {},
+            'start_date_time': None,
+            'item_count': 100,
+            'total_segments': 16,
+            'completed_segments': 16,
+            'links': [
+                {'rel': 'self',
+                 'href': 'http://localhost:8080' + url},
+                {'rel': 'location',
+                 'href': '/var/lib/magnetodb/backup/the_backup'}
+            ]
+        }
+        self.assertEqual(expected, response_model)
+
+    @mock.patch('magnetodb.storage.describe_backup')
+    def test_describe_backup_not_exists(self, mock_describe_backup):
+        mock_describe_backup.side_effect = (
+            exception.BackupNotExistsException()
+        )
+
+        headers = {'Content-Type': 'application/json',
+                   'Accept': 'application/json'}
+
+        conn = httplib.HTTPConnection('localhost:8080')
+        url = ('/v1/management/default_tenant/default_table/backups/'
+               '00000000-0000-0000-0000-000000000001')
+        conn.request("GET", url, headers=headers)
+
+        response = conn.getresponse()
+        response.read()
+        self.assertEqual(404, response.status)
+
+    def test_describe_backup_bad_id(self):
+        headers = {'Content-Type': 'application/json',
+                   'Accept': 'application/json'}
+
+        conn = httplib.HTTPConnection('localhost:8080')
+        url = '/v1/management/default_tenant/default_table/backups/the_backup'
+        conn.request("GET", url, headers=headers)
+
+        response = conn.getresponse()
+        response.read()
+        self.assertEqual(400, response.status)
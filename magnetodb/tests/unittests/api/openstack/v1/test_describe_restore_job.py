@@ -12,25 +12,45 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+
 import httplib
 import json
+import uuid
+
+import mock
 
+from magnetodb.storage.backup_info_repo import RestoreJobInfo
 from magnetodb.tests.unittests.api.openstack.v1 import test_base_testcase
 
 
 class DescribeRestoreJobTest(test_base_testcase.APITestCase):
     """The test for v1 ReST API DescribeRestoreJobController."""
-    def test_describe_restore_job(self):
+
+    @mock.patch('magnetodb.storage.describe_restore_job')
+    def test_describe_restore_job(self, mock_describe_restore_job):
+        restore_job_id = uuid.UUID('00000000-0000-0000-0000-000000000002')
+        mock_describe_restore_job.return_value = RestoreJobInfo(
+            restore_job_id, None, 'the_table', RestoreJobInfo.STATUS_DONE,
+            strategy={}, source='/var/lib/magnetodb/backup/the_backup',
+            item_count=99, failed_item_count=1
+        )
+
         headers = {'Content-Type': 'application/json',
                    'Accept': 'application/json'}
 
         conn = httplib.HTTPConnection('localhost:8080')
-        url = '/v1/management/default_tenant/the_table/restores/the_restore'
-
+        url = ('/v1/management/default_tenant/the_table/restores/' +
+               str(restore_job_id))
         conn.request("GET", url, headers=headers)
 
         response = conn.getresponse()
 
         json_response = response.read()
         response_model = json.loads(json_response)
-        self.assertEqual({}, response_model)
+
+        self.assertEqual(str(restore_job_id),
+                         response_model['restore_job_id'])
+        self.assertEqual('DONE', response_model['status'])
+        self.assertEqual(99, response_model['item_count'])
+        self.assertEqual(1, response_model['failed_item_count'])
+        self.assertNotIn('backup_id', response_model)
@@ -15,13 +15,21 @@
 
 import httplib
 import json
+import uuid
 
+import mock
+
+from magnetodb.storage.backup_info_repo import BackupInfo
 from magnetodb.tests.unittests.api.openstack.v1 import test_base_testcase
 
 
 class ListBackupsTest(test_base_testcase.APITestCase):
     """The test for v1 ReST API ListBackupController."""
-    def test_list_backups(self):
+
+    @mock.patch('magnetodb.storage.list_backups')
+    def test_list_backups(self, mock_list_backups):
+        mock_list_backups.return_value = []
+
         headers = {'Content-Type': 'application/json',
                    'Accept': 'application/json'}
 
@@ -34,3 +42,31 @@ class ListBackupsTest(test_base_testcase.APITestCase):
         json_response = response.read()
         response_model = json.loads(json_response)
         self.assertEqual([], response_model['backups'])
+
+    @mock.patch('magnetodb.storage.list_backups')
+    def test_list_backups_limit(self, mock_list_backups):
+        start_id = uuid.UUID('00000000-0000-0000-0000-000000000001')
+        backup_id = uuid.UUID('00000000-0000-0000-0000-000000000002')
+        mock_list_backups.return_value = [
+            BackupInfo(backup_id, 'the_backup', 'default_table',
+                       BackupInfo.STATUS_ACTIVE)
+        ]
+
+        headers = {'Content-Type': 'application/json',
+                   'Accept': 'application/json'}
+
+        conn = httplib.HTTPConnection('localhost:8080')
+        url = ('/v1/management/default_tenant/default_table/backups'
+               '?limit=1&exclusive_start_backup_id=' + str(start_id))
+        conn.request("GET", url, headers=headers)
+
+        response = conn.getresponse()
+
+        json_response = response.read()
+        response_model = json.loads(json_response)
+        self.assertEqual(str(backup_id),
+                         response_model['last_evaluated_backup_id'])
+        self.assertEqual(1, len(response_model['backups']))
+
+        args = mock_list_backups.call_args[0]
+        self.assertEqual(('default_table', start_id, 1), args[1:])
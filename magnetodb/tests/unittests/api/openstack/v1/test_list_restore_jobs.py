@@ -12,15 +12,22 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
+
 import httplib
 import json
 
+import mock
+
 from magnetodb.tests.unittests.api.openstack.v1 import test_base_testcase
 
 
 class ListRestoreJobsTest(test_base_testcase.APITestCase):
     """The test for v1 ReST API ListRestoreJobsController."""
-    def test_list_restores(self):
+
+    @mock.patch('magnetodb.storage.list_restore_jobs')
+    def test_list_restores(self, mock_list_restore_jobs):
+        mock_list_restore_jobs.return_value = []
+
         headers = {'Content-Type': 'application/json',
                    'Accept': 'application/json'}
 
@@ -0,0 +1,66 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import httplib
+import json
+
+import mock
+
+from magnetodb.common import metrics
+from magnetodb.tests.unittests.api.openstack.v1 import test_base_testcase
+
+
+class MetricsTest(test_base_testcase.APITestCase):
+    """The test for v1 ReST API MetricsController."""
+
+    def setUp(self):
+        super(MetricsTest, self).setUp()
+        registry = metrics.MetricsRegistry()
+        registry.record('test_probe', metrics.STATUS_OK, 0.003)
+        patcher = mock.patch.object(metrics, 'REGISTRY', registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_metrics_json(self):
+        headers = {'Accept': 'application/json'}
+
+        conn = httplib.HTTPConnection('localhost:8080')
+        conn.request("GET", '/v1/monitoring/metrics', headers=headers)
+
+        response = conn.getresponse()
+        self.assertEqual(200, response.status)
+
+        response_model = json.loads(response.read())
+        self.assertEqual(
+            {'name': 'test_probe', 'status': 'ok', 'count': 1,
+             'sum_ms': 3.0, 'mean_ms': 3.0, 'min_ms': 3.0, 'max_ms': 3.0,
+             'p50_ms': 3.0, 'p90_ms': 3.0, 'p99_ms': 3.0, 'p999_ms': 3.0},
+            response_model['metrics'][0]
+        )
+
+    def test_metrics_prometheus(self):
+        conn = httplib.HTTPConnection('localhost:8080')
+        conn.request("GET", '/v1/monitoring/metrics?format=prometheus')
+
+        response = conn.getresponse()
+        self.assertEqual(200, response.status)
+        self.assertTrue(
+            response.getheader('Content-Type').startswith('text/plain')
+        )
+        self.assertIn(
+            'magnetodb_probe_duration_seconds_count'
+            '{probe="test_probe",status="ok"} 1\n',
+            response.read()
+        )
@@ -19,6 +19,8 @@ import json
 import mock
 import unittest
 
+from magnetodb.storage import capacity
+from magnetodb.storage import models
 from magnetodb.tests.unittests.api.openstack.v1 import test_base_testcase
 
 
@@ -80,6 +82,95 @@ class PutitemTestCase(test_base_testcase.APITestCase):
 
         self.assertEqual({}, response_payload)
 
+    @mock.patch('magnetodb.storage.put_item')
+    def test_put_item_return_consumed_capacity(self, mock_put_item):
+        headers = {'Content-Type': 'application/json',
+                   'Accept': 'application/json'}
+
+        table_info = mock.Mock()
+        table_info.name = 'the_table'
+        table_info.schema.index_def_map = {
+            'index': models.IndexDefinition('ForumName', 'Subject')
+        }
+
+        def put_item(context, table_name, item, **kwargs):
+            capacity.add_write(context, table_info, item)
+            return True, None
+
+        mock_put_item.side_effect = put_item
+
+        conn = httplib.HTTPConnection('localhost:8080')
+        url = '/v1/data/default_tenant/tables/the_table/put_item'
+        body = """
+            {
+                "item": {
+                    "ForumName": {
+                        "S": "MagnetoDB"
+                    },
+                    "Subject": {
+                        "S": "Capacity"
+                    }
+                },
+                "return_consumed_capacity": "INDEXES"
+            }
+        """
+        conn.request("POST", url, headers=headers, body=body)
+
+        response = conn.getresponse()
+
+        self.assertTrue(mock_put_item.called)
+
+        json_response = response.read()
+        response_payload = json.loads(json_response)
+
+        expected = {
+            'consumed_capacity': {
+                'table_name': 'the_table',
+                'capacity_units': 2.0,
+                'table': {'capacity_units': 1.0},
+                'local_secondary_indexes': {
+                    'index': {'capacity_units': 1.0}
+                }
+            }
+        }
+        self.assertEqual(expected, response_payload)
+
+    @mock.patch('magnetodb.storage.put_item')
+    def test_put_item_consistency_level(self, mock_put_item):
+        headers = {'Content-Type': 'application/json',
+                   'Accept': 'application/json'}
+        mock_put_item.return_value = (True, None)
+
+        conn = httplib.HTTPConnection('localhost:8080')
+        url = '/v1/data/default_tenant/tables/the_table/put_item'
+        body = """
+            {
+                "item": {
+                    "ForumName": {
+                        "S": "MagnetoDB"
+                    }
+                },
+                "consistency_level": "LOCAL_QUORUM"
+            }
+        """
+        conn.request("POST", url, headers=headers, body=body)
+
+        response = conn.getresponse()
+        response.read()
+
+        self.assertEqual(200, response.status)
+        self.assertEqual('LOCAL_QUORUM',
+                         mock_put_item.call_args[1]['consistency_level'])
+
+        conn.request("POST", url, headers=headers,
+                     body=body.replace('LOCAL_QUORUM', 'MOST'))
+
+        response = conn.getresponse()
+        response.read()
+
+        self.assertEqual(400, response.status)
+        self.assertEqual(1, mock_put_item.call_count)
+
     @unittest.skip("bug: #1299037")
     @mock.patch('magnetodb.storage.put_item')
     def test_put_item_expected(self, mock_put_item):
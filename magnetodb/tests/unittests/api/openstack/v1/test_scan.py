@@ -17,6 +17,8 @@ import httplib
 import json
 
 import mock
+from oslo.config import cfg
+
 from magnetodb.storage import models
 from magnetodb.tests.unittests.api.openstack.v1 import test_base_testcase
 
@@ -117,3 +119,74 @@ class ScanTest(test_base_testcase.APITestCase):
         response_payload = json.loads(json_response)
 
         self.assertEqual(expected_response, response_payload)
+
+    @mock.patch('magnetodb.storage.scan')
+    def test_scan_segment(self, mock_scan):
+        mock_scan.return_value = models.ScanResult(
+            items=[], count=0, scanned_count=0
+        )
+
+        headers = {'Content-Type': 'application/json',
+                   'Accept': 'application/json'}
+
+        conn = httplib.HTTPConnection('localhost:8080')
+        url = '/v1/data/default_tenant/tables/Threads/scan'
+        body = '{"segment": 3, "total_segments": 4}'
+
+        conn.request("POST", url, headers=headers, body=body)
+        response = conn.getresponse()
+        response.read()
+
+        self.assertEqual(200, response.status)
+        args, kwargs = mock_scan.call_args
+        self.assertEqual(3, kwargs['segment'])
+        self.assertEqual(4, kwargs['total_segments'])
+
+        body = '{"segment": 4, "total_segments": 4}'
+        conn.request("POST", url, headers=headers, body=body)
+        response = conn.getresponse()
+        response.read()
+
+        self.assertEqual(400, response.status)
+
+    @mock.patch('magnetodb.storage.scan_stream')
+    def test_scan_streamed(self, mock_scan_stream):
+        cfg.CONF.set_override('stream_read_results', True)
+        self.addCleanup(cfg.CONF.clear_override, 'stream_read_results')
+
+        result = models.ScanResultStream()
+
+        def items():
+            yield {'ForumName': models.AttributeValue('S', 'Testing OS API')}
+            result.count = 1
+            result.scanned_count = 3
+            result.last_evaluated_key = {
+                'ForumName': models.AttributeValue('S', 'Testing OS API')
+            }
+
+        result.items = items()
+        mock_scan_stream.return_value = result
+
+        headers = {'Content-Type': 'application/json',
+                   'Accept': 'application/json'}
+
+        conn = httplib.HTTPConnection('localhost:8080')
+        url = '/v1/data/default_tenant/tables/Threads/scan'
+
+        conn.request("POST", url, headers=headers, body='{"limit": 3}')
+        response = conn.getresponse()
+
+        expected_response = {
+            "count": 1,
+            "items": [
+                {'ForumName': {'S': 'Testing OS API'}}
+            ],
+            "last_evaluated_key": {
+                'ForumName': {'S': 'Testing OS API'}
+            },
+            "scanned_count": 3
+        }
+
+        self.assertEqual(200, response.status)
+        self.assertEqual(expected_response, json.loads(response.read()))
+        self.assertTrue(mock_scan_stream.called)
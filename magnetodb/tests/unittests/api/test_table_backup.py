@@ -0,0 +1,130 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+import uuid
+
+import mock
+from oslo.config import cfg
+
+from magnetodb.api import table_backup
+from magnetodb.api import table_export
+from magnetodb.storage import models
+from magnetodb.storage.backup_info_repo import BackupInfo
+from magnetodb.storage.backup_info_repo import RestoreJobInfo
+
+
+class TableBackupTestCase(unittest.TestCase):
+    """The test for backup and restore jobs."""
+
+    def setUp(self):
+        self.backup_dir = tempfile.mkdtemp()
+        cfg.CONF.set_override('backup_dir', self.backup_dir)
+        self.context = mock.Mock(tenant='fake_tenant')
+
+    def tearDown(self):
+        cfg.CONF.clear_override('backup_dir')
+        shutil.rmtree(self.backup_dir)
+
+    @staticmethod
+    def _make_item(hash_key):
+        return {'id': models.AttributeValue('N', hash_key)}
+
+    def _create_backup(self, backup_info_repo):
+        backup_id = uuid.UUID('00000000-0000-0000-0000-000000000001')
+        backup_info = BackupInfo(backup_id, 'the_backup', 'fake_table',
+                                 BackupInfo.STATUS_CREATING,
+                                 strategy={'total_segments': 2})
+        backup_info_repo.get_backup.return_value = backup_info
+
+        storage_driver = mock.Mock()
+        storage_driver.scan_stream.side_effect = (
+            lambda context, table_info, condition_map, consistent, segment,
+            total_segments: mock.Mock(items=[self._make_item(segment)])
+        )
+        table_info_repo = mock.Mock()
+        table_info_repo.get.return_value.schema.to_json.return_value = '{}'
+
+        return table_backup.create_backup(
+            self.context, storage_driver, table_info_repo, backup_info_repo,
+            'fake_table', backup_id
+        )
+
+    def test_create_backup(self):
+        backup_info_repo = mock.Mock()
+
+        backup_info = self._create_backup(backup_info_repo)
+
+        self.assertEqual(BackupInfo.STATUS_ACTIVE, backup_info.status)
+        self.assertEqual(2, backup_info.completed_segments)
+        self.assertEqual(2, backup_info.item_count)
+        self.assertTrue(
+            backup_info.location.startswith(self.backup_dir)
+        )
+        manifest = table_export.read_manifest(backup_info.location)
+        self.assertEqual(table_export.STATUS_DONE, manifest['status'])
+        self.assertTrue(manifest['compress'])
+
+    def test_restore_table(self):
+        backup_info_repo = mock.Mock()
+        backup_info = self._create_backup(backup_info_repo)
+
+        restore_job = RestoreJobInfo(
+            uuid.uuid4(), backup_info.id, 'fake_table',
+            RestoreJobInfo.STATUS_RESTORING, strategy={},
+            source=backup_info.location
+        )
+        backup_info_repo.get_restore_job.return_value = restore_job
+
+        loaded_items = []
+
+        def bulk_load(context, table_name, items, max_in_flight):
+            items = list(items)
+            loaded_items.extend(items)
+            yield len(items), []
+
+        storage_manager = mock.Mock()
+        storage_manager.bulk_load.side_effect = bulk_load
+
+        restore_job = table_backup.restore_table(
+            self.context, storage_manager, backup_info_repo, 'fake_table',
+            restore_job.id
+        )
+
+        self.assertEqual(RestoreJobInfo.STATUS_DONE, restore_job.status)
+        self.assertEqual(2, restore_job.item_count)
+        self.assertEqual([self._make_item(0), self._make_item(1)],
+                         loaded_items)
+
+    def test_restore_table_source_out_of_backup_dir(self):
+        backup_info_repo = mock.Mock()
+        restore_job = RestoreJobInfo(
+            uuid.uuid4(), None, 'fake_table',
+            RestoreJobInfo.STATUS_RESTORING, strategy={},
+            source=os.path.join(self.backup_dir, '..')
+        )
+        backup_info_repo.get_restore_job.return_value = restore_job
+        storage_manager = mock.Mock()
+
+        restore_job = table_backup.restore_table(
+            self.context, storage_manager, backup_info_repo, 'fake_table',
+            restore_job.id
+        )
+
+        self.assertEqual(RestoreJobInfo.STATUS_FAILED, restore_job.status)
+        self.assertFalse(storage_manager.bulk_load.called)
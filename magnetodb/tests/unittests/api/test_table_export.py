@@ -0,0 +1,164 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import uuid
+
+import mock
+from oslo.config import cfg
+
+from magnetodb.api import table_export
+from magnetodb.api.openstack.v1.parser import Parser
+from magnetodb.common import exception
+from magnetodb.storage import models
+from magnetodb.storage.backup_info_repo import ExportInfo
+
+
+class TableExportTestCase(unittest.TestCase):
+    """The test for table export to NDJSON files."""
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    @staticmethod
+    def _scan_segment(segment, total_segments):
+        for i in xrange(segment + 1):
+            yield {
+                'id': models.AttributeValue('N', segment * 10 + i),
+                'tags': models.AttributeValue('SS', ['a', 'b']),
+                'data': models.AttributeValue('B', decoded_value='\x00\x01')
+            }
+
+    def _read_items(self, manifest):
+        items = []
+        for shard in manifest['shards']:
+            with table_export.open_shard(
+                    os.path.join(self.output_dir, shard['file'])) as f:
+                for line in f:
+                    items.append(
+                        Parser.parse_item_attributes(json.loads(line))
+                    )
+        return items
+
+    def test_export_table(self):
+        manifest = table_export.export_table(
+            self._scan_segment, self.output_dir, total_segments=3,
+            parallelism=2, manifest_extra={'table_name': 'test_table'}
+        )
+
+        self.assertEqual(table_export.STATUS_DONE, manifest['status'])
+        self.assertEqual('test_table', manifest['table_name'])
+        self.assertEqual(6, manifest['item_count'])
+        self.assertEqual(
+            ['part-00000-of-00003.json', 'part-00001-of-00003.json',
+             'part-00002-of-00003.json'],
+            [shard['file'] for shard in manifest['shards']]
+        )
+        self.assertEqual(
+            [1, 2, 3], [shard['item_count'] for shard in manifest['shards']]
+        )
+        self.assertEqual(manifest,
+                         table_export.read_manifest(self.output_dir))
+
+        expected_items = []
+        for segment in xrange(3):
+            expected_items += self._scan_segment(segment, 3)
+        self.assertEqual(expected_items, self._read_items(manifest))
+
+    def test_export_table_compressed(self):
+        manifest = table_export.export_table(
+            self._scan_segment, self.output_dir, total_segments=2,
+            compress=True
+        )
+
+        self.assertEqual(
+            ['part-00000-of-00002.json.gz', 'part-00001-of-00002.json.gz'],
+            [shard['file'] for shard in manifest['shards']]
+        )
+        self.assertEqual(3, len(self._read_items(manifest)))
+
+    def test_export_table_failed(self):
+        def scan_segment(segment, total_segments):
+            if segment == 1:
+                raise exception.BackendInteractionException("scan failed")
+            return self._scan_segment(segment, total_segments)
+
+        self.assertRaises(
+            exception.BackendInteractionException, table_export.export_table,
+            scan_segment, self.output_dir, total_segments=2, parallelism=1
+        )
+
+        manifest = table_export.read_manifest(self.output_dir)
+        self.assertEqual(table_export.STATUS_FAILED, manifest['status'])
+        self.assertEqual('scan failed', manifest['error'])
+
+    def _create_export(self, backup_info_repo, storage_driver):
+        export_id = uuid.UUID('00000000-0000-0000-0000-000000000001')
+        backup_info_repo.get_export.return_value = ExportInfo(
+            export_id, 'fake_table', ExportInfo.STATUS_IN_PROGRESS,
+            total_segments=2
+        )
+        cfg.CONF.set_override('table_export_dir', self.output_dir)
+        self.addCleanup(cfg.CONF.clear_override, 'table_export_dir')
+
+        return table_export.create_export(
+            mock.Mock(tenant='fake_tenant'), storage_driver, mock.Mock(),
+            backup_info_repo, 'fake_table', export_id
+        )
+
+    def test_create_export(self):
+        backup_info_repo = mock.Mock()
+        storage_driver = mock.Mock()
+        storage_driver.scan_stream.side_effect = (
+            lambda context, table_info, condition_map, consistent, segment,
+            total_segments: mock.Mock(
+                items=self._scan_segment(segment, total_segments))
+        )
+
+        export_info = self._create_export(backup_info_repo, storage_driver)
+
+        self.assertEqual(ExportInfo.STATUS_DONE, export_info.status)
+        self.assertEqual(2, export_info.completed_segments)
+        self.assertEqual(3, export_info.item_count)
+        self.assertTrue(export_info.location.startswith(self.output_dir))
+        self.assertIsNotNone(export_info.finish_date_time)
+        backup_info_repo.update_export.assert_called_with(
+            mock.ANY, export_info, ["status", "error", "finish_date_time"]
+        )
+
+        manifest = table_export.read_manifest(export_info.location)
+        self.assertEqual(table_export.STATUS_DONE, manifest['status'])
+
+    def test_create_export_failed(self):
+        backup_info_repo = mock.Mock()
+        storage_driver = mock.Mock()
+        storage_driver.scan_stream.side_effect = (
+            exception.BackendInteractionException("scan failed")
+        )
+
+        export_info = self._create_export(backup_info_repo, storage_driver)
+
+        self.assertEqual(ExportInfo.STATUS_FAILED, export_info.status)
+        self.assertEqual('scan failed', export_info.error)
+        backup_info_repo.update_export.assert_called_with(
+            mock.ANY, export_info, ["status", "error", "finish_date_time"]
+        )
@@ -0,0 +1,140 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+import webob
+
+from magnetodb.common import exception
+from magnetodb.common.middleware import rate_limit
+
+
+class RateLimitTestCase(unittest.TestCase):
+    """The test for rate limit middleware and its backends."""
+
+    def _check_bucket(self, backend):
+        bucket = [("tenant", 1, 3)]
+        self.assertTrue(backend.consume(bucket, 100))
+        self.assertTrue(backend.consume(bucket, 100))
+        self.assertTrue(backend.consume(bucket, 100))
+        self.assertFalse(backend.consume(bucket, 100))
+        self.assertFalse(backend.consume(bucket, 100.5))
+        self.assertTrue(backend.consume(bucket, 101))
+        self.assertTrue(backend.consume([("other_tenant", 1, 3)], 101))
+
+        # token isn't taken from any bucket if one of them is empty
+        self.assertFalse(backend.consume(
+            [(("tenant", "scan"), 1, 3), ("tenant", 1, 3)], 101
+        ))
+        self.assertTrue(backend.consume([(("tenant", "scan"), 1, 1)], 101))
+
+    def test_local_backend(self):
+        backend = rate_limit.LocalBackend({'idle_timeout': '10'})
+        self._check_bucket(backend)
+        self.assertEqual(len(backend), 3)
+
+        backend.consume([("tenant", 1, 3)], 120)
+        self.assertEqual(len(backend), 1)
+
+    def test_shared_memory_backend(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        options = {
+            'shared_memory_file': os.path.join(tmp_dir, 'rate_limit'),
+            'shared_memory_slots': '4'
+        }
+        self._check_bucket(rate_limit.SharedMemoryBackend(options))
+
+        # state is shared by backends opened by different workers
+        backend = rate_limit.SharedMemoryBackend(options)
+        self.assertFalse(backend.consume([("tenant", 1, 3)], 101))
+
+        # idle slots are reused by new keys
+        for i in xrange(10):
+            self.assertTrue(backend.consume([(i, 1, 1)], 1000 + i))
+
+    @mock.patch('magnetodb.notifier.get_notifier')
+    def test_middleware(self, mock_get_notifier):
+        middleware = rate_limit.RateLimitMiddleware(
+            None, {'rps_per_tenant': '100', 'burst_per_tenant': '100',
+                   'scan_rps_per_tenant': '1',
+                   'scan_burst_per_tenant': '2'}
+        )
+
+        def make_request(path_info):
+            return webob.Request.blank(
+                path_info, method='POST', base_url='http://localhost/v1/data'
+            )
+
+        scan_req = make_request('/tenant/tables/table/scan')
+        query_req = make_request('/tenant/tables/table/query')
+        other_scan_req = make_request('/other/tables/table/scan')
+
+        middleware.process_request(scan_req)
+        middleware.process_request(scan_req)
+        self.assertRaises(exception.RequestQuotaExceeded,
+                          middleware.process_request, scan_req)
+        middleware.process_request(query_req)
+        middleware.process_request(other_scan_req)
+        self.assertEqual(mock_get_notifier.return_value.info.call_count, 1)
+
+    def test_operation_class(self):
+        get_operation_class = (
+            rate_limit.RateLimitMiddleware._get_operation_class
+        )
+
+        self.assertEqual(
+            get_operation_class(webob.Request.blank(
+                '/v1/data/tenant/tables/table/get_item', method='POST'
+            )),
+            rate_limit.OPERATION_CLASS_READ
+        )
+        self.assertEqual(
+            get_operation_class(webob.Request.blank(
+                '/v1/data/tenant/tables/table', method='GET'
+            )),
+            rate_limit.OPERATION_CLASS_READ
+        )
+        self.assertEqual(
+            get_operation_class(webob.Request.blank(
+                '/v1/data/tenant/tables', method='POST'
+            )),
+            rate_limit.OPERATION_CLASS_WRITE
+        )
+        self.assertEqual(
+            get_operation_class(webob.Request.blank(
+                '/', method='POST',
+                headers={'X-Amz-Target': 'DynamoDB_20120810.BatchGetItem'}
+            )),
+            rate_limit.OPERATION_CLASS_READ
+        )
+        self.assertEqual(
+            get_operation_class(webob.Request.blank(
+                '/', method='POST',
+                headers={'X-Amz-Target': 'DynamoDB_20120810.UpdateItem'}
+            )),
+            rate_limit.OPERATION_CLASS_WRITE
+        )
+        self.assertEqual(
+            get_operation_class(webob.Request.blank(
+                '/', method='POST',
+                headers={'X-Amz-Target': 'DynamoDB_20120810.Scan'}
+            )),
+            rate_limit.OPERATION_CLASS_SCAN
+        )
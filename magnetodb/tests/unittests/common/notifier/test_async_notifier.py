@@ -0,0 +1,92 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import unittest
+
+import mock
+
+from magnetodb import notifier
+
+
+class AsyncNotifierTestCase(unittest.TestCase):
+    """The test for notifier wrappers."""
+
+    @mock.patch('magnetodb.notifier.random.random')
+    def test_sampling_notifier(self, mock_random):
+        mock_notifier = mock.Mock()
+        sampling_notifier = notifier.SamplingNotifier(
+            mock_notifier, {notifier.EVENT_TYPE_DATA_GETITEM: 0.1}
+        )
+        context = mock.Mock()
+
+        mock_random.return_value = 0.5
+        sampling_notifier.info(context, notifier.EVENT_TYPE_DATA_GETITEM, {})
+        sampling_notifier.info(context, notifier.EVENT_TYPE_DATA_PUTITEM, {})
+        mock_random.return_value = 0.05
+        sampling_notifier.info(context, notifier.EVENT_TYPE_DATA_GETITEM, {})
+
+        self.assertEqual(
+            [
+                mock.call.info(context, notifier.EVENT_TYPE_DATA_PUTITEM, {}),
+                mock.call.info(context, notifier.EVENT_TYPE_DATA_GETITEM, {})
+            ],
+            mock_notifier.mock_calls
+        )
+        self.assertEqual(1, sampling_notifier.sampled_out_count)
+
+    def test_async_notifier_sends_in_background(self):
+        mock_notifier = mock.Mock()
+        async_notifier = notifier.AsyncNotifier(mock_notifier, batch_size=2)
+        context = mock.Mock()
+
+        for i in xrange(5):
+            async_notifier.info(context, notifier.EVENT_TYPE_DATA_PUTITEM, i)
+        async_notifier.error(context, notifier.EVENT_TYPE_DATA_PUTITEM, 5)
+        async_notifier.flush()
+
+        self.assertEqual(
+            [mock.call.info(context, notifier.EVENT_TYPE_DATA_PUTITEM, i)
+             for i in xrange(5)] +
+            [mock.call.error(context, notifier.EVENT_TYPE_DATA_PUTITEM, 5)],
+            mock_notifier.mock_calls
+        )
+        self.assertEqual(6, async_notifier.sent_count)
+        self.assertEqual(0, async_notifier.dropped_count)
+
+    def test_async_notifier_drops_events_if_queue_is_full(self):
+        sending = threading.Event()
+        proceed = threading.Event()
+
+        def info(context, event_type, payload):
+            sending.set()
+            proceed.wait()
+
+        mock_notifier = mock.Mock()
+        mock_notifier.info.side_effect = info
+        async_notifier = notifier.AsyncNotifier(mock_notifier, queue_size=1)
+        context = mock.Mock()
+
+        # the first event is being sent, the second one is queued
+        async_notifier.info(context, notifier.EVENT_TYPE_DATA_PUTITEM, 0)
+        sending.wait()
+        async_notifier.info(context, notifier.EVENT_TYPE_DATA_PUTITEM, 1)
+        async_notifier.info(context, notifier.EVENT_TYPE_DATA_PUTITEM, 2)
+
+        proceed.set()
+        async_notifier.flush()
+
+        self.assertEqual(2, async_notifier.sent_count)
+        self.assertEqual(1, async_notifier.dropped_count)
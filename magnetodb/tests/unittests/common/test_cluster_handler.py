@@ -0,0 +1,284 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import unittest
+
+import mock
+
+from cassandra import cluster as cassandra_cluster
+from cassandra import ConsistencyLevel
+from cassandra import OperationTimedOut
+
+from magnetodb.common.cassandra import cluster_handler
+from magnetodb.common.cassandra.policies import LatencyAwarePolicy
+
+
+class FakeResponseFuture(object):
+    def __init__(self, host, pages=None, error=None, completed=True):
+        self._current_host = host
+        self._pages = list(pages or [[]])
+        self._error = error
+        self._completed = completed
+        self._callbacks = None
+
+    @property
+    def has_more_pages(self):
+        return len(self._pages) > 1
+
+    def add_callbacks(self, callback, errback, callback_args=(),
+                      errback_args=()):
+        self._callbacks = (callback, errback, callback_args, errback_args)
+        if self._completed:
+            self.complete()
+
+    def complete(self):
+        callback, errback, callback_args, errback_args = self._callbacks
+        if self._error is None:
+            callback(self._pages[0], *callback_args)
+        else:
+            errback(self._error, *errback_args)
+
+    def start_fetching_next_page(self):
+        self._pages.pop(0)
+        self.complete()
+
+    def result(self):
+        return self._pages[0]
+
+
+class ClusterHandlerTestCase(unittest.TestCase):
+    """The test for Cassandra cluster handler."""
+
+    @mock.patch('magnetodb.common.cassandra.cluster_handler.'
+                '_monitor_control_connection')
+    def _create_handler(self, response_futures, mock_monitor, **kwargs):
+        self.policy = LatencyAwarePolicy(mock.Mock(), min_measured=1)
+        handler = cluster_handler.ClusterHandler(
+            {"load_balancing_policy": self.policy}, concurrent_queries=2,
+            **kwargs
+        )
+        self.addCleanup(handler.shutdown)
+
+        self.deferred_hosts = []
+        self.statements = []
+        response_futures = iter(response_futures)
+
+        def execute_async(query):
+            self.deferred_hosts.append(
+                getattr(self.policy._local, "deferred_hosts", ())
+            )
+            self.statements.append(query)
+            return next(response_futures)
+
+        handler._ClusterHandler__cluster = mock.Mock()
+        handler._ClusterHandler__session = mock.Mock(
+            execute_async=mock.Mock(side_effect=execute_async)
+        )
+        return handler
+
+    def _assert_tasks_released(self, handler):
+        self.assertTrue(handler._acquire_task(False))
+        self.assertTrue(handler._acquire_task(False))
+
+    def test_operation_profiles(self):
+        handler = self._create_handler(
+            [], query_timeout=5,
+            operation_profiles={
+                "read": {"consistency_level": "LOCAL_QUORUM"},
+                "lwt": {"serial_consistency_level": "LOCAL_SERIAL",
+                        "timeout": 20}
+            }
+        )
+
+        read_profile = handler.get_operation_profile(
+            cluster_handler.OPERATION_READ
+        )
+        self.assertEqual(ConsistencyLevel.LOCAL_QUORUM,
+                         read_profile.consistency_level)
+        self.assertEqual(5, read_profile.timeout)
+        lwt_profile = handler.get_operation_profile(
+            cluster_handler.OPERATION_LWT
+        )
+        self.assertEqual(ConsistencyLevel.LOCAL_SERIAL,
+                         lwt_profile.serial_consistency_level)
+        self.assertEqual(20, lwt_profile.timeout)
+        self.assertEqual(1, lwt_profile.retry_attempts)
+
+        self.assertEqual(cluster_handler.OPERATION_READ,
+                         handler._get_operation(" select * from t"))
+        self.assertEqual(cluster_handler.OPERATION_SCHEMA,
+                         handler._get_operation("DROP TABLE t"))
+        self.assertEqual(cluster_handler.OPERATION_WRITE,
+                         handler._get_operation(
+                             cassandra_cluster.SimpleStatement(
+                                 "UPDATE t SET a=1 WHERE b=2")))
+
+        self.assertRaises(
+            ValueError, cluster_handler.ClusterHandler, {},
+            operation_profiles={"write": {"speculative_retry_delay": 0.1}}
+        )
+        self.assertRaises(
+            ValueError, cluster_handler.ClusterHandler, {},
+            operation_profiles={"read": {"consistency_level": "MOST"}}
+        )
+        self.assertRaises(
+            ValueError, cluster_handler.ClusterHandler, {},
+            operation_profiles={"lwt": {"serial_consistency_level": "ALL"}}
+        )
+
+    def test_explicit_consistency_levels(self):
+        handler = self._create_handler(
+            [FakeResponseFuture("host") for i in xrange(3)]
+        )
+
+        handler.execute_query("SELECT * FROM t", consistent="LOCAL_ONE")
+        handler.execute_query(
+            "UPDATE t SET a=1 WHERE b=2 IF a=0", consistent="LOCAL_QUORUM",
+            operation=cluster_handler.OPERATION_LWT,
+            serial_consistency_level="LOCAL_SERIAL"
+        )
+        handler.execute_query("SELECT * FROM t")
+
+        self.assertEqual(ConsistencyLevel.LOCAL_ONE,
+                         self.statements[0].consistency_level)
+        self.assertEqual(ConsistencyLevel.LOCAL_QUORUM,
+                         self.statements[1].consistency_level)
+        self.assertEqual(ConsistencyLevel.LOCAL_SERIAL,
+                         self.statements[1].serial_consistency_level)
+        # not consistent query is executed with driver's default level
+        self.assertIsNone(self.statements[2].consistency_level)
+
+        self.assertRaises(ValueError, handler.execute_query,
+                          "SELECT * FROM t", consistent="MOST")
+        self.assertRaises(ValueError, handler.execute_query,
+                          "UPDATE t SET a=1 WHERE b=2 IF a=0",
+                          operation=cluster_handler.OPERATION_LWT,
+                          serial_consistency_level="QUORUM")
+
+    def test_speculative_read(self):
+        slow_future = FakeResponseFuture("slow_host", [[{"a": 1}]],
+                                         completed=False)
+        fast_future = FakeResponseFuture("fast_host", [[{"a": 2}]])
+        handler = self._create_handler(
+            [slow_future, fast_future],
+            operation_profiles={"read": {"speculative_retry_delay": 0.01}}
+        )
+
+        self.assertEqual(
+            [{"a": 2}],
+            handler.execute_query("SELECT * FROM t", consistent=True)
+        )
+        # speculative attempt is sent to another host
+        self.assertEqual([(), ["slow_host"]], self.deferred_hosts)
+        self.assertEqual(ConsistencyLevel.QUORUM,
+                         self.statements[0].consistency_level)
+
+        slow_future.complete()
+        self._assert_tasks_released(handler)
+        self.assertEqual(2, len(self.policy._host_latency_map))
+
+    def test_write_is_not_speculated(self):
+        write_future = FakeResponseFuture("host", completed=False)
+        handler = self._create_handler(
+            [write_future],
+            operation_profiles={"read": {"speculative_retry_delay": 0.01},
+                                "write": {"timeout": 0.05}}
+        )
+
+        self.assertRaises(OperationTimedOut, handler.execute_query,
+                          "UPDATE t SET a=1 WHERE b=2")
+        self.assertEqual(1, len(self.statements))
+
+        write_future.complete()
+        self._assert_tasks_released(handler)
+
+    def test_retry_if_no_host_available(self):
+        error = cassandra_cluster.NoHostAvailable("Unable to connect", {})
+        handler = self._create_handler([
+            FakeResponseFuture("host", error=error),
+            FakeResponseFuture("host", [[{"a": 1}], [{"a": 2}]]),
+            FakeResponseFuture("host", error=error)
+        ])
+
+        self.assertEqual(
+            [{"a": 1}, {"a": 2}],
+            handler.execute_query_async("SELECT * FROM t").result()
+        )
+
+        # lightweight transactions aren't retried
+        self.assertRaises(
+            cassandra_cluster.NoHostAvailable, handler.execute_query,
+            "UPDATE t SET a=1 WHERE b=2 IF a=0",
+            operation=cluster_handler.OPERATION_LWT
+        )
+        self.assertEqual(ConsistencyLevel.SERIAL,
+                         self.statements[-1].serial_consistency_level)
+        self._assert_tasks_released(handler)
+
+    def test_retry_does_not_wait_for_free_slot(self):
+        error = cassandra_cluster.NoHostAvailable("Unable to connect", {})
+        failed_future = FakeResponseFuture("host", error=error,
+                                           completed=False)
+        handler = self._create_handler([
+            failed_future, FakeResponseFuture("host", [[{"a": 1}]])
+        ])
+
+        result_future = handler.execute_query_async("SELECT * FROM t")
+        # concurrent queries hold the rest of slots and take over the slot
+        # released by the failed attempt
+        self.assertTrue(handler._acquire_task(False))
+        release_task = handler._release_task
+        with mock.patch.object(handler, "_release_task",
+                               side_effect=[None]):
+            errback_thread = threading.Thread(target=failed_future.complete)
+            errback_thread.daemon = True
+            errback_thread.start()
+            errback_thread.join(1)
+        self.assertFalse(errback_thread.is_alive())
+        self.assertFalse(result_future.done())
+        self.assertEqual(1, len(self.statements))
+
+        # retry is sent when concurrent queries are completed
+        release_task()
+        release_task()
+        self.assertEqual([{"a": 1}], result_future.result(1))
+        self.assertEqual(2, len(self.statements))
+        self._assert_tasks_released(handler)
+
+
+class LatencyAwarePolicyTestCase(unittest.TestCase):
+    """The test for latency aware load balancing policy."""
+
+    def test_make_query_plan(self):
+        child_policy = mock.Mock()
+        child_policy.make_query_plan.return_value = ["h1", "h2", "h3"]
+        policy = LatencyAwarePolicy(child_policy, min_measured=2,
+                                    update_interval=0)
+
+        for i in xrange(2):
+            policy.record_latency("h1", 0.1)
+            policy.record_latency("h2", 0.01)
+            policy.record_latency("h3", 0.015)
+        self.assertEqual(["h2", "h3", "h1"],
+                         list(policy.make_query_plan("keyspace")))
+
+        with policy.deferring(["h2"]):
+            plan = policy.make_query_plan("keyspace")
+            self.assertEqual(["h3", "h1", "h2"], list(plan))
+
+        policy.on_down("h1")
+        self.assertEqual(["h1", "h2", "h3"],
+                         list(policy.make_query_plan("keyspace")))
@@ -0,0 +1,79 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+
+import mock
+
+from magnetodb.common import metrics
+from magnetodb.common import probe
+
+
+class MetricsTestCase(unittest.TestCase):
+    """The test for metrics registry and its feeding by probe."""
+
+    def test_histogram(self):
+        histogram = metrics.Histogram()
+        self.assertEqual([0, 0, 0, 0], histogram.percentiles())
+
+        for value in xrange(1, 100001):
+            histogram.record(value)
+
+        self.assertEqual(100000, histogram.count)
+        self.assertEqual(1, histogram.min)
+        self.assertEqual(100000, histogram.max)
+
+        for expected, value in zip([50000, 90000, 99000, 99900],
+                                   histogram.percentiles()):
+            self.assertTrue(expected <= value <= expected * 1.016,
+                            (expected, value))
+
+        histogram = metrics.Histogram()
+        for value in [5, 7, 100]:
+            histogram.record(value)
+        self.assertEqual([7, 100], histogram.percentiles([50, 99]))
+
+    @mock.patch('magnetodb.common.probe.time.time')
+    def test_probe(self, mock_time):
+        registry = metrics.MetricsRegistry()
+
+        @probe.Probe('test')
+        def func(fail):
+            if fail:
+                raise ValueError()
+
+        with mock.patch.object(metrics, 'REGISTRY', registry):
+            mock_time.side_effect = [10.0, 10.002, 20.0, 20.001]
+            func(False)
+            self.assertRaises(ValueError, func, True)
+
+        snapshot = registry.snapshot()
+        self.assertEqual(['ValueError', 'ok'],
+                         [metric['status'] for metric in snapshot])
+        self.assertEqual('test.func', snapshot[1]['name'])
+        self.assertEqual(1, snapshot[1]['count'])
+        self.assertAlmostEqual(2.0, snapshot[1]['p99_ms'], places=2)
+
+        text = registry.to_prometheus()
+        self.assertIn(
+            'magnetodb_probe_duration_seconds_count'
+            '{probe="test.func",status="ok"} 1\n',
+            text
+        )
+        self.assertIn(
+            'magnetodb_probe_duration_seconds'
+            '{probe="test.func",quantile="0.5",status="ValueError"} 0.001\n',
+            text
+        )
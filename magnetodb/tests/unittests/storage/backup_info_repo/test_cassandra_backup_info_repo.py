@@ -0,0 +1,145 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+import unittest
+import uuid
+
+from magnetodb.common import exception
+
+from magnetodb.storage.backup_info_repo import BackupInfo
+from magnetodb.storage.backup_info_repo import ExportInfo
+from magnetodb.storage.backup_info_repo.cassandra_impl import (
+    CassandraBackupInfoRepository
+)
+
+
+class CassandraBackupInfoRepositoryTestCase(unittest.TestCase):
+    """The test for Cassandra backup info repository implementation."""
+
+    BACKUP_ID = uuid.UUID('00000000-0000-0000-0000-000000000001')
+
+    def test_backup_not_exist_exception_in_get_backup(self):
+        cluster_handler_mock = mock.Mock()
+        cluster_handler_mock.execute_query.return_value = None
+        repo = CassandraBackupInfoRepository(cluster_handler_mock)
+        context = mock.Mock(tenant='fake_tenant')
+
+        with self.assertRaises(
+                exception.BackupNotExistsException) as raises_cm:
+            repo.get_backup(context, 'fake_table', self.BACKUP_ID)
+
+        ex = raises_cm.exception
+        self.assertIn("'{}' does not exist for table 'fake_table'".format(
+            self.BACKUP_ID), ex.message)
+
+    def test_get_backup(self):
+        cluster_handler_mock = mock.Mock()
+        cluster_handler_mock.execute_query.return_value = [{
+            'tenant': 'fake_tenant',
+            'table_name': 'fake_table',
+            'exists': 1,
+            'id': self.BACKUP_ID,
+            'name': 'the_backup',
+            'status': BackupInfo.STATUS_ACTIVE,
+            'strategy': '{"compress": false}',
+            'location': '/backup',
+            'total_segments': 4,
+            'completed_segments': 4,
+            'item_count': 10,
+            'start_date_time': None,
+            'finish_date_time': None
+        }]
+        repo = CassandraBackupInfoRepository(cluster_handler_mock)
+        context = mock.Mock(tenant='fake_tenant')
+
+        backup_info = repo.get_backup(context, 'fake_table', self.BACKUP_ID)
+
+        self.assertEqual(self.BACKUP_ID, backup_info.id)
+        self.assertEqual('fake_table', backup_info.table_name)
+        self.assertEqual({'compress': False}, backup_info.strategy)
+        self.assertEqual(10, backup_info.item_count)
+
+    def test_update_backup_only_given_fields(self):
+        cluster_handler_mock = mock.Mock()
+        cluster_handler_mock.execute_query.return_value = [
+            {'[applied]': True}
+        ]
+        repo = CassandraBackupInfoRepository(cluster_handler_mock)
+        context = mock.Mock(tenant='fake_tenant')
+
+        backup_info = BackupInfo(self.BACKUP_ID, 'the_backup', 'fake_table',
+                                 BackupInfo.STATUS_CREATING, item_count=5)
+        repo.update_backup(context, backup_info, ['item_count'])
+
+        query = cluster_handler_mock.execute_query.call_args[0][0]
+        self.assertEqual(
+            "UPDATE magnetodb.backup_info SET \"item_count\"=5"
+            " WHERE tenant='fake_tenant' AND table_name='fake_table'"
+            " AND id={} IF exists=1".format(self.BACKUP_ID),
+            query
+        )
+
+    def test_save_backup_already_exists(self):
+        cluster_handler_mock = mock.Mock()
+        cluster_handler_mock.execute_query.return_value = [
+            {'[applied]': False}
+        ]
+        repo = CassandraBackupInfoRepository(cluster_handler_mock)
+        context = mock.Mock(tenant='fake_tenant')
+
+        backup_info = BackupInfo(self.BACKUP_ID, 'the_backup', 'fake_table',
+                                 BackupInfo.STATUS_CREATING, strategy={})
+        self.assertRaises(exception.ResourceInUseException,
+                          repo.save_backup, context, backup_info)
+
+    def test_get_export(self):
+        cluster_handler_mock = mock.Mock()
+        cluster_handler_mock.execute_query.return_value = [{
+            'tenant': 'fake_tenant',
+            'table_name': 'fake_table',
+            'exists': 1,
+            'id': self.BACKUP_ID,
+            'status': ExportInfo.STATUS_IN_PROGRESS,
+            'total_segments': 4,
+            'compress': True,
+            'location': '/export',
+            'completed_segments': 1,
+            'item_count': 10,
+            'error': None,
+            'start_date_time': None,
+            'finish_date_time': None
+        }]
+        repo = CassandraBackupInfoRepository(cluster_handler_mock)
+        context = mock.Mock(tenant='fake_tenant')
+
+        export_info = repo.get_export(context, 'fake_table', self.BACKUP_ID)
+
+        self.assertEqual(self.BACKUP_ID, export_info.id)
+        self.assertEqual('fake_table', export_info.table_name)
+        self.assertTrue(export_info.compress)
+        self.assertEqual(1, export_info.completed_segments)
+        query = cluster_handler_mock.execute_query.call_args[0][0]
+        self.assertIn("FROM magnetodb.export_info", query)
+
+    def test_export_not_exist_exception_in_get_export(self):
+        cluster_handler_mock = mock.Mock()
+        cluster_handler_mock.execute_query.return_value = None
+        repo = CassandraBackupInfoRepository(cluster_handler_mock)
+        context = mock.Mock(tenant='fake_tenant')
+
+        self.assertRaises(exception.ExportNotExistsException,
+                          repo.get_export, context, 'fake_table',
+                          self.BACKUP_ID)
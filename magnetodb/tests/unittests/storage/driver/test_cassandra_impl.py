@@ -14,11 +14,16 @@
 #    under the License.
 from magnetodb.storage.models import TableSchema
 
+import decimal
 import mock
 import unittest
 
+from concurrent.futures import Future
+
+from magnetodb.common import exception
 from magnetodb.storage import models
 from magnetodb.storage.driver.cassandra import cassandra_impl
+from magnetodb.storage.driver.cassandra import encoder
 
 
 class CassandraDriverTestCase(unittest.TestCase):
@@ -65,30 +70,124 @@ class CassandraDriverTestCase(unittest.TestCase):
 
         driver.update_item(context, table_info, key_attrs, attr_actions)
 
+        # attribute is deleted without reading of the item
         expected_calls = [
             mock.call('UPDATE "u_fake_tenant"."u_fake_table" SET '
-                      '"u_Tags"=null WHERE "u_hash_key"=1 AND '
-                      '"u_range_key"=\'two\' '
-                      'IF "u_Tags"={\'Help\',\'Update\'}', consistent=True)
+                      '"u_Tags"=null,attr_exist[\'Tags\']=null '
+                      'WHERE "u_hash_key"=1 AND "u_range_key"=\'two\'',
+                      consistent=True)
         ]
 
         self.assertEqual(expected_calls, mock_execute_query.mock_calls)
+        self.assertFalse(mock_select_item.called)
 
     @mock.patch('magnetodb.storage.driver.cassandra.'
                 'cassandra_impl.CassandraStorageDriver.select_item')
-    def test_update_item_delete_set(self, mock_select_item):
+    def test_update_item_put_without_read(self, mock_select_item):
+        mock_execute_query = mock.Mock(return_value=None)
+        mock_table_schema = TableSchema(
+            key_attributes=['hash_key'],
+            attribute_type_map={'hash_key': models.AttributeType('N')}
+        )
+        driver = self.get_connection(mock_execute_query, mock_table_schema)
+
+        context = mock.Mock(tenant='fake_tenant')
+        table_info = mock.Mock(
+            schema=mock_table_schema,
+            internal_name='"u_fake_tenant"."u_fake_table"'
+        )
+
+        key_attrs = {
+            'hash_key': models.AttributeValue('N', 1)
+        }
+        attr_actions = {
+            'Status': models.UpdateItemAction(
+                models.UpdateItemAction.UPDATE_ACTION_PUT,
+                models.AttributeValue('S', 'done')
+            )
+        }
+
+        result = driver.update_item(
+            context, table_info, key_attrs, attr_actions,
+            return_values=models.UpdateReturnValuesType('NONE')
+        )
+
+        self.assertEqual((True, None), result)
+        self.assertFalse(mock_select_item.called)
+        expected_calls = [
+            mock.call('UPDATE "u_fake_tenant"."u_fake_table" SET '
+                      'dyn_attr_dat[\'Status\']=0x0100646f6e65,'
+                      'dyn_attr_typ[\'Status\']=\'S\','
+                      'attr_exist[\'Status\']=1,'
+                      'attr_exist[\'hash_key\']=1 '
+                      'WHERE "u_hash_key"=1', consistent=True)
+        ]
+        self.assertEqual(expected_calls, mock_execute_query.mock_calls)
+
+    @mock.patch('magnetodb.storage.driver.cassandra.'
+                'cassandra_impl.CassandraStorageDriver._select_item_by_key')
+    def test_update_item_put_return_old_reads_item(
+            self, mock_select_item_by_key):
+        mock_execute_query = mock.Mock(return_value=None)
+        mock_table_schema = TableSchema(
+            key_attributes=['hash_key'],
+            attribute_type_map={'hash_key': models.AttributeType('N'),
+                                'Status': models.AttributeType('S')}
+        )
+        driver = self.get_connection(mock_execute_query, mock_table_schema)
+
+        old_value = models.AttributeValue('S', 'new')
+        mock_select_item_by_key.return_value = [{'u_Status': 'new'}]
+
+        context = mock.Mock(tenant='fake_tenant')
+        table_info = mock.Mock(
+            schema=mock_table_schema,
+            internal_name='"u_fake_tenant"."u_fake_table"'
+        )
+
+        key_attrs = {
+            'hash_key': models.AttributeValue('N', 1)
+        }
+        attr_actions = {
+            'Status': models.UpdateItemAction(
+                models.UpdateItemAction.UPDATE_ACTION_PUT,
+                models.AttributeValue('S', 'done')
+            )
+        }
+
+        result = driver.update_item(
+            context, table_info, key_attrs, attr_actions,
+            return_values=models.UpdateReturnValuesType('ALL_OLD')
+        )
+
+        self.assertEqual((True, {'Status': old_value}), result)
+        expected_calls = [
+            mock.call('UPDATE "u_fake_tenant"."u_fake_table" SET '
+                      '"u_Status"=\'done\' WHERE "u_hash_key"=1 '
+                      'IF "u_Status"=\'new\'', consistent=True,
+                      operation=cassandra_impl.OPERATION_LWT)
+        ]
+        self.assertEqual(expected_calls, mock_execute_query.mock_calls)
+
+    @mock.patch('magnetodb.storage.driver.cassandra.'
+                'cassandra_impl.CassandraStorageDriver._select_item_by_key')
+    def test_update_item_delete_set(self, mock_select_item_by_key):
         mock_execute_query = mock.Mock(return_value=None)
         mock_table_schema = TableSchema(
             key_attributes=['hash_key', 'range_key'],
-            attribute_type_map={'hash_key': None,
-                                'range_key': None,
-                                'Tags': None},
+            attribute_type_map={'hash_key': models.AttributeType('N'),
+                                'range_key': models.AttributeType('S')},
             index_def_map=None
         )
         driver = self.get_connection(mock_execute_query, mock_table_schema)
 
-        value = models.AttributeValue('SS', {"Update", "Help"})
-        mock_select_item.return_value = mock.Mock(items=[{'Tags': value}])
+        old_value = models.AttributeValue('SS', {"Update", "Help"})
+        mock_select_item_by_key.return_value = [{
+            'dyn_attr_dat': {
+                'Tags': encoder.pack_dynamic_attr_value(old_value)
+            },
+            'dyn_attr_typ': {'Tags': 'SS'}
+        }]
 
         context = mock.Mock(tenant='fake_tenant')
         table_info = mock.Mock(
@@ -111,32 +210,122 @@ class CassandraDriverTestCase(unittest.TestCase):
 
         expected_calls = [
             mock.call('UPDATE "u_fake_tenant"."u_fake_table" SET '
-                      '"u_Tags"={\'Help\'} WHERE "u_hash_key"=1 AND '
-                      '"u_range_key"=\'two\' '
-                      'IF "u_Tags"={\'Help\',\'Update\'}', consistent=True)
+                      'dyn_attr_dat=dyn_attr_dat+'
+                      '{\'Tags\':0x01030000000448656c70},'
+                      'dyn_attr_typ=dyn_attr_typ+{\'Tags\':\'SS\'},'
+                      'attr_exist=attr_exist+'
+                      '{\'hash_key\':1,\'range_key\':1,\'Tags\':1} '
+                      'WHERE "u_hash_key"=1 AND "u_range_key"=\'two\' '
+                      'IF dyn_attr_dat[\'Tags\']='
+                      '0x01030000000448656c7000000006557064617465',
+                      consistent=True,
+                      operation=cassandra_impl.OPERATION_LWT)
         ]
 
         self.assertEqual(expected_calls, mock_execute_query.mock_calls)
 
     @mock.patch('magnetodb.storage.driver.cassandra.'
-                'cassandra_impl.CassandraStorageDriver.select_item')
-    def test_update_item_add_number(self, mock_select_item):
+                'cassandra_impl.CassandraStorageDriver._select_item_by_key')
+    def test_update_item_condition_on_json_value(
+            self, mock_select_item_by_key):
+        mock_execute_query = mock.Mock(return_value=None)
+        mock_table_schema = TableSchema(
+            key_attributes=['hash_key'],
+            attribute_type_map={'hash_key': models.AttributeType('N')}
+        )
+        driver = self.get_connection(mock_execute_query, mock_table_schema)
+
+        # value written by previous versions is compared in JSON format
+        mock_select_item_by_key.return_value = [{
+            'dyn_attr_dat': {'Status': '"new"'},
+            'dyn_attr_typ': {'Status': 'S'}
+        }]
+
+        context = mock.Mock(tenant='fake_tenant')
+        table_info = mock.Mock(
+            schema=mock_table_schema,
+            internal_name='"u_fake_tenant"."u_fake_table"'
+        )
+
+        key_attrs = {
+            'hash_key': models.AttributeValue('N', 1)
+        }
+        attr_actions = {
+            'Status': models.UpdateItemAction(
+                models.UpdateItemAction.UPDATE_ACTION_PUT,
+                models.AttributeValue('S', 'done')
+            )
+        }
+
+        driver.update_item(
+            context, table_info, key_attrs, attr_actions,
+            return_values=models.UpdateReturnValuesType('ALL_OLD')
+        )
+
+        query = mock_execute_query.call_args[0][0]
+        self.assertTrue(query.endswith(
+            ' IF dyn_attr_dat[\'Status\']={}'.format(
+                encoder.encode_dynamic_attr_value_json(
+                    models.AttributeValue('S', 'new'))
+            )
+        ))
+
+    def test_put_item_expected_dynamic_attribute(self):
+        mock_execute_query = mock.Mock(side_effect=[
+            [{'dyn_attr_dat': {'Status': '"new"'}}],
+            [{'[applied]': True}]
+        ])
+        mock_table_schema = TableSchema(
+            key_attributes=['hash_key'],
+            attribute_type_map={'hash_key': models.AttributeType('N')}
+        )
+        driver = self.get_connection(mock_execute_query, mock_table_schema)
+
+        context = mock.Mock(tenant='fake_tenant')
+        table_info = mock.Mock(
+            schema=mock_table_schema,
+            internal_name='"u_fake_tenant"."u_fake_table"'
+        )
+        expected = models.AttributeValue('S', 'new')
+
+        driver.put_item(
+            context, table_info,
+            {'hash_key': models.AttributeValue('N', 1),
+             'Status': models.AttributeValue('S', 'done')},
+            expected_condition_map={
+                'Status': [models.ExpectedCondition.eq(expected)]
+            }
+        )
+
+        self.assertEqual(
+            mock.call('SELECT dyn_attr_dat FROM '
+                      '"u_fake_tenant"."u_fake_table" WHERE "u_hash_key"=1',
+                      consistent=True),
+            mock_execute_query.mock_calls[0]
+        )
+        query = mock_execute_query.call_args[0][0]
+        self.assertNotIn(' IN ', query)
+        self.assertTrue(query.endswith(
+            ' IF dyn_attr_dat[\'Status\']={}'.format(
+                encoder.encode_dynamic_attr_value_json(expected))
+        ))
+
+    @mock.patch('magnetodb.storage.driver.cassandra.'
+                'cassandra_impl.CassandraStorageDriver._select_item_by_key')
+    def test_update_item_add_number(self, mock_select_item_by_key):
         mock_execute_query = mock.Mock(return_value=None)
         mock_table_schema = TableSchema(
             key_attributes=['hash_key', 'range_key'],
-            attribute_type_map={'hash_key': None,
-                                'range_key': None,
-                                'ViewsCount': None},
+            attribute_type_map={'hash_key': models.AttributeType('N'),
+                                'range_key': models.AttributeType('S'),
+                                'ViewsCount': models.AttributeType('N')},
             index_def_map=None
         )
         driver = self.get_connection(mock_execute_query, mock_table_schema)
 
-        def make_select_result(i):
-            value = models.AttributeValue('N', i)
-            return mock.Mock(items=[{'ViewsCount': value}])
-
-        values = [make_select_result(i) for i in range(10)]
-        mock_select_item.side_effect = values
+        mock_select_item_by_key.side_effect = [
+            [{'u_ViewsCount': i}] for i in range(1, 11)
+        ]
 
         context = mock.Mock(tenant='fake_tenant')
         table_info = mock.Mock(
@@ -163,7 +352,952 @@ class CassandraDriverTestCase(unittest.TestCase):
                       '"u_ViewsCount"=%d WHERE "u_hash_key"=1 AND '
                       '"u_range_key"=\'two\' '
                       'IF "u_ViewsCount"=%d' % (i, i - 1),
-                      consistent=True) for i in range(1, 11)
+                      consistent=True, operation=cassandra_impl.OPERATION_LWT)
+            for i in range(2, 12)
         ]
 
         self.assertEqual(expected_calls, mock_execute_query.mock_calls)
+
+    @mock.patch('magnetodb.storage.driver.cassandra.'
+                'cassandra_impl.CassandraStorageDriver.select_item')
+    def test_update_item_add_set_without_read(self, mock_select_item):
+        mock_execute_query = mock.Mock(return_value=None)
+        mock_table_schema = TableSchema(
+            key_attributes=['hash_key'],
+            attribute_type_map={'hash_key': models.AttributeType('N'),
+                                'Tags': models.AttributeType('SS')}
+        )
+        driver = self.get_connection(mock_execute_query, mock_table_schema)
+
+        context = mock.Mock(tenant='fake_tenant')
+        table_info = mock.Mock(
+            schema=mock_table_schema,
+            internal_name='"u_fake_tenant"."u_fake_table"'
+        )
+
+        key_attrs = {
+            'hash_key': models.AttributeValue('N', 1)
+        }
+        attr_actions = {
+            'Tags': models.UpdateItemAction(
+                models.UpdateItemAction.UPDATE_ACTION_ADD,
+                models.AttributeValue('SS', {"Help"})
+            )
+        }
+
+        driver.update_item(context, table_info, key_attrs, attr_actions)
+
+        self.assertFalse(mock_select_item.called)
+        expected_calls = [
+            mock.call('UPDATE "u_fake_tenant"."u_fake_table" SET '
+                      '"u_Tags"="u_Tags"+{\'Help\'},'
+                      'attr_exist[\'Tags\']=1,attr_exist[\'hash_key\']=1 '
+                      'WHERE "u_hash_key"=1', consistent=True)
+        ]
+        self.assertEqual(expected_calls, mock_execute_query.mock_calls)
+
+        attr_actions['Tags'] = models.UpdateItemAction(
+            models.UpdateItemAction.UPDATE_ACTION_DELETE,
+            models.AttributeValue('NS', {1})
+        )
+        self.assertRaises(
+            exception.InvalidQueryParameter, driver.update_item, context,
+            table_info, key_attrs, attr_actions
+        )
+
+    def test_update_item_delete_map_keys_without_read(self):
+        mock_execute_query = mock.Mock(return_value=None)
+        mock_table_schema = TableSchema(
+            key_attributes=['hash_key'],
+            attribute_type_map={'hash_key': models.AttributeType('N'),
+                                'Prices': models.AttributeType('SNM')}
+        )
+        driver = self.get_connection(mock_execute_query, mock_table_schema)
+
+        context = mock.Mock(tenant='fake_tenant')
+        table_info = mock.Mock(
+            schema=mock_table_schema,
+            internal_name='"u_fake_tenant"."u_fake_table"'
+        )
+
+        key_attrs = {
+            'hash_key': models.AttributeValue('N', 1)
+        }
+        attr_actions = {
+            'Prices': models.UpdateItemAction(
+                models.UpdateItemAction.UPDATE_ACTION_DELETE,
+                models.AttributeValue('SS', {"a", "b"})
+            )
+        }
+
+        driver.update_item(context, table_info, key_attrs, attr_actions)
+
+        expected_calls = [
+            mock.call('UPDATE "u_fake_tenant"."u_fake_table" SET '
+                      '"u_Prices"[\'a\']=null,"u_Prices"[\'b\']=null '
+                      'WHERE "u_hash_key"=1', consistent=True)
+        ]
+        self.assertEqual(expected_calls, mock_execute_query.mock_calls)
+
+    def test_update_item_counter_table(self):
+        mock_execute_query = mock.Mock(return_value=None)
+        mock_table_schema = TableSchema(
+            key_attributes=['hash_key'],
+            attribute_type_map={'hash_key': models.AttributeType('N'),
+                                'views': models.AttributeType('N')},
+            counter_attributes=['views']
+        )
+        driver = self.get_connection(mock_execute_query, mock_table_schema)
+
+        context = mock.Mock(tenant='fake_tenant')
+        table_info = mock.Mock(
+            schema=mock_table_schema,
+            internal_name='"u_fake_tenant"."u_fake_table"'
+        )
+
+        key_attrs = {
+            'hash_key': models.AttributeValue('N', 1)
+        }
+        attr_actions = {
+            'views': models.UpdateItemAction(
+                models.UpdateItemAction.UPDATE_ACTION_ADD,
+                models.AttributeValue('N', -3)
+            )
+        }
+
+        result = driver.update_item(context, table_info, key_attrs,
+                                    attr_actions)
+
+        self.assertEqual((True, None), result)
+        expected_calls = [
+            mock.call('UPDATE "u_fake_tenant"."u_fake_table" SET '
+                      '"u_views"="u_views"-3 WHERE "u_hash_key"=1',
+                      consistent=True)
+        ]
+        self.assertEqual(expected_calls, mock_execute_query.mock_calls)
+
+        attr_actions['views'] = models.UpdateItemAction(
+            models.UpdateItemAction.UPDATE_ACTION_PUT,
+            models.AttributeValue('N', 3)
+        )
+        self.assertRaises(
+            exception.ValidationError, driver.update_item, context,
+            table_info, key_attrs, attr_actions
+        )
+
+    def test_put_item_uses_prepared_insert(self):
+        cluster_handler = mock.Mock()
+        driver = cassandra_impl.CassandraStorageDriver(cluster_handler, {})
+
+        table_info = mock.Mock(
+            schema=TableSchema(
+                key_attributes=['hash_key'],
+                attribute_type_map={
+                    'hash_key': models.AttributeType('N'),
+                    'str': models.AttributeType('S')
+                }
+            ),
+            internal_name='"u_fake_tenant"."u_fake_table"'
+        )
+        context = mock.Mock(tenant='fake_tenant')
+
+        for i in xrange(2):
+            driver.put_item(context, table_info, {
+                'hash_key': models.AttributeValue('N', i),
+                'dyn': models.AttributeValue('S', 'val')
+            })
+
+        expected_query = (
+            'INSERT INTO "u_fake_tenant"."u_fake_table" ("u_hash_key",'
+            '"u_str",dyn_attr_dat,dyn_attr_typ,attr_exist) '
+            'VALUES(?,?,?,?,?)'
+        )
+        expected_calls = [
+            mock.call(expected_query, [
+                decimal.Decimal(i), None, {'dyn': '\x01\x00val'}, {'dyn': 'S'},
+                {'hash_key': 1, 'dyn': 1}
+            ]) for i in xrange(2)
+        ]
+        self.assertEqual(expected_calls,
+                         cluster_handler.bind_query.mock_calls)
+        self.assertEqual(2, cluster_handler.execute_query.call_count)
+        self.assertFalse(cluster_handler.invalidate_prepared_queries.called)
+
+        driver.delete_table(context, table_info)
+
+        cluster_handler.invalidate_prepared_queries.assert_called_once_with(
+            [expected_query]
+        )
+
+    def test_get_item_uses_prepared_select(self):
+        cluster_handler = mock.Mock()
+        cluster_handler.execute_prepared_query.return_value = []
+        driver = cassandra_impl.CassandraStorageDriver(cluster_handler, {})
+
+        table_info = mock.Mock(
+            schema=TableSchema(
+                key_attributes=['hash_key', 'range_key'],
+                attribute_type_map={
+                    'hash_key': models.AttributeType('N'),
+                    'range_key': models.AttributeType('S')
+                }
+            ),
+            internal_name='"u_fake_tenant"."u_fake_table"'
+        )
+        context = mock.Mock(tenant='fake_tenant')
+
+        result = driver.select_item(
+            context, table_info,
+            [models.IndexedCondition.eq(models.AttributeValue('N', 1))],
+            [models.IndexedCondition.eq(models.AttributeValue('S', 'two'))],
+            models.SelectType.all()
+        )
+
+        self.assertEqual(0, result.count)
+        cluster_handler.execute_prepared_query.assert_called_once_with(
+            'SELECT * FROM "u_fake_tenant"."u_fake_table" '
+            'WHERE "u_hash_key"=? AND "u_range_key"=?',
+            [decimal.Decimal(1), 'two'], True
+        )
+        self.assertFalse(cluster_handler.execute_query.called)
+
+    def test_consistency_levels(self):
+        cluster_handler = mock.Mock()
+        cluster_handler.execute_query.return_value = [{'[applied]': True}]
+        cluster_handler.execute_prepared_query.return_value = []
+        driver = cassandra_impl.CassandraStorageDriver(cluster_handler, {})
+
+        table_info = mock.Mock(
+            schema=TableSchema(
+                key_attributes=['hash_key'],
+                attribute_type_map={'hash_key': models.AttributeType('N')},
+                consistency_levels=models.ConsistencyLevels(
+                    read='LOCAL_QUORUM', write='LOCAL_QUORUM',
+                    serial='LOCAL_SERIAL'
+                )
+            ),
+            internal_name='"u_fake_tenant"."u_fake_table"'
+        )
+        context = mock.Mock(tenant='fake_tenant')
+        key = {'hash_key': models.AttributeValue('N', 1)}
+        hash_key_condition_list = [
+            models.IndexedCondition.eq(key['hash_key'])
+        ]
+
+        # levels of the table are used by default
+        driver.put_item(context, table_info, key)
+        driver.put_item(context, table_info, key, if_not_exist=True)
+        driver.select_item(context, table_info, hash_key_condition_list,
+                           None, models.SelectType.all())
+        # level of the request overrides level of the table
+        driver.put_item(context, table_info, key, if_not_exist=True,
+                        consistency_level='SERIAL')
+        driver.delete_item(context, table_info, key,
+                           consistency_level='EACH_QUORUM')
+        driver.select_item(context, table_info, hash_key_condition_list,
+                           None, models.SelectType.all(),
+                           consistent='LOCAL_ONE')
+        driver.select_item(context, table_info, hash_key_condition_list,
+                           None, models.SelectType.all(), consistent=False)
+
+        self.assertEqual(
+            [mock.call(mock.ANY, consistent='LOCAL_QUORUM'),
+             mock.call(mock.ANY, consistent='LOCAL_QUORUM',
+                       operation=cassandra_impl.OPERATION_LWT,
+                       serial_consistency_level='LOCAL_SERIAL'),
+             mock.call(mock.ANY, consistent='LOCAL_QUORUM',
+                       operation=cassandra_impl.OPERATION_LWT,
+                       serial_consistency_level='SERIAL'),
+             mock.call(mock.ANY, consistent='EACH_QUORUM')],
+            cluster_handler.execute_query.mock_calls
+        )
+        self.assertEqual(
+            [mock.call(mock.ANY, mock.ANY, 'LOCAL_QUORUM'),
+             mock.call(mock.ANY, mock.ANY, 'LOCAL_ONE'),
+             mock.call(mock.ANY, mock.ANY, False)],
+            cluster_handler.execute_prepared_query.mock_calls
+        )
+
+    def test_put_item_async(self):
+        cluster_handler = mock.Mock()
+        query_future = Future()
+        cluster_handler.execute_query_async.return_value = query_future
+        driver = cassandra_impl.CassandraStorageDriver(cluster_handler, {})
+
+        table_info = mock.Mock(
+            schema=TableSchema(
+                key_attributes=['hash_key'],
+                attribute_type_map={
+                    'hash_key': models.AttributeType('N')
+                },
+                index_def_map={}
+            ),
+            internal_name='"u_fake_tenant"."u_fake_table"'
+        )
+        context = mock.Mock(tenant='fake_tenant')
+        attribute_map = {'hash_key': models.AttributeValue('N', 1)}
+
+        future = driver.put_item_async(context, table_info, attribute_map)
+
+        self.assertFalse(future.done())
+        query_future.set_result([])
+        self.assertEqual((True, {}), future.result())
+        cluster_handler.execute_query_async.assert_called_once_with(
+            cluster_handler.bind_query.return_value, consistent=True
+        )
+        self.assertFalse(cluster_handler.execute_query.called)
+
+        self.assertRaises(
+            NotImplementedError, driver.put_item_async, context, table_info,
+            attribute_map, if_not_exist=True
+        )
+
+    def test_scan_segment_token_range(self):
+        cluster_handler = mock.Mock()
+        driver = cassandra_impl.CassandraStorageDriver(
+            cluster_handler, {}, scan_parallelism=2
+        )
+
+        table_info = mock.Mock(
+            schema=TableSchema(
+                key_attributes=['hash_key'],
+                attribute_type_map={
+                    'hash_key': models.AttributeType('N')
+                },
+                index_def_map={}
+            ),
+            internal_name='"u_fake_tenant"."u_fake_table"'
+        )
+        context = mock.Mock(tenant='fake_tenant')
+
+        def execute_query_async(query, consistent):
+            future = Future()
+            future.set_result([])
+            return future
+        cluster_handler.execute_query_async.side_effect = execute_query_async
+
+        result = driver.scan(context, table_info, None, segment=1,
+                             total_segments=2)
+
+        self.assertEqual(0, result.count)
+        expected_calls = [
+            mock.call(
+                'SELECT * FROM "u_fake_tenant"."u_fake_table" '
+                'WHERE token("u_hash_key")>=0 '
+                'AND token("u_hash_key")<=4611686018427387903 '
+                'ALLOW FILTERING', False
+            ),
+            mock.call(
+                'SELECT * FROM "u_fake_tenant"."u_fake_table" '
+                'WHERE token("u_hash_key")>=4611686018427387904 '
+                'AND token("u_hash_key")<=9223372036854775807 '
+                'ALLOW FILTERING', False
+            )
+        ]
+        self.assertEqual(expected_calls,
+                         cluster_handler.execute_query_async.call_args_list)
+
+        cluster_handler.execute_query_async.reset_mock()
+
+        driver.scan(
+            context, table_info, None, limit=10,
+            exclusive_start_key={'hash_key': models.AttributeValue('N', 5)},
+            segment=0, total_segments=2
+        )
+
+        cluster_handler.execute_query_async.assert_called_once_with(
+            'SELECT * FROM "u_fake_tenant"."u_fake_table" '
+            'WHERE token("u_hash_key")>token(5) '
+            'AND token("u_hash_key")<=-1 LIMIT 10 ALLOW FILTERING', False
+        )
+
+    def test_scan_pushes_down_projection_and_range_conditions(self):
+        cluster_handler = mock.Mock()
+        driver = cassandra_impl.CassandraStorageDriver(cluster_handler, {})
+
+        table_info = mock.Mock(
+            schema=TableSchema(
+                key_attributes=['hash_key', 'range_key'],
+                attribute_type_map={
+                    'hash_key': models.AttributeType('N'),
+                    'range_key': models.AttributeType('S'),
+                    'str': models.AttributeType('S')
+                },
+                index_def_map={}
+            ),
+            internal_name='"u_fake_tenant"."u_fake_table"'
+        )
+        context = mock.Mock(tenant='fake_tenant')
+
+        future = Future()
+        future.set_result([
+            {'u_hash_key': decimal.Decimal(1), 'u_range_key': 'b',
+             'u_str': 'val'}
+        ])
+        cluster_handler.execute_query_async.return_value = future
+
+        result = driver.scan(
+            context, table_info,
+            {
+                'range_key': [
+                    models.ScanCondition.gt(models.AttributeValue('S', 'a'))
+                ]
+            },
+            attributes_to_get=['str'], limit=5
+        )
+
+        cluster_handler.execute_query_async.assert_called_once_with(
+            'SELECT "u_hash_key","u_range_key","u_str" '
+            'FROM "u_fake_tenant"."u_fake_table" '
+            'WHERE token("u_hash_key")>=-9223372036854775808 '
+            'AND token("u_hash_key")<=9223372036854775807 '
+            'AND "u_range_key">\'a\' LIMIT 5 ALLOW FILTERING', False
+        )
+        self.assertEqual(
+            [{'str': models.AttributeValue('S', 'val')}], result.items
+        )
+
+        cluster_handler.execute_query_async.reset_mock()
+
+        driver.scan(context, table_info, None, attributes_to_get=['dyn'])
+
+        query = cluster_handler.execute_query_async.call_args[0][0]
+        self.assertTrue(query.startswith(
+            'SELECT "u_hash_key","u_range_key",dyn_attr_dat,dyn_attr_typ '
+        ))
+
+    def test_scan_key_condition_type_mismatch(self):
+        cluster_handler = mock.Mock()
+        driver = cassandra_impl.CassandraStorageDriver(cluster_handler, {})
+
+        table_info = mock.Mock(
+            schema=TableSchema(
+                key_attributes=['hash_key', 'range_key'],
+                attribute_type_map={
+                    'hash_key': models.AttributeType('S'),
+                    'range_key': models.AttributeType('S')
+                },
+                index_def_map={}
+            ),
+            internal_name='"u_fake_tenant"."u_fake_table"'
+        )
+        context = mock.Mock(tenant='fake_tenant')
+
+        for key_name, condition in (
+                ('hash_key',
+                 models.ScanCondition.eq(models.AttributeValue('N', 5))),
+                ('range_key',
+                 models.ScanCondition.gt(models.AttributeValue('N', 5)))):
+            result = driver.scan(context, table_info,
+                                 {key_name: [condition]})
+            self.assertEqual(0, result.count)
+            self.assertEqual(0, result.scanned_count)
+
+            result = driver.scan_stream(context, table_info,
+                                        {key_name: [condition]})
+            self.assertEqual([], list(result.items))
+
+        # conditions of mismatched type aren't sent to Cassandra
+        self.assertEqual([], cluster_handler.mock_calls)
+
+    def test_select_items_async_groups_keys_by_partition(self):
+        cluster_handler = mock.Mock()
+        driver = cassandra_impl.CassandraStorageDriver(cluster_handler, {})
+
+        table_info = mock.Mock(
+            schema=TableSchema(
+                key_attributes=['hash_key', 'range_key'],
+                attribute_type_map={
+                    'hash_key': models.AttributeType('N'),
+                    'range_key': models.AttributeType('S'),
+                    'str': models.AttributeType('S')
+                },
+                index_def_map={}
+            ),
+            internal_name='"u_fake_tenant"."u_fake_table"'
+        )
+        context = mock.Mock(tenant='fake_tenant')
+
+        def make_key(hash_key, range_key):
+            return {
+                'hash_key': models.AttributeValue('N', hash_key),
+                'range_key': models.AttributeValue('S', range_key)
+            }
+
+        future1 = Future()
+        future1.set_result([
+            {'u_hash_key': decimal.Decimal(1), 'u_range_key': 'b',
+             'u_str': 'val1b'},
+            {'u_hash_key': decimal.Decimal(1), 'u_range_key': 'a',
+             'u_str': 'val1a'}
+        ])
+        future2 = Future()
+        future2.set_result([
+            {'u_hash_key': decimal.Decimal(2), 'u_range_key': 'a',
+             'u_str': 'val2a'}
+        ])
+        cluster_handler.execute_query_async.side_effect = [future1, future2]
+
+        result = driver.select_items_async(
+            context, table_info,
+            [make_key('1', 'a'), make_key('2', 'a'), make_key('1', 'b'),
+             make_key('1', 'c')],
+            models.SelectType.specific_attributes(['str']), consistent=False
+        ).result()
+
+        self.assertEqual(
+            [
+                mock.call(
+                    'SELECT "u_hash_key","u_range_key","u_str" '
+                    'FROM "u_fake_tenant"."u_fake_table" '
+                    'WHERE "u_hash_key"=1 AND "u_range_key" IN (\'a\',\'b\','
+                    '\'c\')', False
+                ),
+                mock.call(
+                    'SELECT "u_hash_key","u_range_key","u_str" '
+                    'FROM "u_fake_tenant"."u_fake_table" '
+                    'WHERE "u_hash_key"=2 AND "u_range_key" IN (\'a\')', False
+                )
+            ],
+            cluster_handler.execute_query_async.call_args_list
+        )
+        self.assertEqual(
+            [
+                {'str': models.AttributeValue('S', 'val1a')},
+                {'str': models.AttributeValue('S', 'val2a')},
+                {'str': models.AttributeValue('S', 'val1b')},
+                None
+            ],
+            result
+        )
+
+    def test_select_items_async_caps_hash_key_fan_out(self):
+        cluster_handler = mock.Mock()
+        driver = cassandra_impl.CassandraStorageDriver(
+            cluster_handler, {}, batch_get_fan_out=2
+        )
+
+        table_info = mock.Mock(
+            schema=TableSchema(
+                key_attributes=['hash_key'],
+                attribute_type_map={
+                    'hash_key': models.AttributeType('N')
+                },
+                index_def_map={}
+            ),
+            internal_name='"u_fake_tenant"."u_fake_table"'
+        )
+        context = mock.Mock(tenant='fake_tenant')
+
+        future = Future()
+        future.set_result([])
+        cluster_handler.execute_query_async.return_value = future
+
+        result = driver.select_items_async(
+            context, table_info,
+            [{'hash_key': models.AttributeValue('N', str(i))}
+             for i in xrange(3)],
+            models.SelectType.all(), consistent=True
+        ).result()
+
+        self.assertEqual(
+            [
+                mock.call(
+                    'SELECT * FROM "u_fake_tenant"."u_fake_table" '
+                    'WHERE "u_hash_key" IN (0,1)', True
+                ),
+                mock.call(
+                    'SELECT * FROM "u_fake_tenant"."u_fake_table" '
+                    'WHERE "u_hash_key" IN (2)', True
+                )
+            ],
+            cluster_handler.execute_query_async.call_args_list
+        )
+        self.assertEqual([None, None, None], result)
+
+    def test_batch_write_indexed_table(self):
+        cluster_handler = mock.Mock()
+        driver = cassandra_impl.CassandraStorageDriver(cluster_handler, {})
+
+        table_info = mock.Mock(
+            schema=TableSchema(
+                key_attributes=['hash_key', 'range_key'],
+                attribute_type_map={
+                    'hash_key': models.AttributeType('N'),
+                    'range_key': models.AttributeType('S'),
+                    'indexed': models.AttributeType('S')
+                },
+                index_def_map={
+                    'index': models.IndexDefinition('hash_key', 'indexed')
+                }
+            ),
+            internal_name='"u_fake_tenant"."u_fake_table"'
+        )
+        table_info.name = 'fake_table'
+        context = mock.Mock(tenant='fake_tenant')
+
+        def make_put(range_key, indexed):
+            return models.WriteItemRequest.put({
+                'hash_key': models.AttributeValue('N', '1'),
+                'range_key': models.AttributeValue('S', range_key),
+                'indexed': models.AttributeValue('S', indexed)
+            })
+
+        def make_future(result):
+            future = Future()
+            future.set_result(result)
+            return future
+
+        cluster_handler.execute_query_async.side_effect = [
+            make_future([
+                {'u_hash_key': decimal.Decimal(1), 'u_range_key': 'a',
+                 'u_indexed': 'old'}
+            ]),
+            make_future([{'[applied]': False}]),
+            make_future([
+                {'u_hash_key': decimal.Decimal(1), 'u_range_key': 'a',
+                 'u_indexed': 'older'}
+            ]),
+            make_future([{'[applied]': True}]),
+        ]
+
+        driver.batch_write(
+            context,
+            [(table_info, make_put('a', 'new')),
+             (table_info, make_put('b', 'new'))]
+        )
+
+        calls = cluster_handler.execute_query_async.call_args_list
+        self.assertEqual(4, len(calls))
+
+        read_query = calls[0][0][0]
+        self.assertIn('"u_hash_key"=1 AND ', read_query)
+        self.assertIn('"u_range_key" IN (\'a\',\'b\')', read_query)
+
+        batch_query = calls[1][0][0]
+        self.assertTrue(batch_query.startswith('BEGIN UNLOGGED BATCH UPDATE'))
+        self.assertIn(' IF "u_indexed"=\'old\'', batch_query)
+        self.assertIn(' IF NOT EXISTS', batch_query)
+        self.assertIn("iname='index' AND ival_str='new'", batch_query)
+        self.assertIn("DELETE FROM", batch_query)
+        self.assertIn("iname='index' AND ival_str='old'", batch_query)
+
+        # only not applied partition is retried with actual index values
+        retried_read_query = calls[2][0][0]
+        self.assertIn('"u_range_key" IN (\'a\',\'b\')', retried_read_query)
+        retried_batch_query = calls[3][0][0]
+        self.assertIn(' IF "u_indexed"=\'older\'', retried_batch_query)
+
+    def test_scan_stream(self):
+        cluster_handler = mock.Mock()
+        driver = cassandra_impl.CassandraStorageDriver(
+            cluster_handler, {}, fetch_size=2
+        )
+
+        table_info = mock.Mock(
+            schema=TableSchema(
+                key_attributes=['hash_key'],
+                attribute_type_map={
+                    'hash_key': models.AttributeType('N'),
+                    'str': models.AttributeType('S')
+                },
+                index_def_map={}
+            ),
+            internal_name='"u_fake_tenant"."u_fake_table"'
+        )
+        context = mock.Mock(tenant='fake_tenant')
+
+        cluster_handler.execute_query_paged.return_value = iter([
+            {'u_hash_key': decimal.Decimal(i), 'u_str': str(i)}
+            for i in xrange(3)
+        ])
+
+        result = driver.scan_stream(
+            context, table_info,
+            {
+                'str': [
+                    models.ScanCondition.eq(models.AttributeValue('S', '1'))
+                ]
+            },
+            limit=3
+        )
+
+        self.assertFalse(cluster_handler.execute_query_paged.called)
+        self.assertEqual(
+            [{'hash_key': models.AttributeValue('N', 1),
+              'str': models.AttributeValue('S', '1')}],
+            list(result.items)
+        )
+        self.assertEqual(1, result.count)
+        self.assertEqual(3, result.scanned_count)
+        self.assertEqual({'hash_key': models.AttributeValue('N', 2)},
+                         result.last_evaluated_key)
+        cluster_handler.execute_query_paged.assert_called_once_with(
+            'SELECT * FROM "u_fake_tenant"."u_fake_table" '
+            'WHERE token("u_hash_key")>=-9223372036854775808 '
+            'AND token("u_hash_key")<=9223372036854775807 '
+            'LIMIT 3 ALLOW FILTERING', False, 2
+        )
+
+    @staticmethod
+    def _get_projected_table_info():
+        table_info = mock.Mock(
+            schema=TableSchema(
+                key_attributes=['hash_key', 'range_key'],
+                attribute_type_map={
+                    'hash_key': models.AttributeType('N'),
+                    'range_key': models.AttributeType('S'),
+                    'indexed': models.AttributeType('S'),
+                    'title': models.AttributeType('S'),
+                    'body': models.AttributeType('S')
+                },
+                index_def_map={
+                    'index': models.IndexDefinition('hash_key', 'indexed',
+                                                    ['title'])
+                },
+                index_layout=TableSchema.INDEX_LAYOUT_PROJECTED
+            ),
+            internal_name='"u_fake_tenant"."u_fake_table"'
+        )
+        table_info.name = 'fake_table'
+        return table_info
+
+    def test_put_item_projected_index_layout(self):
+        cluster_handler = mock.Mock()
+        driver = cassandra_impl.CassandraStorageDriver(cluster_handler, {})
+        table_info = self._get_projected_table_info()
+        context = mock.Mock(tenant='fake_tenant')
+
+        cluster_handler.execute_query.side_effect = [
+            [], [{'[applied]': True}]
+        ]
+
+        driver.put_item(context, table_info, {
+            'hash_key': models.AttributeValue('N', 1),
+            'range_key': models.AttributeValue('S', 'a'),
+            'indexed': models.AttributeValue('S', 'i'),
+            'title': models.AttributeValue('S', 't'),
+            'body': models.AttributeValue('S', 'b'),
+            'extra': models.AttributeValue('S', 'e')
+        })
+
+        query = cluster_handler.execute_query.call_args[0][0]
+        item_query, index_query = query.split(' IF NOT EXISTS ')
+        self.assertIn("'b'", item_query)
+        self.assertIn("'extra'", item_query)
+
+        # index row contains only key and projected attributes
+        self.assertTrue(index_query.startswith('UPDATE'))
+        self.assertIn("\"u_title\"='t'", index_query)
+        self.assertIn("\"u_indexed\"='i'", index_query)
+        self.assertIn("\"u_body\"=null", index_query)
+        self.assertNotIn("'b'", index_query)
+        self.assertNotIn("'extra'", index_query)
+        self.assertIn("iname='index' AND ival_str='i'", index_query)
+
+    def test_query_projected_index_layout_fetches_item(self):
+        cluster_handler = mock.Mock()
+        driver = cassandra_impl.CassandraStorageDriver(cluster_handler, {})
+        table_info = self._get_projected_table_info()
+        context = mock.Mock(tenant='fake_tenant')
+
+        index_row = {'u_hash_key': decimal.Decimal(1), 'u_range_key': 'a',
+                     'u_indexed': 'i', 'u_title': 't', 'u_body': None}
+        cluster_handler.execute_query.return_value = [index_row]
+        future = Future()
+        future.set_result([
+            {'u_hash_key': decimal.Decimal(1), 'u_range_key': 'a',
+             'u_body': 'b'}
+        ])
+        cluster_handler.execute_query_async.return_value = future
+
+        def select(select_type):
+            return driver.select_item(
+                context, table_info,
+                [models.IndexedCondition.eq(models.AttributeValue('N', 1))],
+                [models.IndexedCondition.eq(models.AttributeValue('S', 'i'))],
+                select_type, index_name='index'
+            ).items
+
+        # projected attributes are read from index rows only
+        self.assertEqual(
+            [{'title': models.AttributeValue('S', 't')}],
+            select(models.SelectType.specific_attributes(['title']))
+        )
+        self.assertEqual(
+            set(['hash_key', 'range_key', 'indexed', 'title']),
+            set(select(models.SelectType.all_projected())[0])
+        )
+        self.assertFalse(cluster_handler.execute_query_async.called)
+
+        # not projected attributes are read from item rows
+        self.assertEqual(
+            [{'title': models.AttributeValue('S', 't'),
+              'body': models.AttributeValue('S', 'b')}],
+            select(models.SelectType.specific_attributes(['title', 'body']))
+        )
+        cluster_handler.execute_query_async.assert_called_once_with(
+            'SELECT "u_body","u_hash_key","u_range_key","u_title" '
+            'FROM "u_fake_tenant"."u_fake_table" WHERE "u_hash_key"=1 '
+            'AND iname=\'\' AND ival_str=\'\' AND ival_num=0 '
+            'AND ival_blb=0x AND "u_range_key" IN (\'a\')', True
+        )
+
+    def test_rewrite_index_rows(self):
+        cluster_handler = mock.Mock()
+        driver = cassandra_impl.CassandraStorageDriver(cluster_handler, {})
+        table_info = self._get_projected_table_info()
+        context = mock.Mock(tenant='fake_tenant')
+
+        cluster_handler.execute_query.return_value = [{'[applied]': True}]
+
+        self.assertEqual(1, driver.rewrite_index_rows(context, table_info, {
+            'hash_key': models.AttributeValue('N', 1),
+            'range_key': models.AttributeValue('S', 'a'),
+            'indexed': models.AttributeValue('S', 'i'),
+            'body': models.AttributeValue('S', 'b')
+        }))
+
+        query = cluster_handler.execute_query.call_args[0][0]
+        update_query, conditions = query.split(' IF ')
+        self.assertIn("\"u_body\"=null", update_query)
+        self.assertIn("\"u_title\"=null", update_query)
+        self.assertIn("iname='index' AND ival_str='i'", update_query)
+        self.assertNotIn("'b'", update_query)
+        self.assertEqual(
+            ["\"u_indexed\"='i'", "attr_exist['title']=null"],
+            sorted(conditions.split(' AND '))
+        )
+
+        # items without index value have no index rows
+        cluster_handler.execute_query.reset_mock()
+        self.assertEqual(0, driver.rewrite_index_rows(context, table_info, {
+            'hash_key': models.AttributeValue('N', 1),
+            'range_key': models.AttributeValue('S', 'a')
+        }))
+        self.assertFalse(cluster_handler.execute_query.called)
+
+    def test_query_index_all_projected(self):
+        cluster_handler = mock.Mock()
+        driver = cassandra_impl.CassandraStorageDriver(cluster_handler, {})
+        table_info = self._get_projected_table_info()
+        table_info.schema = TableSchema(
+            table_info.schema.attribute_type_map,
+            table_info.schema.key_attributes,
+            {'index': models.IndexDefinition('hash_key', 'indexed',
+                                             ['title', 'extra'])}
+        )
+        context = mock.Mock(tenant='fake_tenant')
+
+        extra = models.AttributeValue('S', 'e')
+        other = models.AttributeValue('N', 1)
+        cluster_handler.execute_query.return_value = [{
+            'u_hash_key': decimal.Decimal(1), 'u_range_key': 'a',
+            'u_indexed': 'i', 'u_title': 't',
+            'dyn_attr_dat': {
+                'extra': encoder.bind_dynamic_attr_value(extra),
+                'other': encoder.bind_dynamic_attr_value(other)
+            },
+            'dyn_attr_typ': {'extra': 'S', 'other': 'N'}
+        }]
+
+        result = driver.select_item(
+            context, table_info,
+            [models.IndexedCondition.eq(models.AttributeValue('N', 1))],
+            [models.IndexedCondition.eq(models.AttributeValue('S', 'i'))],
+            models.SelectType.all_projected(), index_name='index'
+        )
+
+        # index rows of full layout contain all attributes, but only
+        # projected ones are selected and decoded
+        query = cluster_handler.execute_query.call_args[0][0]
+        self.assertTrue(query.startswith(
+            'SELECT "u_hash_key","u_indexed","u_range_key","u_title",'
+            'dyn_attr_dat,dyn_attr_typ FROM '
+        ))
+        self.assertEqual(
+            [{'hash_key': models.AttributeValue('N', 1),
+              'range_key': models.AttributeValue('S', 'a'),
+              'indexed': models.AttributeValue('S', 'i'),
+              'title': models.AttributeValue('S', 't'),
+              'extra': extra}],
+            result.items
+        )
+        self.assertFalse(cluster_handler.execute_query_async.called)
+
+    def test_query_index_uses_select_query_plan(self):
+        cluster_handler = mock.Mock()
+        cluster_handler.execute_query.return_value = []
+        driver = cassandra_impl.CassandraStorageDriver(cluster_handler, {})
+        table_info = self._get_projected_table_info()
+        context = mock.Mock(tenant='fake_tenant')
+
+        def select():
+            return driver.select_item(
+                context, table_info,
+                [models.IndexedCondition.eq(models.AttributeValue('N', 1))],
+                None, models.SelectType.all_projected(), index_name='index',
+                limit=2, order_type=models.ORDER_TYPE_DESC,
+                exclusive_start_key={
+                    'hash_key': models.AttributeValue('N', 1),
+                    'range_key': models.AttributeValue('S', 'a'),
+                    'indexed': models.AttributeValue('S', 'i')
+                }
+            )
+
+        with mock.patch.object(
+                driver, '_build_select_query_plan',
+                wraps=driver._build_select_query_plan) as mock_build_plan:
+            select()
+            select()
+            self.assertEqual(1, mock_build_plan.call_count)
+
+            expected_query = (
+                'SELECT "u_hash_key","u_indexed","u_range_key","u_title" '
+                'FROM "u_fake_tenant"."u_fake_table" '
+                'WHERE "u_hash_key"=1 AND "iname"=\'index\' '
+                'AND "ival_str"<=\'i\' AND "ival_num"<0 AND "ival_blb"<0x '
+                'AND "u_range_key"<\'a\' ORDER BY iname DESC LIMIT 2'
+            )
+            self.assertEqual(
+                [mock.call(expected_query, True)] * 2,
+                cluster_handler.execute_query.mock_calls
+            )
+
+            # plan is compiled again for changed schema
+            table_info.schema = table_info.schema.with_index_layout(
+                TableSchema.INDEX_LAYOUT_FULL
+            )
+            select()
+            self.assertEqual(2, mock_build_plan.call_count)
+
+            # and after the table is deleted
+            cluster_handler.check_table_status.return_value = True
+            driver.delete_table(context, table_info)
+            select()
+            self.assertEqual(3, mock_build_plan.call_count)
+
+    def test_query_empty_key_conditions_skips_request(self):
+        cluster_handler = mock.Mock()
+        driver = cassandra_impl.CassandraStorageDriver(cluster_handler, {})
+        table_info = self._get_projected_table_info()
+        context = mock.Mock(tenant='fake_tenant')
+
+        result = driver.select_item(
+            context, table_info,
+            [models.IndexedCondition.eq(models.AttributeValue('N', 1))],
+            [models.IndexedCondition.gt(models.AttributeValue('S', 'b')),
+             models.IndexedCondition.le(models.AttributeValue('S', 'a'))],
+            models.SelectType.count(), index_name='index'
+        )
+        self.assertEqual(0, result.count)
+
+        result = driver.select_item_stream(
+            context, table_info,
+            [models.IndexedCondition.eq(models.AttributeValue('N', 1)),
+             models.IndexedCondition.eq(models.AttributeValue('N', 2))],
+            None, models.SelectType.all()
+        )
+        self.assertEqual([], list(result.items))
+        self.assertFalse(cluster_handler.execute_query.called)
+        self.assertFalse(cluster_handler.execute_query_paged.called)
@@ -0,0 +1,86 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+import decimal
+import json
+import unittest
+
+from magnetodb.storage import models
+from magnetodb.storage.driver.cassandra import encoder
+
+
+class DynamicAttrValueEncoderTestCase(unittest.TestCase):
+    """The test for dynamic attribute value binary format."""
+
+    def test_pack_unpack(self):
+        values = [
+            models.AttributeValue('S', u'\u0444str'),
+            models.AttributeValue('N', '-12.5'),
+            models.AttributeValue('N', '100'),
+            models.AttributeValue('B', 'AAEC'),
+            models.AttributeValue('SS', ['b', 'a', '']),
+            models.AttributeValue('NS', ['1', '2.5']),
+            models.AttributeValue('BS', ['AAEC', 'AwQ=']),
+            models.AttributeValue('SNM', {'k2': '2', 'k1': '1'}),
+            models.AttributeValue('NBM', {'1': 'AAEC'}),
+            models.AttributeValue('BSM', {'AAEC': 'v'}),
+        ]
+
+        for value in values:
+            packed = encoder.pack_dynamic_attr_value(value)
+            unpacked = encoder.unpack_dynamic_attr_value(packed,
+                                                         value.attr_type)
+            self.assertEqual(value, unpacked)
+
+    def test_pack_is_deterministic(self):
+        value1 = models.AttributeValue(
+            'SSM', {'k{}'.format(i): 'v' for i in xrange(10)}
+        )
+        value2 = models.AttributeValue(
+            'SSM', {'k{}'.format(i): 'v' for i in reversed(xrange(10))}
+        )
+
+        self.assertEqual(encoder.pack_dynamic_attr_value(value1),
+                         encoder.pack_dynamic_attr_value(value2))
+
+    def test_pack_format(self):
+        self.assertEqual(
+            '\x01\x03\x00\x00\x00\x01a\x00\x00\x00\x02bc',
+            encoder.pack_dynamic_attr_value(
+                models.AttributeValue('SS', ['bc', 'a'])
+            )
+        )
+        self.assertEqual(
+            '\x01\x01' + '12.5',
+            encoder.pack_dynamic_attr_value(
+                models.AttributeValue('N', decimal.Decimal('12.5'))
+            )
+        )
+
+    def test_unpack_json(self):
+        values = [
+            (models.AttributeValue('S', 'str'), 'S'),
+            (models.AttributeValue('N', '1'), 'N'),
+            (models.AttributeValue('BS', ['AAEC']), 'BS'),
+            (models.AttributeValue('NSM', {'1': 'v1', '2': 'v2'}), 'NSM'),
+        ]
+
+        for value, typ in values:
+            stored = json.dumps(value.encoded_value, sort_keys=True)
+            self.assertEqual(
+                value,
+                encoder.unpack_dynamic_attr_value(
+                    stored, models.AttributeType(typ)
+                )
+            )
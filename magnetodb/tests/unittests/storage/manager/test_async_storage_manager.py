@@ -33,7 +33,9 @@ class AsyncStorageManagerTestCase(unittest.TestCase):
     def test_create_table_async(self, mock_table_info_repo):
         context = mock.Mock(tenant='fake_tenant')
         table_name = 'fake_table'
-        table_schema = 'fake_table_schema'
+        table_schema = models.TableSchema(
+            {'id': models.AttributeType('N')}, ['id']
+        )
 
         mock_storage_driver = mock.Mock()
         mock_storage_driver.create_table.return_value = "fake_internal_name"
@@ -20,6 +20,9 @@ from magnetodb.storage.table_info_repo import TableInfoRepository
 import mock
 import time
 
+from oslo.config import cfg
+from oslo.serialization import jsonutils
+
 from concurrent.futures import Future
 
 from magnetodb.tests.unittests.common.notifier.test_notification \
@@ -44,7 +47,9 @@ class TestNotifyStorageManager(TestNotify):
 
         context = mock.Mock(tenant='fake_tenant')
         table_name = 'fake_table'
-        table_schema = 'fake_table_schema'
+        table_schema = models.TableSchema(
+            {'id': models.AttributeType('N')}, ['id']
+        )
 
         mock_storage_driver = mock.Mock()
         mock_storage_driver.create_table.return_value = True
@@ -75,12 +80,16 @@ class TestNotifyStorageManager(TestNotify):
         self.assertEqual(start_event['priority'], 'INFO')
         self.assertEqual(start_event['event_type'],
                          notifier.EVENT_TYPE_TABLE_CREATE_START)
-        self.assertEqual(start_event['payload'], table_schema)
+        self.assertEqual(start_event['payload'],
+                         jsonutils.to_primitive(table_schema,
+                                                convert_instances=True))
 
         self.assertEqual(end_event['priority'], 'INFO')
         self.assertEqual(end_event['event_type'],
                          notifier.EVENT_TYPE_TABLE_CREATE_END)
-        self.assertEqual(end_event['payload'], table_schema)
+        self.assertEqual(end_event['payload'],
+                         jsonutils.to_primitive(table_schema,
+                                                convert_instances=True))
 
         time_start = datetime.datetime.strptime(
             start_event['timestamp'], DATETIMEFORMAT)
@@ -172,6 +181,7 @@ class TestNotifyStorageManager(TestNotify):
 
         table_info = mock.Mock()
         table_info.schema.key_attributes = ['id', 'range']
+        table_info.schema.index_def_map = {}
         mock_repo_get.return_value = table_info
 
         mock_batch_write.side_effect = NotImplementedError()
@@ -234,3 +244,44 @@ class TestNotifyStorageManager(TestNotify):
             end_event['timestamp'], DATETIMEFORMAT)
         self.assertTrue(time_start < time_end,
                         "start event is later than end event")
+
+    @mock.patch('magnetodb.storage.driver.StorageDriver.put_item')
+    @mock.patch('magnetodb.storage.manager.simple_impl.SimpleStorageManager.'
+                '_validate_table_schema')
+    @mock.patch('magnetodb.storage.manager.simple_impl.SimpleStorageManager.'
+                '_validate_table_is_active')
+    @mock.patch('magnetodb.storage.table_info_repo.TableInfoRepository.get')
+    def test_notify_put_item_keys_only(self, mock_repo_get,
+                                       mock_validate_table_is_active,
+                                       mock_validate_table_schema,
+                                       mock_put_item):
+        self.cleanup_test_notifier()
+        cfg.CONF.set_override('notification_payload_keys_only', True)
+        self.addCleanup(cfg.CONF.clear_override,
+                        'notification_payload_keys_only')
+
+        mock_put_item.return_value = (True, None)
+
+        table_info = mock.Mock()
+        table_info.schema.key_attributes = ['id']
+        table_info.schema.index_def_map = {}
+        mock_repo_get.return_value = table_info
+
+        context = mock.Mock(tenant='fake_tenant')
+
+        storage_manager = SimpleStorageManager(
+            StorageDriver(), TableInfoRepository()
+        )
+        storage_manager.put_item(
+            context, 'fake_table',
+            {
+                'id': models.AttributeValue('N', 1),
+                'str': models.AttributeValue('S', 'str1')
+            }
+        )
+
+        self.assertEqual(len(self.get_notifications()), 1)
+        event = self.get_notifications()[0]
+        self.assertEqual(event['event_type'],
+                         notifier.EVENT_TYPE_DATA_PUTITEM)
+        self.assertEqual(['id'], event['payload']['attribute_map'].keys())
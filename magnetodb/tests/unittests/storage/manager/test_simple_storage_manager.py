@@ -16,6 +16,8 @@
 from magnetodb.common.exception import ValidationError
 from magnetodb.storage.driver import StorageDriver
 from magnetodb.storage.models import WriteItemRequest, TableMeta
+from magnetodb.storage.backup_info_repo import BackupInfo
+from magnetodb.storage.backup_info_repo import ExportInfo
 from magnetodb.storage.table_info_repo import TableInfoRepository, TableInfo
 
 import mock
@@ -53,6 +55,7 @@ class SimpleStorageManagerTestCase(unittest.TestCase):
 
         table_info = mock.Mock()
         table_info.schema.key_attributes = ['id', 'range']
+        table_info.schema.index_def_map = {}
         mock_repo_get.return_value = table_info
 
         context = mock.Mock(tenant='fake_tenant')
@@ -125,6 +128,53 @@ class SimpleStorageManagerTestCase(unittest.TestCase):
 
         self.assertEqual(unprocessed_items, {})
 
+    @mock.patch('magnetodb.storage.driver.StorageDriver.batch_write')
+    @mock.patch('magnetodb.storage.driver.StorageDriver.batch_write_async')
+    def test_batch_write_async_uses_driver_async(self, mock_batch_write_async,
+                                                 mock_batch_write):
+        future = Future()
+        mock_batch_write_async.return_value = future
+
+        context = mock.Mock(tenant='fake_tenant')
+        table_info = mock.Mock()
+        table_info.schema.index_def_map = {}
+        write_request_list = [
+            (table_info, WriteItemRequest.delete(
+                {'id': models.AttributeValue('N', 1)}
+            ))
+        ]
+
+        storage_manager = SimpleStorageManager(StorageDriver(),
+                                               TableInfoRepository())
+        result = storage_manager._batch_write_async(context,
+                                                    write_request_list)
+
+        self.assertFalse(result.done())
+        future.set_result(None)
+        self.assertEqual((), result.result())
+        mock_batch_write_async.assert_called_once_with(context,
+                                                       write_request_list)
+        self.assertFalse(mock_batch_write.called)
+
+    @mock.patch('magnetodb.storage.driver.StorageDriver.put_item')
+    def test_put_item_async_falls_back_to_blocking_driver(self,
+                                                          mock_put_item):
+        mock_put_item.return_value = (True, {})
+
+        context = mock.Mock(tenant='fake_tenant')
+        table_info = mock.Mock()
+        attribute_map = {'id': models.AttributeValue('N', 1)}
+
+        storage_manager = SimpleStorageManager(StorageDriver(),
+                                               TableInfoRepository())
+        result = storage_manager._put_item_async(context, table_info,
+                                                 attribute_map)
+
+        self.assertEqual((True, {}), result.result())
+        mock_put_item.assert_called_once_with(
+            context, table_info, attribute_map, None, False, None, None
+        )
+
     @mock.patch('magnetodb.storage.manager.simple_impl.SimpleStorageManager.'
                 '_validate_table_schema')
     @mock.patch('magnetodb.storage.manager.simple_impl.SimpleStorageManager.'
@@ -136,7 +186,7 @@ class SimpleStorageManagerTestCase(unittest.TestCase):
                                mock_validate_table_is_active,
                                mock_validate_table_schema):
         future = Future()
-        future.set_result(True)
+        future.set_result(models.SelectResult(items=[], count=0))
         mock_get_item.return_value = future
 
         context = mock.Mock(tenant='fake_tenant')
@@ -169,7 +219,8 @@ class SimpleStorageManagerTestCase(unittest.TestCase):
                                   req.attributes_to_get, req.consistent)
                         for req in request_list]
 
-        storage_manager = SimpleStorageManager(None, TableInfoRepository())
+        storage_manager = SimpleStorageManager(StorageDriver(),
+                                               TableInfoRepository())
 
         result, unprocessed_items = storage_manager.execute_get_batch(
             context, request_list
@@ -177,6 +228,124 @@ class SimpleStorageManagerTestCase(unittest.TestCase):
         mock_get_item.has_calls(expected_get)
         self.assertEqual(unprocessed_items, [])
 
+    @mock.patch('magnetodb.storage.manager.simple_impl.SimpleStorageManager.'
+                '_validate_table_schema')
+    @mock.patch('magnetodb.storage.manager.simple_impl.SimpleStorageManager.'
+                '_validate_table_is_active')
+    @mock.patch('magnetodb.storage.table_info_repo.TableInfoRepository.get')
+    @mock.patch('magnetodb.storage.driver.StorageDriver.select_items_async')
+    def test_execute_get_batch_groups_requests(
+            self, mock_select_items, mock_repo_get,
+            mock_validate_table_is_active, mock_validate_table_schema):
+        item = {'id': models.AttributeValue('N', 1),
+                'str': models.AttributeValue('S', 'str1')}
+        future = Future()
+        future.set_result([item, None])
+        mock_select_items.return_value = future
+
+        table_info = mock.Mock()
+        mock_repo_get.return_value = table_info
+
+        context = mock.Mock(tenant='fake_tenant')
+
+        request_list = [
+            models.GetItemRequest(
+                'fake_table',
+                {
+                    'id': models.AttributeValue('N', 1),
+                    'str': models.AttributeValue('S', key),
+                },
+                None,
+                True
+            )
+            for key in ('str1', 'str2')
+        ]
+
+        storage_manager = SimpleStorageManager(StorageDriver(),
+                                               TableInfoRepository())
+
+        result, unprocessed_items = storage_manager.execute_get_batch(
+            context, request_list
+        )
+
+        mock_repo_get.assert_called_once_with(context, 'fake_table')
+        mock_select_items.assert_called_once_with(
+            context, table_info,
+            [req.key_attribute_map for req in request_list],
+            models.SelectType.all(), consistent=True
+        )
+        self.assertEqual(
+            [
+                ('fake_table', models.SelectResult(items=[item], count=1)),
+                ('fake_table', models.SelectResult(items=[], count=0))
+            ],
+            result
+        )
+        self.assertEqual([], unprocessed_items)
+
+    @mock.patch('magnetodb.storage.manager.simple_impl.SimpleStorageManager.'
+                '_batch_write_async')
+    @mock.patch('magnetodb.storage.manager.simple_impl.SimpleStorageManager.'
+                '_validate_table_is_active')
+    @mock.patch('magnetodb.storage.table_info_repo.TableInfoRepository.get')
+    def test_bulk_load(self, mock_repo_get, mock_validate_table_is_active,
+                       mock_batch_write_async):
+        table_info = mock.Mock()
+        table_info.schema = models.TableSchema(
+            {
+                'id': models.AttributeType('N'),
+                'range': models.AttributeType('S')
+            },
+            ['id', 'range']
+        )
+        mock_repo_get.return_value = table_info
+
+        write_request_lists = []
+
+        def batch_write_async(context, write_request_list):
+            write_request_lists.append(write_request_list)
+            future = Future()
+            future.set_result(())
+            return future
+        mock_batch_write_async.side_effect = batch_write_async
+
+        def make_item(hash_key, range_key, value='v'):
+            return {
+                'id': models.AttributeValue('N', hash_key),
+                'range': models.AttributeValue('S', range_key),
+                'value': models.AttributeValue('S', value)
+            }
+
+        items = [make_item('1', 'a', 'old'), make_item('2', 'a'),
+                 make_item('1', 'b'), make_item('1', 'a', 'new'),
+                 make_item('3', 'a'), make_item('4', 'a')]
+
+        context = mock.Mock(tenant='fake_tenant')
+        storage_manager = SimpleStorageManager(StorageDriver(),
+                                               TableInfoRepository())
+
+        result = list(
+            storage_manager.bulk_load(context, 'fake_table', iter(items),
+                                      max_in_flight=1, buffer_size=4)
+        )
+
+        mock_repo_get.assert_called_once_with(context, 'fake_table')
+        # one batch is in flight at once, so results are returned after
+        # each batch, items replaced by later ones are processed as well
+        self.assertEqual([(2, []), (2, []), (1, []), (1, [])], result)
+        self.assertEqual(
+            [
+                [items[1]],
+                [items[2], items[3]],
+                [items[4]],
+                [items[5]]
+            ],
+            [
+                [request.attribute_map for _, request in request_list]
+                for request_list in write_request_lists
+            ]
+        )
+
     @mock.patch('magnetodb.storage.table_info_repo.TableInfoRepository.update')
     @mock.patch('magnetodb.storage.table_info_repo.TableInfoRepository.get')
     def test_update_status_on_describe_for_creating_table(
@@ -269,6 +438,7 @@ class SimpleStorageManagerTestCase(unittest.TestCase):
 
         table_info = mock.Mock()
         table_info.schema.key_attributes = ['id', 'range']
+        table_info.schema.index_def_map = {}
         mock_repo_get.return_value = table_info
 
         context = mock.Mock(tenant='fake_tenant')
@@ -303,3 +473,93 @@ class SimpleStorageManagerTestCase(unittest.TestCase):
 
         exception = raises_cm.exception
         self.assertIn("More than one", exception._error_string)
+
+    @mock.patch('magnetodb.storage.manager.simple_impl.SimpleStorageManager.'
+                '_validate_table_is_active')
+    @mock.patch('magnetodb.storage.table_info_repo.TableInfoRepository.get')
+    def test_create_backup_failed_to_schedule(self, mock_repo_get,
+                                              mock_validate_table_is_active):
+        backup_info_repo = mock.Mock()
+        context = mock.Mock(tenant='fake_tenant')
+        storage_manager = SimpleStorageManager(
+            StorageDriver(), TableInfoRepository(),
+            backup_info_repo=backup_info_repo
+        )
+
+        self.assertRaises(NotImplementedError, storage_manager.create_backup,
+                          context, 'fake_table', 'the_backup', {})
+
+        backup_info = backup_info_repo.save_backup.call_args[0][1]
+        self.assertEqual(BackupInfo.STATUS_CREATE_FAILED, backup_info.status)
+        backup_info_repo.update_backup.assert_called_once_with(
+            context, backup_info, ["status", "finish_date_time"]
+        )
+
+    @mock.patch('magnetodb.storage.manager.simple_impl.SimpleStorageManager.'
+                '_validate_table_is_active')
+    @mock.patch('magnetodb.storage.table_info_repo.TableInfoRepository.get')
+    def test_create_restore_job_of_not_active_backup(
+            self, mock_repo_get, mock_validate_table_is_active):
+        backup_info_repo = mock.Mock()
+        backup_info_repo.get_backup.return_value = BackupInfo(
+            'fake_backup_id', 'the_backup', 'fake_table',
+            BackupInfo.STATUS_CREATING
+        )
+        context = mock.Mock(tenant='fake_tenant')
+        storage_manager = SimpleStorageManager(
+            StorageDriver(), TableInfoRepository(),
+            backup_info_repo=backup_info_repo
+        )
+
+        self.assertRaises(ValidationError, storage_manager.create_restore_job,
+                          context, 'fake_table', backup_id='fake_backup_id')
+        self.assertFalse(backup_info_repo.save_restore_job.called)
+
+    @mock.patch('magnetodb.storage.table_info_repo.TableInfoRepository.get')
+    def test_put_item_to_counter_table(self, mock_repo_get):
+        table_info = TableInfo(
+            'fake_table', '00000000-0000-0000-0000-000000000000',
+            models.TableSchema(
+                {
+                    'id': models.AttributeType('N'),
+                    'views': models.AttributeType('N')
+                },
+                ['id'], counter_attributes=['views']
+            ),
+            TableMeta.TABLE_STATUS_ACTIVE
+        )
+        mock_repo_get.return_value = table_info
+
+        context = mock.Mock(tenant='fake_tenant')
+        storage_manager = SimpleStorageManager(StorageDriver(),
+                                               TableInfoRepository())
+
+        item = {
+            'id': models.AttributeValue('N', 1),
+            'views': models.AttributeValue('N', 1)
+        }
+        self.assertRaises(ValidationError, storage_manager.put_item,
+                          context, 'fake_table', item)
+
+    @mock.patch('magnetodb.storage.manager.simple_impl.SimpleStorageManager.'
+                '_validate_table_is_active')
+    @mock.patch('magnetodb.storage.table_info_repo.TableInfoRepository.get')
+    def test_create_export_failed_to_schedule(self, mock_repo_get,
+                                              mock_validate_table_is_active):
+        backup_info_repo = mock.Mock()
+        context = mock.Mock(tenant='fake_tenant')
+        storage_manager = SimpleStorageManager(
+            StorageDriver(), TableInfoRepository(),
+            backup_info_repo=backup_info_repo
+        )
+
+        self.assertRaises(NotImplementedError, storage_manager.create_export,
+                          context, 'fake_table', 2, True)
+
+        export_info = backup_info_repo.save_export.call_args[0][1]
+        self.assertEqual(ExportInfo.STATUS_FAILED, export_info.status)
+        self.assertEqual(2, export_info.total_segments)
+        self.assertTrue(export_info.compress)
+        backup_info_repo.update_export.assert_called_once_with(
+            context, export_info, ["status", "error", "finish_date_time"]
+        )
@@ -20,7 +20,9 @@ import unittest
 
 from magnetodb.common import exception
 
+from magnetodb.storage.models import AttributeType
 from magnetodb.storage.models import TableMeta
+from magnetodb.storage.models import TableSchema
 from magnetodb.storage.table_info_repo import TableInfo
 from magnetodb.storage.table_info_repo.cassandra_impl import (
     CassandraTableInfoRepository
@@ -80,3 +82,96 @@ class CassandraTableInfoRepositoryTestCase(unittest.TestCase):
         seconds = (datetime.now() -
                    table_info.last_update_date_time).total_seconds()
         self.assertLess(seconds, 30)
+
+    def _get_table_info_row(self, last_update_date_time):
+        return {
+            'id': '00000000-0000-0000-0000-000000000000',
+            'schema': TableSchema(
+                {'hash_key': AttributeType('S')}, ['hash_key']
+            ).to_json(),
+            'internal_name': 'u_fake_table',
+            'status': TableMeta.TABLE_STATUS_ACTIVE,
+            'last_update_date_time': last_update_date_time,
+            'creation_date_time': last_update_date_time
+        }
+
+    def test_cache_evicts_least_recently_used(self):
+        cluster_handler_mock = mock.Mock()
+        cluster_handler_mock.execute_query.return_value = [
+            self._get_table_info_row(datetime.now())
+        ]
+        table_repo = CassandraTableInfoRepository(cluster_handler_mock,
+                                                  cache_size=2)
+        context = mock.Mock(tenant='fake_tenant')
+
+        table_repo.get(context, 'table1')
+        table_repo.get(context, 'table2')
+        table_repo.get(context, 'table1')
+        table_repo.get(context, 'table3')
+        self.assertEqual(3, cluster_handler_mock.execute_query.call_count)
+
+        table_repo.get(context, 'table1')
+        self.assertEqual(3, cluster_handler_mock.execute_query.call_count)
+
+        table_repo.get(context, 'table2')
+        self.assertEqual(4, cluster_handler_mock.execute_query.call_count)
+
+    @mock.patch('magnetodb.storage.table_info_repo.cassandra_impl.time')
+    def test_cache_ttl_checks_last_update_date_time(self, mock_time):
+        last_update_date_time = datetime.now()
+        cluster_handler_mock = mock.Mock()
+        cluster_handler_mock.execute_query.return_value = [
+            self._get_table_info_row(last_update_date_time)
+        ]
+        table_repo = CassandraTableInfoRepository(cluster_handler_mock,
+                                                  cache_ttl=60)
+        context = mock.Mock(tenant='fake_tenant')
+
+        mock_time.time.return_value = 1000
+        table_repo.get(context, 'fake_table')
+        mock_time.time.return_value = 1059
+        table_repo.get(context, 'fake_table')
+        self.assertEqual(1, cluster_handler_mock.execute_query.call_count)
+
+        # not changed table info is only validated
+        mock_time.time.return_value = 1060
+        table_repo.get(context, 'fake_table')
+        self.assertEqual(2, cluster_handler_mock.execute_query.call_count)
+        query = cluster_handler_mock.execute_query.call_args[0][0]
+        self.assertTrue(
+            query.startswith("SELECT last_update_date_time FROM")
+        )
+        mock_time.time.return_value = 1119
+        table_repo.get(context, 'fake_table')
+        self.assertEqual(2, cluster_handler_mock.execute_query.call_count)
+
+        # changed table info is refreshed
+        mock_time.time.return_value = 1120
+        cluster_handler_mock.execute_query.return_value = [
+            self._get_table_info_row(
+                last_update_date_time + timedelta(0, 1)
+            )
+        ]
+        table_repo.get(context, 'fake_table')
+        self.assertEqual(4, cluster_handler_mock.execute_query.call_count)
+
+    @mock.patch('magnetodb.storage.table_info_repo.cassandra_impl.messaging')
+    def test_invalidation_on_update(self, mock_messaging):
+        cluster_handler_mock = mock.Mock()
+        cluster_handler_mock.execute_query.return_value = [{'[applied]': True}]
+        table_repo = CassandraTableInfoRepository(
+            cluster_handler_mock, invalidation_topic='table_info'
+        )
+        context = mock.Mock(tenant='fake_tenant')
+
+        mock_server = mock_messaging.get_rpc_server.return_value
+        self.assertTrue(mock_server.start.called)
+
+        table_info = TableInfo(
+            'fake_table', '00000000-0000-0000-0000-000000000000', None,
+            TableMeta.TABLE_STATUS_ACTIVE)
+        table_repo.update(context, table_info, ['status'])
+
+        mock_messaging.RPCClient.return_value.cast.assert_called_once_with(
+            {}, 'invalidate', tenant='fake_tenant', table_name='fake_table'
+        )
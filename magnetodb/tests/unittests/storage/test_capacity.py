@@ -0,0 +1,170 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+
+import mock
+
+from magnetodb.openstack.common import context as req_context
+from magnetodb.storage import capacity
+from magnetodb.storage import models
+from magnetodb.storage.driver import StorageDriver
+from magnetodb.storage.manager.simple_impl import SimpleStorageManager
+from magnetodb.storage.table_info_repo import TableInfo
+from magnetodb.storage.table_info_repo import TableInfoRepository
+
+
+class CapacityTestCase(unittest.TestCase):
+    """The test for capacity units accounting."""
+
+    def setUp(self):
+        capacity.USAGE.clear()
+        self.addCleanup(capacity.USAGE.clear)
+
+        schema = models.TableSchema(
+            {
+                'id': models.AttributeType('N'),
+                'range': models.AttributeType('S'),
+                'indexed': models.AttributeType('S')
+            },
+            ['id', 'range'],
+            {'index': models.IndexDefinition('id', 'indexed')}
+        )
+        self.table_info = TableInfo('test_table', None, schema,
+                                    models.TableMeta.TABLE_STATUS_ACTIVE)
+        self.context = req_context.RequestContext(tenant='test_tenant')
+
+    def test_item_size(self):
+        item = {
+            'id': models.AttributeValue('N', 12345),
+            'str': models.AttributeValue('S', u'\u0444'),
+            'blob': models.AttributeValue('B', 'AAE='),
+            'set': models.AttributeValue('SS', ['a', 'bc']),
+            'map': models.AttributeValue('SNM', {'k': 10})
+        }
+        self.assertEqual(2 + 5 + 3 + 2 + 4 + 2 + 3 + 3 + 3 + 3,
+                         capacity.item_size(item))
+
+        self.assertEqual(1.0, capacity.read_units(0))
+        self.assertEqual(2.0, capacity.read_units(4097))
+        self.assertEqual(1.0, capacity.read_units(4097, consistent=False))
+        self.assertEqual(1.0, capacity.write_units(1024))
+        self.assertEqual(2.0, capacity.write_units(1025))
+
+    def test_consumed_capacity(self):
+        item = {
+            'id': models.AttributeValue('N', 1),
+            'range': models.AttributeValue('S', '1'),
+            'indexed': models.AttributeValue('S', 'x' * 2000)
+        }
+        capacity.add_write(self.context, self.table_info, item)
+        capacity.add_write(self.context, self.table_info,
+                           {'id': item['id'], 'range': item['range']})
+        capacity.add_read(self.context, self.table_info, [item, item],
+                          consistent=False, index_name='index')
+        capacity.add_delete(self.context, self.table_info,
+                            {'id': item['id'], 'range': item['range']})
+
+        consumed_capacity = capacity.get_consumed_capacity(self.context,
+                                                           'test_table')
+        self.assertEqual(0.0, consumed_capacity.read_units)
+        self.assertEqual(4.0, consumed_capacity.write_units)
+        self.assertEqual({'index': 3.5}, consumed_capacity.index_units)
+        self.assertEqual(7.5, consumed_capacity.capacity_units)
+        self.assertEqual([consumed_capacity],
+                         capacity.get_consumed_capacity(self.context))
+
+        self.assertEqual(
+            {'read_capacity_units': 0.5, 'write_capacity_units': 7.0},
+            capacity.USAGE.get('test_tenant', 'test_table')
+        )
+
+    @mock.patch('magnetodb.storage.driver.StorageDriver.get_table_statistics')
+    @mock.patch('magnetodb.storage.driver.StorageDriver.update_item')
+    @mock.patch('magnetodb.storage.table_info_repo.TableInfoRepository.get')
+    def test_storage_manager(self, mock_repo_get, mock_update_item,
+                             mock_get_table_statistics):
+        mock_repo_get.return_value = self.table_info
+        mock_update_item.return_value = (True, None)
+        mock_get_table_statistics.return_value = {'item_count': 1}
+
+        storage_manager = SimpleStorageManager(StorageDriver(),
+                                               TableInfoRepository())
+        storage_manager.update_item(
+            self.context, 'test_table',
+            {'id': models.AttributeValue('N', 1),
+             'range': models.AttributeValue('S', '1')},
+            {'indexed': models.UpdateItemAction(
+                models.UpdateItemAction.UPDATE_ACTION_PUT,
+                models.AttributeValue('S', 'x'))}
+        )
+
+        consumed_capacity = capacity.get_consumed_capacity(self.context,
+                                                           'test_table')
+        self.assertEqual(1.0, consumed_capacity.write_units)
+        self.assertEqual({'index': 1.0}, consumed_capacity.index_units)
+
+        self.assertEqual(
+            {'item_count': 1, 'write_capacity_units': 2.0},
+            storage_manager.get_table_statistics(
+                self.context, 'test_table',
+                ['item_count', 'write_capacity_units']
+            )
+        )
+        mock_get_table_statistics.assert_called_once_with(
+            self.context, self.table_info, ['item_count']
+        )
+
+    def test_is_strong_read(self):
+        self.assertTrue(capacity.is_strong_read(self.table_info, True))
+        self.assertFalse(capacity.is_strong_read(self.table_info, False))
+        self.assertTrue(capacity.is_strong_read(self.table_info, 'QUORUM'))
+        self.assertTrue(capacity.is_strong_read(self.table_info, 'SERIAL'))
+        self.assertFalse(capacity.is_strong_read(self.table_info, 'ONE'))
+        self.assertFalse(
+            capacity.is_strong_read(self.table_info, 'LOCAL_ONE')
+        )
+
+        schema = models.TableSchema(
+            self.table_info.schema.attribute_type_map,
+            self.table_info.schema.key_attributes,
+            consistency_levels=models.ConsistencyLevels(read='LOCAL_ONE')
+        )
+        table_info = TableInfo('test_table', None, schema,
+                               models.TableMeta.TABLE_STATUS_ACTIVE)
+        self.assertFalse(capacity.is_strong_read(table_info, True))
+        self.assertTrue(capacity.is_strong_read(table_info, 'ALL'))
+
+    @mock.patch('magnetodb.storage.driver.StorageDriver.select_item')
+    @mock.patch('magnetodb.storage.table_info_repo.TableInfoRepository.get')
+    def test_storage_manager_read_level(self, mock_repo_get,
+                                        mock_select_item):
+        mock_repo_get.return_value = self.table_info
+        mock_select_item.return_value = models.SelectResult(items=[])
+
+        storage_manager = SimpleStorageManager(StorageDriver(),
+                                               TableInfoRepository())
+        key_attribute_map = {'id': models.AttributeValue('N', 1),
+                             'range': models.AttributeValue('S', '1')}
+        storage_manager.get_item(self.context, 'test_table',
+                                 key_attribute_map, models.SelectType.all(),
+                                 consistent='ONE')
+        storage_manager.get_item(self.context, 'test_table',
+                                 key_attribute_map, models.SelectType.all(),
+                                 consistent='QUORUM')
+
+        consumed_capacity = capacity.get_consumed_capacity(self.context,
+                                                           'test_table')
+        self.assertEqual(1.5, consumed_capacity.read_units)
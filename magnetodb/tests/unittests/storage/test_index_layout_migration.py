@@ -0,0 +1,89 @@
+# Copyright 2014 Symantec Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import unittest
+
+import mock
+
+from magnetodb.common import exception
+from magnetodb.storage import index_layout_migration
+from magnetodb.storage import models
+from magnetodb.storage.table_info_repo import TableInfo
+
+
+class IndexLayoutMigrationTestCase(unittest.TestCase):
+    """The test for migration of tables to projected index layout."""
+
+    def setUp(self):
+        schema = models.TableSchema(
+            {
+                'id': models.AttributeType('N'),
+                'range': models.AttributeType('S'),
+                'indexed': models.AttributeType('S')
+            },
+            ['id', 'range'],
+            {'index': models.IndexDefinition('id', 'indexed', [])}
+        )
+        self.table_info = TableInfo('test_table', None, schema,
+                                    models.TableMeta.TABLE_STATUS_ACTIVE)
+        self.table_info_repo = mock.Mock()
+        self.table_info_repo.get.return_value = self.table_info
+        self.context = mock.Mock(tenant='test_tenant')
+
+    @mock.patch('time.sleep')
+    def test_migrate_table(self, mock_sleep):
+        storage_driver = mock.Mock()
+        storage_driver.scan_stream.side_effect = lambda *args, **kwargs: (
+            mock.Mock(items=iter([{'id': kwargs['segment']}] * 2))
+        )
+        storage_driver.rewrite_index_rows.return_value = 1
+        progress_callback = mock.Mock()
+
+        stats = index_layout_migration.migrate_table(
+            self.context, storage_driver, self.table_info_repo, 'test_table',
+            total_segments=3, parallelism=2, cache_ttl=10,
+            progress_callback=progress_callback
+        )
+
+        self.assertEqual(
+            dict(item_count=6, rewritten_count=6, segment_count=3), stats
+        )
+        self.assertEqual(3, progress_callback.call_count)
+        self.assertEqual(models.TableSchema.INDEX_LAYOUT_PROJECTED,
+                         self.table_info.schema.index_layout)
+        self.table_info_repo.update.assert_called_once_with(
+            self.context, self.table_info, ["schema"]
+        )
+        mock_sleep.assert_called_once_with(10)
+        self.assertEqual(6, storage_driver.rewrite_index_rows.call_count)
+
+        # repeated migration doesn't switch layout again
+        self.table_info_repo.update.reset_mock()
+        mock_sleep.reset_mock()
+        index_layout_migration.migrate_table(
+            self.context, storage_driver, self.table_info_repo, 'test_table',
+            total_segments=1
+        )
+        self.assertFalse(self.table_info_repo.update.called)
+        self.assertFalse(mock_sleep.called)
+
+    def test_switch_index_layout_not_active_table(self):
+        self.table_info.status = models.TableMeta.TABLE_STATUS_CREATING
+        self.assertRaises(
+            exception.ResourceInUseException,
+            index_layout_migration.switch_index_layout, self.context,
+            self.table_info_repo, 'test_table',
+            models.TableSchema.INDEX_LAYOUT_PROJECTED
+        )
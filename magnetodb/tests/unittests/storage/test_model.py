@@ -13,8 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
 import unittest
 
+from magnetodb.common.exception import ValidationError
 from magnetodb.storage import models
 
 
@@ -30,3 +32,98 @@ class ModelsTestCase(unittest.TestCase):
             '"value": ["Help", "Update"]}'
         )
         self.assertEqual(expected, value.to_json())
+
+    def test_attribute_value_has_no_instance_dict(self):
+        value = models.AttributeValue('N', decoded_value=5)
+
+        self.assertFalse(hasattr(value, '__dict__'))
+        self.assertEqual('5', value.encoded_value)
+        self.assertEqual(models.AttributeType('N'), value['attr_type'])
+        self.assertRaises(AttributeError, setattr, value, 'attr_type', None)
+
+    def test_attribute_value_copy(self):
+        value = models.AttributeValue('SS', ['Update', 'Help'])
+
+        value_copy = copy.deepcopy(value)
+
+        self.assertEqual(value, value_copy)
+        self.assertIs(value.attr_type, value_copy.attr_type)
+
+    def test_counter_table_schema_to_json(self):
+        schema = models.TableSchema(
+            {'id': models.AttributeType('S'),
+             'views': models.AttributeType('N')},
+            ['id'], counter_attributes=['views']
+        )
+
+        self.assertEqual(frozenset(['views']), schema.counter_attributes)
+        self.assertEqual(schema,
+                         models.TableSchema.from_json(schema.to_json()))
+
+        # regular table schema is saved without counter attributes
+        schema = models.TableSchema({'id': models.AttributeType('S')},
+                                    ['id'])
+        self.assertEqual(frozenset(), schema.counter_attributes)
+        self.assertNotIn('counter_attributes', schema.to_json())
+
+    def test_counter_table_schema_not_counter_attribute(self):
+        self.assertRaises(
+            ValidationError, models.TableSchema,
+            {'id': models.AttributeType('S'),
+             'views': models.AttributeType('N'),
+             'title': models.AttributeType('S')},
+            ['id'], counter_attributes=['views']
+        )
+
+    def test_index_layout_table_schema_to_json(self):
+        schema = models.TableSchema(
+            {'id': models.AttributeType('S'),
+             'range': models.AttributeType('S'),
+             'indexed': models.AttributeType('S')},
+            ['id', 'range'],
+            {'index': models.IndexDefinition('id', 'indexed', ['title'])}
+        )
+
+        # schema of existing table is saved without index layout
+        self.assertEqual(models.TableSchema.INDEX_LAYOUT_FULL,
+                         schema.index_layout)
+        self.assertNotIn('index_layout', schema.to_json())
+
+        schema = schema.with_index_layout(
+            models.TableSchema.INDEX_LAYOUT_PROJECTED
+        )
+        self.assertEqual(models.TableSchema.INDEX_LAYOUT_PROJECTED,
+                         schema.index_layout)
+        self.assertEqual(schema,
+                         models.TableSchema.from_json(schema.to_json()))
+
+        self.assertRaises(ValidationError, schema.with_index_layout,
+                          'unknown')
+
+    def test_consistency_levels_table_schema_to_json(self):
+        schema = models.TableSchema(
+            {'id': models.AttributeType('S')}, ['id'],
+            consistency_levels=models.ConsistencyLevels()
+        )
+
+        # schema is saved without consistency levels if none is set
+        self.assertNotIn('consistency_levels', schema.to_json())
+        self.assertIsNone(schema.consistency_levels.read)
+
+        schema = models.TableSchema(
+            {'id': models.AttributeType('S')}, ['id'],
+            consistency_levels=models.ConsistencyLevels(
+                read='LOCAL_ONE', serial='LOCAL_SERIAL'
+            )
+        )
+        schema = models.TableSchema.from_json(schema.to_json())
+        self.assertEqual('LOCAL_ONE', schema.consistency_levels.read)
+        self.assertIsNone(schema.consistency_levels.write)
+        self.assertEqual('LOCAL_SERIAL', schema.consistency_levels.serial)
+
+        self.assertRaises(ValidationError, models.ConsistencyLevels,
+                          write='SERIAL')
+        self.assertRaises(ValidationError, models.ConsistencyLevels,
+                          serial='LOCAL_QUORUM')
+        self.assertRaises(ValidationError,
+                          models.ConsistencyLevels.validate_level, 'MOST')
@@ -77,6 +77,9 @@ ccm start
 create_keyspace_cassandra magnetodb
 create_keyspace_cassandra user_default_tenant
 echo 'CREATE TABLE magnetodb.table_info(tenant text, name text, id uuid, exists int, "schema" text, status text, internal_name text, last_update_date_time timestamp, creation_date_time timestamp, PRIMARY KEY(tenant,name));' >> ~/.ccm/cql.txt
+echo 'CREATE TABLE magnetodb.backup_info(tenant text, table_name text, id uuid, exists int, name text, status text, strategy text, location text, total_segments int, completed_segments int, item_count bigint, start_date_time timestamp, finish_date_time timestamp, PRIMARY KEY((tenant, table_name), id));' >> ~/.ccm/cql.txt
+echo 'CREATE TABLE magnetodb.restore_job_info(tenant text, table_name text, id uuid, exists int, backup_id uuid, status text, strategy text, source text, item_count bigint, failed_item_count bigint, start_date_time timestamp, finish_date_time timestamp, PRIMARY KEY((tenant, table_name), id));' >> ~/.ccm/cql.txt
+echo 'CREATE TABLE magnetodb.export_info(tenant text, table_name text, id uuid, exists int, status text, total_segments int, compress boolean, location text, completed_segments int, item_count bigint, error text, start_date_time timestamp, finish_date_time timestamp, PRIMARY KEY((tenant, table_name), id));' >> ~/.ccm/cql.txt
 echo 'CREATE TABLE magnetodb.dummy(id int PRIMARY KEY);' >> ~/.ccm/cql.txt
 
 timeout 120 sh -c 'while ! nc -z 127.0.0.1 9160; do sleep 1; done' || echo 'Could not login at 127.0.0.1:9160'